@@ -20,35 +20,52 @@ Example:
     >>> response = api.get("https://mysite.com/api/data")
 """
 
+from importlib import import_module
 from importlib.metadata import PackageNotFoundError
 from importlib.metadata import version as _pkg_version
+from typing import TYPE_CHECKING, Any
 
-from graftpunk.backends import BrowserBackend, get_backend, list_backends, register_backend
-from graftpunk.cache import (
-    cache_session,
-    clear_session_cache,
-    get_session_metadata,
-    list_sessions,
-    list_sessions_with_metadata,
-    load_session,
-    load_session_for_api,
-    update_session_status,
-    validate_session_name,
-)
-from graftpunk.client import GraftpunkClient
-from graftpunk.config import GraftpunkSettings, get_settings
-from graftpunk.encryption import decrypt_data, encrypt_data, get_encryption_key
-from graftpunk.exceptions import (
-    BrowserError,
-    EncryptionError,
-    GraftpunkError,
-    SessionExpiredError,
-    SessionNotFoundError,
-)
-from graftpunk.graftpunk_session import get_role_headers, list_roles, register_role
-from graftpunk.session import BrowserSession
-from graftpunk.stealth import create_stealth_driver
-from graftpunk.storage.base import SessionMetadata, SessionStorageBackend
+if TYPE_CHECKING:
+    from graftpunk.backends import (
+        BrowserBackend,
+        get_backend,
+        list_backends,
+        register_backend,
+    )
+    from graftpunk.cache import (
+        cache_session,
+        cache_session_async,
+        clear_session_cache,
+        clear_sessions,
+        get_session_metadata,
+        list_sessions,
+        list_sessions_with_metadata,
+        load_session,
+        load_session_async,
+        load_session_for_api,
+        rekey_sessions,
+        update_session_status,
+        validate_session_name,
+    )
+    from graftpunk.client import GraftpunkClient
+    from graftpunk.config import GraftpunkSettings, get_settings
+    from graftpunk.encryption import (
+        decrypt_data,
+        encrypt_data,
+        get_encryption_key,
+        register_key_provider,
+    )
+    from graftpunk.exceptions import (
+        BrowserError,
+        EncryptionError,
+        GraftpunkError,
+        SessionExpiredError,
+        SessionNotFoundError,
+    )
+    from graftpunk.graftpunk_session import get_role_headers, list_roles, register_role
+    from graftpunk.session import BrowserSession
+    from graftpunk.stealth import create_stealth_driver
+    from graftpunk.storage.base import SessionMetadata, SessionStorageBackend
 
 # Single source of truth: the version lives in pyproject.toml and is read back
 # from the installed package metadata. There is no literal to bump (or forget),
@@ -77,11 +94,15 @@ __all__ = [
     "get_role_headers",
     # Cache operations
     "cache_session",
+    "cache_session_async",
     "load_session",
+    "load_session_async",
     "load_session_for_api",
     "list_sessions",
     "list_sessions_with_metadata",
     "clear_session_cache",
+    "clear_sessions",
+    "rekey_sessions",
     "get_session_metadata",
     "update_session_status",
     "validate_session_name",
@@ -89,6 +110,7 @@ __all__ = [
     "encrypt_data",
     "decrypt_data",
     "get_encryption_key",
+    "register_key_provider",
     # Storage
     "SessionMetadata",
     "SessionStorageBackend",
@@ -102,3 +124,61 @@ __all__ = [
     "SessionNotFoundError",
     "EncryptionError",
 ]
+
+
+# Public names resolve lazily (PEP 562): ``import graftpunk`` only reads the
+# version, and each attribute imports its defining module on first access.
+# The browser stack (selenium, requestium, undetected-chromedriver), the HTTP
+# client and cryptography are therefore only paid for when actually used, which
+# keeps CLI start-up and API-only use of cached sessions fast.
+_LAZY_ATTRS: dict[str, str] = {
+    "BrowserBackend": "graftpunk.backends",
+    "get_backend": "graftpunk.backends",
+    "list_backends": "graftpunk.backends",
+    "register_backend": "graftpunk.backends",
+    "cache_session": "graftpunk.cache",
+    "cache_session_async": "graftpunk.cache",
+    "clear_session_cache": "graftpunk.cache",
+    "clear_sessions": "graftpunk.cache",
+    "get_session_metadata": "graftpunk.cache",
+    "list_sessions": "graftpunk.cache",
+    "list_sessions_with_metadata": "graftpunk.cache",
+    "load_session": "graftpunk.cache",
+    "load_session_async": "graftpunk.cache",
+    "load_session_for_api": "graftpunk.cache",
+    "rekey_sessions": "graftpunk.cache",
+    "update_session_status": "graftpunk.cache",
+    "validate_session_name": "graftpunk.cache",
+    "GraftpunkClient": "graftpunk.client",
+    "GraftpunkSettings": "graftpunk.config",
+    "get_settings": "graftpunk.config",
+    "decrypt_data": "graftpunk.encryption",
+    "encrypt_data": "graftpunk.encryption",
+    "get_encryption_key": "graftpunk.encryption",
+    "register_key_provider": "graftpunk.encryption",
+    "BrowserError": "graftpunk.exceptions",
+    "EncryptionError": "graftpunk.exceptions",
+    "GraftpunkError": "graftpunk.exceptions",
+    "SessionExpiredError": "graftpunk.exceptions",
+    "SessionNotFoundError": "graftpunk.exceptions",
+    "get_role_headers": "graftpunk.graftpunk_session",
+    "list_roles": "graftpunk.graftpunk_session",
+    "register_role": "graftpunk.graftpunk_session",
+    "BrowserSession": "graftpunk.session",
+    "create_stealth_driver": "graftpunk.stealth",
+    "SessionMetadata": "graftpunk.storage.base",
+    "SessionStorageBackend": "graftpunk.storage.base",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY_ATTRS})
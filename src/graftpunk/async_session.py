@@ -0,0 +1,285 @@
+"""AsyncGraftpunkSession — httpx.AsyncClient with browser header replay.
+
+The async counterpart of :class:`graftpunk.graftpunk_session.GraftpunkSession`.
+It applies the same header roles (auto-detected or explicit), CSRF token
+injection and Referer resolution, but sends requests through httpx, so a
+plugin can ``asyncio.gather`` many XHR calls. With HTTP/2 (the ``h2``
+package, ``pip install graftpunk[http2]``) concurrent requests to one host
+are multiplexed over a single connection instead of opening one per request.
+
+Example::
+
+    api = load_session_for_api("mysite")
+    async with AsyncGraftpunkSession.from_session(api) as client:
+        pages = await asyncio.gather(*(client.xhr("GET", url) for url in urls))
+    update_session_cookies(api, "mysite")  # the cookie jar is shared
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from typing import Any
+
+import requests
+
+try:
+    import httpx
+except ImportError as exc:  # pragma: no cover — httpx comes with the http2 extra
+    raise ImportError(
+        "httpx is required for AsyncGraftpunkSession. "
+        "Install with: pip install graftpunk[http2] or pip install 'httpx[http2]'"
+    ) from exc
+
+from graftpunk.graftpunk_session import (
+    GraftpunkSession,
+    TrackingCookieJar,
+    _detect_request_role,
+    _HeaderRoleMixin,
+)
+from graftpunk.logging import get_logger
+from graftpunk.tokens import _CACHE_ATTR, _CSRF_TOKENS_ATTR
+
+LOG = get_logger(__name__)
+
+
+def http2_available() -> bool:
+    """Whether the ``h2`` package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class AsyncGraftpunkSession(_HeaderRoleMixin, httpx.AsyncClient):
+    """An httpx.AsyncClient that auto-applies captured browser header roles.
+
+    Role headers sit between the client's default headers and anything the
+    caller set: headers passed to a request win, then headers explicitly set
+    on the session, then the detected (or explicit) role, then httpx's
+    defaults. CSRF tokens are added to mutation requests only.
+
+    Unlike httpx's defaults, redirects are followed (as requests does) unless
+    ``follow_redirects=False`` is passed.
+    """
+
+    def __init__(
+        self,
+        header_roles: dict[str, dict[str, str]] | None = None,
+        *,
+        base_url: str = "",
+        http2: bool | None = None,
+        cookies: requests.cookies.RequestsCookieJar | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize an AsyncGraftpunkSession.
+
+        Args:
+            header_roles: Dict mapping role names to header dicts.
+            base_url: Base URL for relative request URLs and Referer paths.
+            http2: Negotiate HTTP/2. None enables it when ``h2`` is installed.
+            cookies: Cookie jar to use, e.g. a GraftpunkSession's, so both
+                sessions see (and persist) the same cookies. Defaults to a
+                new change-tracking jar.
+            **kwargs: Additional arguments passed to httpx.AsyncClient.
+
+        Raises:
+            ImportError: If ``http2=True`` and ``h2`` is not installed.
+        """
+        if http2 is None:
+            http2 = http2_available()
+        kwargs.setdefault("follow_redirects", True)
+        super().__init__(
+            base_url=base_url,
+            http2=http2,
+            cookies=cookies if cookies is not None else TrackingCookieJar(),
+            **kwargs,
+        )
+        self._init_header_roles(header_roles, base_url)
+
+    @classmethod
+    def from_session(cls, session: requests.Session, **kwargs: Any) -> AsyncGraftpunkSession:
+        """Create an async session sharing a sync session's state.
+
+        The cookie jar and token caches are shared, not copied: cookies set
+        by responses on either session are visible to both, and
+        :func:`graftpunk.cache.update_session_cookies` on the sync session
+        persists them. Header roles, base URL and default role are copied,
+        as are the headers explicitly set on the sync session.
+
+        Args:
+            session: A GraftpunkSession (e.g. from ``load_session_for_api``)
+                or plain requests.Session.
+            **kwargs: Passed to the constructor (``http2``, ``timeout``, ...).
+
+        Returns:
+            A new AsyncGraftpunkSession.
+        """
+        if isinstance(session, GraftpunkSession):
+            kwargs.setdefault("base_url", session.gp_base_url)
+            client = cls(header_roles=session._gp_header_roles, cookies=session.cookies, **kwargs)
+            client.gp_default_role = session.gp_default_role
+            explicit = {k: v for k, v in session.headers.items() if session._is_user_set_header(k)}
+        else:
+            client = cls(cookies=session.cookies, **kwargs)
+            defaults = requests.utils.default_headers()
+            explicit = {k: v for k, v in session.headers.items() if defaults.get(k) != v}
+        client.headers.update(explicit)
+
+        for attr in (_CACHE_ATTR, _CSRF_TOKENS_ATTR):
+            state = getattr(session, attr, None)
+            if state is None:
+                state = {}
+                setattr(session, attr, state)
+            setattr(client, attr, state)
+        return client
+
+    def _request_role(
+        self, method: str, caller_headers: httpx.Headers, *, has_json: bool, has_data: bool
+    ) -> str:
+        if self.gp_default_role:
+            return self.gp_default_role
+        return _detect_request_role(
+            method,
+            caller_headers.get("Accept", ""),
+            has_json=has_json,
+            has_data=has_data,
+        )
+
+    def build_request(  # type: ignore[override]
+        self,
+        method: str,
+        url: httpx.URL | str,
+        *,
+        headers: Any = None,
+        json: Any = None,
+        data: Any = None,
+        content: Any = None,
+        **kwargs: Any,
+    ) -> httpx.Request:
+        """Build a request with auto-detected role headers and CSRF tokens.
+
+        Args:
+            method: HTTP method.
+            url: Request URL (relative URLs are joined with ``base_url``).
+            headers: Caller headers; these take precedence over everything.
+            json: JSON body.
+            data: Form body.
+            content: Raw body.
+            **kwargs: Passed through to httpx.AsyncClient.build_request().
+
+        Returns:
+            The request to send.
+        """
+        caller_headers = httpx.Headers(headers)
+        merged = httpx.Headers()
+        if self._gp_header_roles:
+            role = self._request_role(
+                method,
+                caller_headers,
+                has_json=json is not None,
+                has_data=bool(data or content),
+            )
+            # Role headers replace library defaults but not headers the
+            # user set on the session (build_request layers these on top
+            # of self.headers).
+            merged.update(self._role_layer(role) or {})
+        merged.update(caller_headers)
+        for name, value in self._csrf_tokens_for(method).items():
+            if name not in merged and name not in self.headers:
+                merged[name] = value
+        return super().build_request(
+            method, url, headers=merged, json=json, data=data, content=content, **kwargs
+        )
+
+    async def request_with_role(
+        self,
+        role_name: str,
+        method: str,
+        url: httpx.URL | str,
+        *,
+        referer: str | None = None,
+        headers: dict[str, str] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Make a request with explicit role headers.
+
+        Args:
+            role_name: Role to apply (e.g. ``"xhr"``, ``"navigation"``,
+                ``"form"``, or any custom role name).
+            method: HTTP method.
+            url: Request URL.
+            referer: Optional Referer path or URL.
+            headers: Optional caller headers (override role headers).
+            **kwargs: Passed through to httpx.AsyncClient.request().
+
+        Returns:
+            The response object.
+        """
+        role_headers = self._role_headers_for(role_name)
+        if referer is not None:
+            role_headers["Referer"] = self._resolve_referer(referer)
+        if headers:
+            role_headers.update(headers)
+        return await self.request(method.upper(), url, headers=role_headers, **kwargs)
+
+    async def xhr(
+        self,
+        method: str,
+        url: httpx.URL | str,
+        *,
+        referer: str | None = None,
+        headers: dict[str, str] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Make a request with XHR role headers (see :meth:`request_with_role`)."""
+        return await self.request_with_role(
+            "xhr", method, url, referer=referer, headers=headers, **kwargs
+        )
+
+    async def navigate(
+        self,
+        method: str,
+        url: httpx.URL | str,
+        *,
+        referer: str | None = None,
+        headers: dict[str, str] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Make a request with navigation role headers (see :meth:`request_with_role`)."""
+        return await self.request_with_role(
+            "navigation", method, url, referer=referer, headers=headers, **kwargs
+        )
+
+    async def form_submit(
+        self,
+        method: str,
+        url: httpx.URL | str,
+        *,
+        referer: str | None = None,
+        headers: dict[str, str] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Make a request with form role headers (see :meth:`request_with_role`)."""
+        return await self.request_with_role(
+            "form", method, url, referer=referer, headers=headers, **kwargs
+        )
+
+
+def load_async_session_for_api(name: str, **kwargs: Any) -> AsyncGraftpunkSession:
+    """Load a cached session as an AsyncGraftpunkSession.
+
+    The sync session it is built from is not returned, so cookies set by
+    responses are not persisted; call :meth:`AsyncGraftpunkSession.from_session`
+    on a ``load_session_for_api()`` session when they should be.
+
+    Args:
+        name: Session name.
+        **kwargs: Passed to :meth:`AsyncGraftpunkSession.from_session`.
+
+    Returns:
+        AsyncGraftpunkSession with the cached cookies, headers and roles.
+
+    Raises:
+        SessionNotFoundError: If session file doesn't exist.
+        SessionExpiredError: If session cannot be decoded.
+    """
+    from graftpunk.cache import load_session_for_api
+
+    return AsyncGraftpunkSession.from_session(load_session_for_api(name), **kwargs)
@@ -1,4 +1,4 @@
-"""Session caching and persistence using dill (enhanced pickle).
+"""Session caching and persistence.
 
 This module provides session storage functionality with pluggable backends:
 - Local filesystem (default): ~/.config/graftpunk/sessions/
@@ -7,30 +7,58 @@ This module provides session storage functionality with pluggable backends:
 
 Backend selection is automatic based on GRAFTPUNK_STORAGE_BACKEND environment variable.
 
+Sessions are serialized with the versioned, non-executable format in
+``graftpunk.session_format``. Legacy dill-pickled blobs are still readable and
+are rewritten in the current format the first time they are loaded.
+
 Thread Safety:
-    This module uses a global cached storage backend for performance. The cache
-    is NOT thread-safe. This is acceptable for the current single-threaded CLI
-    usage pattern. If using graftpunk in a multi-threaded application, external
-    synchronization is required when calling cache functions.
+    The global storage backend is created once, under a lock, and shared by
+    every thread; the in-process decoded-session cache is guarded by its own
+    lock. Loading sessions from several threads (or several ``*_async``
+    calls) at once is safe. Concurrent saves of the *same* session are
+    serialized by the local backend's per-session file lock; on remote
+    backends the last writer wins.
 """
 
+import asyncio
+import contextlib
+import copy
+import dataclasses
 import hashlib
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Any, Protocol, TypeVar, runtime_checkable
 from urllib.parse import urlparse
 
-import dill as pickle
 import requests
 
 from graftpunk.config import get_settings
-from graftpunk.encryption import decrypt_data, encrypt_data
-from graftpunk.exceptions import EncryptionError, SessionExpiredError, SessionNotFoundError
+from graftpunk.encryption import decrypt_data, encrypt_data, needs_rekey
+from graftpunk.exceptions import (
+    EncryptionError,
+    GraftpunkError,
+    SessionExpiredError,
+    SessionFormatError,
+    SessionNotFoundError,
+)
 from graftpunk.logging import get_logger
-from graftpunk.storage.base import SessionMetadata
+from graftpunk.response_cache import clear_response_cache, session_partition
+from graftpunk.session_format import (
+    StoredSession,
+    dumps_session,
+    is_legacy_blob,
+    load_legacy_session,
+    loads_session,
+)
+from graftpunk.storage.base import METADATA_FETCH_WORKERS, SessionMetadata
 
 if TYPE_CHECKING:
     from graftpunk.storage.base import SessionStorageBackend
+    from graftpunk.transport import TransportConfig
 
 
 @runtime_checkable
@@ -38,8 +66,9 @@ class SessionLike(Protocol):
     """Protocol for objects that can be loaded as sessions.
 
     This protocol defines the minimum interface expected from session objects
-    returned by load_session(). It ensures type safety while allowing both
-    BrowserSession and requestium.Session objects.
+    accepted by cache_session() and returned by load_session(). It ensures type
+    safety while allowing BrowserSession, requests.Session and StoredSession
+    objects.
     """
 
     cookies: Any
@@ -83,6 +112,7 @@ def validate_session_name(name: str) -> None:
 
 # Global session storage backend (lazy-loaded)
 _session_storage_backend: "SessionStorageBackend | None" = None
+_session_storage_backend_lock = threading.Lock()
 
 
 _VALID_BACKEND_TYPES = {"local", "supabase", "s3"}
@@ -91,6 +121,9 @@ _VALID_BACKEND_TYPES = {"local", "supabase", "s3"}
 def _create_backend(backend_type: str) -> "SessionStorageBackend":
     """Create a new storage backend instance for the given type.
 
+    Remote backends are wrapped in a TieredSessionStorage local cache when
+    GRAFTPUNK_STORAGE_LOCAL_CACHE is enabled.
+
     Args:
         backend_type: Storage backend type ("local", "supabase", or "s3").
 
@@ -109,29 +142,45 @@ def _create_backend(backend_type: str) -> "SessionStorageBackend":
     settings = get_settings()
     config = settings.get_storage_config(backend_type=backend_type)
 
+    remote: SessionStorageBackend
     if backend_type == "supabase":
         from graftpunk.storage.supabase import SupabaseSessionStorage
 
-        return SupabaseSessionStorage(
+        remote = SupabaseSessionStorage(
             url=config["url"],
             service_key=config["service_key"],
             bucket_name=config.get("bucket_name", "sessions"),
+            use_index=config.get("use_index", False),
         )
-
-    if backend_type == "s3":
+    elif backend_type == "s3":
         from graftpunk.storage.s3 import S3SessionStorage
 
-        return S3SessionStorage(
+        remote = S3SessionStorage(
             bucket=config["bucket"],
             region=config.get("region"),
             endpoint_url=config.get("endpoint_url"),
             max_retries=config.get("retry_max_attempts", 5),
             base_delay=config.get("retry_base_delay", 1.0),
+            use_index=config.get("use_index", False),
+            concurrent_writes=config.get("concurrent_writes", False),
         )
+    else:
+        from graftpunk.storage.local import LocalSessionStorage
+
+        return LocalSessionStorage(base_dir=config["base_dir"])
 
-    from graftpunk.storage.local import LocalSessionStorage
+    cache_root = config.get("local_cache_dir")
+    if not cache_root:
+        return remote
 
-    return LocalSessionStorage(base_dir=config["base_dir"])
+    from graftpunk.storage.tiered import TieredSessionStorage
+
+    # One cache directory per remote store, so switching buckets or endpoints
+    # never serves another store's sessions.
+    identity = f"{remote.storage_location}|{config.get('endpoint_url') or config.get('url') or ''}"
+    digest = hashlib.sha256(identity.encode("utf-8")).hexdigest()[:16]
+    cache_dir = cache_root / f"{remote.storage_backend}-{digest}"
+    return TieredSessionStorage(remote, cache_dir)
 
 
 def _get_session_storage_backend(
@@ -157,19 +206,127 @@ def _get_session_storage_backend(
 
     global _session_storage_backend
 
-    if _session_storage_backend is not None:
-        return _session_storage_backend
+    backend = _session_storage_backend
+    if backend is not None:
+        return backend
 
-    settings = get_settings()
-    _session_storage_backend = _create_backend(settings.storage_backend)
-
-    return _session_storage_backend
+    # Double-checked: threads racing on first use build one backend (and
+    # one set of remote clients) between them.
+    with _session_storage_backend_lock:
+        if _session_storage_backend is None:
+            settings = get_settings()
+            _session_storage_backend = _create_backend(settings.storage_backend)
+        return _session_storage_backend
 
 
 def _reset_session_storage_backend() -> None:
     """Reset the session storage backend (for testing)."""
     global _session_storage_backend
-    _session_storage_backend = None
+    with _session_storage_backend_lock:
+        _session_storage_backend = None
+    with _decoded_sessions_lock:
+        _decoded_sessions.clear()
+
+
+@dataclass(frozen=True)
+class _DecodedSession:
+    """A decoded session plus the stored metadata it was decoded from."""
+
+    checksum: str
+    modified_at: datetime
+    session: Any
+
+
+# In-process LRU of decoded sessions, keyed by (storage location, session name).
+# An entry is only served while the backend's metadata still reports the same
+# checksum and modified_at, so a blob rewritten elsewhere is never returned stale.
+_decoded_sessions: "OrderedDict[tuple[str, str], _DecodedSession]" = OrderedDict()
+_decoded_sessions_lock = threading.Lock()
+
+
+def _decoded_session_key(backend: "SessionStorageBackend", name: str) -> tuple[str, str]:
+    return (backend.storage_location, name)
+
+
+def _get_decoded_session(backend: "SessionStorageBackend", name: str) -> Any | None:
+    """Return the cached decoded session if the stored blob is unchanged.
+
+    Only consults backend metadata when an entry exists, so a cache miss
+    costs nothing beyond the normal load path.
+
+    Args:
+        backend: Storage backend the session lives in.
+        name: Session name.
+
+    Returns:
+        The cached session object, or None if absent, stale, or expired.
+    """
+    key = _decoded_session_key(backend, name)
+    with _decoded_sessions_lock:
+        entry = _decoded_sessions.get(key)
+    if entry is None:
+        return None
+
+    # The metadata read is I/O, so it runs outside the lock; the entry is
+    # only dropped or promoted if no other thread replaced it meanwhile.
+    metadata = backend.get_session_metadata(name)
+    stale = (
+        metadata is None
+        or metadata.checksum != entry.checksum
+        or metadata.modified_at != entry.modified_at
+        or (metadata.expires_at is not None and datetime.now(UTC) > metadata.expires_at)
+    )
+    with _decoded_sessions_lock:
+        if _decoded_sessions.get(key) is entry:
+            if stale:
+                del _decoded_sessions[key]
+            else:
+                _decoded_sessions.move_to_end(key)
+    if stale:
+        LOG.debug("decoded_session_cache_stale", name=name)
+        return None
+
+    LOG.debug("decoded_session_cache_hit", name=name)
+    return entry.session
+
+
+def _put_decoded_session(
+    backend: "SessionStorageBackend",
+    name: str,
+    metadata: SessionMetadata,
+    session: Any,
+) -> None:
+    """Store a decoded session, evicting the least recently used entries.
+
+    Legacy sessions (empty checksum) are never cached because there is
+    nothing to validate a later hit against.
+    """
+    max_size = get_settings().session_cache_size
+    if max_size <= 0 or not metadata.checksum:
+        return
+
+    key = _decoded_session_key(backend, name)
+    entry = _DecodedSession(
+        checksum=metadata.checksum,
+        modified_at=metadata.modified_at,
+        session=session,
+    )
+    with _decoded_sessions_lock:
+        _decoded_sessions[key] = entry
+        _decoded_sessions.move_to_end(key)
+        while len(_decoded_sessions) > max_size:
+            _decoded_sessions.popitem(last=False)
+
+
+def _invalidate_decoded_session(backend: "SessionStorageBackend", name: str) -> Any | None:
+    """Drop any cached decoded session for ``name``.
+
+    Returns:
+        The session object that was cached, or None.
+    """
+    with _decoded_sessions_lock:
+        entry = _decoded_sessions.pop(_decoded_session_key(backend, name), None)
+    return entry.session if entry is not None else None
 
 
 def _extract_session_metadata(session: Any, session_name: str) -> dict[str, Any]:
@@ -224,7 +381,7 @@ def get_session_metadata(
     """Get session metadata without loading the full session.
 
     This is a lightweight way to check session status, timestamps, etc.
-    without deserializing the encrypted pickle file.
+    without decrypting and decoding the session blob.
 
     Args:
         name: Session name.
@@ -263,28 +420,48 @@ def cache_session(session: T, session_name: str | None = None) -> str:
     - "supabase": Supabase Storage bucket (file-pair pattern)
     - "s3": S3-compatible storage bucket (file-pair pattern)
 
+    Only the HTTP state is stored (cookies, headers, header roles, token
+    caches and current URL); see ``graftpunk.session_format``.
+
     Args:
-        session: Session object to cache (must be picklable).
+        session: Session object to cache.
         session_name: Optional session name. If not provided, tries to get from session.
 
     Returns:
         Storage location string.
+
+    Raises:
+        SessionFormatError: If the session state cannot be serialized.
     """
     if session_name is None:
         # Try to get session_name from the session object
         session_name = getattr(session, "session_name", "default")
+    return _cache_session(session, session_name)
 
+
+def _cache_session(session: Any, session_name: str, replaces: Any | None = None) -> str:
+    """Save ``session`` under ``session_name``; see :func:`cache_session`.
+
+    Args:
+        session: Session object to cache.
+        session_name: Session name.
+        replaces: Decoded session that ``session`` is an updated copy of. If
+            it is still the cached decode, ``session`` takes its place.
+
+    Returns:
+        Storage location string.
+    """
     validate_session_name(session_name)
 
     backend = _get_session_storage_backend()
     settings = get_settings()
 
     try:
-        # Pickle and encrypt session data
+        # Serialize and encrypt session data
         LOG.info("caching_session", name=session_name, backend=settings.storage_backend)
-        pickled_data = pickle.dumps(session)
-        checksum = hashlib.sha256(pickled_data).hexdigest()
-        encrypted_data = encrypt_data(pickled_data)
+        serialized_data = dumps_session(session)
+        checksum = hashlib.sha256(serialized_data).hexdigest()
+        encrypted_data = encrypt_data(serialized_data)
 
         # Extract metadata from session
         raw_metadata = _extract_session_metadata(session, session_name)
@@ -306,15 +483,77 @@ def cache_session(session: T, session_name: str | None = None) -> str:
 
         # Save to backend
         location = backend.save_session(session_name, encrypted_data, metadata)
+        # Keep the decoded cache coherent. Re-saving the cached object itself,
+        # or an updated copy of it (update_session_cookies), re-keys the cache
+        # to the new metadata; any other object is caller-owned and live, so
+        # just drop the stale entry.
+        cached = _invalidate_decoded_session(backend, session_name)
+        if cached is not None and (cached is session or cached is replaces):
+            _put_decoded_session(backend, session_name, metadata, session)
+        # A StoredSession is a write-back of this session's own state; anything
+        # else is a new login, which may be a different account.
+        if not isinstance(session, StoredSession):
+            clear_response_cache(session_partition(session_name))
         LOG.info("wrote_session_to_backend", name=session_name, location=location)
         return location
 
-    except (pickle.PickleError, RuntimeError, OSError) as exc:
+    except (SessionFormatError, RuntimeError, OSError) as exc:
         LOG.error("failed_to_cache_session", name=session_name, error=str(exc))
         raise
 
 
-def load_session(name: str) -> SessionLike:
+async def cache_session_async(session: T, session_name: str | None = None) -> str:
+    """Async variant of :func:`cache_session`.
+
+    Serialization, encryption and the backend write run in a worker thread,
+    so callers inside an event loop (nodriver login flows, async
+    applications) don't block it while the session is persisted. The session
+    must not be mutated until the returned coroutine completes.
+
+    Args:
+        session: Session object to cache.
+        session_name: Optional session name. If not provided, tries to get from session.
+
+    Returns:
+        Storage location string.
+
+    Raises:
+        SessionFormatError: If the session state cannot be serialized.
+    """
+    return await asyncio.to_thread(cache_session, session, session_name)
+
+
+def _migrate_legacy_session(
+    backend: "SessionStorageBackend",
+    name: str,
+    session: StoredSession,
+    metadata: SessionMetadata,
+) -> SessionMetadata:
+    """Rewrite a legacy dill-pickled session in the current format.
+
+    Best-effort: a failed rewrite is logged and the legacy blob is left in
+    place, to be migrated on a later load.
+
+    Returns:
+        Metadata describing the stored blob after migration (the original
+        metadata if the rewrite failed).
+    """
+    try:
+        serialized_data = dumps_session(session)
+        migrated = dataclasses.replace(
+            metadata,
+            checksum=hashlib.sha256(serialized_data).hexdigest(),
+            modified_at=datetime.now(UTC),
+        )
+        backend.save_session(name, encrypt_data(serialized_data), migrated)
+    except Exception as exc:  # noqa: BLE001 — best-effort migration
+        LOG.warning("legacy_session_migration_failed", name=name, error=str(exc))
+        return metadata
+    LOG.info("migrated_legacy_session", name=name)
+    return migrated
+
+
+def load_session(name: str) -> StoredSession:
     """Load a cached session.
 
     Storage location depends on GRAFTPUNK_STORAGE_BACKEND:
@@ -322,18 +561,29 @@ def load_session(name: str) -> SessionLike:
     - "supabase": Supabase Storage (file-pair pattern)
     - "s3": S3-compatible storage (file-pair pattern)
 
+    Sessions are returned as a :class:`~graftpunk.session_format.StoredSession`
+    carrying the cached HTTP state; no browser is attached.
+
     Security Notes:
-        This function deserializes pickle data. Pickle can execute arbitrary
-        code during deserialization.
+        Current sessions are JSON documents and decoding them cannot execute
+        code. Legacy sessions are dill pickles, which can execute arbitrary
+        code during deserialization; they are unpickled once, after
+        decryption and checksum validation, and immediately rewritten in the
+        current format.
 
         Threat Model:
-        - Sessions are encrypted with Fernet (AES-128-CBC + HMAC)
-        - SHA256 checksum validation before unpickling (defense-in-depth)
-        - Runtime validation is performed after unpickling to detect corrupted data
-        - Fernet provides HMAC authentication (SHA256) to detect tampering
+        - Sessions are encrypted with AES-256-GCM (legacy blobs: Fernet)
+        - SHA256 checksum validation before decoding (defense-in-depth)
+        - Runtime validation is performed after decoding to detect corrupted data
+        - The AEAD tag (or Fernet HMAC) authenticates every blob to detect tampering
 
         Recommendation: Only run this tool on trusted machines.
 
+    Decoded sessions are kept in a small in-process LRU (sized by
+    ``GRAFTPUNK_SESSION_CACHE_SIZE``). A repeat load whose stored checksum and
+    modified_at are unchanged returns the same object without decrypting or
+    decoding again, so callers that need an independent copy must copy it.
+
     Args:
         name: Session name.
 
@@ -347,6 +597,11 @@ def load_session(name: str) -> SessionLike:
     backend = _get_session_storage_backend()
     settings = get_settings()
 
+    if settings.session_cache_size > 0:
+        cached = _get_decoded_session(backend, name)
+        if cached is not None:
+            return cached
+
     try:
         # Load encrypted data from backend
         encrypted_data, metadata = backend.load_session(name)
@@ -358,7 +613,8 @@ def load_session(name: str) -> SessionLike:
             LOG.error("session_decryption_failed", name=name, backend=settings.storage_backend)
             raise SessionExpiredError(
                 f"Session '{name}' cannot be decrypted. The session file may be corrupted "
-                "or the encryption key has changed. Please run 'graftpunk clear' and re-login."
+                "or the encryption key has changed (keep rotated-out keys as extra lines in "
+                "the key source). Otherwise run 'graftpunk clear' and re-login."
             ) from exc
 
         # Verify checksum (required for new sessions, skipped for legacy)
@@ -378,21 +634,27 @@ def load_session(name: str) -> SessionLike:
                 hint="Consider re-saving session to add checksum",
             )
 
-        # Unpickle (encrypted data has already been validated via Fernet MAC)
-        session = pickle.loads(decrypted_data)  # noqa: S301
+        if is_legacy_blob(decrypted_data):
+            # Unpickle (encrypted data has already been authenticated by decrypt_data)
+            legacy = load_legacy_session(decrypted_data)
 
-        # Runtime validation: verify unpickled object has expected attributes
-        if not hasattr(session, "cookies") or not hasattr(session, "headers"):
-            raise SessionExpiredError(
-                f"Session '{name}' has invalid structure. Run 'gp clear' and re-login."
-            )
+            # Runtime validation: verify unpickled object has expected attributes
+            if not hasattr(legacy, "cookies") or not hasattr(legacy, "headers"):
+                raise SessionExpiredError(
+                    f"Session '{name}' has invalid structure. Run 'gp clear' and re-login."
+                )
+            session = loads_session(dumps_session(legacy))
+            metadata = _migrate_legacy_session(backend, name, session, metadata)
+        else:
+            session = loads_session(decrypted_data)
 
+        _put_decoded_session(backend, name, metadata, session)
         LOG.info("successfully_loaded_session", name=name, backend=settings.storage_backend)
         return session
 
     except (SessionNotFoundError, SessionExpiredError):
         raise
-    except (pickle.UnpicklingError, RuntimeError) as exc:
+    except (SessionFormatError, RuntimeError) as exc:
         LOG.error(
             "failed_to_load_session",
             name=name,
@@ -402,16 +664,43 @@ def load_session(name: str) -> SessionLike:
         raise SessionExpiredError(f"Failed to load session '{name}': {exc}") from exc
 
 
-def load_session_for_api(name: str) -> requests.Session:
+async def load_session_async(name: str) -> StoredSession:
+    """Async variant of :func:`load_session`.
+
+    The backend read, decryption and decoding run in a worker thread so the
+    event loop keeps running.
+
+    Args:
+        name: Session name.
+
+    Returns:
+        Loaded session object.
+
+    Raises:
+        SessionNotFoundError: If session file doesn't exist.
+        SessionExpiredError: If session cannot be decrypted or has invalid structure.
+    """
+    return await asyncio.to_thread(load_session, name)
+
+
+def load_session_for_api(
+    name: str, *, transport: "TransportConfig | None" = None
+) -> requests.Session:
     """Load cached session for API use (no browser required).
 
-    This extracts cookies and headers from a cached BrowserSession
-    and creates a GraftpunkSession that can be used for API calls
+    This projects the cookies, headers and token caches of a cached
+    session onto a GraftpunkSession that can be used for API calls
     without launching a browser. If the cached session has header
     roles (captured during login), they are applied automatically.
 
+    The stored document is decoded without building a BrowserSession, so
+    this path never imports selenium, requestium or nodriver (legacy dill
+    sessions are the one exception, until their first load migrates them).
+
     Args:
         name: Session name (without .session.pickle extension).
+        transport: Connection pool and retry settings for the returned
+            session (e.g. a plugin's ``transport_config``).
 
     Returns:
         GraftpunkSession with cookies, headers, and header roles
@@ -419,7 +708,7 @@ def load_session_for_api(name: str) -> requests.Session:
 
     Raises:
         SessionNotFoundError: If session file doesn't exist.
-        SessionExpiredError: If session cannot be unpickled.
+        SessionExpiredError: If session cannot be decoded.
     """
     try:
         browser_session = load_session(name)
@@ -435,11 +724,13 @@ def load_session_for_api(name: str) -> requests.Session:
     # Create GraftpunkSession with header roles for auto-detection
     from graftpunk.graftpunk_session import GraftpunkSession
 
-    api_session = GraftpunkSession(header_roles=header_roles)
+    api_session = GraftpunkSession(header_roles=header_roles, transport=transport)
 
-    # Copy cookies from browser session
+    # Copy cookies from browser session into the session's change-tracking
+    # jar. Cookies are copied rather than shared because load_session may
+    # hand back the same cached object on every call.
     if hasattr(browser_session, "cookies"):
-        api_session.cookies = browser_session.cookies
+        api_session.cookies.update(browser_session.cookies)
         LOG.debug(
             "copied_cookies_from_session",
             cookie_count=len(browser_session.cookies),
@@ -447,7 +738,7 @@ def load_session_for_api(name: str) -> requests.Session:
 
     # Copy headers from browser session, but skip requests-library defaults
     # that would clobber browser identity headers extracted from roles.
-    # The pickled BrowserSession (a requests.Session) carries default headers
+    # The cached session (a requests.Session) carries default headers
     # like User-Agent: python-requests/2.x — copying them overwrites the
     # Chrome UA that _apply_browser_identity() set during GraftpunkSession init.
     # Also skip ephemeral security headers (e.g. X-CSRF-TOKEN from WAFs like
@@ -469,7 +760,7 @@ def load_session_for_api(name: str) -> requests.Session:
 
     token_cache = getattr(browser_session, _CACHE_ATTR, None)
     if token_cache:
-        setattr(api_session, _CACHE_ATTR, token_cache)
+        setattr(api_session, _CACHE_ATTR, dict(token_cache))
         LOG.debug("copied_cached_tokens_from_session", count=len(token_cache))
 
     csrf_tokens = getattr(browser_session, _CSRF_TOKENS_ATTR, None)
@@ -477,6 +768,9 @@ def load_session_for_api(name: str) -> requests.Session:
         setattr(api_session, _CSRF_TOKENS_ATTR, dict(csrf_tokens))
         LOG.debug("copied_csrf_tokens_from_session", count=len(csrf_tokens))
 
+    api_session._mark_persisted()
+    api_session.enable_response_cache(session_partition(name))
+
     LOG.info(
         "created_api_session_from_cached_session",
         name=name,
@@ -486,17 +780,48 @@ def load_session_for_api(name: str) -> requests.Session:
     return api_session
 
 
+def _copy_session(session: Any) -> Any:
+    """Shallow-copy a decoded session, giving the copy its own cookie jar.
+
+    ``requests.Session`` copies only its own ``__attrs__``, so the remaining
+    instance attributes (current URL, header roles, token caches) are
+    carried over explicitly.
+    """
+    clone = copy.copy(session)
+    for attr, value in vars(session).items():
+        vars(clone).setdefault(attr, value)
+    clone.cookies = session.cookies.copy()
+    return clone
+
+
 def update_session_cookies(api_session: requests.Session, session_name: str) -> None:
     """Persist an API session's cookies and token cache back to the session cache.
 
     Loads the original cached session (preserving browser metadata),
-    updates its cookies and token cache from the API session, and saves it back.
-    This is best-effort — failures are logged but do not raise.
+    applies the API session's cookies and token cache to a copy of it, and
+    saves the copy, which replaces the original in the decoded-session cache
+    only once the save succeeded. This is best-effort — failures are logged
+    but do not raise.
+
+    A GraftpunkSession from :func:`load_session_for_api` tracks its own
+    changes: if no cookie and no token changed since it was loaded (or last
+    saved), nothing is written, and otherwise only the changed and cleared
+    cookies are applied to the stored session. Other sessions have their
+    whole cookie jar merged in.
 
     Args:
         api_session: The API session with potentially updated cookies and token cache.
         session_name: Name of the cached session to update.
     """
+    from graftpunk.graftpunk_session import GraftpunkSession, TrackingCookieJar
+
+    tracked = isinstance(api_session, GraftpunkSession) and isinstance(
+        api_session.cookies, TrackingCookieJar
+    )
+    if tracked and not api_session._has_unpersisted_changes():
+        LOG.debug("session_save_skipped_unchanged", session_name=session_name)
+        return
+
     try:
         original = load_session(session_name)
     except Exception as exc:  # noqa: BLE001 — best-effort save
@@ -510,15 +835,34 @@ def update_session_cookies(api_session: requests.Session, session_name: str) ->
     try:
         from graftpunk.tokens import _CACHE_ATTR, _CSRF_TOKENS_ATTR
 
-        original.cookies.update(api_session.cookies)
+        # ``original`` may be the shared decoded object other threads are
+        # reading; update a copy and let the save publish it.
+        stored = _copy_session(original)
+        if tracked:
+            updated, removed = api_session.cookies.changes()
+            for cookie in updated:
+                stored.cookies.set_cookie(copy.copy(cookie))
+            for domain, path, name in removed:
+                with contextlib.suppress(KeyError):
+                    stored.cookies.clear(domain, path, name)
+            LOG.debug(
+                "applied_cookie_delta",
+                session_name=session_name,
+                updated=len(updated),
+                removed=len(removed),
+            )
+        else:
+            stored.cookies.update(api_session.cookies)
         # Persist token cache and CSRF tokens from working session
         token_cache = getattr(api_session, _CACHE_ATTR, None)
         if token_cache is not None:
-            setattr(original, _CACHE_ATTR, token_cache)
+            setattr(stored, _CACHE_ATTR, dict(token_cache))
         csrf_tokens = getattr(api_session, _CSRF_TOKENS_ATTR, None)
         if csrf_tokens is not None:
-            setattr(original, _CSRF_TOKENS_ATTR, dict(csrf_tokens))
-        cache_session(original, session_name)
+            setattr(stored, _CSRF_TOKENS_ATTR, dict(csrf_tokens))
+        _cache_session(stored, session_name, replaces=original)
+        if tracked:
+            api_session._mark_persisted()
         LOG.info("session_cookies_updated", session_name=session_name)
     except Exception as exc:  # noqa: BLE001 — best-effort save
         LOG.warning(
@@ -554,28 +898,35 @@ def list_sessions_with_metadata(
         - storage_backend, storage_location
     """
     backend = _get_session_storage_backend(backend_override=backend_override)
-    names = backend.list_sessions()
 
-    results = []
-    for name in names:
-        metadata = backend.get_session_metadata(name)
-        if metadata is not None:
-            results.append(
-                {
-                    "name": metadata.name,
-                    "checksum": metadata.checksum,
-                    "created_at": metadata.created_at.isoformat(),
-                    "modified_at": metadata.modified_at.isoformat(),
-                    "expires_at": metadata.expires_at.isoformat() if metadata.expires_at else None,
-                    "domain": metadata.domain,
-                    "current_url": metadata.current_url,
-                    "cookie_count": metadata.cookie_count,
-                    "cookie_domains": metadata.cookie_domains,
-                    "status": metadata.status,
-                    "storage_backend": metadata.storage_backend,
-                    "storage_location": metadata.storage_location,
-                }
-            )
+    batch_list = getattr(backend, "list_sessions_with_metadata", None)
+    if batch_list is not None:
+        all_metadata = batch_list()
+    else:
+        # Third-party backends predating the batch API: one fetch per session.
+        all_metadata = [
+            metadata
+            for metadata in map(backend.get_session_metadata, backend.list_sessions())
+            if metadata is not None
+        ]
+
+    results = [
+        {
+            "name": metadata.name,
+            "checksum": metadata.checksum,
+            "created_at": metadata.created_at.isoformat(),
+            "modified_at": metadata.modified_at.isoformat(),
+            "expires_at": metadata.expires_at.isoformat() if metadata.expires_at else None,
+            "domain": metadata.domain,
+            "current_url": metadata.current_url,
+            "cookie_count": metadata.cookie_count,
+            "cookie_domains": metadata.cookie_domains,
+            "status": metadata.status,
+            "storage_backend": metadata.storage_backend,
+            "storage_location": metadata.storage_location,
+        }
+        for metadata in all_metadata
+    ]
 
     return sorted(results, key=lambda x: x.get("modified_at", ""), reverse=True)
 
@@ -598,16 +949,132 @@ def clear_session_cache(
 
     if session_name:
         # Clear specific session
+        _invalidate_decoded_session(backend, session_name)
+        clear_response_cache(session_partition(session_name))
         if backend.delete_session(session_name):
             removed.append(session_name)
         return removed
 
     # Clear all sessions
-    for name in backend.list_sessions():
-        if backend.delete_session(name):
-            removed.append(name)
+    return _delete_sessions(backend, backend.list_sessions())
+
+
+def clear_sessions(
+    session_names: list[str],
+    backend_override: str | None = None,
+) -> list[str]:
+    """Clear several cached sessions in one batched backend operation.
+
+    Args:
+        session_names: Sessions to remove.
+        backend_override: If set, use this backend type instead of the default.
+
+    Returns:
+        List of removed session names.
+    """
+    backend = _get_session_storage_backend(backend_override=backend_override)
+    return _delete_sessions(backend, session_names)
+
+
+def _delete_sessions(backend: "SessionStorageBackend", names: list[str]) -> list[str]:
+    for name in names:
+        _invalidate_decoded_session(backend, name)
+        clear_response_cache(session_partition(name))
+    if not names:
+        return []
+
+    bulk_delete = getattr(backend, "delete_sessions", None)
+    if bulk_delete is not None:
+        return bulk_delete(names)
+    # Third-party backends predating the batch API: one delete per session.
+    return [name for name in names if backend.delete_session(name)]
+
+
+# Load/save rounds per session before rekey_sessions gives up on a session
+# that other writers keep replacing.
+_REKEY_ATTEMPTS = 3
 
-    return removed
+
+@dataclass(frozen=True)
+class RekeyResult:
+    """Outcome of :func:`rekey_sessions`.
+
+    Attributes:
+        rekeyed: Sessions re-encrypted with the current key
+        current: Sessions that were already encrypted with the current key
+        failed: Session name -> error message for sessions left unchanged
+    """
+
+    rekeyed: list[str] = field(default_factory=list)
+    current: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+
+
+def rekey_sessions(
+    backend_override: str | None = None,
+    max_workers: int = METADATA_FETCH_WORKERS,
+) -> RekeyResult:
+    """Re-encrypt every stored session with the current encryption key.
+
+    Sessions are processed concurrently. The decrypted payload and its
+    metadata (checksum, timestamps, TTL) are unchanged; only the ciphertext
+    is replaced, so sessions stay valid and cached decodes stay current.
+    Run it after rotating keys, then drop old keys once nothing needs them.
+
+    A session saved by another process while it is being rekeyed is not
+    overwritten: backends with ``replace_session`` (local) save only if the
+    generation is unchanged, others re-check the metadata just before
+    saving. The session is then loaded again and rekeyed if still needed.
+
+    Args:
+        backend_override: If set, use this backend type instead of the default.
+        max_workers: Maximum sessions processed in parallel.
+
+    Returns:
+        Which sessions were rekeyed, already current, or failed.
+    """
+    backend = _get_session_storage_backend(backend_override=backend_override)
+    names = backend.list_sessions()
+    replace_session = getattr(backend, "replace_session", None)
+
+    def save_if_unchanged(name: str, encrypted_data: bytes, metadata: SessionMetadata) -> bool:
+        if replace_session is not None:
+            return replace_session(name, encrypted_data, metadata)
+        # Backends without compare-and-swap: narrow the window instead.
+        if backend.get_session_metadata(name) != metadata:
+            return False
+        backend.save_session(name, encrypted_data, metadata)
+        return True
+
+    def rekey(name: str) -> tuple[str, str | None]:
+        try:
+            for _ in range(_REKEY_ATTEMPTS):
+                encrypted_data, metadata = backend.load_session(name)
+                if not needs_rekey(encrypted_data):
+                    return "current", None
+                rekeyed = encrypt_data(decrypt_data(encrypted_data))
+                if save_if_unchanged(name, rekeyed, metadata):
+                    LOG.info("session_rekeyed", name=name)
+                    return "rekeyed", None
+                LOG.info("session_rekey_conflict", name=name)
+            error = "session kept changing while it was rekeyed"
+        except (GraftpunkError, OSError) as exc:
+            error = str(exc)
+        LOG.warning("session_rekey_failed", name=name, error=error)
+        return "failed", error
+
+    result = RekeyResult()
+    if not names:
+        return result
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(names)))) as pool:
+        for name, (outcome, error) in zip(names, pool.map(rekey, names), strict=True):
+            if outcome == "rekeyed":
+                result.rekeyed.append(name)
+            elif outcome == "current":
+                result.current.append(name)
+            else:
+                result.failed[name] = error or "unknown error"
+    return result
 
 
 def update_session_status(name: str, status: str) -> None:
@@ -0,0 +1,327 @@
+"""Shell completion for plugin commands, answered from the plugin manifest.
+
+Typer answers a completion request by building the command tree down to the
+word being completed. For ``gp <site> ...`` that means importing the plugin
+and synthesizing every one of its commands (``_build_site_app`` and
+``synthesize_command_fn``) on every key press.
+
+:func:`complete_plugin_args` answers the same request from the command index
+in :mod:`graftpunk.cli.plugin_manifest` instead, following Click's resolution
+rules (``click.shell_completion._resolve_incomplete``): option names
+when the word starts with ``-``, values for an option that is waiting for
+one, then values for the first unfilled positional argument, otherwise the
+subcommands of the current group. Requests that do not target a plugin
+(built-in commands, root options Typer must parse) fall back to Typer.
+
+Completion items and shell classes come from the Click that Typer runs on:
+the vendored ``typer._click`` on typer 0.26 and later, Click itself before.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from importlib import import_module
+from types import ModuleType
+from typing import TYPE_CHECKING, Any
+
+from graftpunk.cli.plugin_manifest import (
+    ManifestCommand,
+    ManifestParam,
+    ManifestPlugin,
+    get_plugin_manifest,
+)
+from graftpunk.logging import get_logger
+
+if TYPE_CHECKING:
+    from typer._click.shell_completion import CompletionItem
+    from typer._click.utils import make_default_short_help
+    from typer.core import TyperGroup
+
+LOG = get_logger(__name__)
+
+
+def _import_typer_click() -> ModuleType:
+    """Return the Click package Typer runs on (vendored from typer 0.26)."""
+    try:
+        return import_module("typer._click")
+    except ModuleNotFoundError:
+        return import_module("click")
+
+
+_click = _import_typer_click()
+
+if not TYPE_CHECKING:
+    CompletionItem = import_module(f"{_click.__name__}.shell_completion").CompletionItem
+    make_default_short_help = import_module(f"{_click.__name__}.utils").make_default_short_help
+
+# Width Click uses for command help in completion results
+_SHORT_HELP_LIMIT = 45
+
+
+@dataclass(frozen=True)
+class _Option:
+    """A command option as the completion engine sees it."""
+
+    opts: tuple[str, ...]
+    param: ManifestParam
+    multiple: bool = False
+
+    @property
+    def takes_value(self) -> bool:
+        return not self.param.is_flag
+
+
+# The --format/--view/--output options every plugin command gets from
+# command_factory.BUILTIN_OPTIONS (restated here so completion does not import
+# the factory; a test keeps the two in sync).
+BUILTIN_COMMAND_OPTIONS: tuple[_Option, ...] = (
+    _Option(("--format", "-f"), ManifestParam("format", help="Output format")),
+    _Option(
+        ("--view",),
+        ManifestParam("view", help="Select view(s) to render; repeatable"),
+        multiple=True,
+    ),
+    _Option(
+        ("--output", "-o"),
+        ManifestParam("output", help="Write output to file instead of stdout"),
+    ),
+)
+
+
+@dataclass
+class _Group:
+    """One level of a plugin's command tree."""
+
+    help: str = ""
+    commands: dict[str, ManifestCommand] = field(default_factory=dict)
+    groups: dict[str, _Group] = field(default_factory=dict)
+
+
+def _command_tree(plugin: ManifestPlugin) -> _Group:
+    """Rebuild a plugin's nested groups from the commands' dotted group paths."""
+    root = _Group(help=plugin.help_text)
+    for command in plugin.commands:
+        node = root
+        for segment in (command.group or "").split("."):
+            if segment:
+                node = node.groups.setdefault(segment, _Group())
+        node.commands[command.name] = command
+    return root
+
+
+def _help_option(help_names: Sequence[str]) -> _Option:
+    return _Option(
+        tuple(help_names), ManifestParam("help", is_flag=True, help="Show this message and exit.")
+    )
+
+
+def _command_options(command: ManifestCommand, help_names: Sequence[str]) -> list[_Option]:
+    options = [
+        _Option((f"--{param.name.replace('_', '-')}",), param)
+        for param in command.params
+        if param.is_option
+    ]
+    if command.builtin_options:
+        options.extend(BUILTIN_COMMAND_OPTIONS)
+    options.append(_help_option(help_names))
+    return options
+
+
+def _short_help(text: str) -> str:
+    return make_default_short_help(text, _SHORT_HELP_LIMIT) if text else ""
+
+
+def _complete_value(param: ManifestParam, incomplete: str) -> list[CompletionItem]:
+    """Completions for an option value or positional argument."""
+    if param.choices:
+        return [CompletionItem(choice) for choice in param.choices if choice.startswith(incomplete)]
+    if param.type == "Path":
+        return [CompletionItem(incomplete, type="file")]
+    return []
+
+
+def _complete_group(group: _Group, incomplete: str) -> list[CompletionItem]:
+    """Subcommand names of a group, in registration order (commands first)."""
+    items = [
+        CompletionItem(name, help=command.short_help or _short_help(command.help))
+        for name, command in group.commands.items()
+        if not command.hidden and name.startswith(incomplete)
+    ]
+    items.extend(
+        CompletionItem(name, help=_short_help(sub.help))
+        for name, sub in group.groups.items()
+        if name.startswith(incomplete)
+    )
+    return items
+
+
+def _complete_options(
+    options: list[_Option], used: set[str], incomplete: str
+) -> list[CompletionItem]:
+    """Option names starting with ``incomplete``, skipping options already given."""
+    return [
+        CompletionItem(opt, help=option.param.help)
+        for option in options
+        if option.multiple or option.param.name not in used
+        for opt in option.opts
+        if opt.startswith(incomplete)
+    ]
+
+
+def _complete_command(
+    command: ManifestCommand, args: list[str], incomplete: str, help_names: Sequence[str]
+) -> list[CompletionItem]:
+    """Completions for the words after a leaf command name."""
+    options = _command_options(command, help_names)
+    by_name = {opt: option for option in options for opt in option.opts}
+    arguments = [param for param in command.params if not param.is_option]
+
+    # Replay the typed words: which options were given, how many positionals
+    used: set[str] = set()
+    positionals = 0
+    waiting: _Option | None = None
+    options_ended = False
+    for word in args:
+        if waiting is not None:
+            waiting = None
+            continue
+        if word == "--" and not options_ended:
+            options_ended = True
+            continue
+        if word.startswith("-") and word != "-" and not options_ended:
+            name, equals, _ = word.partition("=")
+            option = by_name.get(name)
+            if option is not None:
+                used.add(option.param.name)
+                if option.takes_value and not equals:
+                    waiting = option
+            continue
+        positionals += 1
+
+    if incomplete == "=":
+        incomplete = ""
+    elif "=" in incomplete and incomplete.startswith("-"):
+        name, _, incomplete = incomplete.partition("=")
+        args = [*args, name]
+
+    if "--" not in args and incomplete.startswith("-"):
+        return _complete_options(options, used, incomplete)
+
+    if args and args[-1].startswith("-"):
+        option = by_name.get(args[-1])
+        if option is not None and option.takes_value:
+            return _complete_value(option.param, incomplete)
+
+    for index, param in enumerate(arguments):
+        if param.nargs == -1 or index >= positionals:
+            return _complete_value(param, incomplete)
+    return []
+
+
+def _plugin_args(group: TyperGroup, args: list[str]) -> tuple[str, list[str]] | None:
+    """Split ``args`` into (site_name, words after it).
+
+    Returns None when the words are not a plugin invocation this module can
+    answer: no command yet, an unknown root option, or a built-in command.
+    """
+    from graftpunk.cli.lazy_group import LAZY_SUBCOMMANDS
+
+    root_options = {opt: param for param in group.params for opt in param.opts}
+    index = 0
+    while index < len(args) and args[index].startswith("-"):
+        name, equals, _ = args[index].partition("=")
+        param = root_options.get(name)
+        if param is None:
+            return None
+        takes_value = not (getattr(param, "is_flag", False) or getattr(param, "count", False))
+        index += 2 if takes_value and not equals else 1
+    if index >= len(args):
+        return None
+    site_name = args[index]
+    if site_name in group.commands or site_name in LAZY_SUBCOMMANDS:
+        return None
+    return site_name, args[index + 1 :]
+
+
+def complete_plugin_args(
+    group: TyperGroup, args: list[str], incomplete: str
+) -> list[CompletionItem] | None:
+    """Complete a ``gp <site> ...`` command line from the plugin manifest.
+
+    Args:
+        group: The root command group (used for root options and built-ins).
+        args: Complete words after the program name.
+        incomplete: The word being completed.
+
+    Returns:
+        Completion items, or None if Typer should answer the request.
+    """
+    split = _plugin_args(group, args)
+    if split is None:
+        return None
+    site_name, words = split
+    plugin = get_plugin_manifest().get(site_name)
+    if plugin is None:
+        return None
+
+    help_names = group.context_settings.get("help_option_names", ["--help"])
+    node = _command_tree(plugin)
+    for position, word in enumerate(words):
+        if word in node.groups:
+            node = node.groups[word]
+        elif word in node.commands:
+            return _complete_command(
+                node.commands[word], words[position + 1 :], incomplete, help_names
+            )
+        elif not word.startswith("-"):
+            break
+    if incomplete.startswith("-"):
+        return _complete_options([_help_option(help_names)], set(), incomplete)
+    return _complete_group(node, incomplete)
+
+
+def complete_from_manifest(group: TyperGroup, prog_name: str, complete_var: str | None) -> bool:
+    """Answer a shell completion request for a plugin command, if there is one.
+
+    Reads the request the way Typer does (``_<PROG>_COMPLETE=complete_<shell>``
+    plus the shell's own variables) and prints the result in that shell's
+    format.
+
+    Args:
+        group: The root command group.
+        prog_name: Program name the completion script was installed for.
+        complete_var: Completion environment variable, or None for the default.
+
+    Returns:
+        True if the request was answered and printed.
+    """
+    complete_var = complete_var or f"_{prog_name}_COMPLETE".replace("-", "_").upper()
+    instruction, _, shell = os.environ.get(complete_var, "").partition("_")
+    if instruction != "complete":
+        return False
+
+    from typer._completion_classes import completion_init
+
+    completion_init()
+    comp_cls = import_module(f"{_click.__name__}.shell_completion").get_completion_class(shell)
+    if comp_cls is None:
+        return False
+    comp = comp_cls(group, {}, prog_name, complete_var)
+    args, incomplete = comp.get_completion_args()
+    try:
+        items = complete_plugin_args(group, args, incomplete)
+    except Exception as exc:  # noqa: BLE001 — fall back to Typer's own completion
+        LOG.warning("manifest_completion_failed", error=str(exc))
+        return False
+    if items is None:
+        return False
+
+    def _items(*_: Any) -> list[CompletionItem]:
+        return items
+
+    # Reuse the shell class's own output format around our items
+    comp.get_completions = _items  # type: ignore[method-assign]
+    _click.echo(comp.complete())
+    return True
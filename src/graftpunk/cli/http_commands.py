@@ -8,6 +8,7 @@ observability via HAR capture.
 
 from __future__ import annotations
 
+import dataclasses
 import datetime
 import os
 import sys
@@ -25,6 +26,12 @@ from graftpunk.logging import get_logger
 from graftpunk.observe import OBSERVE_BASE_DIR
 from graftpunk.observe.storage import ObserveStorage
 from graftpunk.session_context import resolve_session
+from graftpunk.transport import (
+    RetryPolicy,
+    TransportConfig,
+    mount_transport,
+    plugin_transport_config,
+)
 
 LOG = get_logger(__name__)
 
@@ -124,6 +131,22 @@ def _dispatch_request(
     return session.request(method, url, **kwargs)
 
 
+def _transport_for(plugin: Any, retries: int) -> TransportConfig | None:
+    """Transport settings for a request: the plugin's, with ``--retries`` applied.
+
+    Args:
+        plugin: Plugin owning the session, or None.
+        retries: Retry count from the command line; 0 keeps the plugin's policy.
+
+    Returns:
+        TransportConfig to mount, or None to keep requests' defaults.
+    """
+    transport = plugin_transport_config(plugin)
+    if retries <= 0:
+        return transport
+    return dataclasses.replace(transport or TransportConfig(), retry=RetryPolicy(total=retries))
+
+
 def _make_request(
     method: str,
     url: str,
@@ -136,6 +159,7 @@ def _make_request(
     form_data: str | None = None,
     extra_headers: list[str] | None = None,
     timeout: float = 30.0,
+    retries: int = 0,
 ) -> requests.Response:
     """Make an HTTP request, optionally using a cached graftpunk session.
 
@@ -156,6 +180,9 @@ def _make_request(
         form_data: Form-encoded body string (mutually exclusive with json_body).
         extra_headers: List of ``"Name: value"`` header strings.
         timeout: Request timeout in seconds.
+        retries: Retry the request up to this many times on connection
+            errors and 429/5xx responses, with backoff that honours
+            ``Retry-After``. Overrides the plugin's retry policy when > 0.
 
     Returns:
         The HTTP response.
@@ -163,11 +190,17 @@ def _make_request(
     Raises:
         typer.Exit: If session cannot be resolved or loaded.
     """
+    from graftpunk.cli.plugin_commands import get_plugin_for_session
+
     session: requests.Session
     resolved: str | None = None
+    plugin = None
     if no_session:
         gp_console.info("No session — making unauthenticated request")
         session = requests.Session()
+        transport = _transport_for(None, retries)
+        if transport is not None:
+            mount_transport(session, transport)
     else:
         resolved = session_name or resolve_session(None)
         if not resolved:
@@ -176,8 +209,9 @@ def _make_request(
                 "gp session use, or --no-session."
             )
             raise typer.Exit(1)
+        plugin = get_plugin_for_session(resolved)
         try:
-            session = load_session_for_api(resolved)
+            session = load_session_for_api(resolved, transport=_transport_for(plugin, retries))
         except Exception as exc:  # noqa: BLE001 — CLI boundary
             LOG.error("session_load_failed", session_name=resolved, error=str(exc))
             gp_console.error(f"Failed to load session '{resolved}': {exc}")
@@ -205,10 +239,6 @@ def _make_request(
         session.headers.setdefault("Content-Type", "application/x-www-form-urlencoded")
 
     # Token injection from plugin session map (skip for bare sessions)
-    from graftpunk.cli.plugin_commands import get_plugin_for_session
-
-    plugin = get_plugin_for_session(resolved) if resolved else None
-
     token_config = getattr(plugin, "token_config", None) if plugin else None
     if token_config is not None:
         from graftpunk.tokens import prepare_session
@@ -432,6 +462,14 @@ def _http_command(method: str) -> typer.models.CommandFunctionType:
             float,
             typer.Option("--timeout", help="Request timeout in seconds"),
         ] = 30.0,
+        retries: Annotated[
+            int,
+            typer.Option(
+                "--retries",
+                min=0,
+                help="Retry on connection errors and 429/5xx (honours Retry-After)",
+            ),
+        ] = 0,
     ) -> None:
         if no_session and session:
             gp_console.error("Cannot use --session and --no-session together.")
@@ -456,6 +494,7 @@ def _http_command(method: str) -> typer.models.CommandFunctionType:
             form_data=data,
             extra_headers=header,
             timeout=timeout,
+            retries=retries,
         )
 
         # Observe: save HAR data by default
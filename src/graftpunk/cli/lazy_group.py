@@ -0,0 +1,187 @@
+"""Root command group that imports sub-apps and plugins on first use.
+
+Building the full command tree at import time meant every ``gp`` invocation
+imported the HTTP client, the encryption stack and every installed plugin
+(executing Python plugin files, parsing YAML plugins, instantiating
+entry-point plugins) before the command even ran.
+
+:class:`LazyCommandGroup` keeps the root app cheap:
+
+- Built-in sub-apps are registered by import path and imported only when
+  their name is invoked (``gp http ...`` imports ``http_commands`` and
+  nothing else).
+- Looking up an unknown command name builds only the plugin with that
+  ``site_name``, importing only the source the plugin manifest lists for it.
+- Listing commands (``gp --help``, shell completion) reads plugin names and
+  help text from the manifest (see :mod:`graftpunk.cli.plugin_manifest`)
+  and imports neither plugins nor built-in sub-apps.
+- Completing ``gp <site> ...`` is answered from the manifest's command index
+  by :mod:`graftpunk.cli.completion` without building the plugin.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import MutableMapping
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+import typer
+from typer.core import TyperGroup
+
+from graftpunk import console as gp_console
+from graftpunk.logging import get_logger
+
+if TYPE_CHECKING:
+    from typer._click import Command, Context
+
+    from graftpunk.cli.plugin_manifest import ManifestPlugin
+
+LOG = get_logger(__name__)
+
+# Built-in sub-apps, as "module:attribute" import paths of their Typer apps.
+LAZY_SUBCOMMANDS: dict[str, str] = {
+    "session": "graftpunk.cli.session_commands:session_app",
+    "keepalive": "graftpunk.cli.keepalive_commands:keepalive_app",
+    "http": "graftpunk.cli.http_commands:http_app",
+}
+
+# Help text shown for built-in sub-apps in ``gp --help`` before they are
+# imported; must match each sub-app's own ``help=``.
+LAZY_SUBCOMMAND_HELP: dict[str, str] = {
+    "session": "Manage encrypted browser sessions.",
+    "keepalive": "Manage the session keepalive daemon.",
+    "http": "Make ad-hoc HTTP requests with cached session cookies.",
+}
+
+
+class LazyCommandGroup(TyperGroup):
+    """TyperGroup that resolves built-in sub-apps and plugins on demand.
+
+    Passed as ``cls=`` to the root :class:`typer.Typer`; commands declared
+    with ``@app.command`` or ``app.add_typer`` stay eager.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._plugin_names: list[str] = []
+        self._plugin_lookups: set[str] = set()
+        self._listing = False
+
+    def get_command(self, ctx: Context, cmd_name: str) -> Command | None:
+        """Return a command, importing its sub-app or plugin if needed.
+
+        While help or completions are being rendered, sub-apps and plugins
+        that have not been built are returned as placeholder groups carrying
+        their help text instead of being imported.
+        """
+        command = super().get_command(ctx, cmd_name)
+        if command is not None:
+            return command
+        if self._listing:
+            if cmd_name in LAZY_SUBCOMMAND_HELP:
+                return TyperGroup(name=cmd_name, help=LAZY_SUBCOMMAND_HELP[cmd_name])
+            return self._manifest_stub(cmd_name)
+        if cmd_name in LAZY_SUBCOMMANDS:
+            return self._load_subcommand(cmd_name)
+        if cmd_name not in self._plugin_lookups:
+            self._plugin_lookups.add(cmd_name)
+            self._load_plugin(cmd_name)
+            return super().get_command(ctx, cmd_name)
+        return None
+
+    def list_commands(self, ctx: Context) -> list[str]:
+        """List built-in commands followed by every plugin in the manifest."""
+        builtin = [name for name in self.commands if name not in self._plugin_names]
+        lazy = [name for name in LAZY_SUBCOMMANDS if name not in self.commands]
+        plugins = list(self._plugin_names)
+        for plugin in self._manifest_plugins():
+            if plugin.site_name not in plugins and plugin.site_name not in builtin:
+                plugins.append(plugin.site_name)
+        return [*builtin, *lazy, *plugins]
+
+    def format_help(self, ctx: Context, formatter: Any) -> None:
+        """Render help, listing unbuilt plugins from the manifest."""
+        self._listing = True
+        try:
+            super().format_help(ctx, formatter)
+        finally:
+            self._listing = False
+
+    def shell_complete(self, ctx: Context, incomplete: str) -> list[Any]:
+        """Complete command names from the manifest without importing plugins."""
+        self._listing = True
+        try:
+            return super().shell_complete(ctx, incomplete)
+        finally:
+            self._listing = False
+
+    def _main_shell_completion(
+        self,
+        ctx_args: MutableMapping[str, Any],
+        prog_name: str,
+        complete_var: str | None = None,
+    ) -> None:
+        """Answer plugin command completions from the manifest, else defer to Typer."""
+        from graftpunk.cli.completion import complete_from_manifest
+
+        if complete_from_manifest(self, prog_name, complete_var):
+            sys.exit(0)
+        super()._main_shell_completion(ctx_args, prog_name, complete_var)
+
+    def _manifest_plugins(self) -> tuple[ManifestPlugin, ...]:
+        """Plugins recorded in the manifest; empty if it cannot be built."""
+        from graftpunk.cli.plugin_manifest import get_plugin_manifest
+
+        try:
+            return get_plugin_manifest().plugins
+        except (SystemExit, KeyboardInterrupt):
+            raise
+        except Exception as exc:  # noqa: BLE001 — plugins are optional; keep core commands usable
+            LOG.exception("plugin_manifest_failed", error=str(exc))
+            return ()
+
+    def _manifest_stub(self, name: str) -> Command | None:
+        """Placeholder group for an unbuilt plugin (help and completion only)."""
+        for plugin in self._manifest_plugins():
+            if plugin.site_name == name:
+                return TyperGroup(name=name, help=plugin.help_text, no_args_is_help=True)
+        return None
+
+    def _load_subcommand(self, name: str) -> Command | None:
+        """Import a built-in sub-app and mount it under ``name``."""
+        module_name, _, attr = LAZY_SUBCOMMANDS[name].partition(":")
+        sub_app: typer.Typer = getattr(import_module(module_name), attr)
+        holder = self._holder()
+        holder.add_typer(sub_app, name=name)
+        return self._mount(holder)[0]
+
+    def _load_plugin(self, name: str) -> None:
+        """Build the command tree of the plugin with this site_name and mount it."""
+        from graftpunk.cli.plugin_commands import register_plugin_commands
+
+        holder = self._holder()
+        try:
+            registered = register_plugin_commands(holder, only=name)
+        except (SystemExit, KeyboardInterrupt):
+            raise
+        except Exception as exc:  # noqa: BLE001 — plugins are optional; keep core commands usable
+            LOG.exception("plugin_registration_failed", error=str(exc))
+            gp_console.warn(f"Plugin registration failed: {exc}")
+            registered = {}
+        if registered:
+            LOG.debug("plugins_registered", count=len(registered), only=name)
+            for command in self._mount(holder):
+                if command.name is not None and command.name not in self._plugin_names:
+                    self._plugin_names.append(command.name)
+
+    def _holder(self) -> typer.Typer:
+        """Empty Typer app used to convert sub-apps with the root's settings."""
+        return typer.Typer(rich_markup_mode=self.rich_markup_mode)
+
+    def _mount(self, holder: typer.Typer) -> list[Command]:
+        """Convert ``holder``'s sub-apps and add them to this group."""
+        group = typer.main.get_group(holder)
+        for name, command in group.commands.items():
+            self.add_command(command, name)
+        return list(group.commands.values())
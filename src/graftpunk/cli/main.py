@@ -18,23 +18,13 @@ from rich.panel import Panel
 from rich.table import Table
 
 import graftpunk
-from graftpunk.cli.http_commands import http_app
-from graftpunk.cli.keepalive_commands import keepalive_app
-from graftpunk.cli.plugin_commands import resolve_session_name
-from graftpunk.cli.session_commands import session_app
+from graftpunk.cli.lazy_group import LazyCommandGroup
 from graftpunk.config import get_settings
 from graftpunk.logging import configure_logging, enable_network_debug, get_logger
 from graftpunk.observe import OBSERVE_BASE_DIR
-from graftpunk.plugins import (
-    discover_keepalive_handlers,
-    discover_site_plugins,
-    discover_storage_backends,
-    infer_site_name,
-)
-from graftpunk.plugins.yaml_plugin import create_yaml_plugins
 from graftpunk.session_context import resolve_session
 
-# Configure logging early (before plugin registration) using env vars directly.
+# Configure logging early (before any plugin is loaded) using env vars directly.
 # We avoid calling get_settings() here because GraftpunkSettings.__init__ creates
 # directories as a side effect, which breaks test isolation.
 # The -v/-vv and --log-format flags in main_callback() may reconfigure later.
@@ -66,6 +56,9 @@ app = typer.Typer(
     no_args_is_help=True,
     rich_markup_mode="rich",
     context_settings={"help_option_names": ["-h", "--help"]},
+    # The session, keepalive and http sub-apps and all plugin commands are
+    # imported only when invoked (or listed by --help / completion).
+    cls=LazyCommandGroup,
 )
 console = Console()
 
@@ -174,6 +167,8 @@ def observe_callback(
     else:
         resolved = resolve_session(session)
         if resolved and session:
+            from graftpunk.cli.plugin_commands import resolve_session_name
+
             resolved = resolve_session_name(resolved)
         obj["observe_session"] = resolved
     if ctx.invoked_subcommand is None:
@@ -343,6 +338,8 @@ def _resolve_observe_context(ctx: typer.Context, url: str) -> tuple[str, str | N
         return session_name, session_name
 
     if no_session:
+        from graftpunk.plugins import infer_site_name
+
         inferred = infer_site_name(url)
         if not inferred:
             LOG.warning("namespace_inference_failed", url=url, fallback="unknown")
@@ -655,19 +652,21 @@ def observe_interactive(
 
 app.add_typer(observe_app)
 
-# Session subcommand group (defined in session_commands.py)
-app.add_typer(session_app)
-
-# Keepalive subcommand group (defined in keepalive_commands.py)
-app.add_typer(keepalive_app)
-
-# HTTP subcommand group (defined in http_commands.py)
-app.add_typer(http_app)
+# The session, keepalive and http groups (session_commands.py,
+# keepalive_commands.py, http_commands.py) are mounted lazily by
+# LazyCommandGroup; see graftpunk.cli.lazy_group.LAZY_SUBCOMMANDS.
 
 
 @app.command("plugins")
 def plugins() -> None:
     """List discovered plugins (storage, handlers, sites, CLI)."""
+    from graftpunk.plugins import (
+        create_yaml_plugins,
+        discover_keepalive_handlers,
+        discover_site_plugins,
+        discover_storage_backends,
+    )
+
     storage = discover_storage_backends()
     handlers = discover_keepalive_handlers()
     site_plugins = discover_site_plugins()
@@ -803,21 +802,5 @@ def config() -> None:
     console.print(Panel(info.strip(), title="⚙ Configuration", border_style="cyan"))
 
 
-# Register plugin commands dynamically at module load time so they appear in --help.
-# Plugin sub-apps are attached with app.add_typer() at import time (below).
-_registered_plugins: dict[str, str] = {}
-try:
-    from graftpunk.cli.plugin_commands import register_plugin_commands
-
-    _registered_plugins = register_plugin_commands(app)
-    if _registered_plugins:
-        LOG.debug("plugins_registered", count=len(_registered_plugins))
-except (SystemExit, KeyboardInterrupt):
-    raise
-except Exception as exc:
-    LOG.exception("plugin_registration_failed", error=str(exc))
-    # Notify user - plugins are optional but they should know if they fail
-    console.print(f"[yellow]Warning: Plugin registration failed: {exc}[/yellow]")
-
 if __name__ == "__main__":
     app()
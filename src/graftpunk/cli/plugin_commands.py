@@ -18,6 +18,7 @@ from graftpunk.cli.login_commands import (
     resolve_login_callable,
     resolve_login_fields,
 )
+from graftpunk.cli.plugin_manifest import get_plugin_manifest, load_source_plugins
 from graftpunk.exceptions import PluginError
 from graftpunk.logging import get_logger
 from graftpunk.plugins import discover_all_plugins
@@ -50,6 +51,10 @@ atexit.register(_teardown_all_plugins)
 # Map site_name → session_name for alias resolution in core commands
 _plugin_session_map: dict[str, str] = {}
 
+# Whether _plugin_session_map has been filled this process. Core commands run
+# without building any plugin app, so the map is filled on first lookup.
+_plugin_session_map_loaded = False
+
 # Track registered plugin sources for collision detection
 _registered_plugin_sources: dict[str, str] = {}  # site_name → source description
 
@@ -277,7 +282,12 @@ def _build_site_app(plugin: CLIPluginProtocol, result: PluginDiscoveryResult) ->
     return site_app
 
 
-def register_plugin_commands(app: typer.Typer, *, notify_errors: bool = True) -> dict[str, str]:
+def register_plugin_commands(
+    app: typer.Typer,
+    *,
+    notify_errors: bool = True,
+    only: str | None = None,
+) -> dict[str, str]:
     """Discover and register all plugin commands with a Typer app.
 
     Discovers Python plugins (via entry points), Python file plugins
@@ -287,6 +297,9 @@ def register_plugin_commands(app: typer.Typer, *, notify_errors: bool = True) ->
     Args:
         app: Typer application to register commands with.
         notify_errors: If True, print errors to stderr for user visibility.
+        only: Build and set up just the plugin with this site_name, importing
+            only the sources the plugin manifest lists for it. The other
+            plugins are recorded for session name resolution from the manifest.
 
     Returns:
         Dictionary mapping plugin site_name to help_text.
@@ -294,20 +307,32 @@ def register_plugin_commands(app: typer.Typer, *, notify_errors: bool = True) ->
     Raises:
         PluginError: If two plugins register the same site_name.
     """
+    global _plugin_session_map_loaded
     _registered_plugin_sources.clear()
     _plugin_session_map.clear()
     _registered_plugins_for_teardown.clear()
+    _plugin_session_map_loaded = True
     result = PluginDiscoveryResult()
 
-    # Use shared discovery (clear cache so CLI always gets fresh results)
-    discover_all_plugins.cache_clear()
-    all_plugins = discover_all_plugins()
+    if only is None:
+        # Use shared discovery (clear cache so CLI always gets fresh results)
+        discover_all_plugins.cache_clear()
+        all_plugins = discover_all_plugins()
+    else:
+        # Import only the sources that provide `only`; the manifest knows
+        # every other plugin's session without importing it.
+        manifest = get_plugin_manifest()
+        _plugin_session_map.update(manifest.session_map())
+        all_plugins = _load_manifest_plugins(only, result)
 
     # Register each plugin (already filtered for config errors,
     # missing site_name, and unsupported api_version)
     for plugin in all_plugins:
         try:
             site_name = plugin.site_name
+            if only is not None and site_name != only:
+                _plugin_session_map.setdefault(site_name, plugin.session_name)
+                continue
 
             # Collision detection: fail fast if two plugins share a site_name
             source = _get_plugin_source(plugin)
@@ -360,9 +385,47 @@ def register_plugin_commands(app: typer.Typer, *, notify_errors: bool = True) ->
     return result.registered
 
 
+def _load_manifest_plugins(
+    site_name: str, result: PluginDiscoveryResult | None = None
+) -> list[CLIPluginProtocol]:
+    """Import the manifest sources that provide ``site_name``.
+
+    Load failures are logged (and recorded on ``result``) rather than raised,
+    so a broken plugin never fails the calling command.
+    """
+    plugins: list[CLIPluginProtocol] = []
+    for key in get_plugin_manifest().sources_for(site_name):
+        try:
+            plugins.extend(load_source_plugins(key))
+        except Exception as exc:  # noqa: BLE001 — plugin boundary: unknown plugin code may raise anything
+            LOG.warning("plugin_source_load_failed", source=key, error=str(exc))
+            if result is not None:
+                result.add_error(site_name, str(exc), "discovery")
+    return plugins
+
+
+def _ensure_plugin_session_map() -> None:
+    """Fill the site_name → session_name map if no registration has run."""
+    global _plugin_session_map_loaded
+    if _plugin_session_map_loaded:
+        return
+    _plugin_session_map_loaded = True
+    try:
+        session_map = get_plugin_manifest().session_map()
+    except Exception as exc:  # noqa: BLE001 — plugin boundary: never fail a core command
+        LOG.warning("plugin_manifest_failed", error=str(exc))
+        return
+    for site_name, session_name in session_map.items():
+        _plugin_session_map.setdefault(site_name, session_name)
+
+
 def get_plugin_for_session(session_name: str) -> CLIPluginProtocol | None:
     """Look up the plugin instance that owns a given session name.
 
+    Plugins whose command tree was not built in this process (core commands
+    such as ``gp http``) are imported from their manifest source and set up
+    on demand.
+
     Args:
         session_name: The session name to look up.
 
@@ -372,6 +435,19 @@ def get_plugin_for_session(session_name: str) -> CLIPluginProtocol | None:
     for plugin in _registered_plugins_for_teardown:
         if _plugin_session_map.get(plugin.site_name) == session_name:
             return plugin
+    _ensure_plugin_session_map()
+    site_names = [site for site, session in _plugin_session_map.items() if session == session_name]
+    for site_name in site_names:
+        for plugin in _load_manifest_plugins(site_name):
+            if plugin.session_name != session_name or plugin in _registered_plugins_for_teardown:
+                continue
+            try:
+                plugin.setup()
+            except Exception as exc:  # noqa: BLE001
+                LOG.exception("plugin_setup_failed", plugin=plugin.site_name, error=str(exc))
+                return None
+            _registered_plugins_for_teardown.append(plugin)
+            return plugin
     return None
 
 
@@ -382,4 +458,5 @@ def resolve_session_name(name: str) -> str:
     session_name. Otherwise returns name unchanged (it may be a literal
     session name).
     """
+    _ensure_plugin_session_map()
     return _plugin_session_map.get(name, name)
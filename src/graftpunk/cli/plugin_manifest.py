@@ -0,0 +1,543 @@
+"""Persistent manifest of installed plugins and their commands.
+
+Listing or routing plugin commands used to mean importing every plugin:
+executing each Python plugin file, parsing each YAML file and loading each
+entry point. The manifest records what those imports produced — site names,
+session names, help text and the full command/parameter tree — in
+``<config_dir>/plugin-manifest.json`` so that ``gp --help``, shell completion
+and command routing can answer from a JSON file instead.
+
+Each plugin *source* (an entry point, a YAML file or a Python file in
+``<config_dir>/plugins``) is stored with a fingerprint:
+
+- files: ``<mtime_ns>:<size>``
+- entry points: ``<module:attr>@<distribution>==<version>``
+
+On every lookup the sources are re-scanned (a directory listing, one
+``stat`` per file and an entry-point metadata scan) and only sources whose
+fingerprint changed are imported again. The whole manifest is discarded when
+the graftpunk version or :data:`MANIFEST_VERSION` changes.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from importlib.metadata import entry_points
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from graftpunk.logging import get_logger
+
+if TYPE_CHECKING:
+    from graftpunk.plugins.cli_plugin import CLIPluginProtocol, PluginParamSpec
+
+LOG = get_logger(__name__)
+
+MANIFEST_VERSION = 2
+MANIFEST_FILE_NAME = "plugin-manifest.json"
+
+# Entry point group for site plugins (mirrors graftpunk.plugins.PLUGINS_GROUP,
+# which is not imported here to keep the manifest cheap to read).
+PLUGINS_GROUP = "graftpunk.plugins"
+
+_YAML_SUFFIXES = (".yaml", ".yml")
+
+
+@dataclass(frozen=True)
+class ManifestParam:
+    """One command parameter as recorded in the manifest.
+
+    Attributes:
+        name: Parameter name (options are exposed as ``--name-with-dashes``).
+        is_option: True for ``--options``, False for positional arguments.
+        type: Name of the parameter type (``str``, ``int``, an Enum name...).
+        required: Whether the parameter must be given.
+        default: JSON-safe default value (Enum members are stored by value).
+        help: Help text for the parameter.
+        is_flag: Whether the option is a boolean flag.
+        nargs: ``-1`` for variadic arguments, otherwise None.
+        choices: Allowed values for Enum-typed parameters.
+    """
+
+    name: str
+    is_option: bool = True
+    type: str = "str"
+    required: bool = False
+    default: Any = None
+    help: str = ""
+    is_flag: bool = False
+    nargs: int | None = None
+    choices: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class ManifestCommand:
+    """One plugin command as recorded in the manifest.
+
+    Attributes:
+        name: Command name.
+        group: Dotted group path, or None for commands at the plugin root.
+        help: Command help text.
+        short_help: Explicit one-line help, if the plugin set one.
+        hidden: Whether the command is hidden from help output.
+        params: The command's parameters.
+        builtin_options: Whether the command has the ``--format``/``--view``/
+            ``--output`` options (False for the auto-registered ``login``).
+    """
+
+    name: str
+    group: str | None = None
+    help: str = ""
+    short_help: str = ""
+    hidden: bool = False
+    params: tuple[ManifestParam, ...] = ()
+    builtin_options: bool = True
+
+
+@dataclass(frozen=True)
+class ManifestPlugin:
+    """One plugin as recorded in the manifest.
+
+    Attributes:
+        site_name: CLI group name of the plugin.
+        session_name: Session the plugin's commands use.
+        help_text: Help text of the plugin's command group.
+        source: Key of the source that provides the plugin.
+        commands: The plugin's commands, including an auto-registered ``login``.
+    """
+
+    site_name: str
+    session_name: str
+    help_text: str = ""
+    source: str = ""
+    commands: tuple[ManifestCommand, ...] = ()
+
+
+@dataclass(frozen=True)
+class ManifestSource:
+    """A plugin source and what importing it produced.
+
+    Attributes:
+        key: ``entry_point:<name>``, ``yaml:<path>`` or ``python:<path>``.
+        fingerprint: Value that changes whenever the source may have changed.
+        plugins: Valid plugins the source provides.
+        error: Why loading the source failed, if it did.
+    """
+
+    key: str
+    fingerprint: str
+    plugins: tuple[ManifestPlugin, ...] = ()
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class PluginManifest:
+    """Snapshot of every plugin source and the plugins it provides.
+
+    Attributes:
+        graftpunk_version: graftpunk version that wrote the manifest.
+        sources: Plugin sources in discovery order (entry points, YAML
+            files, Python files).
+    """
+
+    graftpunk_version: str
+    sources: tuple[ManifestSource, ...] = ()
+    version: int = field(default=MANIFEST_VERSION)
+
+    @property
+    def plugins(self) -> tuple[ManifestPlugin, ...]:
+        """All plugins, in discovery order."""
+        return tuple(plugin for source in self.sources for plugin in source.plugins)
+
+    def get(self, site_name: str) -> ManifestPlugin | None:
+        """Return the first plugin with this site_name, or None."""
+        for plugin in self.plugins:
+            if plugin.site_name == site_name:
+                return plugin
+        return None
+
+    def sources_for(self, site_name: str) -> list[str]:
+        """Return the keys of every source that provides ``site_name``."""
+        return [
+            source.key
+            for source in self.sources
+            if any(plugin.site_name == site_name for plugin in source.plugins)
+        ]
+
+    def session_map(self) -> dict[str, str]:
+        """Map each site_name to its session_name (first source wins)."""
+        mapping: dict[str, str] = {}
+        for plugin in self.plugins:
+            mapping.setdefault(plugin.site_name, plugin.session_name)
+        return mapping
+
+
+# Manifests already validated in this process, by manifest path
+_manifests: dict[Path, PluginManifest] = {}
+
+# Plugin instances imported in this process, by (source key, fingerprint).
+# A source imported to refresh the manifest is reused when its command tree
+# is built, so a plugin file is never executed twice per process.
+_loaded_sources: dict[tuple[str, str], tuple[CLIPluginProtocol, ...]] = {}
+
+
+def get_manifest_path() -> Path:
+    """Return the manifest file location inside the config directory."""
+    from graftpunk.config import get_settings
+
+    return get_settings().config_dir / MANIFEST_FILE_NAME
+
+
+def scan_plugin_sources() -> dict[str, str]:
+    """Fingerprint every plugin source without importing any of them.
+
+    Returns:
+        Mapping of source key to fingerprint, in discovery order.
+    """
+    from graftpunk.config import get_settings
+
+    sources: dict[str, str] = {}
+    try:
+        for ep in entry_points(group=PLUGINS_GROUP):
+            dist = getattr(ep, "dist", None)
+            version = f"{dist.name}=={dist.version}" if dist is not None else "unknown"
+            sources[f"entry_point:{ep.name}"] = f"{ep.value}@{version}"
+    except Exception as exc:  # noqa: BLE001 — broken distribution metadata must not break the CLI
+        LOG.warning("plugin_manifest_entry_point_scan_failed", error=str(exc))
+
+    plugins_dir = get_settings().config_dir / "plugins"
+    if not plugins_dir.is_dir():
+        return sources
+    files = sorted(plugins_dir.iterdir())
+    yaml_files = [path for path in files if path.suffix in _YAML_SUFFIXES]
+    py_files = [path for path in files if path.suffix == ".py" and not path.name.startswith("_")]
+    for kind, paths in (("yaml", yaml_files), ("python", py_files)):
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            sources[f"{kind}:{path}"] = f"{stat.st_mtime_ns}:{stat.st_size}"
+    return sources
+
+
+def load_source_plugins(key: str) -> tuple[CLIPluginProtocol, ...]:
+    """Import one plugin source and return its valid plugin instances.
+
+    Instances are cached for the process, so calling this again for an
+    unchanged source returns the same objects.
+
+    Args:
+        key: Source key as produced by :func:`scan_plugin_sources`.
+
+    Returns:
+        The source's plugins, filtered like :func:`discover_all_plugins`.
+
+    Raises:
+        PluginError: If the source cannot be loaded or instantiated.
+    """
+    fingerprints = {source.key: source.fingerprint for source in get_plugin_manifest().sources}
+    fingerprint = fingerprints.get(key, "")
+    cached = _loaded_sources.get((key, fingerprint))
+    if cached is not None:
+        return cached
+    plugins = _import_source(key)
+    _loaded_sources[(key, fingerprint)] = plugins
+    return plugins
+
+
+def _import_source(key: str) -> tuple[CLIPluginProtocol, ...]:
+    """Import a source without consulting the per-process cache."""
+    from graftpunk.exceptions import PluginError
+    from graftpunk.plugins import filter_valid_plugins
+
+    kind, _, target = key.partition(":")
+    if kind == "entry_point":
+        matches = [ep for ep in entry_points(group=PLUGINS_GROUP) if ep.name == target]
+        if not matches:
+            raise PluginError(f"Entry point '{target}' is no longer installed")
+        plugins: list[CLIPluginProtocol] = [matches[0].load()()]
+    elif kind == "yaml":
+        from graftpunk.plugins.yaml_plugin import create_yaml_plugin_from_file
+
+        plugins = [create_yaml_plugin_from_file(Path(target))]
+    elif kind == "python":
+        from graftpunk.plugins.python_loader import load_python_plugin_file
+
+        result = load_python_plugin_file(Path(target))
+        if result.has_errors and not result.plugins:
+            raise PluginError("; ".join(error.error for error in result.errors))
+        plugins = list(result.plugins)
+    else:
+        raise PluginError(f"Unknown plugin source: {key}")
+    return filter_valid_plugins(plugins)
+
+
+def _json_safe(value: Any) -> Any:
+    if isinstance(value, Enum):
+        value = value.value
+    if value is None or isinstance(value, str | int | float | bool):
+        return value
+    return str(value)
+
+
+def _describe_param(spec: PluginParamSpec) -> ManifestParam:
+    kwargs = spec.click_kwargs
+    param_type = kwargs.get("type", str)
+    choices: tuple[str, ...] = ()
+    if isinstance(param_type, type) and issubclass(param_type, Enum):
+        choices = tuple(str(member.value) for member in param_type)
+    return ManifestParam(
+        name=spec.name,
+        is_option=spec.is_option,
+        type=getattr(param_type, "__name__", str(param_type)),
+        required=bool(kwargs.get("required", not spec.is_option)),
+        default=_json_safe(kwargs.get("default")),
+        help=kwargs.get("help", ""),
+        is_flag=bool(kwargs.get("is_flag", False)),
+        nargs=kwargs.get("nargs"),
+        choices=choices,
+    )
+
+
+def describe_plugin(plugin: CLIPluginProtocol, source: str) -> ManifestPlugin:
+    """Record a plugin's command tree for the manifest.
+
+    Args:
+        plugin: Loaded plugin instance.
+        source: Key of the source that provided the plugin.
+
+    Returns:
+        The plugin's manifest entry.
+    """
+    import inspect
+
+    from graftpunk.cli.login_commands import resolve_login_callable
+
+    commands = [
+        ManifestCommand(
+            name=spec.name,
+            group=spec.group,
+            help=spec.click_kwargs.get("help", f"Run {spec.name} command"),
+            short_help=spec.click_kwargs.get("short_help", ""),
+            hidden=bool(spec.click_kwargs.get("hidden", False)),
+            params=tuple(_describe_param(param) for param in spec.params),
+        )
+        for spec in plugin.get_commands()
+    ]
+    login_callable = resolve_login_callable(plugin)
+    if login_callable is not None:
+        commands.append(
+            ManifestCommand(
+                name="login",
+                help=inspect.getdoc(login_callable) or f"Log in to {plugin.site_name}",
+                builtin_options=False,
+            )
+        )
+    return ManifestPlugin(
+        site_name=plugin.site_name,
+        session_name=plugin.session_name,
+        help_text=plugin.help_text or f"Commands for {plugin.site_name}",
+        source=source,
+        commands=tuple(commands),
+    )
+
+
+def _build_source(key: str, fingerprint: str) -> ManifestSource:
+    try:
+        plugins = _import_source(key)
+        _loaded_sources[(key, fingerprint)] = plugins
+        described = tuple(describe_plugin(plugin, key) for plugin in plugins)
+    except (SystemExit, KeyboardInterrupt):
+        raise
+    except Exception as exc:  # noqa: BLE001 — plugin boundary: unknown plugin code may raise anything
+        LOG.warning("plugin_manifest_source_failed", source=key, error=str(exc))
+        return ManifestSource(key=key, fingerprint=fingerprint, error=str(exc))
+    LOG.debug("plugin_manifest_source_indexed", source=key, plugins=len(described))
+    return ManifestSource(key=key, fingerprint=fingerprint, plugins=described)
+
+
+def _graftpunk_version() -> str:
+    from graftpunk import __version__
+
+    return __version__
+
+
+def _field(data: dict[str, Any], key: str, kind: type | tuple[type, ...]) -> Any:
+    """Return ``data[key]``, checking it has the type the manifest format promises."""
+    value = data[key]
+    kinds = kind if isinstance(kind, tuple) else (kind,)
+    # bool is an int subclass; never accept it where a number is expected.
+    if not isinstance(value, kinds) or (isinstance(value, bool) and bool not in kinds):
+        raise TypeError(f"manifest field {key!r} has unexpected type {type(value).__name__}")
+    return value
+
+
+def _records(data: dict[str, Any], key: str) -> list[dict[str, Any]]:
+    records = _field(data, key, list)
+    for record in records:
+        if not isinstance(record, dict):
+            raise TypeError(f"manifest field {key!r} must hold objects")
+    return records
+
+
+def _param_from_dict(data: dict[str, Any]) -> ManifestParam:
+    choices = _field(data, "choices", list)
+    if not all(isinstance(choice, str) for choice in choices):
+        raise TypeError("manifest field 'choices' must hold strings")
+    return ManifestParam(
+        name=_field(data, "name", str),
+        is_option=_field(data, "is_option", bool),
+        type=_field(data, "type", str),
+        required=_field(data, "required", bool),
+        default=_field(data, "default", (str, int, float, bool, type(None))),
+        help=_field(data, "help", str),
+        is_flag=_field(data, "is_flag", bool),
+        nargs=_field(data, "nargs", (int, type(None))),
+        choices=tuple(choices),
+    )
+
+
+def _command_from_dict(data: dict[str, Any]) -> ManifestCommand:
+    return ManifestCommand(
+        name=_field(data, "name", str),
+        group=_field(data, "group", (str, type(None))),
+        help=_field(data, "help", str),
+        short_help=_field(data, "short_help", str),
+        hidden=_field(data, "hidden", bool),
+        params=tuple(_param_from_dict(param) for param in _records(data, "params")),
+        builtin_options=_field(data, "builtin_options", bool),
+    )
+
+
+def _plugin_from_dict(data: dict[str, Any]) -> ManifestPlugin:
+    return ManifestPlugin(
+        site_name=_field(data, "site_name", str),
+        session_name=_field(data, "session_name", str),
+        help_text=_field(data, "help_text", str),
+        source=_field(data, "source", str),
+        commands=tuple(_command_from_dict(cmd) for cmd in _records(data, "commands")),
+    )
+
+
+def _source_from_dict(data: dict[str, Any]) -> ManifestSource:
+    return ManifestSource(
+        key=_field(data, "key", str),
+        fingerprint=_field(data, "fingerprint", str),
+        plugins=tuple(_plugin_from_dict(plugin) for plugin in _records(data, "plugins")),
+        error=_field(data, "error", (str, type(None))),
+    )
+
+
+def _from_dict(data: Any) -> PluginManifest:
+    """Decode a manifest document, validating every field's type.
+
+    Raises:
+        KeyError: If a field is missing.
+        TypeError: If a field has the wrong type.
+    """
+    if not isinstance(data, dict):
+        raise TypeError("manifest must be a JSON object")
+    return PluginManifest(
+        graftpunk_version=_field(data, "graftpunk_version", str),
+        version=_field(data, "version", int),
+        sources=tuple(_source_from_dict(source) for source in _records(data, "sources")),
+    )
+
+
+def read_manifest(path: Path) -> PluginManifest | None:
+    """Read a manifest file.
+
+    Args:
+        path: Manifest file location.
+
+    Returns:
+        The manifest, or None if the file is missing, unreadable, corrupt or
+        written by another manifest format or graftpunk version.
+    """
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        manifest = _from_dict(data)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        LOG.warning("plugin_manifest_unreadable", path=str(path), error=str(exc))
+        return None
+    if manifest.version != MANIFEST_VERSION or manifest.graftpunk_version != _graftpunk_version():
+        LOG.debug("plugin_manifest_outdated", path=str(path))
+        return None
+    return manifest
+
+
+def write_manifest(manifest: PluginManifest, path: Path) -> None:
+    """Atomically write a manifest file.
+
+    Failures are logged and ignored: the manifest is only a cache.
+
+    Args:
+        manifest: Manifest to write.
+        path: Destination file.
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+                json.dump(asdict(manifest), tmp, indent=2, sort_keys=True)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    except OSError as exc:
+        LOG.warning("plugin_manifest_write_failed", path=str(path), error=str(exc))
+
+
+def get_plugin_manifest(*, refresh: bool = False) -> PluginManifest:
+    """Return an up-to-date plugin manifest.
+
+    The on-disk manifest is reused source by source: sources whose
+    fingerprint is unchanged are kept, new or changed sources are imported
+    and described, and removed sources are dropped. The file is rewritten
+    only when something changed. The result is cached for the process.
+
+    Args:
+        refresh: Re-scan plugin sources even if this process already
+            validated the manifest.
+
+    Returns:
+        The current manifest.
+    """
+    path = get_manifest_path()
+    cached = _manifests.get(path)
+    if cached is not None and not refresh:
+        return cached
+
+    previous = cached or read_manifest(path)
+    known = {source.key: source for source in previous.sources} if previous else {}
+    sources: list[ManifestSource] = []
+    changed = previous is None
+    for key, fingerprint in scan_plugin_sources().items():
+        existing = known.pop(key, None)
+        if existing is not None and existing.fingerprint == fingerprint:
+            sources.append(existing)
+            continue
+        sources.append(_build_source(key, fingerprint))
+        changed = True
+    changed = changed or bool(known)
+
+    manifest = PluginManifest(graftpunk_version=_graftpunk_version(), sources=tuple(sources))
+    if changed:
+        LOG.info("plugin_manifest_rebuilt", path=str(path), sources=len(sources))
+        write_manifest(manifest, path)
+    _manifests[path] = manifest
+    return manifest
+
+
+def clear_manifest_cache() -> None:
+    """Forget manifests and plugin instances loaded in this process."""
+    _manifests.clear()
+    _loaded_sources.clear()
@@ -1,10 +1,12 @@
 """Run-time execution pipeline for plugin CLI commands.
 
 Execution ONLY (the construction factory lives in ``cli/command_factory.py``).
-``run_plugin_command`` is the verbatim 12-step pipeline formerly inlined in
+``run_plugin_command`` is the 12-step pipeline formerly inlined in
 ``_create_plugin_command``'s callback: session load -> observe -> token inject
--> execute_plugin_command -> 403-refresh -> session persist -> format_output,
-with the CommandError/PluginError/generic error->exit funnel.
+-> execute_plugin_command -> 403-refresh -> format_output -> session persist,
+with the CommandError/PluginError/generic error->exit funnel. The session is
+persisted after formatting because paginated results fetch their later pages
+while they are written out.
 """
 
 from __future__ import annotations
@@ -40,6 +42,20 @@ def format_source_is_commandline(ctx: typer.Context) -> bool:
     return source is not None and source.name == "COMMANDLINE"
 
 
+def _anonymous_session(site_name: str) -> requests.Session:
+    """Session for commands that run without the plugin's stored session.
+
+    Its response cache partition is shared by the plugin's session-less
+    commands only.
+    """
+    from graftpunk.graftpunk_session import GraftpunkSession
+    from graftpunk.response_cache import anonymous_partition
+
+    session = GraftpunkSession()
+    session.enable_response_cache(anonymous_partition(site_name))
+    return session
+
+
 def run_plugin_command(
     plugin: CLIPluginProtocol,
     cmd_spec: CommandSpec,
@@ -68,7 +84,7 @@ def run_plugin_command(
 
     # --- Session loading (CLI-specific error handling) ---
     try:
-        session = plugin.get_session() if needs_session else requests.Session()
+        session = plugin.get_session() if needs_session else _anonymous_session(plugin.site_name)
     except SessionNotFoundError:
         gp_console.error(
             f"Session '{plugin.session_name}' not found. Please create a session first."
@@ -183,19 +199,20 @@ def run_plugin_command(
             else:
                 raise
 
-        # Persist session if requested
-        if (cmd_spec.saves_session or cmd_ctx._session_dirty) and needs_session:
-            update_session_cookies(session, plugin.session_name)
-
-        format_output(
-            result,
-            output_format,
-            _format_console,
-            user_explicit=format_is_explicit,
-            view_args=view_args,
-            output_path=output_path,
-            plugin_formatters=getattr(plugin, "format_overrides", None) or None,
-        )
+        try:
+            format_output(
+                result,
+                output_format,
+                _format_console,
+                user_explicit=format_is_explicit,
+                view_args=view_args,
+                output_path=output_path,
+                plugin_formatters=getattr(plugin, "format_overrides", None) or None,
+            )
+        finally:
+            # Persist session if requested (after any pages fetched while formatting)
+            if (cmd_spec.saves_session or cmd_ctx._session_dirty) and needs_session:
+                update_session_cookies(session, plugin.session_name)
     except (SystemExit, KeyboardInterrupt):
         raise
     except CommandError as exc:
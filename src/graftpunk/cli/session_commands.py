@@ -1,7 +1,7 @@
-"""Session management commands — gp session list/show/clear/export."""
+"""Session management commands — gp session list/show/clear/export/rekey."""
 
 from pathlib import Path
-from typing import TYPE_CHECKING, Annotated, cast
+from typing import Annotated
 
 import typer
 from rich.console import Console
@@ -10,12 +10,16 @@ from rich.table import Table
 
 from graftpunk import (
     clear_session_cache,
+    clear_sessions,
     get_session_metadata,
     list_sessions_with_metadata,
     load_session,
+    rekey_sessions,
 )
 from graftpunk.cli.plugin_commands import resolve_session_name
+from graftpunk.encryption import key_id, rotate_encryption_key
 from graftpunk.exceptions import (
+    EncryptionError,
     GraftpunkError,
     SessionExpiredError,
     SessionNotFoundError,
@@ -23,9 +27,6 @@ from graftpunk.exceptions import (
 )
 from graftpunk.session_context import clear_active_session, set_active_session
 
-if TYPE_CHECKING:
-    from graftpunk.session import BrowserSession
-
 session_app = typer.Typer(
     name="session",
     help="Manage encrypted browser sessions.",
@@ -247,8 +248,7 @@ def export(
         raise typer.Exit(1) from None
 
     try:
-        browser_session = cast("BrowserSession", session)
-        httpie_path = browser_session.save_httpie_session(name)
+        httpie_path = session.save_httpie_session(name)
 
         console.print(f"[green]✓ Exported to:[/green] {httpie_path}\n")
         console.print("[dim]Usage:[/dim]")
@@ -312,16 +312,7 @@ def session_clear(
                 console.print("[dim]Cancelled[/dim]")
                 return
 
-        removed = []
-        for s in all_metadata:
-            result = clear_session_cache(
-                s["name"],
-                backend_override=backend_override,
-            )
-            if result:
-                removed.append(s)
-
-        _print_removed(removed)
+        _print_removed(_clear_matching(all_metadata, backend_override))
         return
 
     assert target is not None
@@ -342,16 +333,7 @@ def session_clear(
                 console.print("[dim]Cancelled[/dim]")
                 return
 
-        removed = []
-        for s in matches:
-            result = clear_session_cache(
-                s["name"],
-                backend_override=backend_override,
-            )
-            if result:
-                removed.append(s)
-
-        _print_removed(removed)
+        _print_removed(_clear_matching(matches, backend_override))
     else:
         target = resolve_session_name(target)
         match = next((s for s in all_metadata if s["name"] == target), None)
@@ -371,6 +353,51 @@ def session_clear(
         _print_removed([match])
 
 
+@session_app.command("rekey")
+def session_rekey(
+    ctx: typer.Context,
+    rotate: Annotated[
+        bool,
+        typer.Option("--rotate", help="Generate a new current key first (file key provider)"),
+    ] = False,
+    workers: Annotated[
+        int,
+        typer.Option("--workers", "-w", min=1, help="Sessions re-encrypted in parallel"),
+    ] = 16,
+) -> None:
+    """Re-encrypt all sessions with the current encryption key.
+
+    Old keys stay usable for decryption, so this never forces a re-login:
+
+        gp session rekey --rotate     New key, then re-encrypt everything
+        gp session rekey              Re-encrypt after rotating keys elsewhere
+    """
+    backend_override = ctx.obj.get("storage_backend") if ctx.obj else None
+    if rotate:
+        try:
+            new_key = rotate_encryption_key()
+        except EncryptionError as exc:
+            console.print(f"[red]✗ {exc}[/red]")
+            raise typer.Exit(1) from None
+        console.print(f"[green]New encryption key {key_id(new_key).hex()}[/green]")
+
+    try:
+        result = rekey_sessions(backend_override=backend_override, max_workers=workers)
+    except (ValueError, GraftpunkError) as exc:
+        console.print(f"[red]✗ Rekey failed: {exc}[/red]")
+        raise typer.Exit(1) from None
+
+    console.print(
+        f"[green]Re-encrypted {len(result.rekeyed)} session(s)[/green]"
+        f" [dim]({len(result.current)} already current)[/dim]"
+    )
+    if result.failed:
+        console.print(f"[yellow]{len(result.failed)} session(s) could not be rekeyed:[/yellow]")
+        for name, error in sorted(result.failed.items()):
+            console.print(f"  - {name}: {error}")
+        raise typer.Exit(1)
+
+
 @session_app.command("use")
 def session_use(
     name: Annotated[
@@ -401,6 +428,14 @@ def session_unset() -> None:
     console.print("[green]Active session cleared[/green]")
 
 
+def _clear_matching(sessions: list[dict], backend_override: str | None) -> list[dict]:
+    """Remove the given sessions in one batched call; return those removed."""
+    removed_names = set(
+        clear_sessions([s["name"] for s in sessions], backend_override=backend_override)
+    )
+    return [s for s in sessions if s["name"] in removed_names]
+
+
 def _print_removed(removed: list[dict]) -> None:
     """Print the list of removed sessions."""
     if not removed:
@@ -9,7 +9,13 @@ The module also exposes ``execute_plugin_command()`` -- a thin
 wrapper around ``_run_handler_with_limits()`` that adds
 ``CommandResult`` normalization.  The CLI callback uses this
 function; ``GraftpunkClient`` calls ``_run_handler_with_limits``
-directly so it can manage its own per-client rate-limit state.
+directly so it can manage its own session and token refreshes. Both
+share the process-wide rate limiter (:mod:`graftpunk.ratelimit`).
+
+Async code uses ``GraftpunkClient.aexecute()``, which awaits coroutine
+handlers on the caller's loop. Sync callers that get a coroutine back from
+a handler run it on one persistent loop (:mod:`graftpunk.event_loop`)
+rather than a fresh ``asyncio.run`` per call.
 
 Example::
 
@@ -18,17 +24,29 @@ Example::
     with GraftpunkClient("mysite") as client:
         result = client.login(username="alice")
         invoices = client.invoice.list(status="open")
+
+        # Fan out over one shared session, results streamed as they finish
+        for item in client.map("invoice.get", [{"id": i} for i in ids], concurrency=8):
+            print(item.index, item.unwrap().data)
 """
 
 from __future__ import annotations
 
 import asyncio
+import inspect
+import threading
 import time
-from typing import Any
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, NoReturn
 
 import requests
 
 from graftpunk.cache import load_session_for_api, update_session_cookies
+from graftpunk.event_loop import run_coroutine
+from graftpunk.exceptions import CommandTimeoutError
+from graftpunk.graftpunk_session import GraftpunkSession
 from graftpunk.logging import get_logger
 from graftpunk.observe import NoOpObservabilityContext
 from graftpunk.plugins import get_plugin
@@ -37,111 +55,281 @@ from graftpunk.plugins.cli_plugin import (
     CommandContext,
     CommandResult,
     CommandSpec,
+    PluginConfig,
+)
+from graftpunk.plugins.pagination import Paginator
+from graftpunk.ratelimit import (
+    THROTTLE_STATUSES,
+    AdaptiveConcurrency,
+    RateLimit,
+    RateLimiter,
+    get_rate_limiter,
+    parse_retry_after,
+)
+from graftpunk.response_cache import anonymous_partition, response_cache_ttl
+from graftpunk.retry import (
+    RETRY_BASE_DELAY,
+    attempt_deadline,
+    decorrelated_jitter,
+    is_transient,
+    retry_budget,
 )
 from graftpunk.tokens import clear_cached_tokens, prepare_session
+from graftpunk.transport import plugin_transport_config
 
 LOG = get_logger(__name__)
 
-# ---------------------------------------------------------------------------
-# Module-level rate-limit state used by execute_plugin_command()
-# ---------------------------------------------------------------------------
 
-_rate_limit_state: dict[str, float] = {}
+def _command_buckets(ctx: CommandContext, spec: CommandSpec) -> list[tuple[str, RateLimit]]:
+    """Rate-limit buckets a command execution draws from.
+
+    ``CommandSpec.rate_limit`` spaces out runs of one command; the
+    plugin's ``rate_limit`` spaces out runs of all its commands.
+    """
+    buckets: list[tuple[str, RateLimit]] = []
+    if spec.rate_limit:
+        buckets.append((f"command:{ctx.plugin_name}.{spec.name}", RateLimit(spec.rate_limit)))
+    config = ctx.config
+    plugin_rate_limit = config.rate_limit if isinstance(config, PluginConfig) else None
+    if plugin_rate_limit:
+        buckets.append((f"plugin:{ctx.plugin_name}", RateLimit(plugin_rate_limit)))
+    return buckets
+
+
+def _throttle_response(exc: Exception) -> requests.Response | None:
+    """The 429/503 response behind ``exc``, if it is one."""
+    response = getattr(exc, "response", None)
+    if not isinstance(exc, requests.HTTPError) or response is None:
+        return None
+    return response if response.status_code in THROTTLE_STATUSES else None
+
+
+class _Attempts:
+    """Retry bookkeeping for one command execution.
+
+    Shared by :func:`_run_handler_with_limits` and
+    :func:`_arun_handler_with_limits`, which differ only in how they call
+    the handler and wait.
+    """
+
+    def __init__(self, ctx: CommandContext, spec: CommandSpec, limiter: RateLimiter) -> None:
+        self.ctx = ctx
+        self.spec = spec
+        self.limiter = limiter
+        self.buckets = _command_buckets(ctx, spec)
+        self.budget = retry_budget(ctx.plugin_name)
+        self.deadline = time.monotonic() + spec.deadline if spec.deadline else None
+        self.attempt = 0
+        self.delay = RETRY_BASE_DELAY
+        self.last_exc: Exception | None = None
+
+    def timeout(self) -> float | None:
+        """Time limit for the next attempt: ``spec.timeout`` or the time left, if shorter.
 
+        Raises:
+            CommandTimeoutError: If the deadline has passed.
+        """
+        if self.deadline is None:
+            return self.spec.timeout
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            self._deadline_exceeded()
+        return remaining if self.spec.timeout is None else min(self.spec.timeout, remaining)
+
+    def succeeded(self) -> None:
+        """Record a successful attempt."""
+        for key, limit in self.buckets:
+            self.limiter.succeeded(key, limit)
+        self.budget.record_success()
+
+    def failed(self, exc: Exception) -> float | None:
+        """Record a failed attempt and decide whether to retry.
 
-def _enforce_shared_rate_limit(
-    command_key: str,
-    rate_limit: float,
-    state: dict[str, float],
-) -> None:
-    """Enforce a minimum interval between command executions.
+        Args:
+            exc: The exception the attempt raised.
+
+        Returns:
+            Seconds to wait before the next attempt, or None if ``exc``
+            should be re-raised.
+
+        Raises:
+            CommandTimeoutError: If the next attempt could not start before
+                the deadline.
+        """
+        if not is_transient(exc):
+            return None
+        self.attempt += 1
+        self.last_exc = exc
+        can_retry = self.budget.record_failure()
+        self.delay = decorrelated_jitter(self.delay)
+        backoff = self.delay
+        throttled = _throttle_response(exc)
+        if throttled is not None:
+            retry_after = parse_retry_after(throttled.headers.get("Retry-After"))
+            for key, limit in self.buckets:
+                self.limiter.throttled(key, limit, retry_after)
+            if self.buckets:
+                backoff = 0  # the next acquire() waits out the pause
+            elif retry_after is not None:
+                backoff = retry_after
+        if self.attempt > self.spec.max_retries:
+            return None
+        if not can_retry:
+            LOG.warning(
+                "retry_budget_exhausted", command=self.spec.name, plugin=self.ctx.plugin_name
+            )
+            return None
+        if self.deadline is not None and time.monotonic() + backoff >= self.deadline:
+            self._deadline_exceeded()
+        LOG.warning(
+            "command_retry",
+            command=self.spec.name,
+            attempt=self.attempt,
+            backoff=round(backoff, 3),
+            error=str(exc),
+        )
+        return backoff
+
+    def _deadline_exceeded(self) -> NoReturn:
+        spec = self.spec
+        LOG.warning("command_deadline_exceeded", command=spec.name, deadline=spec.deadline)
+        raise CommandTimeoutError(
+            f"Command '{spec.name}' did not finish within its {spec.deadline:g}s deadline"
+        ) from self.last_exc
+
+
+def _run_handler_with_limits(
+    handler: Any,
+    ctx: CommandContext,
+    spec: CommandSpec,
+    limiter: RateLimiter,
+    **kwargs: Any,
+) -> Any:
+    """Execute handler with retry, deadline and rate-limit support.
+
+    Retries the handler up to ``spec.max_retries`` times on transient
+    failures (see :func:`graftpunk.retry.is_transient`), sleeping with
+    decorrelated jitter between attempts. Retries stop early when the
+    plugin's retry budget is spent or the next attempt could not start
+    before ``spec.deadline``.
+
+    Each attempt first takes a slot from the command's and the plugin's
+    rate-limit buckets, then runs with ``spec.timeout`` (or the time left
+    before the deadline, if shorter) as its time limit: requests sent
+    through a ``GraftpunkSession`` are capped at it and coroutine
+    handlers are cancelled when it runs out. A 429/503 ``HTTPError``
+    slows the buckets down and the retry waits for the server's
+    ``Retry-After`` instead of the jittered backoff. With
+    ``spec.cache_ttl``, GET/HEAD requests the handler sends through a
+    ``GraftpunkSession`` may be answered from the response cache.
+
+    Coroutines returned by async handlers run on the process-wide event
+    loop (:func:`graftpunk.event_loop.run_coroutine`), so this works from
+    inside a running loop too. Async callers should use
+    :func:`_arun_handler_with_limits` instead.
 
     Args:
-        command_key: Unique key for the command.
-        rate_limit: Minimum seconds between executions.
-        state: Mutable dict tracking last-execution timestamps.
+        handler: The command handler callable.
+        ctx: CommandContext to pass to the handler.
+        spec: CommandSpec with retry/deadline/rate-limit configuration.
+        limiter: Rate limiter holding the buckets.
+        **kwargs: Additional keyword arguments for the handler.
+
+    Returns:
+        The handler's return value.
+
+    Raises:
+        CommandTimeoutError: If the deadline passes before the command
+            succeeds.
+        Exception: The last exception if all attempts fail, or the first
+            non-transient one.
     """
-    now = time.monotonic()
-    last = state.get(command_key)
-    if last is not None:
-        elapsed = now - last
-        if elapsed < rate_limit:
-            time.sleep(rate_limit - elapsed)
-    state[command_key] = time.monotonic()
+    attempts = _Attempts(ctx, spec, limiter)
+    while True:
+        try:
+            for key, limit in attempts.buckets:
+                limiter.acquire(key, limit)
+            timeout = attempts.timeout()
+            with attempt_deadline(timeout), response_cache_ttl(spec.cache_ttl):
+                result = handler(ctx, **kwargs)
+                if asyncio.iscoroutine(result):
+                    LOG.debug(
+                        "async_handler_auto_executed",
+                        command=spec.name,
+                        plugin=ctx.plugin_name,
+                    )
+                    result = run_coroutine(asyncio.wait_for(result, timeout))
+            attempts.succeeded()
+            return result
+        except (requests.RequestException, OSError) as exc:
+            backoff = attempts.failed(exc)
+            if backoff is None:
+                raise
+            time.sleep(backoff)
 
 
-def _run_handler_with_limits(
+async def _arun_handler_with_limits(
     handler: Any,
     ctx: CommandContext,
     spec: CommandSpec,
-    rate_limit_state: dict[str, float],
+    limiter: RateLimiter,
     **kwargs: Any,
 ) -> Any:
-    """Execute handler with retry and rate-limit support.
+    """Async counterpart of :func:`_run_handler_with_limits`.
 
-    Retries the handler up to ``spec.max_retries`` times with
-    exponential backoff on transient failures.
+    Same retries, deadline and rate limits, but waits with
+    ``asyncio.sleep`` and awaits coroutine handlers on the caller's loop.
+    Sync handlers run in a worker thread (``asyncio.to_thread``) so they
+    do not block the loop.
 
     Args:
         handler: The command handler callable.
         ctx: CommandContext to pass to the handler.
-        spec: CommandSpec with retry/rate-limit configuration.
-        rate_limit_state: Mutable dict tracking last-execution times.
+        spec: CommandSpec with retry/deadline/rate-limit configuration.
+        limiter: Rate limiter holding the buckets.
         **kwargs: Additional keyword arguments for the handler.
 
     Returns:
         The handler's return value.
 
     Raises:
-        Exception: The last exception if all attempts fail.
+        CommandTimeoutError: If the deadline passes before the command
+            succeeds.
+        Exception: The last exception if all attempts fail, or the first
+            non-transient one.
     """
-    attempts = 1 + spec.max_retries
-    last_exc: Exception | None = None
-    command_key = f"{ctx.plugin_name}.{spec.name}"
-
-    for attempt in range(attempts):
+    attempts = _Attempts(ctx, spec, limiter)
+    while True:
         try:
-            if spec.rate_limit:
-                _enforce_shared_rate_limit(
-                    command_key,
-                    spec.rate_limit,
-                    rate_limit_state,
-                )
-            result = handler(ctx, **kwargs)
-            if asyncio.iscoroutine(result):
-                LOG.warning(
-                    "async_handler_auto_executed",
-                    command=spec.name,
-                    plugin=ctx.plugin_name,
-                )
-                result = asyncio.run(result)
+            for key, limit in attempts.buckets:
+                await limiter.aacquire(key, limit)
+            timeout = attempts.timeout()
+            with attempt_deadline(timeout), response_cache_ttl(spec.cache_ttl):
+                result = await asyncio.wait_for(_await_handler(handler, ctx, kwargs), timeout)
+            attempts.succeeded()
             return result
-        except (
-            requests.RequestException,
-            ConnectionError,
-            TimeoutError,
-            OSError,
-        ) as exc:
-            last_exc = exc
-            if attempt < attempts - 1:
-                backoff = 2**attempt
-                LOG.warning(
-                    "command_retry",
-                    command=spec.name,
-                    attempt=attempt + 1,
-                    backoff=backoff,
-                )
-                time.sleep(backoff)
+        except (requests.RequestException, OSError) as exc:
+            backoff = attempts.failed(exc)
+            if backoff is None:
+                raise
+            await asyncio.sleep(backoff)
+
 
-    assert last_exc is not None  # for type narrowing
-    raise last_exc
+async def _await_handler(handler: Any, ctx: CommandContext, kwargs: Mapping[str, Any]) -> Any:
+    """Call a sync or async handler without blocking the running loop."""
+    if inspect.iscoroutinefunction(handler):
+        return await handler(ctx, **kwargs)
+    result = await asyncio.to_thread(handler, ctx, **kwargs)
+    if asyncio.iscoroutine(result):
+        result = await result
+    return result
 
 
 def execute_plugin_command(
     spec: CommandSpec,
     ctx: CommandContext,
     *,
-    rate_limit_state: dict[str, float] | None = None,
+    limiter: RateLimiter | None = None,
     plugin_formatters: dict[str, Any] | None = None,
     **kwargs: Any,
 ) -> CommandResult:
@@ -159,8 +347,8 @@ def execute_plugin_command(
     Args:
         spec: The resolved command specification.
         ctx: Pre-built ``CommandContext``.
-        rate_limit_state: Mutable dict for rate-limit
-            tracking.  Defaults to a module-level dict.
+        limiter: Rate limiter for the command's buckets.
+            Defaults to the process-wide limiter.
         plugin_formatters: Plugin-wide formatter overrides to
             attach to the result for ``export()`` support.
         **kwargs: Arguments forwarded to the handler.
@@ -169,14 +357,12 @@ def execute_plugin_command(
         A ``CommandResult`` wrapping the handler's return
         value.
     """
-    rl_state = rate_limit_state if rate_limit_state is not None else _rate_limit_state
-
     # Execute with retry / rate-limit
     result = _run_handler_with_limits(
         spec.handler,
         ctx,
         spec,
-        rl_state,
+        limiter if limiter is not None else get_rate_limiter(),
         **kwargs,
     )
 
@@ -195,6 +381,54 @@ def execute_plugin_command(
     return CommandResult(data=result, _plugin_formatters=plugin_formatters)
 
 
+DEFAULT_CONCURRENCY = 8
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Outcome of one call made by ``GraftpunkClient.map()`` or ``batch()``.
+
+    Attributes:
+        index: Position of the call in the input.
+        command: Dotted command name, e.g. ``"invoice.get"``.
+        kwargs: Keyword arguments the command was called with.
+        result: The command's ``CommandResult``, or None if it failed.
+        error: The exception the command raised, or None.
+    """
+
+    index: int
+    command: str
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    result: CommandResult | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the call succeeded."""
+        return self.error is None
+
+    def unwrap(self) -> CommandResult:
+        """Return the result, or raise the call's exception.
+
+        Raises:
+            Exception: The exception the command raised.
+        """
+        if self.error is not None:
+            raise self.error
+        assert self.result is not None  # for type narrowing
+        return self.result
+
+
+@dataclass
+class _RunState:
+    """Session state shared by the calls of one execute/map/batch run."""
+
+    session: requests.Session
+    needs_session: bool
+    token_generation: int = 0
+    dirty: bool = False
+
+
 class GraftpunkClient:
     """Stateful client for a single plugin.
 
@@ -203,6 +437,11 @@ class GraftpunkClient:
     (``client.execute("login")``).  Sessions are loaded lazily
     on first command that requires one, and reused across calls.
 
+    ``map()`` and ``batch()`` run many calls concurrently on a thread
+    pool against the same session. The client is safe to use from
+    several threads. From async code, use ``aexecute()`` and
+    ``async with``.
+
     Observability is a no-op in the Python API -- use the CLI
     (``--observe``) for capture-based observability.
 
@@ -216,8 +455,13 @@ class GraftpunkClient:
     def __init__(self, plugin_name: str) -> None:
         self._plugin: CLIPluginProtocol = get_plugin(plugin_name)
         self._session: requests.Session | None = None
+        self._bare_session: requests.Session | None = None
         self._session_dirty: bool = False
-        self._last_execution: dict[str, float] = {}
+        # Guards session loading and persistence; the token lock makes
+        # concurrent 403s trigger a single token refresh.
+        self._lock = threading.RLock()
+        self._token_lock = threading.Lock()
+        self._token_generation = 0
 
         # Build command hierarchy
         self._top_commands: dict[str, CommandSpec] = {}
@@ -263,6 +507,28 @@ class GraftpunkClient:
         spec = self._resolve_command(*args)
         return self._execute_command(spec, **kwargs)
 
+    async def aexecute(self, *args: str, **kwargs: Any) -> CommandResult:
+        """Execute a command by name from async code.
+
+        Same arguments and pipeline as :meth:`execute`, but coroutine
+        handlers are awaited on the running loop and sync handlers run in a
+        worker thread, so many commands can be gathered concurrently::
+
+            async with GraftpunkClient("mysite") as client:
+                results = await asyncio.gather(
+                    *(client.aexecute("invoice", "get", id=i) for i in ids)
+                )
+
+        Args:
+            *args: Command path -- ``("login",)`` or ``("invoice", "list")``.
+            **kwargs: Keyword arguments forwarded to the command handler.
+
+        Returns:
+            The ``CommandResult`` from the handler.
+        """
+        spec = self._resolve_command(*args)
+        return await self._aexecute_command(spec, **kwargs)
+
     def _resolve_command(self, *args: str) -> CommandSpec:
         """Resolve positional args to a ``CommandSpec``.
 
@@ -294,98 +560,138 @@ class GraftpunkClient:
             return spec
         raise ValueError("execute() takes 1 arg (command) or 2 args (group, command)")
 
+    def _resolve_ref(
+        self, command: str | tuple[str, ...] | CommandSpec | _CommandCallable
+    ) -> CommandSpec:
+        """Resolve a map()/batch() command reference to a ``CommandSpec``.
+
+        Args:
+            command: A command name (``"invoice.get"`` for grouped
+                commands), a path tuple, a bound ``_CommandCallable``
+                such as ``client.invoice.get``, or a ``CommandSpec``.
+
+        Returns:
+            The matching ``CommandSpec``.
+
+        Raises:
+            AttributeError: If the command or group is unknown.
+            ValueError: If the reference is malformed.
+        """
+        if isinstance(command, CommandSpec):
+            return command
+        if isinstance(command, _CommandCallable):
+            return command._spec
+        if isinstance(command, str):
+            return self._resolve_command(*command.split("."))
+        if isinstance(command, tuple):
+            return self._resolve_command(*command)
+        raise ValueError(f"Cannot resolve command reference {command!r}")
+
     # -- execution ---------------------------------------------------------
 
-    def _execute_command(self, spec: CommandSpec, **kwargs: Any) -> CommandResult:
-        """Execute a resolved command through the full pipeline.
+    def _needs_session(self, spec: CommandSpec) -> bool:
+        if spec.requires_session is not None:
+            return spec.requires_session
+        return self._plugin.requires_session
 
-        Pipeline:
-        1. Lazy-load session if needed.
-        2. Inject tokens via ``prepare_session`` if configured.
-        3. Build ``CommandContext``.
-        4. Run handler with retry/rate-limit; on 403 + token_config,
-           clear tokens, re-prepare, and retry once.
-        5. Persist session if dirty or ``spec.saves_session``.
-        6. Normalize return to ``CommandResult``.
+    def _start_run(self, needs_session: bool) -> _RunState:
+        """Load the session (once) and inject tokens for a run of commands.
 
         Args:
-            spec: The resolved command specification.
-            **kwargs: Arguments forwarded to the handler.
+            needs_session: Whether the commands require the plugin's session.
 
         Returns:
-            A ``CommandResult`` wrapping the handler's return value.
+            The shared state for the run's calls.
 
         Raises:
             SessionNotFoundError: If the session cannot be loaded.
-            requests.exceptions.HTTPError: On non-403 HTTP errors, or
-                403 errors when no ``token_config`` is set.
             ValueError: If ``prepare_session`` fails to extract tokens.
         """
         plugin = self._plugin
         base_url: str = getattr(plugin, "base_url", "")
         token_config = getattr(plugin, "token_config", None)
-        needs_session = (
-            spec.requires_session if spec.requires_session is not None else plugin.requires_session
-        )
-
-        # 1. Lazy-load session
-        if needs_session and self._session is None:
-            self._session = load_session_for_api(plugin.session_name)
-            if base_url and hasattr(self._session, "gp_base_url"):
-                setattr(self._session, "gp_base_url", base_url)  # noqa: B010
+        transport = plugin_transport_config(plugin)
+
+        with self._lock:
+            if needs_session and self._session is None:
+                self._session = load_session_for_api(plugin.session_name, transport=transport)
+                if base_url and hasattr(self._session, "gp_base_url"):
+                    setattr(self._session, "gp_base_url", base_url)  # noqa: B010
+
+            # Commands without a session share one bare session, so their
+            # connections (and cached responses) are shared across calls too
+            if not needs_session and self._bare_session is None:
+                bare = GraftpunkSession(transport=transport)
+                bare.enable_response_cache(anonymous_partition(plugin.site_name))
+                self._bare_session = bare
+
+            session = self._session if needs_session else self._bare_session
+            assert session is not None  # guaranteed by lazy-load above
+
+        with self._token_lock:
+            if token_config is not None and needs_session:
+                prepare_session(session, token_config, base_url)
+            generation = self._token_generation
+        return _RunState(session=session, needs_session=needs_session, token_generation=generation)
 
-        session = self._session if needs_session else requests.Session()
-        assert session is not None  # guaranteed by lazy-load above
+    def _refresh_tokens(self, run: _RunState, seen_generation: int) -> None:
+        """Re-extract tokens after a 403, once per token generation.
 
-        # 2. Token injection
-        if token_config is not None and needs_session:
-            prepare_session(session, token_config, base_url)
+        Concurrent calls that were rejected with the same tokens wait for
+        the first caller's refresh and then reuse its tokens.
 
-        # 3. Build CommandContext
-        ctx = CommandContext(
-            session=session,
+        Args:
+            run: The run whose session gets the new tokens.
+            seen_generation: Token generation the rejected call used.
+        """
+        token_config = getattr(self._plugin, "token_config", None)
+        if token_config is None:
+            return
+        with self._token_lock:
+            if self._token_generation == seen_generation:
+                clear_cached_tokens(run.session)
+                prepare_session(run.session, token_config, getattr(self._plugin, "base_url", ""))
+                self._token_generation += 1
+            run.token_generation = self._token_generation
+            run.dirty = True
+
+    def _make_context(self, spec: CommandSpec, run: _RunState) -> CommandContext:
+        """Build the ``CommandContext`` for one call (step 3)."""
+        plugin = self._plugin
+        return CommandContext(
+            session=run.session,
             plugin_name=plugin.site_name,
             command_name=spec.name,
             api_version=plugin.api_version,
-            base_url=base_url,
+            base_url=getattr(plugin, "base_url", ""),
             config=getattr(plugin, "_plugin_config", None),
             observe=NoOpObservabilityContext(),
-            _session_name=(plugin.session_name if needs_session else ""),
+            _session_name=(plugin.session_name if run.needs_session else ""),
         )
 
-        # 4. Execute with retry/rate-limit; 403 token refresh
-        try:
-            result = _run_handler_with_limits(
-                spec.handler, ctx, spec, self._last_execution, **kwargs
-            )
-        except requests.exceptions.HTTPError as exc:
-            if (
-                exc.response is not None
-                and exc.response.status_code == 403
-                and token_config is not None
-            ):
-                LOG.info(
-                    "token_403_retry",
-                    command=spec.name,
-                    url=(exc.response.url if exc.response else "unknown"),
-                )
-                clear_cached_tokens(session)
-                prepare_session(session, token_config, base_url)
-                self._session_dirty = True
-                result = _run_handler_with_limits(
-                    spec.handler, ctx, spec, self._last_execution, **kwargs
-                )
-            else:
-                raise
+    def _is_token_rejection(self, spec: CommandSpec, exc: requests.exceptions.HTTPError) -> bool:
+        """Whether ``exc`` is a 403 that fresh tokens might fix."""
+        if (
+            exc.response is None
+            or exc.response.status_code != 403
+            or getattr(self._plugin, "token_config", None) is None
+        ):
+            return False
+        LOG.info(
+            "token_403_retry",
+            command=spec.name,
+            url=(exc.response.url if exc.response else "unknown"),
+        )
+        return True
 
-        # 5. Persist session if dirty
-        if needs_session and (spec.saves_session or ctx._session_dirty or self._session_dirty):
-            self._session_dirty = True
-            update_session_cookies(session, plugin.session_name)
-            self._session_dirty = False
+    def _to_result(
+        self, spec: CommandSpec, ctx: CommandContext, run: _RunState, result: Any
+    ) -> CommandResult:
+        """Mark the session dirty if needed and normalize to ``CommandResult`` (step 6)."""
+        if spec.saves_session or ctx._session_dirty:
+            run.dirty = True
 
-        # 6. Normalize to CommandResult
-        plugin_fmts = getattr(plugin, "format_overrides", None) or None
+        plugin_fmts = getattr(self._plugin, "format_overrides", None) or None
         if isinstance(result, CommandResult):
             if plugin_fmts and not result._plugin_formatters:
                 result = CommandResult(
@@ -399,6 +705,269 @@ class GraftpunkClient:
             return result
         return CommandResult(data=result, _plugin_formatters=plugin_fmts)
 
+    def _call(
+        self,
+        spec: CommandSpec,
+        run: _RunState,
+        kwargs: Mapping[str, Any],
+        limiter: RateLimiter | None = None,
+    ) -> CommandResult:
+        """Run one command against a prepared run (steps 3, 4 and 6).
+
+        Args:
+            spec: The resolved command specification.
+            run: Session state from :meth:`_start_run`.
+            kwargs: Arguments forwarded to the handler.
+            limiter: Rate limiter for the command's buckets.
+                Defaults to the process-wide limiter.
+
+        Returns:
+            A ``CommandResult`` wrapping the handler's return value.
+        """
+        ctx = self._make_context(spec, run)
+        limiter = limiter if limiter is not None else get_rate_limiter()
+
+        # 4. Execute with retry/rate-limit; 403 token refresh
+        generation = run.token_generation
+        try:
+            result = _run_handler_with_limits(spec.handler, ctx, spec, limiter, **kwargs)
+        except requests.exceptions.HTTPError as exc:
+            if not self._is_token_rejection(spec, exc):
+                raise
+            self._refresh_tokens(run, generation)
+            result = _run_handler_with_limits(spec.handler, ctx, spec, limiter, **kwargs)
+        return self._to_result(spec, ctx, run, result)
+
+    async def _acall(
+        self, spec: CommandSpec, run: _RunState, kwargs: Mapping[str, Any]
+    ) -> CommandResult:
+        """Async counterpart of :meth:`_call`; token refreshes run in a worker thread."""
+        ctx = self._make_context(spec, run)
+
+        generation = run.token_generation
+        try:
+            result = await _arun_handler_with_limits(
+                spec.handler, ctx, spec, get_rate_limiter(), **kwargs
+            )
+        except requests.exceptions.HTTPError as exc:
+            if not self._is_token_rejection(spec, exc):
+                raise
+            await asyncio.to_thread(self._refresh_tokens, run, generation)
+            result = await _arun_handler_with_limits(
+                spec.handler, ctx, spec, get_rate_limiter(), **kwargs
+            )
+        return self._to_result(spec, ctx, run, result)
+
+    def _finish_run(self, run: _RunState) -> None:
+        """Persist the session if the run (or an earlier one) changed it (step 5)."""
+        if not run.needs_session:
+            return
+        with self._lock:
+            if run.dirty or self._session_dirty:
+                self._session_dirty = True
+                update_session_cookies(run.session, self._plugin.session_name)
+                self._session_dirty = False
+
+    def _execute_command(self, spec: CommandSpec, **kwargs: Any) -> CommandResult:
+        """Execute a resolved command through the full pipeline.
+
+        Pipeline:
+        1. Lazy-load session if needed.
+        2. Inject tokens via ``prepare_session`` if configured.
+        3. Build ``CommandContext``.
+        4. Run handler with retry/rate-limit; on 403 + token_config,
+           clear tokens, re-prepare, and retry once.
+        5. Persist session if dirty or ``spec.saves_session``.
+        6. Normalize return to ``CommandResult``.
+
+        Args:
+            spec: The resolved command specification.
+            **kwargs: Arguments forwarded to the handler.
+
+        Returns:
+            A ``CommandResult`` wrapping the handler's return value.
+
+        Raises:
+            SessionNotFoundError: If the session cannot be loaded.
+            requests.exceptions.HTTPError: On non-403 HTTP errors, or
+                403 errors when no ``token_config`` is set.
+            ValueError: If ``prepare_session`` fails to extract tokens.
+        """
+        run = self._start_run(self._needs_session(spec))
+        try:
+            result = self._call(spec, run, kwargs)
+        except BaseException:
+            # Keep a token refresh from a failed call for close() to persist
+            if run.dirty and run.needs_session:
+                self._session_dirty = True
+            raise
+        self._finish_run(run)
+        self._defer_stream_persist(run, result)
+        return result
+
+    def _defer_stream_persist(self, run: _RunState, result: CommandResult) -> None:
+        """Let close() persist cookies set while a paginated result is iterated."""
+        if run.dirty and run.needs_session and isinstance(result.data, Paginator):
+            self._session_dirty = True
+
+    async def _aexecute_command(self, spec: CommandSpec, **kwargs: Any) -> CommandResult:
+        """Async counterpart of :meth:`_execute_command`.
+
+        Session loading, token extraction and session persistence block, so
+        they run in worker threads; the handler runs on the caller's loop.
+        """
+        run = await asyncio.to_thread(self._start_run, self._needs_session(spec))
+        try:
+            result = await self._acall(spec, run, kwargs)
+        except BaseException:
+            if run.dirty and run.needs_session:
+                self._session_dirty = True
+            raise
+        await asyncio.to_thread(self._finish_run, run)
+        self._defer_stream_persist(run, result)
+        return result
+
+    # -- bulk execution ----------------------------------------------------
+
+    def map(
+        self,
+        command: str | tuple[str, ...] | _CommandCallable,
+        kwargs_list: Iterable[Mapping[str, Any]],
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        limiter: RateLimiter | None = None,
+    ) -> Iterator[BatchResult]:
+        """Run one command for every set of arguments, concurrently.
+
+        Shorthand for ``batch((command, kwargs) for kwargs in kwargs_list)``.
+
+        Args:
+            command: Command reference (``"invoice.get"``,
+                ``("invoice", "get")`` or ``client.invoice.get``).
+            kwargs_list: Keyword arguments for each call.
+            concurrency: Maximum number of calls in flight.
+            limiter: Rate limiter for the calls' buckets.
+                Defaults to the process-wide limiter.
+
+        Returns:
+            Iterator of ``BatchResult`` in completion order.
+        """
+        spec = self._resolve_ref(command)
+        return self.batch(
+            ((spec, kwargs) for kwargs in kwargs_list), concurrency=concurrency, limiter=limiter
+        )
+
+    def batch(
+        self,
+        calls: Iterable[tuple[Any, Mapping[str, Any]]],
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        limiter: RateLimiter | None = None,
+    ) -> Iterator[BatchResult]:
+        """Run many commands concurrently against the shared session.
+
+        Every call goes through the same pipeline as :meth:`execute`, but
+        the session is loaded and tokens are injected once for the whole
+        batch. Rate limits are shared by all workers, throttling responses
+        (429/503) lower the number of calls in flight until the site
+        recovers, a 403
+        refreshes tokens once for every worker that hit it, and the
+        session is persisted once when the batch ends. A failing call does
+        not stop the batch: its ``BatchResult`` carries the exception.
+
+        Calls are read from ``calls`` lazily, at most ``2 * concurrency``
+        ahead of the results, so large or generated inputs are fine.
+        Nothing runs until iteration starts; breaking out of the loop
+        cancels the calls not yet started.
+
+        Args:
+            calls: ``(command, kwargs)`` pairs; commands as in :meth:`map`.
+            concurrency: Maximum (and starting) number of calls in flight.
+            limiter: Rate limiter for the calls' buckets.
+                Defaults to the process-wide limiter.
+
+        Returns:
+            Iterator of ``BatchResult`` in completion order (use
+            ``BatchResult.index`` to match results to calls).
+
+        Raises:
+            ValueError: If ``concurrency`` is less than 1.
+            SessionNotFoundError: If the session cannot be loaded.
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        return self._run_batch(calls, concurrency, limiter or get_rate_limiter())
+
+    def _run_batch(
+        self,
+        calls: Iterable[tuple[Any, Mapping[str, Any]]],
+        concurrency: int,
+        limiter: RateLimiter,
+    ) -> Iterator[BatchResult]:
+        # One run per session kind, started on first use from this thread
+        # so a missing session raises here instead of failing every call.
+        runs: dict[bool, _RunState] = {}
+        # Workers back off together when the site starts throttling: any
+        # 429/503 seen while a call ran (by the command or the transport)
+        # halves the calls allowed in flight; successes win them back.
+        gate = AdaptiveConcurrency(concurrency)
+
+        def invoke(
+            index: int, spec: CommandSpec, run: _RunState, kwargs: dict[str, Any]
+        ) -> BatchResult:
+            name = f"{spec.group}.{spec.name}" if spec.group else spec.name
+            ticket = gate.acquire()
+            throttles = limiter.throttle_count
+            try:
+                result = self._call(spec, run, kwargs, limiter)
+            except Exception as exc:  # noqa: BLE001 — reported per call
+                throttled = _throttle_response(exc) is not None
+                gate.release(ticket, throttled=throttled or limiter.throttle_count != throttles)
+                LOG.warning("batch_call_failed", command=name, index=index, error=str(exc))
+                return BatchResult(index=index, command=name, kwargs=kwargs, error=exc)
+            gate.release(ticket, throttled=limiter.throttle_count != throttles)
+            return BatchResult(index=index, command=name, kwargs=kwargs, result=result)
+
+        pending = enumerate(calls)
+        in_flight: set[Future[BatchResult]] = set()
+        executor = ThreadPoolExecutor(
+            max_workers=concurrency,
+            thread_name_prefix=f"graftpunk-{self._plugin.site_name}",
+        )
+        completed = 0
+        try:
+            exhausted = False
+            while True:
+                while not exhausted and len(in_flight) < 2 * concurrency:
+                    item = next(pending, None)
+                    if item is None:
+                        exhausted = True
+                        break
+                    index, (command, kwargs) = item
+                    spec = self._resolve_ref(command)
+                    needs_session = self._needs_session(spec)
+                    if needs_session not in runs:
+                        runs[needs_session] = self._start_run(needs_session)
+                    in_flight.add(
+                        executor.submit(invoke, index, spec, runs[needs_session], dict(kwargs))
+                    )
+                if not in_flight:
+                    break
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    completed += 1
+                    yield future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            for run in runs.values():
+                self._finish_run(run)
+            LOG.debug(
+                "batch_finished",
+                plugin=self._plugin.site_name,
+                completed=completed,
+                concurrency=concurrency,
+            )
+
     # -- lifecycle ---------------------------------------------------------
 
     def close(self) -> None:
@@ -418,6 +987,9 @@ class GraftpunkClient:
                     plugin=self._plugin.site_name,
                     exc_info=True,
                 )
+        if self._bare_session is not None:
+            self._bare_session.close()
+            self._bare_session = None
         try:
             self._plugin.teardown()
         except Exception:  # noqa: BLE001
@@ -436,6 +1008,12 @@ class GraftpunkClient:
     def __exit__(self, *exc: object) -> None:
         self.close()
 
+    async def __aenter__(self) -> GraftpunkClient:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await asyncio.to_thread(self.close)
+
 
 class _GroupProxy:
     """Proxy for a command group.
@@ -26,6 +26,48 @@ class GraftpunkSettings(BaseSettings):
         default=720,  # 30 days
         description="Session TTL in hours",
     )
+    session_cache_size: int = Field(
+        default=8,
+        ge=0,
+        description="Max decoded sessions kept in the in-process cache (0 disables)",
+    )
+
+    response_cache_size_mb: int = Field(
+        default=64,
+        ge=0,
+        description="Max size of the encrypted HTTP response cache in MiB (0 disables)",
+    )
+
+    rate_limit_backend: Literal["memory", "file"] = Field(
+        default="memory",
+        description=(
+            "Where rate-limit buckets live: memory (per process) or file "
+            "(shared by every process using this config directory)"
+        ),
+    )
+
+    storage_local_cache: bool = Field(
+        default=False,
+        description="Cache s3/supabase sessions on local disk (read-through, offline fallback)",
+    )
+    storage_index: bool = Field(
+        default=False,
+        description="Maintain a consolidated _index.json in s3/supabase storage for fast listing",
+    )
+
+    # Encryption key configuration
+    key_provider: str | None = Field(
+        default=None,
+        description=(
+            "Encryption key provider (file, supabase-vault or a registered provider). "
+            "Defaults to supabase-vault for supabase storage, file otherwise"
+        ),
+    )
+    key_cache_ttl_seconds: int = Field(
+        default=3600,
+        ge=0,
+        description="Seconds to cache encryption keys in memory (0 caches for the process)",
+    )
 
     # Logging configuration
     log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = Field(
@@ -68,6 +110,10 @@ class GraftpunkSettings(BaseSettings):
         default=None,
         description="S3 endpoint URL (for S3-compatible storage)",
     )
+    s3_concurrent_writes: bool = Field(
+        default=False,
+        description="Upload session data and metadata to S3 in parallel",
+    )
 
     # Retry configuration
     retry_max_attempts: int = Field(
@@ -110,6 +156,11 @@ class GraftpunkSettings(BaseSettings):
         """Get the sessions storage directory."""
         return self.config_dir / "sessions"
 
+    @property
+    def remote_cache_dir(self) -> Path:
+        """Get the local cache directory for remote storage backends."""
+        return self.config_dir / "remote-cache"
+
     def get_storage_config(self, backend_type: str | None = None) -> dict[str, Any]:
         """Get storage backend configuration.
 
@@ -146,6 +197,8 @@ class GraftpunkSettings(BaseSettings):
                 "bucket_name": self.session_storage_bucket,
                 "retry_max_attempts": self.retry_max_attempts,
                 "retry_base_delay": self.retry_base_delay,
+                "use_index": self.storage_index,
+                "local_cache_dir": self.remote_cache_dir if self.storage_local_cache else None,
             }
 
         if storage_type == "s3":
@@ -161,6 +214,9 @@ class GraftpunkSettings(BaseSettings):
                 "endpoint_url": self.s3_endpoint_url,
                 "retry_max_attempts": self.retry_max_attempts,
                 "retry_base_delay": self.retry_base_delay,
+                "use_index": self.storage_index,
+                "concurrent_writes": self.s3_concurrent_writes,
+                "local_cache_dir": self.remote_cache_dir if self.storage_local_cache else None,
             }
 
         raise ValueError(
@@ -1,25 +1,68 @@
-"""Session encryption using Fernet symmetric encryption.
+"""Session encryption.
+
+Data is sealed in a versioned binary envelope: the plaintext is split into
+fixed-size chunks, each encrypted with an AEAD cipher (AES-256-GCM by
+default, ChaCha20-Poly1305 supported) under a nonce made of a random
+per-message prefix, the chunk counter and a final-chunk flag (the STREAM
+construction). Every envelope is sealed with its own cipher key, derived
+from the master key and a random 16-byte salt stored in the header, so
+nonces never repeat under one key however many envelopes are written.
+Reordered, dropped or truncated chunks fail authentication, the output is
+raw binary instead of base64, and large payloads can be processed with
+:func:`encrypt_stream`/:func:`decrypt_stream` without holding them in
+memory.
+
+Envelope layout::
+
+    magic "GPEN" | version (1 byte) | algorithm (1 byte) |
+    chunk size (uint32 BE) | nonce prefix (7 bytes) | key id (8 bytes) |
+    salt (16 bytes) | chunk ciphertexts...
+
+The header is authenticated as associated data of every chunk. Version 1
+(no key id) and version 2 (no salt, one cipher key for every envelope)
+envelopes and Fernet tokens written by earlier releases are still decrypted
+transparently.
+
+Keys come from a pluggable :class:`KeyProvider` selected with
+GRAFTPUNK_KEY_PROVIDER (see :func:`register_key_provider`). By default:
 
-This module provides encryption/decryption for session data using
-Fernet (AES-128-CBC with HMAC authentication). Keys are sourced based
-on the storage backend configuration:
-
-- GRAFTPUNK_STORAGE_BACKEND=local: Local file (~/.config/graftpunk/.session_key)
 - GRAFTPUNK_STORAGE_BACKEND=supabase: Supabase Vault
   (secret name from GRAFTPUNK_SESSION_KEY_VAULT_NAME)
+- any other backend: Local file (~/.config/graftpunk/.session_key)
+
+A key source may hold several Fernet-format keys, one per line: the first
+encrypts, all of them decrypt. The key id in each envelope selects the right
+key directly, so rotating keys never strands existing sessions. Cipher keys
+are derived with HKDF-SHA256 from the Fernet-format key.
 
 Thread Safety:
-    The encryption key is cached globally for performance (avoids repeated
-    round-trips to Vault or filesystem). The cache is NOT thread-safe.
-    This is acceptable for the current single-threaded CLI usage pattern.
-    If using graftpunk in a multi-threaded application, external synchronization
-    is required when calling get_encryption_key() or reset_encryption_key_cache().
+    The keyring is cached globally for performance (avoids repeated
+    round-trips to Vault or filesystem) for GRAFTPUNK_KEY_CACHE_TTL_SECONDS.
+    Loading it is serialized by a module lock, so threads racing on first
+    use load the keys (and create the local key file) once. A key file
+    created concurrently by another process is read instead of replaced.
+    The derived cipher objects themselves are safe to share between threads.
 """
 
+import base64
 import binascii
+import contextlib
+import hashlib
 import os
-
-from cryptography.fernet import Fernet
+import struct
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import BinaryIO, Protocol
+
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 
 from graftpunk.config import get_settings
 from graftpunk.exceptions import EncryptionError
@@ -27,70 +70,310 @@ from graftpunk.logging import get_logger
 
 LOG = get_logger(__name__)
 
-# Cache the encryption key in memory to avoid repeated round-trips
-_encryption_key_cache: bytes | None = None
+ENVELOPE_MAGIC = b"GPEN"
+# Version 2 added the key id, version 3 the per-envelope salt; older
+# versions are still read.
+ENVELOPE_VERSION = 3
+ALGORITHM_AES_256_GCM = 1
+ALGORITHM_CHACHA20_POLY1305 = 2
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_HEADER = struct.Struct(">4sBBI7s8s16s")
+_HEADER_V2 = struct.Struct(">4sBBI7s8s")
+_HEADER_V1 = struct.Struct(">4sBBI7s")
+_HEADER_SIZES = {1: _HEADER_V1.size, 2: _HEADER_V2.size, ENVELOPE_VERSION: _HEADER.size}
+_NONCE_PREFIX_SIZE = 7
+_KEY_ID_SIZE = 8
+_SALT_SIZE = 16
+_TAG_SIZE = 16
+# Upper bound accepted when decoding, so a corrupt header can't force a huge read.
+_MAX_CHUNK_SIZE = 16 * 1024 * 1024
+_MAX_CHUNKS = 2**32
+
+_ALGORITHMS: dict[int, tuple[bytes, type[AESGCM] | type[ChaCha20Poly1305]]] = {
+    ALGORITHM_AES_256_GCM: (b"aes-256-gcm", AESGCM),
+    ALGORITHM_CHACHA20_POLY1305: (b"chacha20-poly1305", ChaCha20Poly1305),
+}
+
+
+def _split_keys(material: bytes) -> list[bytes]:
+    """Split key material into Fernet keys, one per line, current key first.
 
+    Raises:
+        EncryptionError: If there is no key or a line is not a valid Fernet key.
+    """
+    keys = [line.strip() for line in material.splitlines() if line.strip()]
+    if not keys:
+        raise EncryptionError("No encryption key found")
+    for key in keys:
+        try:
+            Fernet(key)
+        except (ValueError, TypeError, binascii.Error) as exc:
+            raise EncryptionError(
+                f"Invalid encryption key ({exc}); each line must be a Fernet key "
+                "(base64-encoded 32 bytes)"
+            ) from exc
+    return keys
+
+
+@lru_cache(maxsize=32)
+def key_id(key: bytes) -> bytes:
+    """Return the 8-byte identifier embedded in envelopes sealed with ``key``."""
+    return hashlib.sha256(b"graftpunk-key-id:" + key).digest()[:_KEY_ID_SIZE]
+
+
+@dataclass(frozen=True)
+class Keyring:
+    """Encryption keys from a key provider.
+
+    Attributes:
+        keys: Fernet-format keys, current key first. Older keys are only used
+            to decrypt data sealed before a rotation.
+    """
+
+    keys: tuple[bytes, ...]
+
+    @property
+    def current(self) -> bytes:
+        """The key new data is encrypted with."""
+        return self.keys[0]
+
+    def find(self, kid: bytes) -> bytes | None:
+        """Return the key with identifier ``kid``, if present."""
+        for key in self.keys:
+            if key_id(key) == kid:
+                return key
+        return None
+
+
+class KeyProvider(Protocol):
+    """Source of encryption keys.
+
+    Providers may also implement ``rotate() -> bytes`` to generate a new
+    current key while keeping the old ones for decryption.
+    """
+
+    def load_keys(self) -> list[bytes]:
+        """Return Fernet-format keys, current key first.
+
+        Raises:
+            EncryptionError: If the keys cannot be retrieved.
+        """
+        ...
+
+
+class FileKeyProvider:
+    """Keys from ``~/.config/graftpunk/.session_key``, one per line.
+
+    The file is created with a fresh key on first use. ``rotate()`` prepends
+    a new key, keeping older keys on the following lines.
+    """
+
+    def load_keys(self) -> list[bytes]:
+        """Return the keys in the key file, creating it if needed."""
+        return _split_keys(_get_key_from_file())
+
+    def rotate(self) -> bytes:
+        """Generate a new current key and keep the old ones after it.
+
+        Returns:
+            The new key.
+        """
+        key_file = get_settings().config_dir / ".session_key"
+        keys = self.load_keys()
+        new_key = Fernet.generate_key()
+        fd, tmp_path = tempfile.mkstemp(prefix=".session_key.", dir=key_file.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(b"\n".join([new_key, *keys]) + b"\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, key_file)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+        LOG.info("rotated_session_encryption_key", key_count=len(keys) + 1)
+        return new_key
+
+
+class SupabaseVaultKeyProvider:
+    """Keys from the Supabase Vault secret named by GRAFTPUNK_SESSION_KEY_VAULT_NAME.
+
+    To rotate, put the new key on the first line of the secret and keep the
+    previous keys on the following lines.
+    """
+
+    def load_keys(self) -> list[bytes]:
+        """Return the keys stored in the Vault secret."""
+        return _split_keys(_get_key_from_supabase_vault())
+
+
+_KEY_PROVIDER_REGISTRY: dict[str, Callable[[], KeyProvider]] = {
+    "file": FileKeyProvider,
+    "supabase-vault": SupabaseVaultKeyProvider,
+}
 
-def get_encryption_key() -> bytes:
-    """Get encryption key for session data.
 
-    Key source is determined by GRAFTPUNK_STORAGE_BACKEND:
-    - "local" (default): Local file (~/.config/graftpunk/.session_key)
-    - "supabase": Supabase Vault (using GRAFTPUNK_SESSION_KEY_VAULT_NAME or default)
+def register_key_provider(name: str, factory: Callable[[], KeyProvider]) -> None:
+    """Register a key provider selectable with GRAFTPUNK_KEY_PROVIDER.
+
+    Args:
+        name: Provider name (e.g., "aws-kms").
+        factory: Zero-argument callable returning the provider.
+
+    Raises:
+        ValueError: If name is already registered.
+
+    Example:
+        >>> register_key_provider("env", lambda: EnvKeyProvider())
+    """
+    if name in _KEY_PROVIDER_REGISTRY:
+        raise ValueError(f"Key provider '{name}' is already registered")
+    _KEY_PROVIDER_REGISTRY[name] = factory
+
+
+def list_key_providers() -> list[str]:
+    """Return the names of all registered key providers, sorted."""
+    return sorted(_KEY_PROVIDER_REGISTRY)
+
+
+def get_key_provider() -> KeyProvider:
+    """Instantiate the configured key provider.
+
+    GRAFTPUNK_KEY_PROVIDER selects it by name. When unset, Supabase storage
+    uses "supabase-vault" and every other backend uses "file".
+
+    Raises:
+        EncryptionError: If the configured provider is not registered.
+    """
+    settings = get_settings()
+    name = settings.key_provider
+    if not name:
+        name = "supabase-vault" if settings.storage_backend.lower() == "supabase" else "file"
+    try:
+        factory = _KEY_PROVIDER_REGISTRY[name]
+    except KeyError:
+        available = ", ".join(list_key_providers())
+        raise EncryptionError(f"Unknown key provider '{name}'. Available: {available}") from None
+    return factory()
+
+
+# Keys are cached in memory to avoid repeated round-trips to Vault or the
+# filesystem: (monotonic load time, keyring). Loads hold _keyring_lock;
+# it is reentrant because providers may call back into this module.
+_keyring_cache: tuple[float, Keyring] | None = None
+_keyring_lock = threading.RLock()
 
-    The key is cached in memory after first retrieval to avoid
-    repeated round-trips to Vault or filesystem.
+
+def _cached_keyring(ttl: float) -> Keyring | None:
+    cached = _keyring_cache
+    if cached is not None and (ttl <= 0 or time.monotonic() - cached[0] < ttl):
+        return cached[1]
+    return None
+
+
+def get_keyring(refresh: bool = False) -> Keyring:
+    """Get the encryption keyring, cached for GRAFTPUNK_KEY_CACHE_TTL_SECONDS.
+
+    Args:
+        refresh: Reload from the provider even if the cached keyring is fresh.
 
     Returns:
-        Fernet-compatible 32-byte key (base64 encoded).
+        The current keyring.
 
     Raises:
-        EncryptionError: If key cannot be retrieved or generated.
+        EncryptionError: If keys cannot be retrieved.
     """
-    global _encryption_key_cache
+    global _keyring_cache
 
-    if _encryption_key_cache is not None:
-        return _encryption_key_cache
+    ttl = get_settings().key_cache_ttl_seconds
+    if not refresh and (keyring := _cached_keyring(ttl)) is not None:
+        return keyring
 
-    _encryption_key_cache = _load_encryption_key()
-    return _encryption_key_cache
+    with _keyring_lock:
+        # Another thread may have loaded the keys while this one waited.
+        if not refresh and (keyring := _cached_keyring(ttl)) is not None:
+            return keyring
+        now = time.monotonic()
+        keyring = Keyring(tuple(get_key_provider().load_keys()))
+        _keyring_cache = (now, keyring)
+        return keyring
+
+
+def get_encryption_key() -> bytes:
+    """Get the current encryption key for session data.
+
+    Keys come from the configured key provider (see :func:`get_key_provider`)
+    and are cached in memory to avoid repeated round-trips to Vault or the
+    filesystem.
+
+    Returns:
+        Fernet-compatible 32-byte key (base64 encoded).
+
+    Raises:
+        EncryptionError: If key cannot be retrieved or generated.
+    """
+    return get_keyring().current
 
 
 def _load_encryption_key() -> bytes:
-    """Load encryption key based on storage backend configuration.
+    """Load the current encryption key from the configured provider, uncached.
 
     Returns:
         Fernet-compatible key bytes.
     """
-    settings = get_settings()
-    storage_backend = settings.storage_backend.lower()
+    return get_key_provider().load_keys()[0]
+
 
-    if storage_backend == "supabase":
-        return _get_key_from_supabase_vault()
+def rotate_encryption_key() -> bytes:
+    """Make a new key current, keeping old keys for decryption.
+
+    Returns:
+        The new current key.
 
-    return _get_key_from_file()
+    Raises:
+        EncryptionError: If the configured provider cannot rotate keys.
+    """
+    provider = get_key_provider()
+    rotate = getattr(provider, "rotate", None)
+    if rotate is None:
+        raise EncryptionError(
+            f"Key provider {type(provider).__name__} does not support rotation. "
+            "Add the new key as the first line of the key source instead."
+        )
+    new_key = rotate()
+    reset_encryption_key_cache()
+    LOG.info("encryption_key_rotated", key_id=key_id(new_key).hex())
+    return new_key
 
 
 def _get_key_from_file() -> bytes:
-    """Get or create encryption key from local file.
+    """Get or create the key file.
 
     Returns:
-        Fernet-compatible key bytes.
+        Key file contents: one Fernet key per line, current key first.
     """
     settings = get_settings()
     key_file = settings.config_dir / ".session_key"
 
-    if key_file.exists():
-        LOG.debug("using_encryption_key_from_file")
-        return key_file.read_bytes()
+    with _keyring_lock:
+        if key_file.exists():
+            LOG.debug("using_encryption_key_from_file")
+            return key_file.read_bytes()
 
-    # Generate new key and save it with secure permissions from creation
-    key = Fernet.generate_key()
-    fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
-    with os.fdopen(fd, "wb") as f:
-        f.write(key)
-    LOG.info("generated_new_session_encryption_key")
-    return key
+        # Generate new key and save it with secure permissions from creation
+        key = Fernet.generate_key()
+        try:
+            fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            # Another process created the key first; use theirs.
+            LOG.debug("encryption_key_file_created_concurrently")
+            return key_file.read_bytes()
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+        LOG.info("generated_new_session_encryption_key")
+        return key
 
 
 def _get_key_from_supabase_vault() -> bytes:
@@ -101,7 +384,7 @@ def _get_key_from_supabase_vault() -> bytes:
     defaulting to "session-encryption-key".
 
     Returns:
-        Fernet-compatible key bytes.
+        Secret value: one Fernet key per line, current key first.
 
     Raises:
         EncryptionError: If Vault fetch fails or key is invalid.
@@ -167,7 +450,7 @@ def _get_key_from_supabase_vault() -> bytes:
         if not secret_value:
             raise EncryptionError(f"Empty encryption key returned from Vault for '{vault_name}'")
 
-        # Validate it's a valid Fernet key (base64-encoded 32 bytes)
+        # Validate every line is a valid Fernet key (base64-encoded 32 bytes)
         key: bytes
         if isinstance(secret_value, str):
             key = secret_value.encode()
@@ -179,11 +462,10 @@ def _get_key_from_supabase_vault() -> bytes:
             )
 
         try:
-            Fernet(key)  # Validate key format
-        except (ValueError, TypeError, binascii.Error) as e:
+            _split_keys(key)
+        except EncryptionError as e:
             raise EncryptionError(
                 f"Invalid encryption key in Vault '{vault_name}': {e}. "
-                "Key must be a valid Fernet key (base64-encoded 32 bytes). "
                 "Generate with: python -c "
                 "'from cryptography.fernet import Fernet; "
                 "print(Fernet.generate_key().decode())'"
@@ -199,30 +481,260 @@ def _get_key_from_supabase_vault() -> bytes:
 
 
 def reset_encryption_key_cache() -> None:
-    """Reset the encryption key cache.
+    """Reset the cached keyring and the ciphers derived from it.
 
     Useful for testing or when rotating keys.
     """
-    global _encryption_key_cache
-    _encryption_key_cache = None
+    global _keyring_cache
+    with _keyring_lock:
+        _keyring_cache = None
+    _fernet.cache_clear()
+    _multi_fernet.cache_clear()
+    _master_key.cache_clear()
+    _aead.cache_clear()
+
 
+@lru_cache(maxsize=8)
+def _fernet(key: bytes) -> Fernet:
+    return Fernet(key)
 
-def encrypt_data(data: bytes) -> bytes:
-    """Encrypt data using Fernet symmetric encryption.
+
+@lru_cache(maxsize=4)
+def _multi_fernet(keys: tuple[bytes, ...]) -> MultiFernet:
+    return MultiFernet([_fernet(key) for key in keys])
+
+
+@lru_cache(maxsize=8)
+def _master_key(key: bytes) -> bytes:
+    """Decode (once per key) the raw bytes of a Fernet-format key."""
+    try:
+        master = base64.urlsafe_b64decode(key)
+    except (ValueError, binascii.Error) as exc:
+        raise EncryptionError(f"Invalid encryption key: {exc}") from exc
+    if len(master) != 32:
+        raise EncryptionError("Invalid encryption key: expected a Fernet key (32 bytes)")
+    return master
+
+
+def _derive_key(key: bytes, algorithm: int, salt: bytes | None) -> bytes:
+    """Derive the cipher key for ``algorithm``; ``salt`` is None for pre-v3 envelopes."""
+    try:
+        label, _ = _ALGORITHMS[algorithm]
+    except KeyError:
+        raise EncryptionError(f"Unsupported encryption algorithm id {algorithm}") from None
+    info = b"graftpunk-envelope-v1:" if salt is None else b"graftpunk-envelope-v3:"
+    return HKDF(algorithm=hashes.SHA256(), length=32, salt=salt, info=info + label).derive(
+        _master_key(key)
+    )
+
+
+@lru_cache(maxsize=8)
+def _aead(key: bytes, algorithm: int) -> AESGCM | ChaCha20Poly1305:
+    """Derive (once per key) the cipher shared by version 1 and 2 envelopes."""
+    derived = _derive_key(key, algorithm, None)
+    return _ALGORITHMS[algorithm][1](derived)
+
+
+def _nonce(prefix: bytes, counter: int, last: bool) -> bytes:
+    if counter >= _MAX_CHUNKS:
+        raise EncryptionError("Payload too large for a single envelope")
+    return prefix + struct.pack(">IB", counter, 1 if last else 0)
+
+
+def _split(data: bytes, size: int) -> Iterator[tuple[bytes, bool]]:
+    """Yield ``(chunk, is_last)``; empty input yields one empty final chunk."""
+    count = max(1, -(-len(data) // size))
+    for index in range(count):
+        yield data[index * size : (index + 1) * size], index == count - 1
+
+
+def _read_exact(src: BinaryIO, size: int) -> bytes:
+    buffer = bytearray()
+    while len(buffer) < size:
+        block = src.read(size - len(buffer))
+        if not block:
+            break
+        buffer += block
+    return bytes(buffer)
+
+
+def _read_chunks(src: BinaryIO, size: int) -> Iterator[tuple[bytes, bool]]:
+    """Stream ``(chunk, is_last)`` pairs, reading one chunk ahead."""
+    chunk = _read_exact(src, size)
+    while True:
+        following = _read_exact(src, size)
+        if not following:
+            yield chunk, True
+            return
+        yield chunk, False
+        chunk = following
+
+
+@dataclass(frozen=True)
+class _EnvelopeHeader:
+    raw: bytes
+    algorithm: int
+    chunk_size: int
+    prefix: bytes
+    key_id: bytes | None  # None for version 1 envelopes
+    salt: bytes | None  # None for version 1 and 2 envelopes
+
+
+def _cipher(key: bytes, header: _EnvelopeHeader) -> AESGCM | ChaCha20Poly1305:
+    """Return the cipher that seals or opens the envelope described by ``header``."""
+    if header.salt is None:
+        return _aead(key, header.algorithm)
+    derived = _derive_key(key, header.algorithm, header.salt)
+    return _ALGORITHMS[header.algorithm][1](derived)
+
+
+def _new_header(key: bytes, algorithm: int, chunk_size: int) -> _EnvelopeHeader:
+    if algorithm not in _ALGORITHMS:
+        raise EncryptionError(f"Unsupported encryption algorithm id {algorithm}")
+    if not 0 < chunk_size <= _MAX_CHUNK_SIZE:
+        raise EncryptionError(f"Chunk size must be between 1 and {_MAX_CHUNK_SIZE} bytes")
+    prefix = os.urandom(_NONCE_PREFIX_SIZE)
+    salt = os.urandom(_SALT_SIZE)
+    kid = key_id(key)
+    raw = _HEADER.pack(ENVELOPE_MAGIC, ENVELOPE_VERSION, algorithm, chunk_size, prefix, kid, salt)
+    return _EnvelopeHeader(raw, algorithm, chunk_size, prefix, kid, salt)
+
+
+def _header_size(lead: bytes) -> int:
+    """Return the full header size given at least the magic and version bytes."""
+    if lead[: len(ENVELOPE_MAGIC)] != ENVELOPE_MAGIC:
+        raise EncryptionError("Decryption failed: not an encrypted graftpunk envelope")
+    if len(lead) <= len(ENVELOPE_MAGIC):
+        raise EncryptionError("Decryption failed: truncated envelope header")
+    version = lead[len(ENVELOPE_MAGIC)]
+    if version not in _HEADER_SIZES:
+        raise EncryptionError(
+            f"Unsupported envelope version {version}; upgrade graftpunk to read this data"
+        )
+    return _HEADER_SIZES[version]
+
+
+def _parse_header(raw: bytes) -> _EnvelopeHeader:
+    """Validate a complete envelope header."""
+    if len(raw) != _header_size(raw):
+        raise EncryptionError("Decryption failed: truncated envelope header")
+    version = raw[len(ENVELOPE_MAGIC)]
+    kid = salt = None
+    if version == 1:
+        _, _, algorithm, chunk_size, prefix = _HEADER_V1.unpack(raw)
+    elif version == 2:
+        _, _, algorithm, chunk_size, prefix, kid = _HEADER_V2.unpack(raw)
+    else:
+        _, _, algorithm, chunk_size, prefix, kid, salt = _HEADER.unpack(raw)
+    if algorithm not in _ALGORITHMS or not 0 < chunk_size <= _MAX_CHUNK_SIZE:
+        raise EncryptionError("Decryption failed: corrupt envelope header")
+    return _EnvelopeHeader(raw, algorithm, chunk_size, prefix, kid, salt)
+
+
+def _candidate_keys(header: _EnvelopeHeader) -> list[bytes]:
+    """Keys that may have sealed the envelope, most likely first.
+
+    An unknown key id triggers one keyring refresh, so a key rotated in by
+    another process is picked up before the TTL expires.
+    """
+    keyring = get_keyring()
+    if header.key_id is None:
+        return list(keyring.keys)
+    key = keyring.find(header.key_id)
+    if key is None:
+        key = get_keyring(refresh=True).find(header.key_id)
+    if key is None:
+        raise EncryptionError(
+            f"Decryption failed: encrypted with unknown key {header.key_id.hex()}. "
+            "The key may have been removed from the key file or Vault secret."
+        )
+    return [key]
+
+
+def _seal(
+    key: bytes, header: _EnvelopeHeader, chunks: Iterable[tuple[bytes, bool]]
+) -> Iterator[bytes]:
+    aead = _cipher(key, header)
+    for counter, (chunk, last) in enumerate(chunks):
+        yield aead.encrypt(_nonce(header.prefix, counter, last), chunk, header.raw)
+
+
+def _open(header: _EnvelopeHeader, chunks: Iterable[tuple[bytes, bool]]) -> Iterator[bytes]:
+    candidates = [_cipher(key, header) for key in _candidate_keys(header)]
+    try:
+        for counter, (chunk, last) in enumerate(chunks):
+            nonce = _nonce(header.prefix, counter, last)
+            if counter == 0:
+                # Only version 1 envelopes have several candidates: pick the
+                # key that authenticates the first chunk.
+                for aead in candidates:
+                    try:
+                        plaintext = aead.decrypt(nonce, chunk, header.raw)
+                    except InvalidTag:
+                        continue
+                    candidates = [aead]
+                    yield plaintext
+                    break
+                else:
+                    raise InvalidTag
+                continue
+            yield candidates[0].decrypt(nonce, chunk, header.raw)
+    except InvalidTag as exc:
+        raise EncryptionError(
+            "Decryption failed. The session file may be corrupted "
+            "or the encryption key has changed."
+        ) from exc
+
+
+def is_envelope(data: bytes) -> bool:
+    """Return True if ``data`` is an envelope (as opposed to a legacy Fernet token)."""
+    return data[: len(ENVELOPE_MAGIC)] == ENVELOPE_MAGIC
+
+
+def needs_rekey(data: bytes) -> bool:
+    """Return True unless ``data`` is a current-version envelope sealed with the current key.
+
+    Fernet tokens, version 1 and 2 envelopes and envelopes sealed with an
+    older key all need re-encrypting.
+    """
+    if not is_envelope(data):
+        return True
+    try:
+        header = _parse_header(data[: _header_size(data)])
+    except EncryptionError:
+        return True
+    return header.salt is None or header.key_id != key_id(get_encryption_key())
+
+
+def encrypt_data(
+    data: bytes,
+    *,
+    algorithm: int = ALGORITHM_AES_256_GCM,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> bytes:
+    """Encrypt data with the current key into a chunked AEAD envelope.
 
     Args:
         data: Raw bytes to encrypt.
+        algorithm: ``ALGORITHM_AES_256_GCM`` or ``ALGORITHM_CHACHA20_POLY1305``.
+        chunk_size: Plaintext bytes per chunk.
 
     Returns:
         Encrypted bytes.
+
+    Raises:
+        EncryptionError: If the algorithm, chunk size or key is invalid.
     """
     key = get_encryption_key()
-    fernet = Fernet(key)
-    return fernet.encrypt(data)
+    header = _new_header(key, algorithm, chunk_size)
+    return header.raw + b"".join(_seal(key, header, _split(data, chunk_size)))
 
 
 def decrypt_data(data: bytes) -> bytes:
-    """Decrypt data using Fernet symmetric encryption.
+    """Decrypt an envelope, or a Fernet token written by an earlier release.
+
+    Any key in the keyring is accepted, so data sealed before a rotation
+    stays readable.
 
     Args:
         data: Encrypted bytes.
@@ -233,14 +745,75 @@ def decrypt_data(data: bytes) -> bytes:
     Raises:
         EncryptionError: If decryption fails (wrong key or corrupted data).
     """
-    from cryptography.fernet import InvalidToken
+    if not is_envelope(data):
+        return _decrypt_fernet(data)
+    header = _parse_header(data[: _header_size(data)])
+    body = data[len(header.raw) :]
+    return b"".join(_open(header, _split(body, header.chunk_size + _TAG_SIZE)))
 
-    key = get_encryption_key()
-    fernet = Fernet(key)
+
+def _decrypt_fernet(data: bytes) -> bytes:
     try:
-        return fernet.decrypt(data)
-    except InvalidToken as exc:
+        return _multi_fernet(get_keyring().keys).decrypt(data)
+    except (InvalidToken, ValueError, binascii.Error) as exc:
         raise EncryptionError(
             "Decryption failed. The session file may be corrupted "
             "or the encryption key has changed."
         ) from exc
+
+
+def encrypt_stream(
+    src: BinaryIO,
+    dst: BinaryIO,
+    *,
+    algorithm: int = ALGORITHM_AES_256_GCM,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Encrypt everything readable from ``src`` into ``dst``.
+
+    Only about two chunks are held in memory at a time.
+
+    Args:
+        src: Binary stream of plaintext.
+        dst: Binary stream receiving the envelope.
+        algorithm: ``ALGORITHM_AES_256_GCM`` or ``ALGORITHM_CHACHA20_POLY1305``.
+        chunk_size: Plaintext bytes per chunk.
+
+    Returns:
+        Number of bytes written to ``dst``.
+    """
+    key = get_encryption_key()
+    header = _new_header(key, algorithm, chunk_size)
+    dst.write(header.raw)
+    written = len(header.raw)
+    for sealed in _seal(key, header, _read_chunks(src, chunk_size)):
+        dst.write(sealed)
+        written += len(sealed)
+    return written
+
+
+def decrypt_stream(src: BinaryIO, dst: BinaryIO) -> int:
+    """Decrypt an envelope read from ``src`` into ``dst``.
+
+    Each chunk is authenticated before it is written, but a truncated or
+    tampered stream is only detected when the bad chunk is reached: on
+    EncryptionError, discard whatever was already written to ``dst``.
+
+    Args:
+        src: Binary stream positioned at the start of an envelope.
+        dst: Binary stream receiving the plaintext.
+
+    Returns:
+        Number of plaintext bytes written.
+
+    Raises:
+        EncryptionError: If the envelope is malformed, truncated or was
+            encrypted with a key that is not in the keyring.
+    """
+    lead = _read_exact(src, len(ENVELOPE_MAGIC) + 1)
+    header = _parse_header(lead + _read_exact(src, _header_size(lead) - len(lead)))
+    written = 0
+    for chunk in _open(header, _read_chunks(src, header.chunk_size + _TAG_SIZE)):
+        dst.write(chunk)
+        written += len(chunk)
+    return written
@@ -0,0 +1,171 @@
+"""A persistent event loop for running coroutines from synchronous code.
+
+Sync callers (the CLI, ``GraftpunkClient.execute``) that get a coroutine
+back from an async command handler hand it to :func:`run_coroutine` instead
+of ``asyncio.run``. The coroutine runs on one long-lived loop in a daemon
+thread, so:
+
+- no loop is created and torn down per call;
+- sync code that is itself running inside an event loop (a notebook, an
+  async web app) can still run async handlers;
+- loop-bound objects an async plugin keeps between commands (an
+  ``httpx.AsyncClient``, an ``AsyncGraftpunkSession``) stay usable, because
+  every command runs on the same loop.
+
+The caller's context variables (e.g. the attempt deadline set by
+:func:`graftpunk.retry.attempt_deadline`) are visible to the coroutine.
+Async callers should ``await`` instead (``GraftpunkClient.aexecute``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import threading
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+from graftpunk.logging import get_logger
+
+LOG = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Seconds close() waits for pending callbacks before giving up on the thread.
+SHUTDOWN_TIMEOUT = 5.0
+
+
+class LoopRunner:
+    """An event loop running forever in a daemon thread.
+
+    The loop and its thread start on first use. The runner is safe to use
+    from several threads; their coroutines run concurrently on the loop.
+    """
+
+    def __init__(self, name: str = "graftpunk-event-loop") -> None:
+        """Initialize a runner without starting it.
+
+        Args:
+            name: Name of the loop's thread.
+        """
+        self.name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Whether the loop thread has been started and not closed."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The runner's loop, started if necessary."""
+        loop = self._loop
+        if loop is not None and self.running:
+            return loop
+        with self._lock:
+            if self._loop is None or not self.running:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                thread = threading.Thread(
+                    target=self._run_forever, args=(loop, ready), name=self.name, daemon=True
+                )
+                thread.start()
+                ready.wait()
+                self._loop, self._thread = loop, thread
+                LOG.debug("event_loop_started", thread=self.name)
+            return self._loop
+
+    @staticmethod
+    def _run_forever(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            try:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+                loop.run_until_complete(loop.shutdown_default_executor())
+            finally:
+                loop.close()
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine on the loop and wait for its result.
+
+        If the calling thread is interrupted (e.g. ``KeyboardInterrupt``),
+        the coroutine is cancelled.
+
+        Args:
+            coro: The coroutine to run.
+
+        Returns:
+            The coroutine's result.
+
+        Raises:
+            RuntimeError: If called from a coroutine running on this loop,
+                which would deadlock; ``await`` the coroutine instead.
+            Exception: Whatever the coroutine raises.
+        """
+        if self._thread is threading.current_thread():
+            coro.close()
+            raise RuntimeError(
+                "LoopRunner.run() cannot be called from its own event loop; await the coroutine"
+            )
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result()
+        except BaseException:
+            future.cancel()
+            raise
+
+    def close(self) -> None:
+        """Stop the loop and join its thread.
+
+        Coroutines still running are abandoned. The runner starts a new loop
+        if it is used again.
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None or not thread.is_alive():
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not threading.current_thread():
+            thread.join(SHUTDOWN_TIMEOUT)
+
+
+_runner: LoopRunner | None = None
+_runner_lock = threading.Lock()
+
+
+def get_loop_runner() -> LoopRunner:
+    """Return the process-wide loop runner."""
+    global _runner
+    runner = _runner
+    if runner is not None:
+        return runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = LoopRunner()
+        return _runner
+
+
+def run_coroutine(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on the process-wide loop and wait for its result.
+
+    See :meth:`LoopRunner.run`.
+    """
+    return get_loop_runner().run(coro)
+
+
+def shutdown_loop_runner() -> None:
+    """Stop the process-wide loop (at exit, and for testing)."""
+    global _runner
+    with _runner_lock:
+        runner, _runner = _runner, None
+    if runner is not None:
+        runner.close()
+
+
+atexit.register(shutdown_loop_runner)
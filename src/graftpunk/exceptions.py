@@ -25,6 +25,10 @@ class EncryptionError(GraftpunkError):
     """Raised when encryption or decryption operations fail."""
 
 
+class SessionFormatError(GraftpunkError):
+    """Raised when stored session data cannot be encoded or decoded."""
+
+
 class StorageError(GraftpunkError):
     """Raised when a storage backend operation fails."""
 
@@ -49,6 +53,14 @@ class CommandError(PluginError):
         super().__init__(user_message)
 
 
+class CommandTimeoutError(CommandError, TimeoutError):
+    """Raised when a command runs past its ``deadline``.
+
+    A ``CommandError`` so the CLI reports it without a traceback, and a
+    ``TimeoutError`` so generic timeout handling catches it.
+    """
+
+
 class KeepaliveError(GraftpunkError):
     """Raised when a keepalive operation fails."""
 
@@ -9,12 +9,27 @@
 
 from __future__ import annotations
 
-from typing import Any, Final
+import copy
+import functools
+import threading
+from collections.abc import Iterator, Mapping
+from http.cookiejar import Cookie
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Final
 
 import requests
+import requests.cookies
+from requests.structures import CaseInsensitiveDict
+from requests.utils import to_native_string
 
 from graftpunk.logging import get_logger
-from graftpunk.tokens import _CSRF_TOKENS_ATTR
+from graftpunk.response_cache import current_cache_ttl, get_response_cache
+from graftpunk.retry import clamp_timeout
+from graftpunk.tokens import _CACHE_ATTR, _CSRF_TOKENS_ATTR
+
+if TYPE_CHECKING:
+    from graftpunk.response_cache import ResponseCache
+    from graftpunk.transport import TransportConfig
 
 LOG = get_logger(__name__)
 
@@ -31,6 +46,9 @@ _BROWSER_IDENTITY_HEADERS: Final[frozenset[str]] = frozenset(
         "Accept-Encoding",
     }
 )
+_BROWSER_IDENTITY_LOWER: Final[frozenset[str]] = frozenset(
+    h.lower() for h in _BROWSER_IDENTITY_HEADERS
+)
 
 # HTTP methods that trigger CSRF token injection.  Browsers only enforce
 # CSRF protection for state-changing operations; read-only methods (GET,
@@ -51,6 +69,10 @@ _CANONICAL_HTML_ACCEPT: Final[str] = (
 
 _ROLE_REGISTRY: dict[str, dict[str, str]] = {}
 
+# Bumped by register_role() so sessions can tell their cached role tables
+# (which may include registered fallbacks) are stale.
+_registry_version = 0
+
 
 def register_role(name: str, headers: dict[str, str]) -> None:
     """Register a header role (built-in or plugin-defined).
@@ -74,9 +96,11 @@ def register_role(name: str, headers: dict[str, str]) -> None:
         raise ValueError("Role name must be a non-empty string")
     if not headers:
         raise ValueError(f"Role '{name}' must have at least one header")
+    global _registry_version
     if name in _ROLE_REGISTRY:
         LOG.warning("role_overwritten", role=name)
     _ROLE_REGISTRY[name] = dict(headers)
+    _registry_version += 1
 
 
 def list_roles() -> list[str]:
@@ -147,37 +171,203 @@ def _case_insensitive_get(mapping: dict[str, str], key: str) -> str | None:
     return next((v for k, v in mapping.items() if k.lower() == lower_key), None)
 
 
-class GraftpunkSession(requests.Session):
-    """A requests.Session that auto-applies captured browser header roles.
+def _detect_request_role(
+    method: str,
+    caller_accept: str,
+    *,
+    has_json: bool,
+    has_data: bool,
+) -> str:
+    """Pick the header role a browser would use for a request.
 
-    Header roles are dicts of real browser headers captured during login,
-    classified into roles: "navigation", "xhr", "form". This session
-    auto-detects which role to apply based on request characteristics,
-    or allows explicit override.
+    Shared by the requests-based and httpx-based sessions, which describe
+    the request being built differently.
 
-    Role headers are applied as defaults — any headers explicitly passed
-    by the caller take precedence and are not overwritten.
+    Args:
+        method: HTTP method.
+        caller_accept: ``Accept`` header supplied by the caller, or ``""``.
+        has_json: Whether the body is a JSON payload.
+        has_data: Whether the body is form data or a raw string.
+
+    Returns:
+        Role name ("navigation", "xhr", or "form").
     """
+    method = method.upper()
 
-    def __init__(
-        self,
-        header_roles: dict[str, dict[str, str]] | None = None,
-        *,
-        base_url: str = "",
-        **kwargs: Any,
+    # Non-GET/POST methods are always XHR — browsers have no mechanism
+    # to issue DELETE/PUT/PATCH/HEAD/OPTIONS as navigation requests.
+    # HTML forms only support GET and POST (HTML spec §4.10.18.6).
+    if method not in ("GET", "POST"):
+        return "xhr"
+
+    # Explicit Accept: application/json in caller headers
+    if "application/json" in caller_accept:
+        return "xhr"
+
+    # POST with json= → xhr
+    if method == "POST" and has_json:
+        return "xhr"
+
+    # POST with data= (string or dict) → form
+    if method == "POST" and has_data:
+        return "form"
+
+    # Default: navigation (GET without Accept: application/json)
+    return "navigation"
+
+
+CookieKey = tuple[str, str, str]
+"""A cookie's identity in a jar: ``(domain, path, name)``."""
+
+
+def _cookie_key(cookie: Cookie) -> CookieKey:
+    return (cookie.domain, cookie.path, cookie.name)
+
+
+class TrackingCookieJar(requests.cookies.RequestsCookieJar):
+    """A RequestsCookieJar that records which cookies changed.
+
+    Every cookie set (by a response, a redirect, or the caller) and every
+    cookie cleared is recorded by ``(domain, path, name)`` until
+    :meth:`mark_clean` is called. Re-setting a cookie to an identical value
+    is not a change, so servers that echo cookies on every response do not
+    make a session look dirty.
+
+    The jar is safe to share between threads: writes, change tracking and
+    iteration all hold the cookie jar's own lock (``http.cookiejar`` already
+    takes it when adding and extracting cookies), and iteration walks a
+    snapshot, so preparing a request never sees the jar change size under
+    it.
+    """
+
+    def __init__(self, policy: Any = None) -> None:
+        super().__init__(policy)
+        self._gp_changed: set[CookieKey] = set()
+        self._gp_removed: set[CookieKey] = set()
+
+    def __iter__(self) -> Iterator[Cookie]:
+        with self._cookies_lock:
+            return iter(list(super().__iter__()))
+
+    def set_cookie(self, cookie: Cookie, *args: Any, **kwargs: Any) -> None:
+        key = _cookie_key(cookie)
+        with self._cookies_lock:
+            existing = next((c for c in self if _cookie_key(c) == key), None)
+            if existing is None or (existing.value, existing.expires, existing.secure) != (
+                cookie.value,
+                cookie.expires,
+                cookie.secure,
+            ):
+                self._gp_changed.add(key)
+                self._gp_removed.discard(key)
+            super().set_cookie(cookie, *args, **kwargs)
+
+    def clear(
+        self, domain: str | None = None, path: str | None = None, name: str | None = None
     ) -> None:
-        """Initialize a GraftpunkSession.
+        with self._cookies_lock:
+            for cookie in list(self):
+                key = _cookie_key(cookie)
+                if (
+                    (domain is None or key[0] == domain)
+                    and (path is None or key[1] == path)
+                    and (name is None or key[2] == name)
+                ):
+                    self._gp_removed.add(key)
+                    self._gp_changed.discard(key)
+            super().clear(domain, path, name)
+
+    @property
+    def has_changes(self) -> bool:
+        """Whether any cookie was set or cleared since :meth:`mark_clean`."""
+        with self._cookies_lock:
+            return bool(self._gp_changed or self._gp_removed)
+
+    def changes(self) -> tuple[list[Cookie], list[CookieKey]]:
+        """Return the cookie delta since the last :meth:`mark_clean`.
 
-        Args:
-            header_roles: Dict mapping role names to header dicts.
-                Roles: "navigation", "xhr", "form", or any custom name.
-            base_url: Base URL for constructing Referer headers from paths.
-            **kwargs: Additional arguments passed to requests.Session.
+        Returns:
+            Tuple of ``(updated, removed)``: cookies added or changed, and
+            the ``(domain, path, name)`` keys of cookies that were cleared.
         """
-        super().__init__(**kwargs)
-        self._gp_header_roles: dict[str, dict[str, str]] = (
-            dict(header_roles) if header_roles else {}
-        )
+        with self._cookies_lock:
+            updated = [cookie for cookie in self if _cookie_key(cookie) in self._gp_changed]
+            return updated, sorted(self._gp_removed)
+
+    def mark_clean(self) -> None:
+        """Forget recorded changes; the current contents become the baseline."""
+        with self._cookies_lock:
+            self._gp_changed.clear()
+            self._gp_removed.clear()
+
+
+class _VersionedHeaders(CaseInsensitiveDict):  # type: ignore[type-arg]
+    """Session headers that count their own mutations.
+
+    Lets GraftpunkSession key its cached role tables on the header state
+    without comparing the headers on every request.
+
+    Writes are copy-on-write under a lock: each one swaps in a new backing
+    dict, so a thread merging the headers into a request keeps iterating
+    the snapshot it started with instead of failing with "dictionary
+    changed size during iteration".
+    """
+
+    def __init__(self, data: Any = None, **kwargs: Any) -> None:
+        self.version = 0
+        self._lock = threading.Lock()
+        super().__init__(data, **kwargs)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        with self._lock:
+            store = self._store.copy()
+            store[key.lower()] = (key, value)
+            self._store = store
+            self.version += 1
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            store = self._store.copy()
+            del store[key.lower()]
+            self._store = store
+            self.version += 1
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+RoleTable = Mapping[str, str]
+"""A read-only header table computed for one role."""
+
+
+class _HeaderRoleMixin:
+    """Header-role state and logic shared by the sync and async sessions.
+
+    Expects the host class to provide a mutable, case-insensitive
+    ``headers`` mapping (``requests`` and ``httpx`` sessions both do) and to
+    call :meth:`_init_header_roles` once its own headers are set up.
+    """
+
+    headers: Any
+
+    def _init_header_roles(
+        self, header_roles: dict[str, dict[str, str]] | None, base_url: str
+    ) -> None:
+        self._gp_header_roles: dict[str, dict[str, str]] = {
+            name: dict(headers) for name, headers in (header_roles or {}).items()
+        }
+        # Role tables are computed once per role and reused until the roles,
+        # the role registry or (for the merge layer) the session headers
+        # change. Entries are (cache key, table) pairs.
+        self._gp_roles_version = 0
+        self._gp_role_layers: dict[str, tuple[tuple[Any, ...], RoleTable | None]] = {}
+        self._gp_request_type_headers: dict[str, tuple[tuple[int, int], RoleTable]] = {}
         self._gp_csrf_tokens: dict[str, str] = {}
         self.gp_default_role: str | None = None
         self.gp_base_url: str = base_url
@@ -186,8 +376,11 @@ class GraftpunkSession(requests.Session):
         # as defaults rather than user-set overrides.
         self._apply_browser_identity()
         # Snapshot the default session headers so we can distinguish
-        # user-modified headers from requests library defaults.
-        self._gp_default_session_headers: dict[str, str] = dict(self.headers)
+        # user-modified headers from HTTP library defaults. Case-insensitive,
+        # like the headers themselves (httpx reports names in lower case).
+        self._gp_default_session_headers: CaseInsensitiveDict[str] = CaseInsensitiveDict(
+            self.headers
+        )
 
     def headers_for(self, role: str) -> dict[str, str]:
         """Get the header dict for a specific role.
@@ -202,7 +395,10 @@ class GraftpunkSession(requests.Session):
 
     def clear_header_roles(self) -> None:
         """Remove all captured header roles from this session."""
-        self._gp_header_roles.clear()
+        # Roles are replaced, never mutated in place, so a request being
+        # prepared on another thread sees either the old or the new set.
+        self._gp_header_roles = {}
+        self._gp_roles_version += 1
 
     def merge_header_roles(self, roles: dict[str, dict[str, str]]) -> None:
         """Merge additional header roles into this session.
@@ -210,7 +406,11 @@ class GraftpunkSession(requests.Session):
         Args:
             roles: Dict mapping role names to header dicts.
         """
-        self._gp_header_roles.update(roles)
+        self._gp_header_roles = {
+            **self._gp_header_roles,
+            **{name: dict(headers) for name, headers in roles.items()},
+        }
+        self._gp_roles_version += 1
 
     def _resolve_referer(self, referer: str) -> str:
         """Resolve a Referer value from a path or full URL.
@@ -285,15 +485,55 @@ class GraftpunkSession(requests.Session):
 
         Returns:
             Dict of request-type headers, or empty dict if role unknown.
+            The dict is a fresh copy the caller may modify.
         """
-        headers = self._resolve_role(role_name)
-        if headers is None:
-            return {}
+        key = (self._gp_roles_version, _registry_version)
+        cached = self._gp_request_type_headers.get(role_name)
+        if cached is None or cached[0] != key:
+            headers = self._resolve_role(role_name) or {}
+            # Strip identity headers — they're session-level defaults.
+            # Case-insensitive filter handles mixed-case CDP headers.
+            table: RoleTable = MappingProxyType(
+                {k: v for k, v in headers.items() if k.lower() not in _BROWSER_IDENTITY_LOWER}
+            )
+            cached = (key, table)
+            self._gp_request_type_headers[role_name] = cached
+        return dict(cached[1])
+
+    def _headers_version(self) -> int | None:
+        """A counter that changes whenever ``self.headers`` does, if tracked."""
+        return None
 
-        # Strip identity headers — they're session-level defaults.
-        # Case-insensitive filter handles mixed-case CDP headers.
-        lower_identity = {h.lower() for h in _BROWSER_IDENTITY_HEADERS}
-        return {k: v for k, v in headers.items() if k.lower() not in lower_identity}
+    def _role_layer(self, role_name: str) -> RoleTable | None:
+        """Role headers to layer over the session headers for one request.
+
+        That is the role's headers minus any header the user explicitly set
+        on the session (those keep their session value). The table is cached
+        while the session headers are tracked (see :meth:`_headers_version`)
+        and nothing it depends on changes.
+
+        Args:
+            role_name: Role name ("navigation", "xhr", "form", or custom).
+
+        Returns:
+            Read-only header table, or None if the role is unknown.
+        """
+        headers_version = self._headers_version()
+        key = (headers_version, self._gp_roles_version, _registry_version)
+        if headers_version is not None:
+            cached = self._gp_role_layers.get(role_name)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+
+        headers = self._resolve_role(role_name)
+        layer: RoleTable | None = None
+        if headers is not None:
+            layer = MappingProxyType(
+                {k: v for k, v in headers.items() if not self._is_user_set_header(k)}
+            )
+        if headers_version is not None:
+            self._gp_role_layers[role_name] = (key, layer)
+        return layer
 
     def _apply_browser_identity(self) -> None:
         """Copy browser identity headers from roles onto the session.
@@ -318,6 +558,142 @@ class GraftpunkSession(requests.Session):
                 available=list(self._gp_header_roles.keys()),
             )
 
+    def _is_user_set_header(self, key: str) -> bool:
+        """Check if a session header was explicitly changed by the user.
+
+        Compares the current value against the snapshot taken at init time.
+        If the value differs or the key is new, the user set it.
+
+        Args:
+            key: Header name to check.
+
+        Returns:
+            True if the header differs from its initial value, False otherwise.
+        """
+        current_value = self.headers.get(key)
+        default_value = self._gp_default_session_headers.get(key)
+        return current_value != default_value
+
+    def _csrf_tokens_for(self, method: str) -> dict[str, str]:
+        """CSRF tokens to send with a request, or ``{}`` for read-only methods."""
+        if method.upper() not in _MUTATION_METHODS:
+            return {}
+        # Copied so a token refresh on another thread can't change the dict
+        # while it is being applied.
+        return dict(getattr(self, _CSRF_TOKENS_ATTR, None) or {})
+
+
+class GraftpunkSession(_HeaderRoleMixin, requests.Session):
+    """A requests.Session that auto-applies captured browser header roles.
+
+    Header roles are dicts of real browser headers captured during login,
+    classified into roles: "navigation", "xhr", "form". This session
+    auto-detects which role to apply based on request characteristics,
+    or allows explicit override.
+
+    Role headers are applied as defaults — any headers explicitly passed
+    by the caller take precedence and are not overwritten.
+    """
+
+    def __init__(
+        self,
+        header_roles: dict[str, dict[str, str]] | None = None,
+        *,
+        base_url: str = "",
+        transport: TransportConfig | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize a GraftpunkSession.
+
+        Args:
+            header_roles: Dict mapping role names to header dicts.
+                Roles: "navigation", "xhr", "form", or any custom name.
+            base_url: Base URL for constructing Referer headers from paths.
+            transport: Connection pool and retry settings. None keeps
+                requests' default adapters.
+            **kwargs: Additional arguments passed to requests.Session.
+        """
+        super().__init__(**kwargs)
+        if transport is not None:
+            self.configure_transport(transport)
+        self.cookies: TrackingCookieJar = TrackingCookieJar()
+        self._gp_persisted_tokens: tuple[dict[str, Any], dict[str, str]] = ({}, {})
+        self._gp_cache_partition: str | None = None
+        self._gp_response_cache: ResponseCache | None = None
+        self.gp_cache_ttl: float | None = None
+        self._init_header_roles(header_roles, base_url)
+
+    @property  # type: ignore[override]
+    def headers(self) -> _VersionedHeaders:
+        """Session headers (a case-insensitive dict that tracks changes)."""
+        return self._gp_headers
+
+    @headers.setter
+    def headers(self, value: Mapping[str, Any]) -> None:
+        self._gp_headers = (
+            value if isinstance(value, _VersionedHeaders) else _VersionedHeaders(value)
+        )
+
+    def _headers_version(self) -> int:
+        return self._gp_headers.version
+
+    def _token_state(self) -> tuple[dict[str, Any], dict[str, str]]:
+        return (
+            dict(getattr(self, _CACHE_ATTR, None) or {}),
+            dict(getattr(self, _CSRF_TOKENS_ATTR, None) or {}),
+        )
+
+    def _mark_persisted(self) -> None:
+        """Record the current cookies and token caches as saved."""
+        if isinstance(self.cookies, TrackingCookieJar):
+            self.cookies.mark_clean()
+        self._gp_persisted_tokens = self._token_state()
+
+    def _has_unpersisted_changes(self) -> bool:
+        """Whether cookies or token caches changed since :meth:`_mark_persisted`.
+
+        A cookie jar replaced by the caller cannot be tracked and always
+        counts as changed.
+        """
+        if not isinstance(self.cookies, TrackingCookieJar) or self.cookies.has_changes:
+            return True
+        return self._token_state() != self._gp_persisted_tokens
+
+    def configure_transport(self, transport: TransportConfig) -> None:
+        """Mount connection pool and retry settings on this session.
+
+        Args:
+            transport: Transport settings; replaces the current adapters.
+        """
+        from graftpunk.transport import mount_transport
+
+        mount_transport(self, transport)
+
+    def enable_response_cache(
+        self,
+        partition: str,
+        *,
+        cache: ResponseCache | None = None,
+        ttl: float | None = None,
+    ) -> None:
+        """Let GET/HEAD requests from this session use the response cache.
+
+        Requests are only cached while a freshness lifetime is in effect:
+        the ``cache_ttl`` of the command being run or, outside commands,
+        ``ttl`` (see :mod:`graftpunk.response_cache`).
+
+        Args:
+            partition: Cache partition owned by this session, e.g.
+                ``session_partition(name)``. Never share one between sessions
+                with different credentials.
+            cache: Cache to use. Defaults to the process-wide cache (no
+                caching when ``GRAFTPUNK_RESPONSE_CACHE_SIZE_MB=0``).
+            ttl: Freshness lifetime for requests sent outside a command.
+        """
+        self._gp_cache_partition = partition
+        self._gp_response_cache = cache
+        self.gp_cache_ttl = ttl
+
     def xhr(
         self,
         method: str,
@@ -470,47 +846,14 @@ class GraftpunkSession(requests.Session):
         """
         if self.gp_default_role:
             return self.gp_default_role
-
-        method = (request.method or "GET").upper()
-
-        # Non-GET/POST methods are always XHR — browsers have no mechanism
-        # to issue DELETE/PUT/PATCH/HEAD/OPTIONS as navigation requests.
-        # HTML forms only support GET and POST (HTML spec §4.10.18.6).
-        if method not in ("GET", "POST"):
-            return "xhr"
-
-        # Check for explicit Accept: application/json in caller headers
         caller_headers = request.headers or {}
-        caller_accept = caller_headers.get("Accept", "")
-        if "application/json" in caller_accept:
-            return "xhr"
-
-        # POST with json= → xhr
-        if method == "POST" and request.json is not None:
-            return "xhr"
-
-        # POST with data= (string or dict) → form
-        if method == "POST" and request.data:
-            return "form"
-
-        # Default: navigation (GET without Accept: application/json)
-        return "navigation"
-
-    def _is_user_set_header(self, key: str) -> bool:
-        """Check if a session header was explicitly changed by the user.
-
-        Compares the current value against the snapshot taken at init time.
-        If the value differs or the key is new, the user set it.
-
-        Args:
-            key: Header name to check.
-
-        Returns:
-            True if the header differs from its initial value, False otherwise.
-        """
-        current_value = self.headers.get(key)
-        default_value = self._gp_default_session_headers.get(key)
-        return current_value != default_value
+        return _detect_request_role(
+            request.method or "GET",
+            # Callers may pass bytes; httpx decodes header values for us.
+            to_native_string(caller_headers.get("Accept", "")),
+            has_json=request.json is not None,
+            has_data=bool(request.data),
+        )
 
     def _inject_csrf_tokens(self, prepared: requests.PreparedRequest) -> None:
         """Inject CSRF tokens into a prepared request, mutation methods only.
@@ -525,11 +868,9 @@ class GraftpunkSession(requests.Session):
         Args:
             prepared: The prepared request to conditionally add tokens to.
         """
-        csrf_tokens: dict[str, str] = getattr(self, _CSRF_TOKENS_ATTR, {})
+        csrf_tokens = self._csrf_tokens_for(prepared.method or "GET")
         if not csrf_tokens:
             return
-        if (prepared.method or "GET").upper() not in _MUTATION_METHODS:
-            return
         assert prepared.headers is not None, "PreparedRequest.headers is None after preparation"
         for name, value in csrf_tokens.items():
             prepared.headers.setdefault(name, value)
@@ -538,11 +879,14 @@ class GraftpunkSession(requests.Session):
         """Prepare a request with auto-detected role headers.
 
         Overrides the base implementation to inject header roles based on
-        request characteristics. Role headers are applied as session-level
-        defaults so that any headers explicitly set by the caller take precedence.
+        request characteristics. Role headers rank below the caller's headers
+        and user-set session headers, above the library defaults.
 
-        Session headers are temporarily modified during preparation and restored
-        afterward (even on exception) to avoid permanently altering session state.
+        Priority: request headers (caller-supplied) > user-modified session
+        headers > role > session defaults. The role's table already omits
+        user-modified session headers, so it is layered under the caller's
+        headers on a copy of the request; neither the caller's request nor
+        ``self.headers`` is modified.
 
         CSRF tokens (stored separately by ``tokens.prepare_session``) are injected
         only on mutation methods (POST/PUT/PATCH/DELETE).
@@ -554,35 +898,42 @@ class GraftpunkSession(requests.Session):
         Returns:
             A PreparedRequest with applied role headers (if configured).
         """
-        if not self._gp_header_roles:
-            prepared = super().prepare_request(request, **kwargs)
-        elif role_headers := self._resolve_role(self._detect_role(request)):
-            # Apply role headers as session defaults (lowest priority).
-            # Priority: request headers (caller-supplied) >
-            # user-modified session headers > role > session defaults.
-            original_session_headers = dict(self.headers)
-
-            # Start from role headers as the base
-            merged = dict(role_headers)
-            # Layer session headers on top, but only if user changed them
-            for key, value in original_session_headers.items():
-                if self._is_user_set_header(key):
-                    merged[key] = value
-                elif key not in merged:
-                    # Keep defaults that role doesn't override
-                    merged[key] = value
-
-            self.headers.clear()
-            self.headers.update(merged)
-
-            try:
-                prepared = super().prepare_request(request, **kwargs)
-            finally:
-                # Restore original session headers
-                self.headers.clear()
-                self.headers.update(original_session_headers)
-        else:
-            prepared = super().prepare_request(request, **kwargs)
-
+        if self._gp_header_roles:
+            layer = self._role_layer(self._detect_role(request))
+            if layer:
+                merged: CaseInsensitiveDict[Any] = CaseInsensitiveDict(layer)
+                merged.update(request.headers or {})
+                request = copy.copy(request)
+                request.headers = merged
+
+        prepared = super().prepare_request(request, **kwargs)
         self._inject_csrf_tokens(prepared)
         return prepared
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        """Send a request, bounded by the current command attempt's deadline.
+
+        Inside a command with a ``timeout`` or ``deadline``, a request sent
+        without a timeout gets the time left in the attempt, and a longer
+        timeout is shortened to it (see :func:`graftpunk.retry.request_timeout`).
+
+        With :meth:`enable_response_cache`, GET and HEAD requests sent while
+        a cache TTL is in effect are served from (and stored in) the
+        response cache. Streamed requests always go to the network.
+
+        Args:
+            request: The prepared request.
+            **kwargs: Passed to requests.Session.send().
+
+        Returns:
+            The response.
+        """
+        kwargs["timeout"] = clamp_timeout(kwargs.get("timeout"))
+        partition = self._gp_cache_partition
+        if partition is not None and not kwargs.get("stream"):
+            ttl = current_cache_ttl(self.gp_cache_ttl)
+            cache = self._gp_response_cache or (get_response_cache() if ttl else None)
+            if ttl and cache is not None:
+                send = functools.partial(super().send, **kwargs)
+                return cache.fetch(partition, request, ttl, send)
+        return super().send(request, **kwargs)
@@ -16,6 +16,7 @@ Example plugin registration in pyproject.toml:
 """
 
 import warnings
+from collections.abc import Iterable
 from functools import lru_cache
 from importlib.metadata import entry_points
 from typing import Any
@@ -60,6 +61,7 @@ from graftpunk.plugins.output_config import (
     extract_view_data,
     parse_view_arg,
 )
+from graftpunk.plugins.pagination import PaginationConfig, Paginator, paginate
 from graftpunk.plugins.python_loader import (
     PythonDiscoveryError,
     PythonDiscoveryResult,
@@ -100,6 +102,10 @@ __all__ = [
     "auto_detect_columns",
     "extract_view_data",
     "parse_view_arg",
+    # Pagination
+    "PaginationConfig",
+    "Paginator",
+    "paginate",
     # Export utilities
     "flatten_dict",
     "get_downloads_dir",
@@ -125,6 +131,7 @@ __all__ = [
     "discover_python_plugins",
     # Shared plugin discovery (all sources)
     "discover_all_plugins",
+    "filter_valid_plugins",
     "get_plugin",
 ]
 
@@ -321,6 +328,50 @@ def list_available_plugins() -> dict[str, list[str]]:
     }
 
 
+def filter_valid_plugins(plugins: Iterable[CLIPluginProtocol]) -> tuple[CLIPluginProtocol, ...]:
+    """Drop plugins that cannot be registered.
+
+    Filters out plugins that have config errors, missing site_name,
+    or unsupported api_version, logging why each one was skipped.
+
+    Args:
+        plugins: Plugin instances from any discovery source.
+
+    Returns:
+        Tuple of the valid plugins, in their original order.
+    """
+    valid: list[CLIPluginProtocol] = []
+    for plugin in plugins:
+        config_error = getattr(plugin, "_plugin_config_error", None)
+        if config_error:
+            LOG.warning(
+                "plugin_config_error",
+                plugin=type(plugin).__name__,
+                error=str(config_error),
+            )
+            continue
+
+        if not plugin.site_name:
+            LOG.warning(
+                "plugin_missing_site_name",
+                plugin=type(plugin).__name__,
+            )
+            continue
+
+        if plugin.api_version not in SUPPORTED_API_VERSIONS:
+            LOG.warning(
+                "plugin_unsupported_api_version",
+                plugin=type(plugin).__name__,
+                api_version=plugin.api_version,
+                supported=sorted(SUPPORTED_API_VERSIONS),
+            )
+            continue
+
+        valid.append(plugin)
+
+    return tuple(valid)
+
+
 @lru_cache(maxsize=1)
 def discover_all_plugins() -> tuple[CLIPluginProtocol, ...]:
     """Discover plugins from all sources and return valid ones.
@@ -390,38 +441,9 @@ def discover_all_plugins() -> tuple[CLIPluginProtocol, ...]:
             error=str(exc),
         )
 
-    # Filter out invalid plugins
-    valid: list[CLIPluginProtocol] = []
-    for plugin in all_plugins:
-        config_error = getattr(plugin, "_plugin_config_error", None)
-        if config_error:
-            LOG.warning(
-                "plugin_config_error",
-                plugin=type(plugin).__name__,
-                error=str(config_error),
-            )
-            continue
-
-        if not plugin.site_name:
-            LOG.warning(
-                "plugin_missing_site_name",
-                plugin=type(plugin).__name__,
-            )
-            continue
-
-        if plugin.api_version not in SUPPORTED_API_VERSIONS:
-            LOG.warning(
-                "plugin_unsupported_api_version",
-                plugin=type(plugin).__name__,
-                api_version=plugin.api_version,
-                supported=sorted(SUPPORTED_API_VERSIONS),
-            )
-            continue
-
-        valid.append(plugin)
-
+    valid = filter_valid_plugins(all_plugins)
     LOG.info("all_plugins_discovered", count=len(valid))
-    return tuple(valid)
+    return valid
 
 
 def get_plugin(name: str) -> CLIPluginProtocol:
@@ -52,6 +52,7 @@ if TYPE_CHECKING:
     from graftpunk.plugins.formatters import OutputFormatter
     from graftpunk.plugins.output_config import OutputConfig
     from graftpunk.tokens import TokenConfig
+    from graftpunk.transport import TransportConfig
 
 from graftpunk.cache import load_session_for_api
 from graftpunk.exceptions import PluginError
@@ -277,7 +278,9 @@ class CommandResult:
     Handlers can still return raw data -- this is not required.
 
     Attributes:
-        data: The command response data.
+        data: The command response data. May be an item stream (such as a
+            :class:`~graftpunk.plugins.pagination.Paginator`), which the json
+            and csv formatters write incrementally.
         metadata: Optional metadata dict (pagination, status info, etc.).
         format_hint: Preferred output format (e.g. ``"json"``, ``"table"``).
             Only applies when the user has not explicitly passed ``--format``
@@ -331,7 +334,7 @@ class CommandResult:
 
         from rich.console import Console
 
-        from graftpunk.plugins.formatters import discover_formatters
+        from graftpunk.plugins.formatters import collect_stream, discover_formatters
         from graftpunk.plugins.output_config import parse_view_arg
 
         # Resolve formatters using the 3-level hierarchy
@@ -359,12 +362,13 @@ class CommandResult:
             output_config = output_config.filter_views(names, column_overrides)
 
         output_path = str(output) if output else ""
+        data = collect_stream(self.data, formatter)
 
         # --- Output path given: write to file, return Path ---
         if output_path:
             buf_console = Console(file=io.StringIO(), width=200)
             formatter.format(
-                self.data,
+                data,
                 buf_console,
                 output_config=output_config,
                 output_path=output_path,
@@ -381,7 +385,7 @@ class CommandResult:
             try:
                 buf_console = Console(file=io.StringIO(), width=200)
                 formatter.format(
-                    self.data,
+                    data,
                     buf_console,
                     output_config=output_config,
                     output_path=tmp_path,
@@ -394,7 +398,7 @@ class CommandResult:
         buf = io.StringIO()
         buf_console = Console(file=buf, width=200)
         formatter.format(
-            self.data,
+            data,
             buf_console,
             output_config=output_config,
             output_path="",
@@ -419,6 +423,8 @@ class CommandSpec:
     timeout: float | None = None
     max_retries: int = 0
     rate_limit: float | None = None
+    deadline: float | None = None
+    cache_ttl: float | None = None
     requires_session: bool | None = None
     group: str | None = None
     saves_session: bool = False
@@ -433,6 +439,10 @@ class CommandSpec:
             raise ValueError("timeout must be positive when set")
         if self.rate_limit is not None and self.rate_limit <= 0:
             raise ValueError("rate_limit must be positive when set")
+        if self.deadline is not None and self.deadline <= 0:
+            raise ValueError("deadline must be positive when set")
+        if self.cache_ttl is not None and self.cache_ttl <= 0:
+            raise ValueError("cache_ttl must be positive when set")
         # Defensive copy to prevent external mutation of the kwargs dict
         object.__setattr__(self, "click_kwargs", dict(self.click_kwargs))
 
@@ -558,6 +568,8 @@ class PluginConfig:
     password_envvar: str = ""
     login_config: LoginConfig | None = None
     token_config: TokenConfig | None = None
+    transport_config: TransportConfig | None = None
+    rate_limit: float | None = None
     plugin_version: str = ""
     plugin_author: str = ""
     plugin_url: str = ""
@@ -572,6 +584,12 @@ class PluginConfig:
                 f"api_version {self.api_version} not supported. "
                 f"Supported: {sorted(SUPPORTED_API_VERSIONS)}"
             )
+        if self.rate_limit is not None and (
+            isinstance(self.rate_limit, bool)
+            or not isinstance(self.rate_limit, int | float)
+            or self.rate_limit <= 0
+        ):
+            raise ValueError(f"rate_limit must be a positive number, got {self.rate_limit!r}")
 
 
 def build_plugin_config(**raw: Any) -> PluginConfig:
@@ -820,6 +838,12 @@ class SitePlugin:
     login_config: LoginConfig | None = None
     token_config: TokenConfig | None = None
 
+    # Connection pooling and retries for this plugin's API session
+    transport_config: TransportConfig | None = None
+
+    # Minimum seconds between executions of any of this plugin's commands
+    rate_limit: float | None = None
+
     # Plugin-wide format overrides: keys are format names, values are
     # OutputFormatter instances.  Overrides core formatters for all
     # commands in this plugin.
@@ -1055,7 +1079,7 @@ class SitePlugin:
                 await tab.get(f"{self.base_url}/login")
                 # ... custom login logic ...
         """
-        from graftpunk import BrowserSession, cache_session
+        from graftpunk import BrowserSession, cache_session_async
 
         session = BrowserSession(backend="nodriver", headless=False)
         await session.start_async()
@@ -1069,7 +1093,7 @@ class SitePlugin:
                 session.current_url = f"{self.base_url}/"
             # Success path: transfer cookies and cache
             await session.transfer_nodriver_cookies_to_session()
-            cache_session(session, self.session_name)
+            await cache_session_async(session, self.session_name)
         finally:
             try:
                 session.driver.stop()
@@ -1119,10 +1143,16 @@ class SitePlugin:
         """Load the graftpunk session for API calls.
 
         If requires_session is False, returns a plain requests.Session.
+        Either way the session uses the plugin's ``transport_config``.
         """
         if not self.requires_session:
-            return requests.Session()
-        return load_session_for_api(self.session_name)
+            session = requests.Session()
+            if self.transport_config is not None:
+                from graftpunk.transport import mount_transport
+
+                mount_transport(session, self.transport_config)
+            return session
+        return load_session_for_api(self.session_name, transport=self.transport_config)
 
 
 def has_declarative_login(plugin: CLIPluginProtocol) -> bool:
@@ -3,14 +3,19 @@
 Provides a protocol-based formatter system with entry-point discovery,
 allowing third-party packages to register custom output formatters via
 the ``graftpunk.formatters`` entry-point group.
+
+Commands may return an item stream (a paginated listing or any other
+iterator) instead of a list. Formatters with ``streaming = True`` (json and
+csv) write it item by item; the others receive it collected into a list.
 """
 
 import csv
 import datetime
 import importlib.metadata
 import io
+import itertools
 import json
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
 from pathlib import Path
 from typing import Any, Protocol, runtime_checkable
 
@@ -30,6 +35,7 @@ from graftpunk.plugins.output_config import (
     extract_view_data,
     parse_view_arg,
 )
+from graftpunk.plugins.pagination import Paginator
 
 LOG = get_logger(__name__)
 
@@ -77,6 +83,25 @@ class OutputFormatter(Protocol):
 # Helpers
 # ---------------------------------------------------------------------------
 
+# Rows a streamed CSV samples to choose its columns
+CSV_STREAM_SAMPLE_ROWS = 100
+
+
+def is_item_stream(data: Any) -> bool:
+    """Whether command data is a stream of items rather than a complete value."""
+    return isinstance(data, Paginator | Iterator)
+
+
+def collect_stream(data: Any, formatter: OutputFormatter) -> Any:
+    """Collect an item stream into a list unless the formatter streams it.
+
+    Formatters opt in to item streams with a ``streaming = True``
+    attribute; everything else keeps receiving complete data.
+    """
+    if is_item_stream(data) and not getattr(formatter, "streaming", False):
+        return list(data)
+    return data
+
 
 def _resolve_view_data(data: Any, view: ViewConfig) -> Any | None:
     """Extract and filter data for a single view.
@@ -134,10 +159,15 @@ def _resolve_output_filepath(output_path: str, extension: str) -> Path:
 
 
 class JsonFormatter:
-    """Output as formatted JSON with syntax highlighting."""
+    """Output as formatted JSON with syntax highlighting.
+
+    Item streams are written as a JSON array one item at a time, without
+    highlighting.
+    """
 
     name = "json"
     binary = False
+    streaming = True
 
     def format(
         self,
@@ -146,12 +176,29 @@ class JsonFormatter:
         output_config: OutputConfig | None = None,
         output_path: str = "",
     ) -> None:
+        if is_item_stream(data):
+            if output_path:
+                Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+                with open(output_path, "w", encoding="utf-8") as f:
+                    self._write_stream(data, f.write)
+                return
+            self._write_stream(data, lambda text: console.out(text, end="", highlight=False))
+            return
         json_str = json.dumps(data, indent=2, default=str)
         if output_path:
             _write_to_file(output_path, lambda c: c.print(JSON(json_str)))
             return
         console.print(JSON(json_str))
 
+    @staticmethod
+    def _write_stream(items: Iterable[Any], write: Callable[[str], Any]) -> None:
+        """Write items as an indented JSON array, one item at a time."""
+        separator = "[\n  "
+        for item in items:
+            write(separator + json.dumps(item, indent=2, default=str).replace("\n", "\n  "))
+            separator = ",\n  "
+        write("[]\n" if separator.startswith("[") else "\n]\n")
+
 
 class TableFormatter:
     """Output as a rich table (for lists of dicts or single dicts)."""
@@ -269,10 +316,15 @@ class RawFormatter:
 
 
 class CsvFormatter:
-    """Output as CSV (comma-separated values)."""
+    """Output as CSV (comma-separated values).
+
+    Item streams are written row by row. Their columns come from the first
+    ``CSV_STREAM_SAMPLE_ROWS`` rows; keys first seen later are left out.
+    """
 
     name = "csv"
     binary = False
+    streaming = True
 
     def format(
         self,
@@ -281,6 +333,9 @@ class CsvFormatter:
         output_config: OutputConfig | None = None,
         output_path: str = "",
     ) -> None:
+        if is_item_stream(data):
+            self._format_stream(iter(data), console, output_config, output_path)
+            return
         if isinstance(data, str):
             LOG.debug("csv_format_string_passthrough", length=len(data))
             RawFormatter().format(data, console, output_path=output_path)
@@ -341,12 +396,7 @@ class CsvFormatter:
         writer = csv.writer(buf)
         writer.writerow(headers)
         for row in data:
-            writer.writerow(
-                [
-                    json.dumps(v, default=str) if isinstance(v, (dict, list)) else str(v)
-                    for v in (row.get(h, "") for h in headers)
-                ]
-            )
+            writer.writerow(_csv_cells(row, headers))
         if output_path:
             Path(output_path).parent.mkdir(parents=True, exist_ok=True)
             Path(output_path).write_text(buf.getvalue())
@@ -354,6 +404,67 @@ class CsvFormatter:
             return
         console.print(buf.getvalue(), end="")
 
+    def _format_stream(
+        self,
+        items: Iterator[Any],
+        console: Console,
+        output_config: OutputConfig | None,
+        output_path: str,
+    ) -> None:
+        """Write an item stream as CSV without collecting it."""
+        columns = None
+        if output_config:
+            view = output_config.get_default_view()
+            columns = view.columns if view else None
+
+        sample: list[Any] = []
+        for item in items:
+            sample.append(item)
+            if len(sample) >= CSV_STREAM_SAMPLE_ROWS:
+                break
+        if not all(isinstance(item, dict) for item in sample):
+            LOG.warning("csv_format_unsupported_type", data_type="stream[mixed]", fallback="raw")
+            RawFormatter().format([*sample, *items], console, output_path=output_path)
+            return
+        if not sample:
+            LOG.debug("csv_format_empty_list")
+            return
+
+        headers = ordered_keys(apply_column_filter(sample, columns))
+
+        def write_rows(write: Callable[[str], Any]) -> None:
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            writer.writerow(headers)
+            skipped = 0
+            for index, row in enumerate(itertools.chain(sample, items), start=1):
+                if not isinstance(row, dict):
+                    skipped += 1
+                    continue
+                writer.writerow(_csv_cells(row, headers))
+                if index % CSV_STREAM_SAMPLE_ROWS == 0:
+                    write(buf.getvalue())
+                    buf.seek(0)
+                    buf.truncate()
+            write(buf.getvalue())
+            if skipped:
+                LOG.warning("csv_stream_rows_skipped", count=skipped)
+
+        if output_path:
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            with open(output_path, "w", encoding="utf-8", newline="") as f:
+                write_rows(f.write)
+            gp_console.info(f"Saved: {output_path}")
+            return
+        write_rows(lambda text: console.out(text, end="", highlight=False))
+
+
+def _csv_cells(row: dict[str, Any], headers: list[str]) -> list[str]:
+    return [
+        json.dumps(v, default=str) if isinstance(v, (dict, list)) else str(v)
+        for v in (row.get(h, "") for h in headers)
+    ]
+
 
 class XlsxFormatter:
     """Output as an Excel XLSX file with one worksheet per view."""
@@ -638,4 +749,5 @@ def format_output(
                     column_overrides[name] = cols
             output_config = output_config.filter_views(names, column_overrides)
 
+    data = collect_stream(data, formatter)
     formatter.format(data, console, output_config=output_config, output_path=output_path)
@@ -13,7 +13,7 @@ import time
 import urllib.parse
 from typing import TYPE_CHECKING, Any
 
-from graftpunk import BrowserSession, cache_session
+from graftpunk import BrowserSession, cache_session, cache_session_async
 from graftpunk.exceptions import PluginError
 from graftpunk.logging import get_logger
 
@@ -497,7 +497,7 @@ def _generate_nodriver_login(plugin: SitePlugin) -> Any:
                     error=str(exc),
                 )
 
-            cache_session(session, plugin.session_name)
+            await cache_session_async(session, plugin.session_name)
             return True
 
     return login
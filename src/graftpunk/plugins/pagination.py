@@ -0,0 +1,435 @@
+"""Declarative pagination for plugin commands.
+
+A :class:`PaginationConfig` describes how a listing endpoint pages through
+its results; :func:`paginate` fetches the first page and returns a
+:class:`Paginator` that yields the items of every page:
+
+- ``cursor``: the next cursor is read from each page with the ``next``
+  path and sent back as the ``param`` query parameter. A ``next`` value
+  that is itself a URL (absolute, or starting with ``/``) is followed as is.
+- ``offset``: ``param`` (``offset``) advances by the number of items
+  received.
+- ``page``: ``param`` (``page``) advances by one.
+- ``link``: the ``rel="next"`` URL of the ``Link`` response header is
+  followed.
+
+Offset and page listings end at an empty or short page (when ``page_size``
+is set) or once ``total`` items were received; cursor and link listings end
+when there is no next cursor or link. ``max_pages`` caps every style.
+
+While the caller works through one page, the next one is already being
+fetched in a background thread, so at most two pages are held in memory.
+Pages after the first are usually fetched while the output is written,
+after the command attempt has ended: they keep the command's
+``cache_ttl`` but not its deadline, and each is bounded by ``timeout``
+instead.
+
+YAML commands declare a ``pagination:`` block; Python handlers return
+``paginate(ctx.session, "GET", url, config)``.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import time
+from collections.abc import Iterator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Literal
+from urllib.parse import urljoin
+
+import requests
+
+from graftpunk.exceptions import CommandError
+from graftpunk.logging import get_logger
+from graftpunk.plugins.output_config import extract_view_data
+from graftpunk.response_cache import current_cache_ttl, response_cache_ttl
+from graftpunk.retry import RETRY_BASE_DELAY, decorrelated_jitter, is_transient, request_timeout
+
+LOG = get_logger(__name__)
+
+PaginationStyle = Literal["cursor", "offset", "page", "link"]
+
+PAGINATION_STYLES: tuple[str, ...] = ("cursor", "offset", "page", "link")
+
+# Query parameter and first value for each style, unless configured
+_DEFAULT_PARAMS = {"cursor": "cursor", "offset": "offset", "page": "page"}
+_DEFAULT_START = {"offset": 0, "page": 1}
+
+
+@dataclass(frozen=True)
+class PaginationConfig:
+    """How a listing endpoint pages through its results.
+
+    Attributes:
+        style: ``"cursor"``, ``"offset"``, ``"page"`` or ``"link"``.
+        items: Path (JMESPath or dot notation) to the items in each page.
+            Empty means the page itself is the list of items.
+        next: Path to the next cursor or next-page URL (``cursor`` style).
+        param: Query parameter carrying the cursor, offset or page number.
+            Defaults to the style's name.
+        limit_param: Query parameter carrying the page size, if any.
+        page_size: Items requested per page (sent as ``limit_param``). A
+            page with fewer items ends ``offset`` and ``page`` listings.
+        start: First offset or page number. Defaults to 0 for ``offset``
+            and 1 for ``page``; a value passed for ``param`` by the caller
+            takes precedence.
+        total: Path to the total number of items (``offset``/``page``).
+        max_pages: Stop after this many pages.
+        prefetch: Fetch the next page while the current one is consumed.
+    """
+
+    style: PaginationStyle
+    items: str = ""
+    next: str = ""
+    param: str = ""
+    limit_param: str = ""
+    page_size: int | None = None
+    start: int | None = None
+    total: str = ""
+    max_pages: int | None = None
+    prefetch: bool = True
+
+    def __post_init__(self) -> None:
+        if self.style not in PAGINATION_STYLES:
+            raise ValueError(
+                f"pagination style must be one of {', '.join(PAGINATION_STYLES)}, "
+                f"got {self.style!r}"
+            )
+        if self.style == "cursor" and not self.next:
+            raise ValueError("cursor pagination requires 'next'")
+        for name in ("page_size", "max_pages"):
+            value = getattr(self, name)
+            if value is not None and (
+                isinstance(value, bool) or not isinstance(value, int) or value < 1
+            ):
+                raise ValueError(f"pagination {name} must be a positive integer, got {value!r}")
+        if self.start is not None and (
+            isinstance(self.start, bool) or not isinstance(self.start, int) or self.start < 0
+        ):
+            raise ValueError(f"pagination start must be a non-negative integer, got {self.start!r}")
+        if not self.param and self.style in _DEFAULT_PARAMS:
+            object.__setattr__(self, "param", _DEFAULT_PARAMS[self.style])
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> PaginationConfig:
+        """Build a config from a plain mapping (e.g. a YAML ``pagination:`` block).
+
+        Raises:
+            ValueError: On unknown keys or invalid values.
+        """
+        unknown = sorted(set(data) - set(cls.__dataclass_fields__))
+        if unknown:
+            raise ValueError(f"pagination has unknown key(s): {', '.join(map(str, unknown))}")
+        if "style" not in data:
+            raise ValueError("pagination requires 'style'")
+        return cls(**data)
+
+
+@dataclass(frozen=True)
+class Page:
+    """One fetched page.
+
+    Attributes:
+        number: 1-based page number.
+        url: URL the page was requested from.
+        params: Query parameters sent with the request.
+        data: The decoded JSON body.
+        items: The items extracted from ``data``.
+        next_link: ``rel="next"`` URL from the ``Link`` header, if any.
+    """
+
+    number: int
+    url: str
+    params: dict[str, Any] | None
+    data: Any
+    items: list[Any]
+    next_link: str | None = None
+
+
+@dataclass
+class _Position:
+    """Progress of one walk through the pages."""
+
+    seen: int = 0
+    cursors: set[str] = field(default_factory=set)
+
+
+class Paginator:
+    """The items of a paginated listing, fetched page by page.
+
+    Iterating yields every item of every page. Each iteration starts over
+    from the first page (fetched once, by :func:`paginate`) and requests
+    the following pages again, so the listing can be exported more than
+    once without being held in memory.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        method: str,
+        first: Page,
+        config: PaginationConfig,
+        *,
+        request_kwargs: Mapping[str, Any] | None = None,
+        raise_for_status: bool = True,
+        max_retries: int = 0,
+        timeout: float | None = None,
+    ) -> None:
+        """Initialize a paginator from an already fetched first page.
+
+        Use :func:`paginate` rather than calling this directly.
+
+        Args:
+            session: Session the pages are requested with.
+            method: HTTP method.
+            first: The first page.
+            config: Pagination settings.
+            request_kwargs: Extra ``session.request`` arguments (headers etc.).
+            raise_for_status: Raise ``HTTPError`` for error responses.
+            max_retries: Retries of transient failures for each later page.
+            timeout: Seconds allowed for each later page request.
+
+        Raises:
+            TypeError: If ``request_kwargs`` contains ``timeout``; pass it as
+                ``timeout`` instead.
+        """
+        if request_kwargs and "timeout" in request_kwargs:
+            raise TypeError("pass the page timeout as 'timeout', not in request_kwargs")
+        self.session = session
+        self.method = method
+        self.first = first
+        self.config = config
+        self.request_kwargs = dict(request_kwargs or {})
+        self.raise_for_status = raise_for_status
+        self.max_retries = max_retries
+        self.timeout = timeout
+        # Later pages outlive the command attempt: carry over its cache TTL
+        # only, never its deadline.
+        self._cache_ttl = current_cache_ttl()
+
+    def __repr__(self) -> str:
+        return f"Paginator({self.config.style!r}, {self.first.url!r})"
+
+    def __iter__(self) -> Iterator[Any]:
+        for page in self.pages():
+            yield from page.items
+
+    def pages(self) -> Iterator[Page]:
+        """Yield the pages, prefetching the next one while each is consumed."""
+        page = self.first
+        position = _Position()
+        executor: ThreadPoolExecutor | None = None
+        try:
+            while True:
+                request = self._next_request(page, position)
+                future: Future[Page] | None = None
+                if request is not None and self.config.prefetch:
+                    if executor is None:
+                        executor = ThreadPoolExecutor(
+                            max_workers=1, thread_name_prefix="graftpunk-pagination"
+                        )
+                    future = executor.submit(self._fetch_detached, page.number + 1, *request)
+                yield page
+                if request is None:
+                    return
+                if future is not None:
+                    page = future.result()
+                else:
+                    page = self._fetch_detached(page.number + 1, *request)
+        finally:
+            if executor is not None:
+                # An abandoned prefetch finishes in the background
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _next_request(
+        self, page: Page, position: _Position
+    ) -> tuple[str, dict[str, Any] | None] | None:
+        """URL and query parameters of the page after ``page``, or None at the end."""
+        config = self.config
+        position.seen += len(page.items)
+        if config.max_pages is not None and page.number >= config.max_pages:
+            LOG.debug("pagination_max_pages_reached", max_pages=config.max_pages)
+            return None
+
+        if config.style == "link":
+            return (page.next_link, None) if page.next_link else None
+
+        if config.style == "cursor":
+            cursor = extract_view_data(page.data, config.next)
+            if cursor is None or cursor == "" or cursor is False:
+                return None
+            cursor = str(cursor)
+            if cursor in position.cursors:
+                LOG.warning("pagination_cursor_repeated", url=page.url, page=page.number)
+                return None
+            position.cursors.add(cursor)
+            if cursor.startswith(("http://", "https://", "/")):
+                return urljoin(page.url, cursor), None
+            return page.url, {**(page.params or {}), config.param: cursor}
+
+        # offset / page
+        if not page.items:
+            return None
+        if config.page_size is not None and len(page.items) < config.page_size:
+            return None
+        if config.total:
+            total = extract_view_data(page.data, config.total)
+            if isinstance(total, int | float) and position.seen >= total:
+                return None
+        params = dict(page.params or {})
+        current = int(params.get(config.param, _start(config)))
+        step = len(page.items) if config.style == "offset" else 1
+        params[config.param] = current + step
+        return page.url, params
+
+    def _fetch_detached(self, number: int, url: str, params: dict[str, Any] | None) -> Page:
+        """Run :meth:`_fetch` in an empty context, free of the attempt's deadline."""
+        return contextvars.Context().run(self._fetch, number, url, params)
+
+    def _fetch(self, number: int, url: str, params: dict[str, Any] | None) -> Page:
+        """Request one page, retrying transient failures up to ``max_retries`` times."""
+        delay = RETRY_BASE_DELAY
+        attempt = 0
+        while True:
+            try:
+                with response_cache_ttl(self._cache_ttl):
+                    return _request_page(
+                        self.session,
+                        self.method,
+                        url,
+                        params,
+                        number,
+                        self.config,
+                        self.request_kwargs,
+                        self.raise_for_status,
+                        self.timeout,
+                    )
+            except (requests.RequestException, OSError) as exc:
+                if attempt >= self.max_retries or not is_transient(exc):
+                    raise
+                attempt += 1
+                delay = decorrelated_jitter(delay)
+                LOG.warning(
+                    "pagination_page_retry",
+                    url=url,
+                    page=number,
+                    attempt=attempt,
+                    backoff=round(delay, 3),
+                    error=str(exc),
+                )
+                time.sleep(delay)
+
+
+def _start(config: PaginationConfig) -> int:
+    if config.start is not None:
+        return config.start
+    return _DEFAULT_START.get(config.style, 0)
+
+
+def _request_page(
+    session: requests.Session,
+    method: str,
+    url: str,
+    params: dict[str, Any] | None,
+    number: int,
+    config: PaginationConfig,
+    request_kwargs: Mapping[str, Any],
+    raise_for_status: bool,
+    timeout: float | None,
+) -> Page:
+    LOG.debug("pagination_request", url=url, page=number, params=params)
+    response = session.request(
+        method=method, url=url, params=params or None, timeout=timeout, **request_kwargs
+    )
+    if raise_for_status:
+        response.raise_for_status()
+    try:
+        data = response.json()
+    except ValueError as exc:
+        content_type = response.headers.get("Content-Type", "unknown")
+        raise CommandError(
+            f"Page {number} of {url} is not JSON (Content-Type: {content_type})"
+        ) from exc
+
+    items = extract_view_data(data, config.items) if config.items else data
+    if items is None:
+        items = []
+    elif not isinstance(items, list):
+        items = [items]
+    next_link = response.links.get("next", {}).get("url")
+    return Page(
+        number=number,
+        url=url,
+        params=params,
+        data=data,
+        items=items,
+        next_link=urljoin(response.url or url, next_link) if next_link else None,
+    )
+
+
+def paginate(
+    session: requests.Session,
+    method: str,
+    url: str,
+    config: PaginationConfig,
+    *,
+    params: Mapping[str, Any] | None = None,
+    raise_for_status: bool = True,
+    max_retries: int = 0,
+    timeout: float | None = None,
+    **request_kwargs: Any,
+) -> Paginator:
+    """Fetch the first page of a listing and return a paginator over all of it.
+
+    The first page is requested right away, so errors surface (and are
+    retried) inside the command handler, within the attempt's time limit.
+    Later pages are requested as the paginator is iterated, each within
+    ``timeout``.
+
+    Args:
+        session: Session to send the requests with (usually ``ctx.session``).
+        method: HTTP method.
+        url: URL of the listing.
+        config: Pagination settings.
+        params: Query parameters sent with every page.
+        raise_for_status: Raise ``HTTPError`` for error responses.
+        max_retries: Retries of transient failures for each later page.
+        timeout: Seconds allowed for each later page request (usually the
+            command's ``timeout``). None leaves them unbounded.
+        **request_kwargs: Extra ``session.request`` arguments (headers etc.).
+
+    Returns:
+        A :class:`Paginator` yielding the items of every page.
+
+    Raises:
+        requests.HTTPError: If the first page fails and ``raise_for_status``.
+        CommandError: If a page is not JSON.
+    """
+    method = method.upper()
+    first_params = dict(params or {})
+    if config.limit_param and config.page_size is not None:
+        first_params.setdefault(config.limit_param, config.page_size)
+    if config.style in _DEFAULT_START:
+        first_params.setdefault(config.param, _start(config))
+    first = _request_page(
+        session,
+        method,
+        url,
+        first_params,
+        1,
+        config,
+        request_kwargs,
+        raise_for_status,
+        request_timeout(),
+    )
+    return Paginator(
+        session,
+        method,
+        first,
+        config,
+        request_kwargs=request_kwargs,
+        raise_for_status=raise_for_status,
+        max_retries=max_retries,
+        timeout=timeout,
+    )
@@ -138,37 +138,54 @@ def discover_python_plugins() -> PythonDiscoveryResult:
             LOG.debug("python_plugin_skipped_underscore", path=str(py_file))
             continue
 
-        try:
-            module = _load_module_from_file(py_file)
-            plugin_classes = _find_siteplugin_classes(module)
-
-            for plugin_class in plugin_classes:
-                try:
-                    instance = plugin_class()
-                    result.plugins.append(instance)
-                    LOG.info(
-                        "python_plugin_loaded",
-                        site_name=instance.site_name,
-                        path=str(py_file),
-                    )
-                except (SystemExit, KeyboardInterrupt):
-                    raise
-                except Exception as exc:
-                    LOG.warning(
-                        "python_plugin_instantiation_failed",
-                        path=str(py_file),
-                        class_name=plugin_class.__name__,
-                        error=str(exc),
-                    )
-                    result.errors.append(
-                        PythonDiscoveryError(
-                            filepath=py_file,
-                            error=f"Failed to instantiate {plugin_class.__name__}: {exc}",
-                        )
+        file_result = load_python_plugin_file(py_file)
+        result.plugins.extend(file_result.plugins)
+        result.errors.extend(file_result.errors)
+
+    return result
+
+
+def load_python_plugin_file(py_file: Path) -> PythonDiscoveryResult:
+    """Load and instantiate the SitePlugin classes defined in one file.
+
+    Args:
+        py_file: Path to the Python plugin file.
+
+    Returns:
+        PythonDiscoveryResult with the file's plugins and any errors.
+    """
+    result = PythonDiscoveryResult()
+    try:
+        module = _load_module_from_file(py_file)
+        plugin_classes = _find_siteplugin_classes(module)
+
+        for plugin_class in plugin_classes:
+            try:
+                instance = plugin_class()
+                result.plugins.append(instance)
+                LOG.info(
+                    "python_plugin_loaded",
+                    site_name=instance.site_name,
+                    path=str(py_file),
+                )
+            except (SystemExit, KeyboardInterrupt):
+                raise
+            except Exception as exc:
+                LOG.warning(
+                    "python_plugin_instantiation_failed",
+                    path=str(py_file),
+                    class_name=plugin_class.__name__,
+                    error=str(exc),
+                )
+                result.errors.append(
+                    PythonDiscoveryError(
+                        filepath=py_file,
+                        error=f"Failed to instantiate {plugin_class.__name__}: {exc}",
                     )
+                )
 
-        except Exception as exc:
-            LOG.exception("python_plugin_load_failed", path=str(py_file), error=str(exc))
-            result.errors.append(PythonDiscoveryError(filepath=py_file, error=str(exc)))
+    except Exception as exc:
+        LOG.exception("python_plugin_load_failed", path=str(py_file), error=str(exc))
+        result.errors.append(PythonDiscoveryError(filepath=py_file, error=str(exc)))
 
     return result
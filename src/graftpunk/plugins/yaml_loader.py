@@ -24,7 +24,9 @@ from graftpunk.exceptions import PluginError
 from graftpunk.logging import get_logger
 from graftpunk.plugins.cli_plugin import LoginConfig, LoginStep
 from graftpunk.plugins.output_config import ColumnFilter, OutputConfig, ViewConfig
+from graftpunk.plugins.pagination import PaginationConfig
 from graftpunk.tokens import Token, TokenConfig
+from graftpunk.transport import TransportConfig
 
 LOG = get_logger(__name__)
 
@@ -66,6 +68,9 @@ class YAMLCommandDef:
     timeout: float | None = None
     max_retries: int = 0
     rate_limit: float | None = None
+    deadline: float | None = None
+    cache_ttl: float | None = None
+    pagination: PaginationConfig | None = None
     output_config: OutputConfig | None = None
 
     def __post_init__(self) -> None:
@@ -77,6 +82,15 @@ class YAMLCommandDef:
             raise ValueError(f"timeout must be positive, got {self.timeout}")
         if self.rate_limit is not None and self.rate_limit <= 0:
             raise ValueError(f"rate_limit must be positive, got {self.rate_limit}")
+        if self.deadline is not None and self.deadline <= 0:
+            raise ValueError(f"deadline must be positive, got {self.deadline}")
+        if self.cache_ttl is not None:
+            if self.cache_ttl <= 0:
+                raise ValueError(f"cache_ttl must be positive, got {self.cache_ttl}")
+            if self.method not in ("GET", "HEAD"):
+                raise ValueError(f"cache_ttl only applies to GET and HEAD, not {self.method}")
+        if self.pagination is not None and self.jmespath:
+            raise ValueError("paginated commands select items with pagination.items, not jmespath")
 
 
 @dataclass(frozen=True)
@@ -190,6 +204,26 @@ def _parse_output_config(config_dict: dict[str, Any] | None) -> OutputConfig | N
     )
 
 
+def _parse_pagination(block: Any, filepath: Path, cmd_name: str) -> PaginationConfig | None:
+    """Parse a command's ``pagination:`` block.
+
+    Raises:
+        PluginError: If the block is not a valid pagination config.
+    """
+    if block is None:
+        return None
+    if not isinstance(block, dict):
+        raise PluginError(
+            f"Plugin '{filepath}': command '{cmd_name}' 'pagination' must be a mapping."
+        )
+    try:
+        return PaginationConfig.from_dict(block)
+    except (TypeError, ValueError) as exc:
+        raise PluginError(
+            f"Plugin '{filepath}': command '{cmd_name}' has invalid 'pagination': {exc}"
+        ) from exc
+
+
 def validate_yaml_schema(data: dict[str, Any], filepath: Path) -> None:
     """Validate YAML plugin schema with helpful error messages.
 
@@ -334,6 +368,9 @@ def parse_yaml_plugin(
                 timeout=cmd_def.get("timeout"),
                 max_retries=cmd_def.get("max_retries", 0),
                 rate_limit=cmd_def.get("rate_limit"),
+                deadline=cmd_def.get("deadline"),
+                cache_ttl=cmd_def.get("cache_ttl"),
+                pagination=_parse_pagination(cmd_def.get("pagination"), filepath, str(cmd_name)),
                 output_config=_parse_output_config(cmd_def.get("output_config")),
             )
         )
@@ -419,6 +456,24 @@ def parse_yaml_plugin(
             )
         token_config = TokenConfig(tokens=tuple(tokens))
 
+    # Parse transport config (connection pooling and retries)
+    transport_block = data.get("transport")
+    transport_config: TransportConfig | None = None
+    if transport_block is not None:
+        if not isinstance(transport_block, dict):
+            raise PluginError(f"Plugin '{filepath}': 'transport' must be a mapping.")
+        try:
+            transport_config = TransportConfig.from_dict(transport_block)
+        except (TypeError, ValueError) as exc:
+            raise PluginError(f"Plugin '{filepath}': invalid 'transport': {exc}") from exc
+
+    # Plugin-wide rate limit (seconds between command executions)
+    rate_limit = data.get("rate_limit")
+    if rate_limit is not None and (
+        isinstance(rate_limit, bool) or not isinstance(rate_limit, int | float) or rate_limit <= 0
+    ):
+        raise PluginError(f"Plugin '{filepath}': 'rate_limit' must be a positive number.")
+
     # Build PluginConfig via shared factory (without mutating data dict)
     config = build_plugin_config(
         site_name=data.get("site_name", ""),
@@ -432,6 +487,8 @@ def parse_yaml_plugin(
         api_version=data.get("api_version", 1),
         login_config=login_config,
         token_config=token_config,
+        transport_config=transport_config,
+        rate_limit=rate_limit,
         source_filepath=filepath,
     )
 
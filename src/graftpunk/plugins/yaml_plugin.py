@@ -23,12 +23,15 @@ from graftpunk.plugins.cli_plugin import (
     PluginParamSpec,
     SitePlugin,
 )
+from graftpunk.plugins.pagination import paginate
 from graftpunk.plugins.yaml_loader import (
     YAMLCommandDef,
     YAMLDiscoveryError,
     discover_yaml_plugins,
     expand_env_vars,
+    parse_yaml_plugin,
 )
+from graftpunk.retry import request_timeout
 
 LOG = get_logger(__name__)
 
@@ -131,6 +134,22 @@ def _create_handler(
         url_params = set(URL_PARAM_PATTERN.findall(cmd_def.url))
         query_params = {k: v for k, v in kwargs.items() if k not in url_params and v is not None}
 
+        if cmd_def.pagination is not None:
+            items = paginate(
+                session,
+                cmd_def.method,
+                url,
+                cmd_def.pagination,
+                params=query_params,
+                raise_for_status=cmd_def.raise_for_status,
+                max_retries=cmd_def.max_retries,
+                timeout=cmd_def.timeout,
+                headers=headers,
+            )
+            if cmd_def.output_config:
+                return CommandResult(data=items, output_config=cmd_def.output_config)
+            return items
+
         # Make request
         LOG.debug("yaml_plugin_request", method=cmd_def.method, url=url, params=query_params)
 
@@ -139,6 +158,7 @@ def _create_handler(
             url=url,
             headers=headers,
             params=query_params if query_params else None,
+            timeout=request_timeout(),
         )
         if cmd_def.raise_for_status:
             response.raise_for_status()
@@ -220,6 +240,8 @@ def create_yaml_site_plugin(
                 timeout=cmd_def.timeout,
                 max_retries=cmd_def.max_retries,
                 rate_limit=cmd_def.rate_limit,
+                deadline=cmd_def.deadline,
+                cache_ttl=cmd_def.cache_ttl,
                 click_kwargs={"help": cmd_def.help_text} if cmd_def.help_text else {},
             )
         )
@@ -230,6 +252,7 @@ def create_yaml_site_plugin(
     attrs["login_config"] = config.login_config
     # Restore TokenConfig instance (asdict deep-converts Token objects to dicts)
     attrs["token_config"] = config.token_config
+    attrs["transport_config"] = config.transport_config
 
     def get_commands(self: Any) -> list[CommandSpec]:
         return command_specs
@@ -264,3 +287,20 @@ def create_yaml_plugins() -> tuple[list[SitePlugin], list[YAMLDiscoveryError]]:
                 YAMLDiscoveryError(filepath=Path(f"<{config.site_name}>"), error=str(exc))
             )
     return plugins, discovery_result.errors
+
+
+def create_yaml_plugin_from_file(filepath: Path) -> SitePlugin:
+    """Parse one YAML plugin file and build its SitePlugin instance.
+
+    Args:
+        filepath: Path to the YAML plugin file.
+
+    Returns:
+        SitePlugin instance ready for CLI registration.
+
+    Raises:
+        PluginError: If validation or plugin creation fails.
+        yaml.YAMLError: If the file is not valid YAML.
+    """
+    bundle = parse_yaml_plugin(filepath)
+    return create_yaml_site_plugin(bundle.config, bundle.commands, bundle.headers)
@@ -0,0 +1,444 @@
+"""Shared rate limiting for plugin commands and HTTP requests.
+
+A :class:`RateLimiter` hands out slots from named token buckets: one per
+command (``CommandSpec.rate_limit``), one per plugin (the plugin's
+``rate_limit``) and one per host (``TransportConfig.rate_limit``). Callers
+reserve the next free slot and sleep until it, so threads sharing a bucket
+are spaced out instead of all waking at once.
+
+Buckets react to throttling. A 429 or 503 pauses the bucket for the
+server's ``Retry-After`` and, for adaptive limits, halves its rate; every
+later success wins back a tenth of the base rate (AIMD: additive increase,
+multiplicative decrease). :class:`AdaptiveConcurrency` applies the same rule
+to the number of requests a batch keeps in flight.
+
+Bucket state lives in a :class:`BucketStore`. The default keeps it in
+memory, per process. With ``GRAFTPUNK_RATE_LIMIT_BACKEND=file`` it is kept
+in small JSON files under ``~/.config/graftpunk/ratelimit/`` and updated
+under an advisory file lock, so several ``gp`` processes and the keepalive
+daemon share one budget per site.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import re
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass
+from datetime import UTC
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Protocol, TypeVar
+
+from graftpunk.logging import get_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: buckets are only shared between threads
+    fcntl = None  # type: ignore[assignment]
+
+LOG = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Response statuses that mean "slow down".
+THROTTLE_STATUSES: frozenset[int] = frozenset({429, 503})
+
+# AIMD tuning: each throttle doubles a bucket's interval (up to MAX_SLOWDOWN
+# times the configured one); each success restores RECOVERY_STEP of the base
+# rate.
+MAX_SLOWDOWN = 32.0
+RECOVERY_STEP = 0.1
+
+# Upper bound for honouring a server's Retry-After, in seconds.
+MAX_RETRY_AFTER = 300.0
+
+RATE_LIMIT_DIR_NAME = "ratelimit"
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """How often a bucket hands out slots.
+
+    Attributes:
+        interval: Minimum seconds between calls at full speed.
+        burst: Calls allowed back to back after the bucket has been idle.
+        adaptive: Slow down on throttling responses and recover gradually
+            (AIMD). Retry-After pauses apply either way.
+    """
+
+    interval: float
+    burst: int = 1
+    adaptive: bool = True
+
+    def __post_init__(self) -> None:
+        if isinstance(self.interval, bool) or not self.interval > 0:
+            raise ValueError(f"RateLimit.interval must be positive, got {self.interval!r}")
+        if isinstance(self.burst, bool) or not isinstance(self.burst, int) or self.burst < 1:
+            raise ValueError(f"RateLimit.burst must be a positive integer, got {self.burst!r}")
+
+
+@dataclass
+class BucketState:
+    """Mutable state of one bucket (wall-clock seconds, shared across processes).
+
+    Attributes:
+        tat: Theoretical arrival time of the next slot at the current rate.
+        blocked_until: No slot starts before this time (Retry-After pause).
+        slowdown: Factor applied to the configured interval (1.0 = full speed).
+    """
+
+    tat: float = 0.0
+    blocked_until: float = 0.0
+    slowdown: float = 1.0
+
+
+class BucketStore(Protocol):
+    """Where bucket state lives. ``update`` must be atomic per key."""
+
+    def update(self, key: str, fn: Callable[[BucketState], T]) -> T:
+        """Apply ``fn`` to the state for ``key`` and save it, atomically."""
+        ...
+
+
+class MemoryBucketStore:
+    """Bucket state in a dict, shared by the threads of one process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._states: dict[str, BucketState] = {}
+
+    def update(self, key: str, fn: Callable[[BucketState], T]) -> T:
+        with self._lock:
+            state = self._states.setdefault(key, BucketState())
+            return fn(state)
+
+
+class FileBucketStore:
+    """Bucket state in one JSON file per key, updated under ``flock``.
+
+    Every process using the same directory shares the buckets. Without
+    ``fcntl`` (Windows) updates are only serialized within the process.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._fallback_lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        slug = re.sub(r"[^A-Za-z0-9._-]+", "_", key)[:80]
+        digest = hashlib.sha256(key.encode()).hexdigest()[:12]
+        return self.directory / f"{slug}-{digest}.json"
+
+    @contextlib.contextmanager
+    def _locked(self, path: Path) -> Iterator[Any]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with path.open("a+b") as f:
+            if fcntl is None:
+                with self._fallback_lock:
+                    yield f
+                return
+            # Each open() is its own lock owner, so this also serializes
+            # threads of this process; closing the file releases the lock.
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            yield f
+
+    def update(self, key: str, fn: Callable[[BucketState], T]) -> T:
+        path = self._path(key)
+        with self._locked(path) as f:
+            f.seek(0)
+            raw = f.read()
+            state = BucketState()
+            if raw:
+                try:
+                    state = BucketState(**json.loads(raw))
+                except (TypeError, ValueError):
+                    LOG.warning("rate_limit_state_corrupt", key=key, path=str(path))
+            result = fn(state)
+            f.seek(0)
+            f.truncate()
+            f.write(json.dumps(asdict(state)).encode())
+            f.flush()
+            return result
+
+
+def parse_retry_after(value: str | None, *, now: float | None = None) -> float | None:
+    """Parse a ``Retry-After`` header into seconds from now.
+
+    Args:
+        value: Header value: delay seconds or an HTTP date.
+        now: Current wall-clock time (defaults to ``time.time()``).
+
+    Returns:
+        Seconds to wait (capped at ``MAX_RETRY_AFTER``), or None if the
+        header is missing or unparseable.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=UTC)
+        seconds = when.timestamp() - (now if now is not None else time.time())
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+class RateLimiter:
+    """Token buckets keyed by name, backed by a :class:`BucketStore`.
+
+    Buckets follow the generic cell rate algorithm: each call reserves the
+    next slot ``interval`` after the previous one (``burst`` slots may be
+    taken at once after an idle period) and gets back how long to wait.
+    """
+
+    def __init__(
+        self,
+        store: BucketStore | None = None,
+        *,
+        clock: Callable[[], float] | None = None,
+        sleep: Callable[[float], None] | None = None,
+    ) -> None:
+        """Initialize a RateLimiter.
+
+        Args:
+            store: Bucket storage. Defaults to an in-memory store.
+            clock: Wall-clock source (defaults to ``time.time``).
+            sleep: Sleep function (defaults to ``time.sleep``).
+        """
+        self.store: BucketStore = store if store is not None else MemoryBucketStore()
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        # Keys this process last saw slowed down; lets succeeded() skip the
+        # store (a file lock, for the shared backend) while at full speed.
+        self._slowed: set[str] = set()
+        self.throttle_count = 0
+
+    def _now(self) -> float:
+        return self._clock() if self._clock is not None else time.time()
+
+    def _note_slowdown(self, key: str, slowdown: float) -> None:
+        with self._lock:
+            if slowdown > 1.0:
+                self._slowed.add(key)
+            else:
+                self._slowed.discard(key)
+
+    def reserve(self, key: str, limit: RateLimit) -> float:
+        """Reserve the next slot in a bucket without waiting for it.
+
+        Args:
+            key: Bucket name, e.g. ``"host:api.example.com"``.
+            limit: The bucket's rate.
+
+        Returns:
+            Seconds until the reserved slot starts (0 if it is now).
+        """
+        now = self._now()
+
+        def take(state: BucketState) -> tuple[float, float]:
+            interval = limit.interval * state.slowdown
+            tolerance = (limit.burst - 1) * interval
+            tat = max(state.tat, now)
+            start = max(tat - tolerance, now, state.blocked_until)
+            state.tat = max(tat, start) + interval
+            return start - now, state.slowdown
+
+        delay, slowdown = self.store.update(key, take)
+        self._note_slowdown(key, slowdown)
+        return delay
+
+    def acquire(self, key: str, limit: RateLimit) -> float:
+        """Reserve the next slot in a bucket and sleep until it starts.
+
+        Args:
+            key: Bucket name.
+            limit: The bucket's rate.
+
+        Returns:
+            Seconds slept.
+        """
+        delay = self.reserve(key, limit)
+        if delay > 0:
+            LOG.debug("rate_limit_wait", key=key, delay=round(delay, 3))
+            (self._sleep or time.sleep)(delay)
+        return delay
+
+    async def aacquire(self, key: str, limit: RateLimit) -> float:
+        """Like :meth:`acquire`, but waits with ``asyncio.sleep``.
+
+        Args:
+            key: Bucket name.
+            limit: The bucket's rate.
+
+        Returns:
+            Seconds waited.
+        """
+        delay = self.reserve(key, limit)
+        if delay > 0:
+            LOG.debug("rate_limit_wait", key=key, delay=round(delay, 3))
+            await asyncio.sleep(delay)
+        return delay
+
+    def throttled(self, key: str, limit: RateLimit, retry_after: float | None = None) -> float:
+        """Record a throttling response for a bucket.
+
+        Pauses the bucket for ``retry_after`` seconds (or one interval at
+        the new rate) and, for adaptive limits, halves its rate.
+
+        Args:
+            key: Bucket name.
+            limit: The bucket's rate.
+            retry_after: The server's Retry-After in seconds, if any.
+
+        Returns:
+            Seconds until the bucket hands out its next slot.
+        """
+        now = self._now()
+
+        def penalize(state: BucketState) -> tuple[float, float]:
+            if limit.adaptive:
+                state.slowdown = min(MAX_SLOWDOWN, state.slowdown * 2)
+            pause = retry_after if retry_after is not None else limit.interval * state.slowdown
+            state.blocked_until = max(state.blocked_until, now + pause)
+            return state.blocked_until - now, state.slowdown
+
+        pause, slowdown = self.store.update(key, penalize)
+        self._note_slowdown(key, slowdown)
+        with self._lock:
+            self.throttle_count += 1
+        LOG.warning("rate_limited", key=key, pause=round(pause, 3), slowdown=slowdown)
+        return pause
+
+    def succeeded(self, key: str, limit: RateLimit) -> None:
+        """Record a successful call, recovering some of a slowed bucket's rate.
+
+        Args:
+            key: Bucket name.
+            limit: The bucket's rate.
+        """
+        if not limit.adaptive:
+            return
+        with self._lock:
+            if key not in self._slowed:
+                return
+
+        def recover(state: BucketState) -> float:
+            if state.slowdown > 1.0:
+                state.slowdown = max(1.0, 1.0 / (1.0 / state.slowdown + RECOVERY_STEP))
+            return state.slowdown
+
+        self._note_slowdown(key, self.store.update(key, recover))
+
+
+class AdaptiveConcurrency:
+    """An AIMD limit on how many calls run at once.
+
+    Starts at ``maximum``. A throttled call halves the limit (down to
+    ``minimum``); each successful call adds ``1 / limit``, so the limit
+    grows by about one per round of calls. Calls that started before the
+    last decrease cannot trigger another one, so a burst of 429s answering
+    one round of calls halves the limit once, not once per call.
+    """
+
+    def __init__(self, maximum: int, *, minimum: int = 1) -> None:
+        """Initialize the limit.
+
+        Args:
+            maximum: Upper (and starting) limit.
+            minimum: Lower bound the limit never drops below.
+
+        Raises:
+            ValueError: If the bounds are not positive or are inverted.
+        """
+        if minimum < 1 or maximum < minimum:
+            raise ValueError(f"Invalid concurrency bounds: minimum={minimum}, maximum={maximum}")
+        self.minimum = minimum
+        self.maximum = maximum
+        self._limit = float(maximum)
+        self._active = 0
+        self._epoch = 0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Calls currently allowed in flight."""
+        return max(self.minimum, int(self._limit))
+
+    def acquire(self) -> int:
+        """Wait until a call may start.
+
+        Returns:
+            A ticket to pass to :meth:`release`.
+        """
+        with self._cond:
+            while self._active >= self.limit:
+                self._cond.wait()
+            self._active += 1
+            return self._epoch
+
+    def release(self, ticket: int, *, throttled: bool = False) -> None:
+        """Finish a call and adjust the limit.
+
+        Args:
+            ticket: The value :meth:`acquire` returned for this call.
+            throttled: Whether the call was rate limited by the server.
+        """
+        with self._cond:
+            self._active -= 1
+            before = self.limit
+            if throttled:
+                if ticket == self._epoch:
+                    self._epoch += 1
+                    self._limit = max(float(self.minimum), self._limit / 2)
+            else:
+                self._limit = min(float(self.maximum), self._limit + 1 / self._limit)
+            if self.limit != before:
+                LOG.debug("concurrency_limit_changed", limit=self.limit, throttled=throttled)
+            self._cond.notify_all()
+
+
+_rate_limiter: RateLimiter | None = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter.
+
+    The backend follows ``GRAFTPUNK_RATE_LIMIT_BACKEND``: ``memory``
+    (default) or ``file`` to share buckets between processes.
+    """
+    global _rate_limiter
+    limiter = _rate_limiter
+    if limiter is not None:
+        return limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            from graftpunk.config import get_settings
+
+            settings = get_settings()
+            store: BucketStore
+            if settings.rate_limit_backend == "file":
+                store = FileBucketStore(settings.config_dir / RATE_LIMIT_DIR_NAME)
+            else:
+                store = MemoryBucketStore()
+            _rate_limiter = RateLimiter(store)
+        return _rate_limiter
+
+
+def reset_rate_limiter() -> None:
+    """Drop the process-wide rate limiter (for testing and reconfiguration)."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        _rate_limiter = None
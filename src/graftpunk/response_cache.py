@@ -0,0 +1,553 @@
+"""Encrypted on-disk HTTP response cache for idempotent commands.
+
+Commands opt in with ``CommandSpec.cache_ttl`` (``cache_ttl:`` on YAML
+commands). While such a command runs, GET and HEAD requests sent through a
+``GraftpunkSession`` are answered from the cache for ``cache_ttl`` seconds.
+After that the cached response is revalidated: the request is sent with
+``If-None-Match``/``If-Modified-Since`` from the stored ``ETag``/
+``Last-Modified``, and a ``304 Not Modified`` refreshes the entry without
+downloading the body again.
+
+Entries are partitioned per session: ``session:<name>`` for sessions loaded
+with ``load_session_for_api()`` and ``anonymous:<site>`` for session-less
+commands. A partition is only ever read by the session it belongs to, so an
+authenticated response is never served to another session, and saving a new
+login (``cache_session()``) or deleting a session drops its partition.
+
+Each entry is one file under ``~/.config/graftpunk/response-cache/``,
+encrypted with the session encryption key. The cache is bounded by
+``GRAFTPUNK_RESPONSE_CACHE_SIZE_MB`` (0 disables it) and evicts the least
+recently used entries first. ``Set-Cookie`` is never stored, responses marked
+``Cache-Control: no-store`` are not cached, and ``no-cache`` responses are
+revalidated on every use.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Mapping
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+import requests
+from requests.hooks import dispatch_hook
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers, to_native_string
+
+from graftpunk.logging import get_logger
+
+LOG = get_logger(__name__)
+
+RESPONSE_CACHE_DIR_NAME = "response-cache"
+CACHEABLE_METHODS = frozenset({"GET", "HEAD"})
+# Final (non-redirect) statuses that are cacheable by default (RFC 9110 §15.1).
+CACHEABLE_STATUSES = frozenset({200, 203, 404, 405, 410, 414, 501})
+
+# Headers that describe one transfer rather than the resource. The stored
+# body is already decoded, so the original encoding and length no longer
+# apply; cookies must never be replayed from the cache.
+_UNSTORED_HEADERS = frozenset(
+    {
+        "connection",
+        "content-encoding",
+        "content-length",
+        "keep-alive",
+        "set-cookie",
+        "set-cookie2",
+        "transfer-encoding",
+    }
+)
+# Requests carrying these manage caching (or partial content) themselves.
+_BYPASS_REQUEST_HEADERS = ("If-None-Match", "If-Modified-Since", "If-Match", "Range")
+
+_ENTRY_VERSION = 1
+_LENGTH = struct.Struct(">I")
+
+_cache_ttl: ContextVar[float | None] = ContextVar("graftpunk_response_cache_ttl", default=None)
+
+
+@contextlib.contextmanager
+def response_cache_ttl(seconds: float | None) -> Iterator[None]:
+    """Serve cached responses up to ``seconds`` old to requests sent in this context.
+
+    ``_run_handler_with_limits`` wraps every attempt of a command with a
+    ``cache_ttl`` in this. ``None`` leaves the current setting in place.
+
+    Args:
+        seconds: Freshness lifetime for cached responses.
+    """
+    if seconds is None:
+        yield
+        return
+    token = _cache_ttl.set(seconds)
+    try:
+        yield
+    finally:
+        _cache_ttl.reset(token)
+
+
+def current_cache_ttl(default: float | None = None) -> float | None:
+    """The freshness lifetime in effect, or ``default`` outside a caching command."""
+    ttl = _cache_ttl.get()
+    return default if ttl is None else ttl
+
+
+def session_partition(session_name: str) -> str:
+    """Cache partition of a stored session."""
+    return f"session:{session_name}"
+
+
+def anonymous_partition(site_name: str) -> str:
+    """Cache partition shared by a plugin's session-less commands."""
+    return f"anonymous:{site_name}"
+
+
+def _header_str(headers: Mapping[str, str | bytes], name: str) -> str | None:
+    """Header value as ``str``; requests allows callers to set ``bytes`` values."""
+    value = headers.get(name)
+    return None if value is None else to_native_string(value)
+
+
+def _directives(value: str | None) -> set[str]:
+    """Lower-cased ``Cache-Control`` directive names."""
+    return {part.split("=", 1)[0].strip().lower() for part in (value or "").split(",")}
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A stored response.
+
+    Attributes:
+        method: Request method.
+        url: Final response URL.
+        status: HTTP status code.
+        reason: HTTP reason phrase.
+        headers: Response headers, minus per-transfer headers and cookies.
+        body: Decoded response body.
+        stored_at: Wall-clock time the response was received or revalidated.
+        vary: Request header values the response varies on, as
+            ``(lower-case name, value)`` pairs.
+    """
+
+    method: str
+    url: str
+    status: int
+    reason: str
+    headers: tuple[tuple[str, str], ...]
+    body: bytes
+    stored_at: float
+    vary: tuple[tuple[str, str | None], ...] = ()
+
+    @classmethod
+    def from_response(
+        cls, response: requests.Response, request: requests.PreparedRequest, now: float
+    ) -> CachedResponse:
+        """Build an entry from a complete (non-streamed) response."""
+        vary = tuple(
+            sorted(
+                (name, _header_str(request.headers, name))
+                for name in {
+                    part.strip().lower()
+                    for part in (_header_str(response.headers, "Vary") or "").split(",")
+                    if part.strip()
+                }
+            )
+        )
+        return cls(
+            method=(request.method or "GET").upper(),
+            url=response.url,
+            status=response.status_code,
+            reason=response.reason or "",
+            headers=_stored_headers(response.headers.items()),
+            body=response.content or b"",
+            stored_at=now,
+            vary=vary,
+        )
+
+    def header(self, name: str) -> str | None:
+        """Case-insensitive header lookup."""
+        name = name.lower()
+        return next((value for key, value in self.headers if key.lower() == name), None)
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers that revalidate this entry."""
+        validators = {}
+        etag = self.header("ETag")
+        if etag:
+            validators["If-None-Match"] = etag
+        last_modified = self.header("Last-Modified")
+        if last_modified:
+            validators["If-Modified-Since"] = last_modified
+        return validators
+
+    @property
+    def size(self) -> int:
+        """Approximate bytes the entry takes on disk."""
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers) + len(self.url)
+
+    def matches(self, request: requests.PreparedRequest) -> bool:
+        """Whether the request agrees with every header the response varies on."""
+        return all(_header_str(request.headers, name) == value for name, value in self.vary)
+
+    def is_fresh(self, ttl: float, now: float) -> bool:
+        """Whether the entry may be served without revalidation."""
+        if "no-cache" in _directives(self.header("Cache-Control")):
+            return False
+        return 0 <= now - self.stored_at < ttl
+
+    def revalidated(self, not_modified: requests.Response, now: float) -> CachedResponse:
+        """The entry refreshed by a ``304 Not Modified``, with its updated headers."""
+        updates = {k.lower(): (k, v) for k, v in _stored_headers(not_modified.headers.items())}
+        merged = [updates.pop(k.lower(), (k, v)) for k, v in self.headers]
+        return replace(self, headers=(*merged, *updates.values()), stored_at=now)
+
+    def to_response(self, request: requests.PreparedRequest) -> requests.Response:
+        """Rebuild a ``requests.Response`` for ``request``."""
+        response = requests.Response()
+        response.status_code = self.status
+        response.reason = self.reason
+        response.headers = CaseInsensitiveDict(dict(self.headers))
+        response.headers["Content-Length"] = str(len(self.body))
+        response._content = self.body
+        response._content_consumed = True
+        response.url = self.url
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.request = request
+        response.elapsed = timedelta(0)
+        return response
+
+    def encode(self) -> bytes:
+        """Serialize to bytes (unencrypted)."""
+        meta = json.dumps(
+            {
+                "v": _ENTRY_VERSION,
+                "method": self.method,
+                "url": self.url,
+                "status": self.status,
+                "reason": self.reason,
+                "headers": self.headers,
+                "stored_at": self.stored_at,
+                "vary": self.vary,
+            },
+            separators=(",", ":"),
+        ).encode()
+        return _LENGTH.pack(len(meta)) + meta + self.body
+
+    @classmethod
+    def decode(cls, data: bytes) -> CachedResponse:
+        """Parse bytes written by :meth:`encode`.
+
+        Raises:
+            ValueError: If the data is not a supported entry.
+        """
+        try:
+            (length,) = _LENGTH.unpack_from(data)
+            meta = json.loads(data[_LENGTH.size : _LENGTH.size + length])
+        except (struct.error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+            raise ValueError("Malformed response cache entry") from exc
+        if not isinstance(meta, dict) or meta.get("v") != _ENTRY_VERSION:
+            raise ValueError("Unsupported response cache entry version")
+        return cls(
+            method=meta["method"],
+            url=meta["url"],
+            status=meta["status"],
+            reason=meta["reason"],
+            headers=tuple((str(k), str(v)) for k, v in meta["headers"]),
+            body=data[_LENGTH.size + length :],
+            stored_at=meta["stored_at"],
+            vary=tuple((str(k), v) for k, v in meta["vary"]),
+        )
+
+
+def _stored_headers(items: Any) -> tuple[tuple[str, str], ...]:
+    return tuple((k, v) for k, v in items if k.lower() not in _UNSTORED_HEADERS)
+
+
+def _digest(value: str, length: int) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()[:length]
+
+
+class ResponseCache:
+    """Size-bounded, encrypted response store with LRU eviction.
+
+    Safe to share between threads. Several processes may use the same
+    directory: files are replaced atomically and each process evicts from
+    its own view of the directory, so the bound holds per process.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int,
+        *,
+        clock: Callable[[], float] | None = None,
+    ) -> None:
+        """Initialize a cache over ``directory``.
+
+        Args:
+            directory: Where entries are stored (created on first write).
+            max_bytes: Largest total size of the entries kept.
+            clock: Wall-clock function (``time.time`` by default).
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._clock = clock or time.time
+        self._lock = threading.Lock()
+        # Entry path -> size on disk, least recently used first
+        self._index: OrderedDict[Path, int] | None = None
+        self._total = 0
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of the entries on disk."""
+        with self._lock:
+            self._load_index()
+            return self._total
+
+    def _path(self, partition: str, key: str) -> Path:
+        # Hashed names keep session names and URLs out of the file system.
+        return self.directory / _digest(partition, 32) / f"{_digest(key, 40)}.bin"
+
+    def _load_index(self) -> OrderedDict[Path, int]:
+        """Scan the directory once, oldest entries first (caller holds the lock)."""
+        if self._index is None:
+            found: list[tuple[float, Path, int]] = []
+            if self.directory.is_dir():
+                for path in self.directory.glob("*/*.bin"):
+                    with contextlib.suppress(OSError):
+                        stat = path.stat()
+                        found.append((stat.st_mtime, path, stat.st_size))
+            found.sort()
+            self._index = OrderedDict((path, size) for _, path, size in found)
+            self._total = sum(size for _, _, size in found)
+        return self._index
+
+    def _forget(self, path: Path) -> None:
+        """Drop a path from the index (caller holds the lock)."""
+        size = self._load_index().pop(path, None)
+        if size is not None:
+            self._total -= size
+
+    def get(self, partition: str, key: str) -> CachedResponse | None:
+        """Read an entry, marking it recently used.
+
+        Unreadable entries (corrupt, or sealed with a key no longer in the
+        keyring) are deleted and reported as missing.
+        """
+        from graftpunk.encryption import decrypt_data
+        from graftpunk.exceptions import EncryptionError
+
+        path = self._path(partition, key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            with self._lock:
+                self._forget(path)
+            return None
+        try:
+            entry = CachedResponse.decode(decrypt_data(data))
+        except (EncryptionError, ValueError, KeyError, TypeError) as exc:
+            LOG.warning("response_cache_entry_unreadable", error=str(exc))
+            self._remove(path)
+            return None
+        with self._lock:
+            index = self._load_index()
+            if path in index:
+                index.move_to_end(path)
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return entry
+
+    def put(self, partition: str, key: str, entry: CachedResponse) -> None:
+        """Store an entry, evicting the least recently used ones to stay in bounds.
+
+        Entries larger than the whole cache are not stored.
+        """
+        from graftpunk.encryption import encrypt_data
+
+        if entry.size > self.max_bytes:
+            return
+        data = encrypt_data(entry.encode())
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(partition, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_name)
+            raise
+
+        evicted: list[Path] = []
+        with self._lock:
+            index = self._load_index()
+            self._forget(path)
+            index[path] = len(data)
+            self._total += len(data)
+            while self._total > self.max_bytes and len(index) > 1:
+                oldest, size = index.popitem(last=False)
+                self._total -= size
+                evicted.append(oldest)
+        for oldest in evicted:
+            oldest.unlink(missing_ok=True)
+        if evicted:
+            LOG.debug("response_cache_evicted", count=len(evicted))
+
+    def delete(self, partition: str, key: str) -> None:
+        """Remove one entry."""
+        self._remove(self._path(partition, key))
+
+    def _remove(self, path: Path) -> None:
+        with self._lock:
+            self._forget(path)
+        path.unlink(missing_ok=True)
+
+    def clear(self, partition: str | None = None) -> None:
+        """Remove a partition's entries, or every entry.
+
+        Args:
+            partition: Partition to clear; None clears the whole cache.
+        """
+        target = self.directory if partition is None else self.directory / _digest(partition, 32)
+        with self._lock:
+            if self._index is not None:
+                for path in [p for p in self._index if p.is_relative_to(target)]:
+                    self._forget(path)
+            shutil.rmtree(target, ignore_errors=True)
+        LOG.debug("response_cache_cleared", partition=partition)
+
+    def fetch(
+        self,
+        partition: str,
+        request: requests.PreparedRequest,
+        ttl: float,
+        send: Callable[[requests.PreparedRequest], requests.Response],
+    ) -> requests.Response:
+        """Answer a request from the cache, revalidating or fetching as needed.
+
+        Args:
+            partition: The sending session's partition.
+            request: The prepared request.
+            ttl: Seconds a stored response may be served without revalidation.
+            send: Sends a prepared request over the network.
+
+        Returns:
+            The cached, revalidated or freshly fetched response.
+        """
+        method = (request.method or "GET").upper()
+        if (
+            method not in CACHEABLE_METHODS
+            or any(name in request.headers for name in _BYPASS_REQUEST_HEADERS)
+            or _directives(_header_str(request.headers, "Cache-Control")) & {"no-cache", "no-store"}
+        ):
+            return send(request)
+
+        key = f"{method} {request.url}"
+        now = self._clock()
+        entry = self.get(partition, key)
+        if entry is not None and not entry.matches(request):
+            entry = None
+        if entry is not None and entry.is_fresh(ttl, now):
+            LOG.debug("response_cache_hit", url=request.url)
+            return dispatch_hook("response", request.hooks, entry.to_response(request))
+
+        validators = entry.validators if entry is not None else {}
+        if validators:
+            conditional = request.copy()
+            conditional.headers.update(validators)
+            response = send(conditional)
+        else:
+            response = send(request)
+
+        now = self._clock()
+        if entry is not None and validators and response.status_code == 304:
+            response.close()
+            entry = entry.revalidated(response, now)
+            self.put(partition, key, entry)
+            LOG.debug("response_cache_revalidated", url=request.url)
+            return dispatch_hook("response", request.hooks, entry.to_response(request))
+
+        if _storable(response):
+            self.put(partition, key, CachedResponse.from_response(response, request, now))
+            LOG.debug("response_cache_stored", url=request.url)
+        elif entry is not None:
+            self.delete(partition, key)
+        return response
+
+
+def _storable(response: requests.Response) -> bool:
+    if response.status_code not in CACHEABLE_STATUSES or response.history:
+        return False
+    if "no-store" in _directives(_header_str(response.headers, "Cache-Control")):
+        return False
+    return (_header_str(response.headers, "Vary") or "").strip() != "*"
+
+
+_response_cache: ResponseCache | None = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache | None:
+    """Return the process-wide response cache, or None if it is disabled.
+
+    Sized by ``GRAFTPUNK_RESPONSE_CACHE_SIZE_MB``; ``0`` disables caching.
+    """
+    global _response_cache
+    cache = _response_cache
+    if cache is not None:
+        return cache
+    from graftpunk.config import get_settings
+
+    settings = get_settings()
+    if settings.response_cache_size_mb <= 0:
+        return None
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(
+                settings.config_dir / RESPONSE_CACHE_DIR_NAME,
+                settings.response_cache_size_mb * 1024 * 1024,
+            )
+        return _response_cache
+
+
+def clear_response_cache(partition: str | None = None) -> None:
+    """Remove a partition's cached responses, or all of them.
+
+    Args:
+        partition: e.g. ``session_partition("mysite")``; None clears everything.
+    """
+    cache = get_response_cache()
+    if cache is not None:
+        cache.clear(partition)
+        return
+    # Disabled now, but entries from when it was enabled may remain.
+    from graftpunk.config import get_settings
+
+    directory = get_settings().config_dir / RESPONSE_CACHE_DIR_NAME
+    if partition is not None:
+        directory /= _digest(partition, 32)
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def reset_response_cache() -> None:
+    """Drop the process-wide cache object (for testing and reconfiguration)."""
+    global _response_cache
+    with _response_cache_lock:
+        _response_cache = None
@@ -0,0 +1,225 @@
+"""Retry, backoff and deadline helpers for command execution.
+
+``_run_handler_with_limits`` (graftpunk.client) retries failed command
+attempts. This module decides which failures are worth retrying, how long to
+wait between attempts and when to give up:
+
+- :func:`is_transient` accepts connection failures, timeouts and
+  429/502/503/504 responses, and rejects everything else (a 404, a bad URL,
+  a missing file).
+- :func:`decorrelated_jitter` spreads retries out so that workers failing
+  together do not retry together.
+- :class:`RetryBudget` stops retries for a plugin while most of its recent
+  attempts are failing, so a struggling site is not hit with retries on top
+  of regular traffic.
+- :func:`attempt_deadline` bounds one attempt. Inside it,
+  :func:`request_timeout` returns the time left, which ``GraftpunkSession``
+  applies to every request the handler sends.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import random
+import threading
+import time
+from collections.abc import Iterator
+from contextvars import ContextVar
+from typing import Any
+
+import requests
+
+from graftpunk.exceptions import CommandTimeoutError
+from graftpunk.logging import get_logger
+from graftpunk.transport import DEFAULT_RETRY_STATUSES
+
+LOG = get_logger(__name__)
+
+# Backoff bounds for command retries, in seconds.
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+# Retry budget: every failed attempt costs a token, every successful one
+# earns back RETRY_BUDGET_TOKEN_RATIO, and retries stop while fewer than
+# half of RETRY_BUDGET_MAX_TOKENS are left.
+RETRY_BUDGET_MAX_TOKENS = 10.0
+RETRY_BUDGET_TOKEN_RATIO = 0.1
+
+_attempt_deadline: ContextVar[float | None] = ContextVar("graftpunk_attempt_deadline", default=None)
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Whether a failed attempt is worth retrying.
+
+    Args:
+        exc: The exception the attempt raised.
+
+    Returns:
+        True for connection errors, timeouts and retryable HTTP statuses.
+    """
+    if isinstance(exc, CommandTimeoutError):
+        return False
+    if isinstance(exc, requests.HTTPError):
+        response = exc.response
+        return response is not None and response.status_code in DEFAULT_RETRY_STATUSES
+    if isinstance(exc, requests.exceptions.SSLError):
+        return False
+    if isinstance(
+        exc,
+        requests.ConnectionError | requests.Timeout | requests.exceptions.ChunkedEncodingError,
+    ):
+        return True
+    if isinstance(exc, requests.RequestException):
+        return False
+    return isinstance(exc, ConnectionError | TimeoutError)
+
+
+def decorrelated_jitter(
+    previous: float, *, base: float = RETRY_BASE_DELAY, cap: float = RETRY_MAX_DELAY
+) -> float:
+    """Next backoff delay, drawn from ``[base, 3 * previous]`` and capped.
+
+    Each delay depends on the previous one rather than on the attempt
+    number, so callers that failed at the same moment drift apart.
+
+    Args:
+        previous: The previous delay (``base`` before the first retry).
+        base: Smallest delay.
+        cap: Largest delay.
+
+    Returns:
+        Seconds to sleep before the next attempt.
+    """
+    return min(cap, random.uniform(base, max(base, previous * 3)))  # noqa: S311
+
+
+class RetryBudget:
+    """Token-bucket retry throttle shared by one plugin's commands.
+
+    Starts full. A failed attempt takes a token, a successful one adds
+    ``token_ratio``; retries are allowed only while more than half the
+    tokens are left. With the defaults, retries stop after about five
+    failures in a row and resume once roughly one attempt in ten fails.
+    """
+
+    def __init__(
+        self,
+        max_tokens: float = RETRY_BUDGET_MAX_TOKENS,
+        token_ratio: float = RETRY_BUDGET_TOKEN_RATIO,
+    ) -> None:
+        """Initialize a full budget.
+
+        Args:
+            max_tokens: Bucket size.
+            token_ratio: Tokens earned by a successful attempt.
+        """
+        self.max_tokens = max_tokens
+        self.token_ratio = token_ratio
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available."""
+        return self._tokens
+
+    def record_success(self) -> None:
+        """Earn back part of a token after a successful attempt."""
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.token_ratio)
+
+    def record_failure(self) -> bool:
+        """Spend a token for a failed attempt.
+
+        Returns:
+            Whether a retry is still allowed.
+        """
+        with self._lock:
+            self._tokens = max(0.0, self._tokens - 1)
+            return self._tokens > self.max_tokens / 2
+
+
+_retry_budgets: dict[str, RetryBudget] = {}
+_retry_budgets_lock = threading.Lock()
+
+
+def retry_budget(plugin_name: str) -> RetryBudget:
+    """Return the process-wide retry budget for a plugin."""
+    with _retry_budgets_lock:
+        budget = _retry_budgets.get(plugin_name)
+        if budget is None:
+            budget = _retry_budgets[plugin_name] = RetryBudget()
+        return budget
+
+
+def reset_retry_budgets() -> None:
+    """Forget all retry budgets (for testing)."""
+    with _retry_budgets_lock:
+        _retry_budgets.clear()
+
+
+@contextlib.contextmanager
+def attempt_deadline(seconds: float | None) -> Iterator[None]:
+    """Bound the requests sent in this context to ``seconds`` from now.
+
+    Nested deadlines never extend an outer one. ``None`` leaves the
+    current deadline (if any) in place.
+
+    Args:
+        seconds: Time allowed for the attempt.
+    """
+    if seconds is None:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    outer = _attempt_deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _attempt_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _attempt_deadline.reset(token)
+
+
+def request_timeout() -> float | None:
+    """Seconds left in the current command attempt.
+
+    Handlers that send requests through something other than a
+    ``GraftpunkSession`` can pass this as ``timeout=``.
+
+    Returns:
+        Remaining seconds, or None outside a bounded attempt.
+
+    Raises:
+        requests.Timeout: If the attempt's time is already used up.
+    """
+    deadline = _attempt_deadline.get()
+    if deadline is None:
+        return None
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise requests.Timeout("Command attempt timed out before the request was sent")
+    return remaining
+
+
+def clamp_timeout(timeout: Any) -> Any:
+    """Cap a requests ``timeout`` at the time left in the current attempt.
+
+    Args:
+        timeout: None, seconds, or a ``(connect, read)`` tuple. Other values
+            (e.g. a urllib3 ``Timeout``) are returned unchanged.
+
+    Returns:
+        The capped timeout.
+    """
+    remaining = request_timeout()
+    if remaining is None:
+        return timeout
+    if timeout is None:
+        return remaining
+    if isinstance(timeout, tuple):
+        return tuple(remaining if part is None else min(part, remaining) for part in timeout)
+    if isinstance(timeout, int | float):
+        return min(timeout, remaining)
+    return timeout
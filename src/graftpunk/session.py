@@ -656,42 +656,61 @@ class BrowserSession(requestium.Session):
         if session_name is None:
             session_name = self.session_name
 
-        LOG.info("saving_httpie_session", name=session_name)
-
-        env = httpie.context.Environment()
-        httpie_session_path = Path(env.config.directory) / "sessions" / f"{session_name}.json"
-
         try:
             driver_url = self.driver.current_url
         except (BrowserError, selenium.common.exceptions.WebDriverException) as exc:
             driver_url = ""
             LOG.warning("driver_url_unavailable_for_httpie_session", error=str(exc))
         current_url = getattr(self, "current_url", driver_url)
-        parsed = urlparse(current_url)
-        current_hostname = f"{parsed.scheme}://{parsed.hostname}" if current_url else ""
-
-        httpie_session = httpie.sessions.get_httpie_session(
-            env=env,
-            config_dir=env.config.directory,
-            session_name=str(httpie_session_path),
-            url=current_hostname,
-            host=None,
-        )
+        return write_httpie_session(self.cookies, current_url, session_name)
 
-        cookiejar_dict = requests.utils.dict_from_cookiejar(self.cookies)
-        cookiejar = requests.utils.cookiejar_from_dict(cookiejar_dict)
-        httpie_session.cookie_jar = cookiejar
-        httpie_session.load()
-        httpie_session.post_process_data(httpie_session)
-        httpie_session.save()
-
-        LOG.info(
-            "successfully_saved_httpie_session",
-            name=session_name,
-            path=str(httpie_session_path),
-        )
 
-        return httpie_session_path
+def write_httpie_session(
+    cookies: "requests.cookies.RequestsCookieJar",
+    current_url: str,
+    session_name: str,
+) -> Path:
+    """Write cookies to an HTTPie session file.
+
+    Args:
+        cookies: Cookie jar to export.
+        current_url: Last URL the session visited; its origin scopes the
+            HTTPie session.
+        session_name: HTTPie session name.
+
+    Returns:
+        Path to the saved HTTPie session file.
+    """
+    LOG.info("saving_httpie_session", name=session_name)
+
+    env = httpie.context.Environment()
+    httpie_session_path = Path(env.config.directory) / "sessions" / f"{session_name}.json"
+
+    parsed = urlparse(current_url)
+    current_hostname = f"{parsed.scheme}://{parsed.hostname}" if current_url else ""
+
+    httpie_session = httpie.sessions.get_httpie_session(
+        env=env,
+        config_dir=env.config.directory,
+        session_name=str(httpie_session_path),
+        url=current_hostname,
+        host=None,
+    )
+
+    cookiejar_dict = requests.utils.dict_from_cookiejar(cookies)
+    cookiejar = requests.utils.cookiejar_from_dict(cookiejar_dict)
+    httpie_session.cookie_jar = cookiejar
+    httpie_session.load()
+    httpie_session.post_process_data(httpie_session)
+    httpie_session.save()
+
+    LOG.info(
+        "successfully_saved_httpie_session",
+        name=session_name,
+        path=str(httpie_session_path),
+    )
+
+    return httpie_session_path
 
 
 # Known bot-detection / WAF tracking cookies that should NOT be injected
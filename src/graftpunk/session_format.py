@@ -0,0 +1,249 @@
+"""Versioned, non-executable wire format for cached sessions.
+
+Sessions are stored as a schema-versioned JSON document holding only the
+HTTP state graftpunk needs to resume: cookies, headers, header roles, cached
+tokens, CSRF tokens, the session name and the last browser URL. Decoding a
+document never executes code, and the document omits browser driver state
+(webdriver options, hooks, proxies) that the old dill pickle carried along.
+
+Blobs written by earlier releases are dill pickles. :func:`is_legacy_blob`
+detects them and :func:`load_legacy_session` decodes them so callers can
+migrate them to the current format; ``dill`` is only imported on that path.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping
+from http.cookiejar import Cookie, CookieJar
+from pathlib import Path
+from typing import Any
+
+import requests
+import requests.cookies
+
+from graftpunk.exceptions import SessionFormatError
+from graftpunk.logging import get_logger
+
+LOG = get_logger(__name__)
+
+FORMAT_NAME = "graftpunk.session"
+FORMAT_VERSION = 1
+
+# Cookie fields round-tripped through requests.cookies.create_cookie(); the
+# *_specified/initial_dot flags are derived from these on decode.
+_COOKIE_FIELDS = (
+    "version",
+    "name",
+    "value",
+    "port",
+    "domain",
+    "path",
+    "secure",
+    "expires",
+    "discard",
+    "comment",
+    "comment_url",
+    "rfc2109",
+)
+
+# Attribute names shared with graftpunk.session / graftpunk.tokens. Duplicated
+# here rather than imported so decoding a session never pulls in the browser
+# stack.
+_HEADER_ROLES_ATTR = "_gp_header_roles"
+_CACHED_TOKENS_ATTR = "_gp_cached_tokens"
+_CSRF_TOKENS_ATTR = "_gp_csrf_tokens"
+
+
+class StoredSession(requests.Session):
+    """HTTP session state decoded from a cached session.
+
+    A plain ``requests.Session`` carrying the cookies and headers captured at
+    login plus graftpunk's header roles and token caches. No browser is
+    attached; use :func:`graftpunk.cache.load_session_for_api` for a
+    ready-to-use API session.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.current_url: str = ""
+        self.session_name: str = "default"
+        self._backend_type: str = ""
+        self._gp_header_roles: dict[str, dict[str, str]] = {}
+        self._gp_cached_tokens: dict[str, Any] = {}
+        self._gp_csrf_tokens: dict[str, str] = {}
+
+    def save_httpie_session(self, session_name: str | None = None) -> Path:
+        """Save session cookies to HTTPie format for CLI HTTP requests.
+
+        Args:
+            session_name: Optional session name. Uses self.session_name if not provided.
+
+        Returns:
+            Path to the saved HTTPie session file.
+        """
+        from graftpunk.session import write_httpie_session
+
+        return write_httpie_session(
+            self.cookies, self.current_url, session_name or self.session_name
+        )
+
+
+def is_legacy_blob(data: bytes) -> bool:
+    """Return True if ``data`` is a pre-versioned (dill pickle) session blob."""
+    return data.lstrip()[:1] != b"{"
+
+
+def load_legacy_session(data: bytes) -> Any:
+    """Decode a legacy dill-pickled session blob.
+
+    Only call this on data that has already been authenticated (decrypted
+    and checksum-verified): unpickling can execute arbitrary code.
+
+    Raises:
+        SessionFormatError: If the blob cannot be unpickled.
+    """
+    import pickle
+
+    import dill
+
+    try:
+        return dill.loads(data)  # noqa: S301
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as exc:
+        raise SessionFormatError(f"Cannot decode legacy session: {exc}") from exc
+
+
+def _cookie_to_dict(cookie: Cookie) -> dict[str, Any]:
+    data = {field: getattr(cookie, field) for field in _COOKIE_FIELDS}
+    data["rest"] = dict(getattr(cookie, "_rest", {}) or {})
+    return data
+
+
+def _cookies_to_list(cookies: Any) -> list[dict[str, Any]]:
+    if not cookies:
+        return []
+    # RequestsCookieJar is also a MutableMapping, so test for a jar first.
+    if not isinstance(cookies, CookieJar) and isinstance(cookies, Mapping):
+        return [{"name": str(k), "value": str(v)} for k, v in cookies.items()]
+    return [_cookie_to_dict(cookie) for cookie in cookies if isinstance(cookie, Cookie)]
+
+
+def _tokens_to_dict(token_cache: Mapping[str, Any]) -> dict[str, dict[str, Any]]:
+    return {
+        key: {
+            "name": token.name,
+            "value": token.value,
+            "extracted_at": token.extracted_at,
+            "ttl": token.ttl,
+        }
+        for key, token in token_cache.items()
+    }
+
+
+def session_to_document(session: Any) -> dict[str, Any]:
+    """Project a session object onto the versioned session document.
+
+    Accepts a ``BrowserSession``, a ``requests.Session``, a previously
+    decoded :class:`StoredSession`, or any object with ``cookies`` and
+    ``headers`` attributes.
+
+    Args:
+        session: Session object to project.
+
+    Returns:
+        JSON-serializable document dict.
+    """
+    headers = getattr(session, "headers", None) or {}
+    # BrowserSession.session_name is a property that may query the driver, so
+    # read the stored name directly.
+    session_name = getattr(session, "_session_name", None) or getattr(session, "__dict__", {}).get(
+        "session_name", "default"
+    )
+    return {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "session_name": session_name,
+        "backend_type": getattr(session, "_backend_type", "") or "",
+        "current_url": getattr(session, "current_url", "") or "",
+        "cookies": _cookies_to_list(getattr(session, "cookies", None)),
+        "headers": {str(k): str(v) for k, v in headers.items()},
+        "header_roles": dict(getattr(session, _HEADER_ROLES_ATTR, None) or {}),
+        "cached_tokens": _tokens_to_dict(getattr(session, _CACHED_TOKENS_ATTR, None) or {}),
+        "csrf_tokens": dict(getattr(session, _CSRF_TOKENS_ATTR, None) or {}),
+    }
+
+
+def session_from_document(document: Mapping[str, Any]) -> StoredSession:
+    """Build a :class:`StoredSession` from a session document.
+
+    Args:
+        document: Parsed session document.
+
+    Returns:
+        The decoded session.
+
+    Raises:
+        SessionFormatError: If the document is not a supported session document.
+    """
+    if document.get("format") != FORMAT_NAME:
+        raise SessionFormatError("Not a graftpunk session document")
+    version = document.get("version")
+    if not isinstance(version, int) or version > FORMAT_VERSION:
+        raise SessionFormatError(
+            f"Unsupported session format version {version!r} "
+            f"(this graftpunk reads up to {FORMAT_VERSION}); upgrade graftpunk"
+        )
+
+    from graftpunk.tokens import CachedToken
+
+    session = StoredSession()
+    # Start from an empty header set so requests' defaults (python-requests UA,
+    # Accept, ...) are only present if the original session carried them.
+    session.headers.clear()
+    try:
+        session.headers.update(document.get("headers", {}))
+        for cookie in document.get("cookies", []):
+            session.cookies.set_cookie(requests.cookies.create_cookie(**cookie))
+        session.current_url = document.get("current_url", "")
+        session.session_name = document.get("session_name", "default")
+        session._backend_type = document.get("backend_type", "")
+        session._gp_header_roles = dict(document.get("header_roles", {}))
+        session._gp_cached_tokens = {
+            key: CachedToken(**token) for key, token in document.get("cached_tokens", {}).items()
+        }
+        session._gp_csrf_tokens = dict(document.get("csrf_tokens", {}))
+    except (TypeError, ValueError, AttributeError) as exc:
+        raise SessionFormatError(f"Malformed session document: {exc}") from exc
+    return session
+
+
+def dumps_session(session: Any) -> bytes:
+    """Serialize a session to the current wire format.
+
+    Output is deterministic (sorted keys, compact separators) so identical
+    session state always produces an identical checksum.
+
+    Raises:
+        SessionFormatError: If the session holds values that cannot be encoded.
+    """
+    try:
+        return json.dumps(
+            session_to_document(session), separators=(",", ":"), sort_keys=True
+        ).encode("utf-8")
+    except (TypeError, ValueError) as exc:
+        raise SessionFormatError(f"Cannot encode session: {exc}") from exc
+
+
+def loads_session(data: bytes) -> StoredSession:
+    """Deserialize a session written by :func:`dumps_session`.
+
+    Raises:
+        SessionFormatError: If the data is not a valid session document.
+    """
+    try:
+        document = json.loads(data)
+    except (UnicodeDecodeError, ValueError) as exc:
+        raise SessionFormatError(f"Malformed session document: {exc}") from exc
+    if not isinstance(document, dict):
+        raise SessionFormatError("Malformed session document: expected a JSON object")
+    return session_from_document(document)
@@ -8,7 +8,9 @@ Storage backends are discovered via entry points, allowing custom backends
 to be installed as separate packages.
 """
 
+from graftpunk.storage.aio import AsyncSessionStorage
 from graftpunk.storage.base import (
+    AsyncSessionStorageBackend,
     SessionMetadata,
     SessionStorageBackend,
     parse_datetime_iso,
@@ -16,6 +18,8 @@ from graftpunk.storage.base import (
 from graftpunk.storage.local import LocalSessionStorage
 
 __all__ = [
+    "AsyncSessionStorage",
+    "AsyncSessionStorageBackend",
     "SessionMetadata",
     "SessionStorageBackend",
     "parse_datetime_iso",
@@ -0,0 +1,108 @@
+"""Async access to session storage backends.
+
+:class:`AsyncSessionStorage` adapts any :class:`SessionStorageBackend` (local,
+S3, Supabase, tiered or third-party) to :class:`AsyncSessionStorageBackend`
+by running each call in a worker thread with :func:`asyncio.to_thread`.
+
+Offloading the existing synchronous backends, rather than maintaining
+separate aiobotocore/httpx implementations, keeps one code path for retries,
+the session index and the local cache. File I/O, HTTP round trips and retry
+backoff sleeps all happen off the event loop.
+
+Third-party backends predating the batch API (no
+``list_sessions_with_metadata`` or ``delete_sessions``) fall back to one
+call per session, as :mod:`graftpunk.cache` does.
+"""
+
+import asyncio
+
+from graftpunk.storage.base import SessionMetadata, SessionStorageBackend
+
+
+class AsyncSessionStorage:
+    """Async adapter over a synchronous session storage backend.
+
+    Example:
+        >>> storage = AsyncSessionStorage(LocalSessionStorage())
+        >>> names = await storage.list_sessions()
+    """
+
+    def __init__(self, backend: SessionStorageBackend) -> None:
+        """Initialize the adapter.
+
+        Args:
+            backend: Synchronous backend that performs the actual storage
+        """
+        self.backend = backend
+
+    @property
+    def storage_backend(self) -> str:
+        """Backend type identifier of the wrapped backend."""
+        return self.backend.storage_backend
+
+    @property
+    def storage_location(self) -> str:
+        """Display-friendly storage location of the wrapped backend."""
+        return self.backend.storage_location
+
+    async def save_session(
+        self,
+        name: str,
+        encrypted_data: bytes,
+        metadata: SessionMetadata,
+    ) -> str:
+        """Save encrypted session data and return storage location."""
+        return await asyncio.to_thread(self.backend.save_session, name, encrypted_data, metadata)
+
+    async def load_session(self, name: str) -> tuple[bytes, SessionMetadata]:
+        """Load encrypted session data and metadata.
+
+        Raises:
+            SessionNotFoundError: If session doesn't exist
+            SessionExpiredError: If session TTL exceeded
+        """
+        return await asyncio.to_thread(self.backend.load_session, name)
+
+    async def list_sessions(self) -> list[str]:
+        """List all session names."""
+        return await asyncio.to_thread(self.backend.list_sessions)
+
+    async def list_sessions_with_metadata(self) -> list[SessionMetadata]:
+        """Get metadata for every stored session."""
+        batch_list = getattr(self.backend, "list_sessions_with_metadata", None)
+        if batch_list is not None:
+            return await asyncio.to_thread(batch_list)
+        return await asyncio.to_thread(self._list_metadata_one_by_one)
+
+    def _list_metadata_one_by_one(self) -> list[SessionMetadata]:
+        return [
+            metadata
+            for metadata in map(self.backend.get_session_metadata, self.backend.list_sessions())
+            if metadata is not None
+        ]
+
+    async def delete_session(self, name: str) -> bool:
+        """Delete a session."""
+        return await asyncio.to_thread(self.backend.delete_session, name)
+
+    async def delete_sessions(self, names: list[str]) -> list[str]:
+        """Delete several sessions."""
+        bulk_delete = getattr(self.backend, "delete_sessions", None)
+        if bulk_delete is not None:
+            return await asyncio.to_thread(bulk_delete, names)
+        return await asyncio.to_thread(self._delete_one_by_one, names)
+
+    def _delete_one_by_one(self, names: list[str]) -> list[str]:
+        return [name for name in names if self.backend.delete_session(name)]
+
+    async def get_session_metadata(self, name: str) -> SessionMetadata | None:
+        """Get session metadata without loading the full session."""
+        return await asyncio.to_thread(self.backend.get_session_metadata, name)
+
+    async def update_session_metadata(
+        self,
+        name: str,
+        status: str | None = None,
+    ) -> bool:
+        """Update session metadata fields."""
+        return await asyncio.to_thread(self.backend.update_session_metadata, name, status=status)
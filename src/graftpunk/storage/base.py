@@ -1,5 +1,7 @@
 """Base protocols and data classes for session storage backends."""
 
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Protocol
@@ -7,6 +9,10 @@ from typing import TYPE_CHECKING, Protocol
 if TYPE_CHECKING:
     from typing import Any
 
+# Upper bound on concurrent metadata fetches for remote backends. Metadata
+# objects are tiny, so listing is latency-bound rather than bandwidth-bound.
+METADATA_FETCH_WORKERS = 16
+
 
 def parse_datetime_iso(value: str | None) -> datetime | None:
     """Parse ISO datetime string to datetime with UTC timezone.
@@ -66,6 +72,8 @@ class SessionMetadata:
         status: Session status ("active", "logged_out")
         storage_backend: Backend that stored this session (e.g., "local", "s3")
         storage_location: Where the session is stored (path or URI)
+        generation: Write counter incremented on every save or metadata
+            update by backends that track it (local); 0 when untracked
     """
 
     name: str
@@ -80,6 +88,7 @@ class SessionMetadata:
     status: str = "active"
     storage_backend: str = ""
     storage_location: str = ""
+    generation: int = 0
 
 
 def metadata_to_dict(metadata: SessionMetadata) -> dict[str, "Any"]:
@@ -104,6 +113,7 @@ def metadata_to_dict(metadata: SessionMetadata) -> dict[str, "Any"]:
         "status": metadata.status,
         "storage_backend": metadata.storage_backend,
         "storage_location": metadata.storage_location,
+        "generation": metadata.generation,
     }
 
 
@@ -129,9 +139,38 @@ def dict_to_metadata(data: dict[str, "Any"]) -> SessionMetadata:
         status=data.get("status", "active"),
         storage_backend=data.get("storage_backend", ""),
         storage_location=data.get("storage_location", ""),
+        generation=data.get("generation", 0),
     )
 
 
+def fetch_metadata_concurrently(
+    names: Iterable[str],
+    fetch: Callable[[str], SessionMetadata | None],
+    max_workers: int = METADATA_FETCH_WORKERS,
+) -> list[SessionMetadata]:
+    """Fetch metadata for many sessions in parallel.
+
+    Used by remote backends to turn N sequential round-trips into roughly
+    one round-trip of wall-clock time.
+
+    Args:
+        names: Session identifiers to fetch
+        fetch: Per-session fetch function (e.g. ``get_session_metadata``)
+        max_workers: Maximum number of concurrent fetches
+
+    Returns:
+        Metadata for every session that exists, in input order.
+        Exceptions raised by ``fetch`` propagate to the caller.
+    """
+    names = list(names)
+    if not names:
+        return []
+    workers = max(1, min(max_workers, len(names)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(fetch, names))
+    return [metadata for metadata in results if metadata is not None]
+
+
 class SessionStorageBackend(Protocol):
     """Protocol defining session storage backend interface.
 
@@ -152,7 +191,7 @@ class SessionStorageBackend(Protocol):
 
         Args:
             name: Session identifier (e.g., "humaninterest")
-            encrypted_data: Already-encrypted session bytes (Fernet)
+            encrypted_data: Already-encrypted session bytes
             metadata: Session metadata for querying and TTL
 
         Returns:
@@ -201,6 +240,17 @@ class SessionStorageBackend(Protocol):
         """
         ...
 
+    def delete_sessions(self, names: list[str]) -> list[str]:
+        """Delete several sessions, batching requests where the store allows.
+
+        Args:
+            names: Session identifiers
+
+        Returns:
+            Names that were deleted
+        """
+        ...
+
     def get_session_metadata(self, name: str) -> SessionMetadata | None:
         """Get session metadata without loading the full session.
 
@@ -215,6 +265,19 @@ class SessionStorageBackend(Protocol):
         """
         ...
 
+    def list_sessions_with_metadata(self) -> list[SessionMetadata]:
+        """Get metadata for every stored session in one batched operation.
+
+        Equivalent to calling ``get_session_metadata`` for each name from
+        ``list_sessions``, but implementations avoid the per-session round
+        trip (single directory scan, concurrent or batched fetches).
+
+        Returns:
+            Metadata for all sessions that have readable metadata, in no
+            particular order
+        """
+        ...
+
     def update_session_metadata(
         self,
         name: str,
@@ -243,3 +306,63 @@ class SessionStorageBackend(Protocol):
     def storage_location(self) -> str:
         """Display-friendly storage location (e.g., "s3://bucket", "~/.config/...")."""
         ...
+
+
+class AsyncSessionStorageBackend(Protocol):
+    """Awaitable counterpart of :class:`SessionStorageBackend`.
+
+    Same methods and semantics, but every operation is a coroutine so callers
+    running an event loop (nodriver login flows, async applications) can
+    persist sessions without blocking it.
+    """
+
+    async def save_session(
+        self,
+        name: str,
+        encrypted_data: bytes,
+        metadata: SessionMetadata,
+    ) -> str:
+        """Save encrypted session data and return storage location."""
+        ...
+
+    async def load_session(self, name: str) -> tuple[bytes, SessionMetadata]:
+        """Load encrypted session data and metadata."""
+        ...
+
+    async def list_sessions(self) -> list[str]:
+        """List all session names."""
+        ...
+
+    async def list_sessions_with_metadata(self) -> list[SessionMetadata]:
+        """Get metadata for every stored session in one batched operation."""
+        ...
+
+    async def delete_session(self, name: str) -> bool:
+        """Delete a session."""
+        ...
+
+    async def delete_sessions(self, names: list[str]) -> list[str]:
+        """Delete several sessions, batching requests where the store allows."""
+        ...
+
+    async def get_session_metadata(self, name: str) -> SessionMetadata | None:
+        """Get session metadata without loading the full session."""
+        ...
+
+    async def update_session_metadata(
+        self,
+        name: str,
+        status: str | None = None,
+    ) -> bool:
+        """Update session metadata fields."""
+        ...
+
+    @property
+    def storage_backend(self) -> str:
+        """Backend type identifier (e.g., "local", "s3", "r2", "supabase")."""
+        ...
+
+    @property
+    def storage_location(self) -> str:
+        """Display-friendly storage location (e.g., "s3://bucket", "~/.config/...")."""
+        ...
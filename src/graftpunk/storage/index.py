@@ -0,0 +1,126 @@
+"""Consolidated session index shared by the remote storage backends.
+
+Remote backends can keep a single small JSON object (``_index.json``) that maps
+every session name to its metadata. Listing then reads one object instead of
+walking the bucket and fetching ``metadata.json`` per session.
+
+The index is an optimization, never the source of truth: the per-session
+``metadata.json`` objects remain authoritative. Writers update the index with
+optimistic concurrency (read, mutate, conditional write, retry on conflict);
+when an update cannot be completed the backend deletes the index so readers
+fall back to walking the bucket until the next write rebuilds it. Stores
+without conditional writes (Supabase) can still lose an update, so their
+index is advisory and checked against a bucket listing before use.
+"""
+
+import json
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from graftpunk.logging import get_logger
+from graftpunk.storage.base import SessionMetadata, dict_to_metadata, metadata_to_dict
+
+LOG = get_logger(__name__)
+
+INDEX_OBJECT_NAME = "_index.json"
+INDEX_VERSION = 1
+
+# Conditional-write attempts before giving up and invalidating the index.
+INDEX_UPDATE_ATTEMPTS = 5
+
+IndexEntries = dict[str, SessionMetadata]
+
+
+@dataclass(frozen=True)
+class SessionIndex:
+    """Decoded index document.
+
+    Attributes:
+        entries: Session name -> metadata for every indexed session
+        revision: Random token rewritten on every update. Stores without
+            conditional writes compare it to catch most concurrent updates;
+            it narrows the race but cannot rule out a lost update
+    """
+
+    entries: IndexEntries = field(default_factory=dict)
+    revision: str = ""
+
+
+def encode_index(entries: IndexEntries) -> tuple[bytes, str]:
+    """Serialize index entries under a fresh revision.
+
+    Args:
+        entries: Session name -> metadata
+
+    Returns:
+        Tuple of (encoded document, new revision)
+    """
+    revision = uuid.uuid4().hex
+    document = {
+        "version": INDEX_VERSION,
+        "revision": revision,
+        "sessions": {name: metadata_to_dict(meta) for name, meta in sorted(entries.items())},
+    }
+    return json.dumps(document, separators=(",", ":")).encode("utf-8"), revision
+
+
+def decode_index(data: bytes) -> SessionIndex | None:
+    """Parse an index document.
+
+    Args:
+        data: Raw index object bytes
+
+    Returns:
+        The decoded index, or None if the document is malformed or written by
+        a newer, incompatible version (callers then ignore the index)
+    """
+    try:
+        document = json.loads(data)
+        if not isinstance(document, dict) or document.get("version") != INDEX_VERSION:
+            return None
+        sessions: dict[str, Any] = document.get("sessions", {})
+        entries = {name: dict_to_metadata(meta) for name, meta in sessions.items()}
+        return SessionIndex(entries=entries, revision=str(document.get("revision", "")))
+    except (UnicodeDecodeError, ValueError, TypeError, AttributeError) as exc:
+        LOG.warning("session_index_invalid", error=str(exc))
+        return None
+
+
+def update_index(
+    read: Callable[[], tuple[SessionIndex, Any] | None],
+    write: Callable[[bytes, str, Any], bool],
+    rebuild: Callable[[], IndexEntries],
+    mutate: Callable[[IndexEntries], None],
+    attempts: int = INDEX_UPDATE_ATTEMPTS,
+) -> bool:
+    """Apply ``mutate`` to the index with optimistic concurrency.
+
+    Args:
+        read: Returns ``(index, token)`` or None when no index exists. The
+            token is opaque to this function (an ETag, a revision, ...).
+        write: Called as ``write(data, revision, token)``; writes the encoded
+            index conditioned on ``token`` (None means "create only if
+            absent") and returns False on a conflict.
+        rebuild: Produces entries from a full bucket walk, used to seed the
+            index when it does not exist yet.
+        mutate: Edits the entries in place.
+        attempts: Conflict retries before giving up.
+
+    Returns:
+        True if the update was written, False if every attempt conflicted.
+    """
+    for attempt in range(attempts):
+        current = read()
+        if current is None:
+            entries, token = rebuild(), None
+        else:
+            index, token = current
+            entries = dict(index.entries)
+        mutate(entries)
+        data, revision = encode_index(entries)
+        if write(data, revision, token):
+            return True
+        LOG.debug("session_index_conflict", attempt=attempt + 1, max_attempts=attempts)
+    return False
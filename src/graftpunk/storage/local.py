@@ -1,8 +1,11 @@
 """Local filesystem session storage backend."""
 
+import contextlib
 import json
 import os
 import shutil
+import tempfile
+from collections.abc import Iterator
 from dataclasses import replace
 from datetime import UTC, datetime
 from pathlib import Path
@@ -12,8 +15,51 @@ from graftpunk.exceptions import SessionExpiredError, SessionNotFoundError
 from graftpunk.logging import get_logger
 from graftpunk.storage.base import SessionMetadata, parse_datetime_iso
 
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, writes are still atomic
+    fcntl = None  # type: ignore[assignment]
+
 LOG = get_logger(__name__)
 
+# Per-session lock files live outside the session directories so deleting a
+# session never unlinks a lock another process is holding.
+LOCK_DIR_NAME = ".locks"
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Replace ``path`` with ``data`` without exposing a partial file.
+
+    The bytes go to a 0o600 temp file in the same directory, are fsynced, and
+    the temp file is renamed over ``path``; readers see the old or the new
+    content, never a truncated one.
+    """
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+def _fsync_dir(path: Path) -> None:
+    """Persist directory entries (renames) where the platform supports it."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
 
 class LocalSessionStorage:
     """Local filesystem session storage (backward compatible).
@@ -21,7 +67,12 @@ class LocalSessionStorage:
     Storage structure: {base_dir}/{name}/session.pickle + metadata.json
 
     Features:
-    - Atomic writes with secure permissions (0o600)
+    - Atomic, fsynced writes (temp file + ``os.replace``) with secure
+      permissions (0o600)
+    - Per-session advisory file lock: writers are exclusive, loads take a
+      shared lock so they never see session.pickle and metadata.json from
+      different saves
+    - Generation counter in metadata.json, incremented on every write
     - TTL enforcement via metadata.json
     - Backward compatible with existing sessions
     """
@@ -57,6 +108,48 @@ class LocalSessionStorage:
         except ValueError:
             return str(self.base_dir)
 
+    @contextlib.contextmanager
+    def _session_lock(self, name: str, *, shared: bool = False) -> Iterator[None]:
+        """Hold the advisory lock for one session.
+
+        Args:
+            name: Session identifier
+            shared: Take a shared (reader) lock instead of an exclusive one.
+                Readers proceed unlocked if the lock file cannot be created
+                (e.g. a read-only sessions directory).
+        """
+        if fcntl is None:
+            yield
+            return
+        lock_path = self.base_dir / LOCK_DIR_NAME / f"{name}.lock"
+        try:
+            lock_path.parent.mkdir(exist_ok=True)
+            fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        except OSError as exc:
+            if not shared:
+                raise
+            LOG.debug("session_lock_unavailable", name=name, error=str(exc))
+            yield
+            return
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _read_generation(metadata_path: Path) -> int:
+        """Return the stored generation, or 0 if there is no readable metadata."""
+        try:
+            with metadata_path.open() as f:
+                return int(json.load(f).get("generation", 0))
+        except (OSError, ValueError, TypeError, AttributeError):
+            return 0
+
+    def _write_metadata(self, metadata_path: Path, metadata_dict: dict[str, Any]) -> None:
+        data = json.dumps(metadata_dict, indent=2, default=str).encode("utf-8")
+        _atomic_write(metadata_path, data)
+
     def save_session(
         self,
         name: str,
@@ -65,6 +158,12 @@ class LocalSessionStorage:
     ) -> str:
         """Save encrypted session to local filesystem.
 
+        Both files are replaced atomically while holding the session's
+        exclusive lock, so concurrent savers (keepalive daemon, CLI, cron)
+        serialize instead of interleaving into a checksum mismatch. The
+        stored generation is the previous one plus one; the generation on
+        ``metadata`` is ignored.
+
         Args:
             name: Session identifier
             encrypted_data: Already-encrypted session bytes
@@ -76,32 +175,67 @@ class LocalSessionStorage:
         Raises:
             OSError: If save fails
         """
-        session_dir = self.base_dir / name
-        session_dir.mkdir(parents=True, exist_ok=True)
+        LOG.info("session_save_started", name=name, path=str(self.base_dir / name))
+        with self._session_lock(name):
+            return self._write_session(name, encrypted_data, metadata)
 
-        pickle_path = session_dir / "session.pickle"
-        metadata_path = session_dir / "metadata.json"
+    def replace_session(
+        self,
+        name: str,
+        encrypted_data: bytes,
+        metadata: SessionMetadata,
+    ) -> bool:
+        """Save a session only if nothing was written since it was loaded.
 
-        LOG.info("session_save_started", name=name, path=str(pickle_path))
+        Compare-and-swap on the generation counter: under the session's
+        exclusive lock, the stored generation must still equal
+        ``metadata.generation`` (as returned by :meth:`load_session`).
 
-        # Write encrypted pickle file with secure permissions from creation
-        fd = os.open(pickle_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
-        with os.fdopen(fd, "wb") as f:
-            f.write(encrypted_data)
+        Args:
+            name: Session identifier
+            encrypted_data: Already-encrypted session bytes
+            metadata: Metadata of the session as it was loaded
+
+        Returns:
+            True if saved, False if the session changed or disappeared since
 
+        Raises:
+            OSError: If save fails
+        """
+        session_dir = self.base_dir / name
+        with self._session_lock(name):
+            exists = session_dir.is_dir() or (self.base_dir / f"{name}.session.pickle").exists()
+            if not exists or (
+                self._read_generation(session_dir / "metadata.json") != metadata.generation
+            ):
+                LOG.info("session_replace_conflict", name=name, generation=metadata.generation)
+                return False
+            self._write_session(name, encrypted_data, metadata)
+        return True
+
+    def _write_session(self, name: str, encrypted_data: bytes, metadata: SessionMetadata) -> str:
+        """Write both session files (caller holds the exclusive lock)."""
+        session_dir = self.base_dir / name
+        metadata_path = session_dir / "metadata.json"
+
+        session_dir.mkdir(parents=True, exist_ok=True)
         # Stamp storage identity fields before serialization
         metadata = replace(
             metadata,
             storage_backend=self.storage_backend,
             storage_location=self.storage_location,
+            generation=self._read_generation(metadata_path) + 1,
         )
+        _atomic_write(session_dir / "session.pickle", encrypted_data)
+        self._write_metadata(metadata_path, self._metadata_to_dict(metadata))
+        _fsync_dir(session_dir)
 
-        # Write metadata
-        metadata_dict = self._metadata_to_dict(metadata)
-        with metadata_path.open("w") as f:
-            json.dump(metadata_dict, f, indent=2, default=str)
-
-        LOG.info("session_save_completed", name=name, path=str(session_dir))
+        LOG.info(
+            "session_save_completed",
+            name=name,
+            path=str(session_dir),
+            generation=metadata.generation,
+        )
         return str(session_dir)
 
     def load_session(
@@ -131,6 +265,11 @@ class LocalSessionStorage:
             LOG.warning("session_not_found", name=name)
             raise SessionNotFoundError(f"Session '{name}' not found")
 
+        with self._session_lock(name, shared=True):
+            return self._load_session_files(name, session_dir)
+
+    def _load_session_files(self, name: str, session_dir: Path) -> tuple[bytes, SessionMetadata]:
+        """Read and validate a session directory (caller holds the lock)."""
         pickle_path = session_dir / "session.pickle"
         metadata_path = session_dir / "metadata.json"
 
@@ -254,6 +393,11 @@ class LocalSessionStorage:
         Returns:
             True if deleted, False if not found
         """
+        with self._session_lock(name):
+            return self._delete_session_files(name)
+
+    def _delete_session_files(self, name: str) -> bool:
+        """Remove a session's files (caller holds the lock)."""
         session_dir = self.base_dir / name
 
         if session_dir.is_dir():
@@ -278,6 +422,17 @@ class LocalSessionStorage:
 
         return False
 
+    def delete_sessions(self, names: list[str]) -> list[str]:
+        """Delete several sessions.
+
+        Args:
+            names: Session identifiers
+
+        Returns:
+            Names that were deleted
+        """
+        return [name for name in names if self.delete_session(name)]
+
     def get_session_metadata(self, name: str) -> SessionMetadata | None:
         """Get session metadata without loading the full session.
 
@@ -301,6 +456,40 @@ class LocalSessionStorage:
             LOG.warning("failed_to_read_session_metadata", name=name, error=str(exc))
             return None
 
+    def list_sessions_with_metadata(self) -> list[SessionMetadata]:
+        """Get metadata for all sessions with a single directory scan.
+
+        Legacy flat-file sessions have no metadata and are omitted, matching
+        ``get_session_metadata``.
+
+        Returns:
+            Metadata for all sessions that have readable metadata
+        """
+        results: list[SessionMetadata] = []
+        try:
+            entries = list(os.scandir(self.base_dir))
+        except OSError as exc:
+            LOG.error("failed_to_list_sessions", error=str(exc))
+            return []
+
+        for entry in entries:
+            session_dir = Path(entry.path)
+            if not entry.is_dir() or not (session_dir / "session.pickle").exists():
+                continue
+            metadata_path = session_dir / "metadata.json"
+            try:
+                with metadata_path.open() as f:
+                    metadata_dict = json.load(f)
+            except FileNotFoundError:
+                continue
+            except (OSError, json.JSONDecodeError) as exc:
+                LOG.warning("failed_to_read_session_metadata", name=entry.name, error=str(exc))
+                continue
+            results.append(self._dict_to_metadata(metadata_dict))
+
+        LOG.debug("session_metadata_list_completed", count=len(results))
+        return results
+
     def update_session_metadata(
         self,
         name: str,
@@ -324,19 +513,21 @@ class LocalSessionStorage:
         if not metadata_path.exists():
             return False
 
+        if status is not None and status not in ("active", "logged_out"):
+            raise ValueError(f"Invalid status '{status}'. Must be 'active' or 'logged_out'")
+
         try:
-            with metadata_path.open("r") as f:
-                metadata_dict = json.load(f)
+            with self._session_lock(name):
+                with metadata_path.open("r") as f:
+                    metadata_dict = json.load(f)
 
-            if status is not None:
-                if status not in ("active", "logged_out"):
-                    raise ValueError(f"Invalid status '{status}'. Must be 'active' or 'logged_out'")
-                metadata_dict["status"] = status
+                if status is not None:
+                    metadata_dict["status"] = status
 
-            metadata_dict["modified_at"] = datetime.now(UTC).isoformat()
+                metadata_dict["modified_at"] = datetime.now(UTC).isoformat()
+                metadata_dict["generation"] = int(metadata_dict.get("generation", 0)) + 1
 
-            with metadata_path.open("w") as f:
-                json.dump(metadata_dict, f, indent=2, default=str)
+                self._write_metadata(metadata_path, metadata_dict)
 
             LOG.info("session_metadata_updated", name=name, status=status)
             return True
@@ -366,6 +557,7 @@ class LocalSessionStorage:
             "status": metadata.status,
             "storage_backend": metadata.storage_backend,
             "storage_location": metadata.storage_location,
+            "generation": metadata.generation,
         }
 
     def _dict_to_metadata(self, data: dict[str, Any]) -> SessionMetadata:
@@ -395,4 +587,5 @@ class LocalSessionStorage:
             status=data.get("status", "active"),
             storage_backend=data.get("storage_backend", ""),
             storage_location=data.get("storage_location", ""),
+            generation=data.get("generation", 0),
         )
@@ -13,16 +13,21 @@ Configuration:
     - endpoint_url: Custom endpoint for R2/MinIO (e.g., https://<account>.r2.cloudflarestorage.com)
     - max_retries: Maximum retry attempts for transient failures (default: 3)
     - base_delay: Base delay in seconds for exponential backoff (default: 1.0)
+    - use_index: Maintain sessions/_index.json for single-object listing (default: False)
+    - concurrent_writes: Put session data and metadata in parallel (default: False)
 
 Storage Structure:
     sessions/{name}/session.pickle - Encrypted session data
     sessions/{name}/metadata.json - Session metadata
+    sessions/_index.json - Optional consolidated index of all session metadata
 """
 
 import json
 import random
+import threading
 import time
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import replace
 from datetime import UTC, datetime
 from typing import Any
@@ -32,11 +37,49 @@ from graftpunk.logging import get_logger
 from graftpunk.storage.base import (
     SessionMetadata,
     dict_to_metadata,
+    fetch_metadata_concurrently,
     metadata_to_dict,
 )
+from graftpunk.storage.index import (
+    INDEX_OBJECT_NAME,
+    IndexEntries,
+    SessionIndex,
+    decode_index,
+    update_index,
+)
 
 LOG = get_logger(__name__)
 
+# Connection pool size for the shared botocore client; also bounds the shared
+# I/O thread pool so concurrent requests never queue for a connection.
+S3_MAX_POOL_CONNECTIONS = 32
+
+# delete_objects accepts at most 1000 keys per request.
+S3_DELETE_BATCH_SIZE = 1000
+
+# boto3 clients are thread-safe and own their connection pool, so every
+# S3SessionStorage pointing at the same endpoint shares one client.
+_shared_clients: dict[tuple[str | None, str | None], Any] = {}
+_shared_clients_lock = threading.Lock()
+
+_io_executor: ThreadPoolExecutor | None = None
+_io_executor_lock = threading.Lock()
+
+
+def _get_io_executor() -> ThreadPoolExecutor:
+    """Return the process-wide thread pool used for pipelined S3 requests."""
+    global _io_executor
+    with _io_executor_lock:
+        if _io_executor is None:
+            _io_executor = ThreadPoolExecutor(
+                max_workers=S3_MAX_POOL_CONNECTIONS, thread_name_prefix="graftpunk-s3"
+            )
+        return _io_executor
+
+
+class _IndexUnsupportedError(StorageError):
+    """The client or store cannot make conditional PUTs, so no index is kept."""
+
 
 class S3SessionStorage:
     """S3-compatible session storage backend.
@@ -51,6 +94,10 @@ class S3SessionStorage:
     - Exponential backoff retry for transient failures
     - Client injection for testing
     - Region='auto' handling for Cloudflare R2
+    - Optional consolidated index updated with If-Match conditional writes
+      (disabled for the process if the store or botocore cannot make them)
+    - Shared, pooled client and optional concurrent data/metadata puts
+    - Bulk deletes via delete_objects
     """
 
     def __init__(
@@ -61,6 +108,8 @@ class S3SessionStorage:
         max_retries: int = 3,
         base_delay: float = 1.0,
         client: Any | None = None,
+        use_index: bool = False,
+        concurrent_writes: bool = False,
     ) -> None:
         """Initialize S3 session storage.
 
@@ -71,6 +120,14 @@ class S3SessionStorage:
             max_retries: Maximum retry attempts for transient failures
             base_delay: Base delay in seconds for exponential backoff
             client: Optional pre-configured boto3 S3 client (for testing)
+            use_index: Maintain a consolidated ``sessions/_index.json`` so that
+                listing reads one object instead of walking the bucket. Turned
+                off for the rest of the process if the store does not support
+                conditional PUTs (``If-Match``/``If-None-Match``).
+            concurrent_writes: Upload session data and metadata in parallel.
+                Halves save latency; if one of the two puts fails the pair
+                may be left inconsistent until the next save (loads then fail
+                checksum verification rather than returning stale data).
 
         Raises:
             StorageError: If boto3 is not installed
@@ -80,6 +137,9 @@ class S3SessionStorage:
         self.endpoint_url = endpoint_url
         self.max_retries = max_retries
         self.base_delay = base_delay
+        self.use_index = use_index
+        self.concurrent_writes = concurrent_writes
+        self._index_lock = threading.Lock()
 
         if client is not None:
             self._client = client
@@ -91,6 +151,8 @@ class S3SessionStorage:
             bucket=bucket,
             region=region,
             endpoint_url=endpoint_url,
+            use_index=use_index,
+            concurrent_writes=concurrent_writes,
         )
 
     @property
@@ -114,7 +176,11 @@ class S3SessionStorage:
         return f"{self.storage_backend}://{self.bucket}"
 
     def _create_client(self) -> Any:
-        """Create boto3 S3 client.
+        """Return the shared boto3 S3 client for this region and endpoint.
+
+        The client is created once per (region, endpoint) with a connection
+        pool sized for concurrent requests and TCP keepalive enabled, then
+        reused by every storage instance in the process.
 
         Returns:
             Configured boto3 S3 client
@@ -124,23 +190,39 @@ class S3SessionStorage:
         """
         try:
             import boto3
+            from botocore.config import Config
         except ImportError as exc:
             raise StorageError(
                 "boto3 is required for S3 storage. "
                 "Install with: pip install graftpunk[s3] or pip install boto3"
             ) from exc
 
-        # Build client kwargs
-        client_kwargs: dict[str, Any] = {}
-
-        # Handle region='auto' for Cloudflare R2 (ignores region)
-        if self.region and self.region != "auto":
-            client_kwargs["region_name"] = self.region
-
-        if self.endpoint_url:
-            client_kwargs["endpoint_url"] = self.endpoint_url
-
-        return boto3.client("s3", **client_kwargs)
+        cache_key = (self.region, self.endpoint_url)
+        with _shared_clients_lock:
+            client = _shared_clients.get(cache_key)
+            if client is not None:
+                return client
+
+            # Build client kwargs
+            client_kwargs: dict[str, Any] = {
+                "config": Config(
+                    max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+                    tcp_keepalive=True,
+                ),
+            }
+
+            # Handle region='auto' for Cloudflare R2 (ignores region)
+            if self.region and self.region != "auto":
+                client_kwargs["region_name"] = self.region
+
+            if self.endpoint_url:
+                client_kwargs["endpoint_url"] = self.endpoint_url
+
+            # Creating clients on the default boto3 session is not
+            # thread-safe, so this stays under the lock.
+            client = boto3.client("s3", **client_kwargs)
+            _shared_clients[cache_key] = client
+            return client
 
     def _session_key(self, name: str) -> str:
         """Generate S3 key for session pickle data.
@@ -164,6 +246,10 @@ class S3SessionStorage:
         """
         return f"sessions/{name}/metadata.json"
 
+    def _index_key(self) -> str:
+        """S3 key of the consolidated session index."""
+        return f"sessions/{INDEX_OBJECT_NAME}"
+
     def _with_retry(
         self, operation: str, func: Callable[..., Any], *args: Any, **kwargs: Any
     ) -> Any:
@@ -253,16 +339,6 @@ class S3SessionStorage:
         session_key = self._session_key(name)
         metadata_key = self._metadata_key(name)
 
-        # Save encrypted session data with retry
-        self._with_retry(
-            "save_session_data",
-            self._client.put_object,
-            Bucket=self.bucket,
-            Key=session_key,
-            Body=encrypted_data,
-            ContentType="application/octet-stream",
-        )
-
         # Stamp storage identity onto metadata before serialization
         stamped = replace(
             metadata,
@@ -270,15 +346,52 @@ class S3SessionStorage:
             storage_location=self.storage_location,
         )
         metadata_json = json.dumps(metadata_to_dict(stamped), indent=2)
-        self._with_retry(
-            "save_session_metadata",
-            self._client.put_object,
-            Bucket=self.bucket,
-            Key=metadata_key,
-            Body=metadata_json.encode("utf-8"),
-            ContentType="application/json",
+
+        puts = (
+            (
+                "save_session_data",
+                {
+                    "Key": session_key,
+                    "Body": encrypted_data,
+                    "ContentType": "application/octet-stream",
+                },
+            ),
+            (
+                "save_session_metadata",
+                {
+                    "Key": metadata_key,
+                    "Body": metadata_json.encode("utf-8"),
+                    "ContentType": "application/json",
+                },
+            ),
         )
 
+        if self.concurrent_writes:
+            executor = _get_io_executor()
+            futures = [
+                executor.submit(
+                    self._with_retry, op, self._client.put_object, Bucket=self.bucket, **kwargs
+                )
+                for op, kwargs in puts
+            ]
+            # Wait for both before surfacing the first failure.
+            errors = [f.exception() for f in futures]
+            for error in errors:
+                if error is not None:
+                    raise error
+        else:
+            # Data before metadata, so a failed save never leaves metadata
+            # pointing at missing data.
+            for op, kwargs in puts:
+                self._with_retry(op, self._client.put_object, Bucket=self.bucket, **kwargs)
+
+        if self.use_index:
+
+            def _put(entries: IndexEntries) -> None:
+                entries[name] = stamped
+
+            self._update_index(_put)
+
         location = f"s3://{self.bucket}/{session_key}"
         LOG.info("session_saved", name=name, location=location)
         return location
@@ -346,6 +459,23 @@ class S3SessionStorage:
     def list_sessions(self) -> list[str]:
         """List all session names in the bucket.
 
+        Reads the consolidated index when enabled and present, otherwise
+        walks the ``sessions/`` prefix.
+
+        Returns:
+            Sorted list of session names
+
+        Raises:
+            StorageError: If listing fails due to S3 errors
+        """
+        index = self._load_index()
+        if index is not None:
+            return sorted(index.entries)
+        return self._walk_session_names()
+
+    def _walk_session_names(self) -> list[str]:
+        """List session names by paginating over the bucket.
+
         Returns:
             Sorted list of session names
 
@@ -401,9 +531,79 @@ class S3SessionStorage:
                 LOG.error("delete_object_failed", key=key, error=str(e))
                 raise StorageError(f"Failed to delete '{key}': {e}") from e
 
+        if self.use_index:
+
+            def _remove(entries: IndexEntries) -> None:
+                entries.pop(name, None)
+
+            self._update_index(_remove)
+
         LOG.info("session_deleted", name=name)
         return True
 
+    def delete_sessions(self, names: list[str]) -> list[str]:
+        """Delete many sessions with batched ``delete_objects`` requests.
+
+        Args:
+            names: Session identifiers
+
+        Returns:
+            Names whose data and metadata objects were both deleted
+
+        Raises:
+            StorageError: If a batch request fails after retries, or S3
+                reports per-key errors other than NoSuchKey
+        """
+        keys = [
+            key for name in names for key in (self._session_key(name), self._metadata_key(name))
+        ]
+        batches = [
+            keys[i : i + S3_DELETE_BATCH_SIZE] for i in range(0, len(keys), S3_DELETE_BATCH_SIZE)
+        ]
+
+        def _delete_batch(batch: list[str]) -> list[dict[str, Any]]:
+            response = self._with_retry(
+                "delete_sessions",
+                self._client.delete_objects,
+                Bucket=self.bucket,
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+            )
+            return list(response.get("Errors", []))
+
+        if len(batches) > 1:
+            results = list(_get_io_executor().map(_delete_batch, batches))
+        else:
+            results = [_delete_batch(batch) for batch in batches]
+
+        failed_keys = {
+            error["Key"]
+            for errors in results
+            for error in errors
+            if error.get("Code") not in ("NoSuchKey", "404")
+        }
+        deleted = [
+            name
+            for name in names
+            if self._session_key(name) not in failed_keys
+            and self._metadata_key(name) not in failed_keys
+        ]
+
+        if self.use_index and deleted:
+            gone = set(deleted)
+
+            def _remove(entries: IndexEntries) -> None:
+                for name in gone:
+                    entries.pop(name, None)
+
+            self._update_index(_remove)
+
+        if failed_keys:
+            LOG.error("delete_sessions_partial_failure", failed=sorted(failed_keys))
+            raise StorageError(f"Failed to delete: {', '.join(sorted(failed_keys))}")
+
+        LOG.info("sessions_deleted", count=len(deleted))
+        return deleted
+
     def get_session_metadata(self, name: str) -> SessionMetadata | None:
         """Get session metadata without loading session data.
 
@@ -434,6 +634,28 @@ class S3SessionStorage:
             LOG.error("get_session_metadata_failed", name=name, error=str(e))
             raise StorageError(f"Failed to get metadata for '{name}': {e}") from e
 
+    def list_sessions_with_metadata(self) -> list[SessionMetadata]:
+        """Get metadata for all sessions using the index or concurrent GETs.
+
+        With the index enabled this is a single GET. Otherwise it is one
+        paginated listing followed by parallel metadata fetches, so
+        wall-clock time stays close to a single round-trip.
+
+        Returns:
+            Metadata for all sessions that have metadata objects
+
+        Raises:
+            StorageError: If listing or fetching fails due to S3 errors
+        """
+        index = self._load_index()
+        if index is not None:
+            LOG.debug("session_metadata_list_completed", count=len(index.entries), source="index")
+            return list(index.entries.values())
+        names = self._walk_session_names()
+        metadata = fetch_metadata_concurrently(names, self.get_session_metadata)
+        LOG.debug("session_metadata_list_completed", count=len(metadata))
+        return metadata
+
     def update_session_metadata(
         self,
         name: str,
@@ -477,7 +699,160 @@ class S3SessionStorage:
                 ContentType="application/json",
             )
             LOG.info("metadata_updated", name=name, status=status)
-            return True
         except (ClientError, BotoCoreError) as e:
             LOG.error("metadata_update_failed", name=name, error=str(e))
             raise StorageError(f"Failed to update metadata for '{name}': {e}") from e
+
+        if self.use_index:
+
+            def _put(entries: IndexEntries) -> None:
+                entries[name] = new_metadata
+
+            self._update_index(_put)
+        return True
+
+    def rebuild_index(self) -> int:
+        """Rebuild the consolidated index from a full bucket walk.
+
+        Returns:
+            Number of sessions written to the index
+
+        Raises:
+            StorageError: If the bucket cannot be walked
+        """
+        entries = self._walk_metadata()
+
+        def _replace(current: IndexEntries) -> None:
+            current.clear()
+            current.update(entries)
+
+        self._update_index(_replace, rebuild=lambda: dict(entries))
+        return len(entries)
+
+    def _walk_metadata(self) -> IndexEntries:
+        """Fetch metadata for every session by walking the bucket."""
+        fetched = fetch_metadata_concurrently(self._walk_session_names(), self.get_session_metadata)
+        return {metadata.name: metadata for metadata in fetched}
+
+    def _read_index(self) -> tuple[SessionIndex, str] | None:
+        """Read the index object and its ETag.
+
+        Returns:
+            Tuple of (index, etag), or None if no index object exists. A
+            malformed index is replaced by a fresh walk under the existing ETag
+            so the next conditional write overwrites it.
+
+        Raises:
+            StorageError: If the read fails due to S3 errors
+        """
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        try:
+            response = self._client.get_object(Bucket=self.bucket, Key=self._index_key())
+            data = response["Body"].read()
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "")
+            if error_code in ("NoSuchKey", "404"):
+                return None
+            raise StorageError(f"Failed to read session index: {e}") from e
+        except BotoCoreError as e:
+            raise StorageError(f"Failed to read session index: {e}") from e
+
+        index = decode_index(data)
+        if index is None:
+            index = SessionIndex(entries=self._walk_metadata())
+        return index, response.get("ETag", "")
+
+    def _write_index(self, data: bytes, revision: str, etag: str | None) -> bool:
+        """Conditionally write the index object.
+
+        Args:
+            data: Encoded index document
+            revision: Revision embedded in ``data`` (unused; S3 compares ETags)
+            etag: ETag the write is conditioned on, or None to create only if
+                no index exists
+
+        Returns:
+            True if written, False if another writer got there first
+
+        Raises:
+            _IndexUnsupportedError: If conditional PUTs are not available
+            StorageError: If the write fails for any other reason
+        """
+        from botocore.exceptions import BotoCoreError, ClientError, ParamValidationError
+
+        condition = {"IfMatch": etag} if etag else {"IfNoneMatch": "*"}
+        try:
+            self._client.put_object(
+                Bucket=self.bucket,
+                Key=self._index_key(),
+                Body=data,
+                ContentType="application/json",
+                **condition,
+            )
+        except ParamValidationError as e:
+            # botocore predating conditional PutObject rejects the call client-side.
+            raise _IndexUnsupportedError(f"Conditional PUT not supported: {e}") from e
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "")
+            status_code = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+            if status_code in (409, 412) or error_code in (
+                "PreconditionFailed",
+                "ConditionalRequestConflict",
+            ):
+                return False
+            if status_code == 501 or error_code == "NotImplemented":
+                raise _IndexUnsupportedError(f"Conditional PUT not supported: {e}") from e
+            raise StorageError(f"Failed to write session index: {e}") from e
+        except BotoCoreError as e:
+            raise StorageError(f"Failed to write session index: {e}") from e
+        return True
+
+    def _load_index(self) -> SessionIndex | None:
+        """Return the index for read paths, or None to fall back to walking."""
+        if not self.use_index:
+            return None
+        try:
+            current = self._read_index()
+        except StorageError as exc:
+            LOG.warning("session_index_read_failed", error=str(exc))
+            return None
+        return None if current is None else current[0]
+
+    def _update_index(
+        self,
+        mutate: Callable[[IndexEntries], None],
+        rebuild: Callable[[], IndexEntries] | None = None,
+    ) -> None:
+        """Apply ``mutate`` to the index, invalidating it if that fails.
+
+        Session objects are authoritative, so an index failure never fails
+        the surrounding save/delete: the index is removed instead and readers
+        walk the bucket until the next successful update recreates it. If
+        the store cannot make conditional PUTs at all, the index is removed
+        once and ``use_index`` is turned off for the rest of the process.
+
+        Args:
+            mutate: Edits the index entries in place
+            rebuild: Seeds a missing index (defaults to a full bucket walk)
+        """
+        try:
+            if update_index(
+                self._read_index, self._write_index, rebuild or self._walk_metadata, mutate
+            ):
+                return
+            LOG.warning("session_index_update_conflicted", bucket=self.bucket)
+        except _IndexUnsupportedError as exc:
+            with self._index_lock:
+                if not self.use_index:
+                    return  # another thread already disabled and removed it
+                self.use_index = False
+            LOG.warning("session_index_unsupported", bucket=self.bucket, error=str(exc))
+        except StorageError as exc:
+            LOG.warning("session_index_update_failed", bucket=self.bucket, error=str(exc))
+
+        try:
+            self._client.delete_object(Bucket=self.bucket, Key=self._index_key())
+            LOG.info("session_index_invalidated", bucket=self.bucket)
+        except Exception as exc:  # noqa: BLE001 — best effort; walk fallback still works
+            LOG.error("session_index_invalidate_failed", bucket=self.bucket, error=str(exc))
@@ -4,6 +4,7 @@ Uses Supabase Storage bucket for both session data and metadata.
 Follows the same file-pair pattern as local and S3 backends:
 - {session_name}/session.pickle - Encrypted session data
 - {session_name}/metadata.json - Session metadata (JSON)
+- _index.json - Optional consolidated index of all session metadata
 
 This is a BREAKING CHANGE from the previous implementation that used
 Supabase database table for metadata. Users with existing sessions
@@ -13,6 +14,7 @@ will need to re-login.
 import json
 import random
 import time
+from collections.abc import Callable
 from dataclasses import replace
 from datetime import UTC, datetime
 from typing import Any
@@ -22,13 +24,22 @@ from graftpunk.logging import get_logger
 from graftpunk.storage.base import (
     SessionMetadata,
     dict_to_metadata,
+    fetch_metadata_concurrently,
     metadata_to_dict,
 )
+from graftpunk.storage.index import (
+    INDEX_OBJECT_NAME,
+    IndexEntries,
+    SessionIndex,
+    decode_index,
+    update_index,
+)
 
 LOG = get_logger(__name__)
 
 # Storage configuration
 CACHE_CONTROL_SECONDS = 3600  # 1 hour
+INDEX_CACHE_CONTROL_SECONDS = 0  # the index changes on every write
 
 
 class SupabaseSessionStorage:
@@ -40,6 +51,14 @@ class SupabaseSessionStorage:
 
     This matches the local and S3 storage patterns, storing both
     session data and metadata in the same Supabase Storage bucket.
+
+    Supabase Storage has no conditional (If-Match) uploads, so the optional
+    index is advisory. Updates compare its revision token before uploading
+    and read it back afterwards, which catches most concurrent writers but
+    cannot close the race: a writer that passes its check just before
+    another uploads will overwrite that update, and both read back their
+    own revision. Readers therefore check the index against one bucket
+    listing (see :meth:`_load_index`); ``rebuild_index`` repairs it.
     """
 
     def __init__(
@@ -49,6 +68,7 @@ class SupabaseSessionStorage:
         bucket_name: str = "sessions",
         max_retries: int = 5,
         base_delay: float = 1.0,
+        use_index: bool = False,
     ) -> None:
         """Initialize Supabase session storage.
 
@@ -58,6 +78,9 @@ class SupabaseSessionStorage:
             bucket_name: Storage bucket name for sessions
             max_retries: Maximum retry attempts
             base_delay: Base delay in seconds for exponential backoff
+            use_index: Maintain a consolidated ``_index.json`` so that listing
+                metadata downloads one object plus a bucket listing instead of
+                one object per session
         """
         try:
             from supabase import Client, create_client
@@ -74,11 +97,13 @@ class SupabaseSessionStorage:
         self.bucket_name = bucket_name
         self.max_retries = max_retries
         self.base_delay = base_delay
+        self.use_index = use_index
 
         LOG.info(
             "supabase_session_storage_initialized",
             url=normalized_url,
             bucket=bucket_name,
+            use_index=use_index,
         )
 
     @property
@@ -255,6 +280,13 @@ class SupabaseSessionStorage:
             else:
                 raise
 
+        if self.use_index:
+
+            def _put(entries: IndexEntries) -> None:
+                entries[name] = metadata
+
+            self._update_index(_put)
+
         location = f"{self.bucket_name}/{session_path}"
         LOG.info("session_save_completed", name=name, location=location, backend="supabase")
         return location
@@ -314,6 +346,20 @@ class SupabaseSessionStorage:
     def list_sessions(self) -> list[str]:
         """List all session names.
 
+        Always lists the bucket root: the index is only trusted after it
+        has been checked against that listing, so it cannot save a request.
+
+        Returns:
+            Sorted list of session names
+
+        Raises:
+            StorageError: If listing fails due to Supabase errors
+        """
+        return self._walk_session_names()
+
+    def _walk_session_names(self) -> list[str]:
+        """List session names from the top-level folders of the bucket.
+
         Returns:
             Sorted list of session names
 
@@ -338,7 +384,7 @@ class SupabaseSessionStorage:
                 # Supabase Storage returns objects with 'name' field
                 # Folders appear as entries; we extract session names from paths
                 name = item.get("name", "")
-                if name and not name.startswith("."):
+                if name and not name.startswith(".") and name != INDEX_OBJECT_NAME:
                     # This could be a folder name directly, or we may need to
                     # parse paths if list returns full paths
                     sessions.add(name)
@@ -382,9 +428,56 @@ class SupabaseSessionStorage:
                     LOG.error("session_file_delete_failed", name=name, path=path, error=str(e))
                     raise StorageError(f"Failed to delete '{path}': {e}") from e
 
+        if self.use_index:
+
+            def _remove(entries: IndexEntries) -> None:
+                entries.pop(name, None)
+
+            self._update_index(_remove)
+
         LOG.info("session_delete_completed", name=name, backend="supabase")
         return True
 
+    def delete_sessions(self, names: list[str]) -> list[str]:
+        """Delete several sessions with a single batched remove request.
+
+        Args:
+            names: Session identifiers
+
+        Returns:
+            Names that were deleted
+
+        Raises:
+            StorageError: If the remove request fails
+        """
+        from httpx import HTTPStatusError
+        from storage3.exceptions import StorageApiError
+
+        if not names:
+            return []
+
+        paths = [
+            path for name in names for path in (self._session_path(name), self._metadata_path(name))
+        ]
+        try:
+            # Supabase ignores paths that don't exist, so one call covers all.
+            self.client.storage.from_(self.bucket_name).remove(paths)
+        except (HTTPStatusError, StorageApiError) as e:
+            LOG.error("delete_sessions_failed", count=len(names), error=str(e), backend="supabase")
+            raise StorageError(f"Failed to delete sessions: {e}") from e
+
+        if self.use_index:
+            gone = set(names)
+
+            def _remove(entries: IndexEntries) -> None:
+                for name in gone:
+                    entries.pop(name, None)
+
+            self._update_index(_remove)
+
+        LOG.info("sessions_deleted", count=len(names), backend="supabase")
+        return list(names)
+
     def get_session_metadata(self, name: str) -> SessionMetadata | None:
         """Get session metadata without loading the full session.
 
@@ -415,6 +508,29 @@ class SupabaseSessionStorage:
             LOG.error("get_session_metadata_failed", name=name, error=str(e))
             raise StorageError(f"Failed to get metadata for '{name}': {e}") from e
 
+    def list_sessions_with_metadata(self) -> list[SessionMetadata]:
+        """Get metadata for all sessions from the index or concurrent downloads.
+
+        Returns:
+            Metadata for all sessions that have metadata files
+
+        Raises:
+            StorageError: If listing or downloading fails due to Supabase errors
+        """
+        index = self._load_index()
+        if index is not None:
+            LOG.debug(
+                "session_metadata_list_completed",
+                count=len(index.entries),
+                backend="supabase",
+                source="index",
+            )
+            return list(index.entries.values())
+        names = self._walk_session_names()
+        metadata = fetch_metadata_concurrently(names, self.get_session_metadata)
+        LOG.debug("session_metadata_list_completed", count=len(metadata), backend="supabase")
+        return metadata
+
     def update_session_metadata(
         self,
         name: str,
@@ -479,11 +595,168 @@ class SupabaseSessionStorage:
                     raise
 
             LOG.info("session_metadata_updated", name=name, status=status, backend="supabase")
-            return True
         except (HTTPStatusError, StorageApiError) as e:
             LOG.error("failed_to_update_session_metadata", name=name, error=str(e))
             raise StorageError(f"Failed to update metadata for '{name}': {e}") from e
 
+        if self.use_index:
+
+            def _put(entries: IndexEntries) -> None:
+                entries[name] = new_metadata
+
+            self._update_index(_put)
+        return True
+
+    def rebuild_index(self) -> int:
+        """Rebuild the consolidated index from the bucket contents.
+
+        Returns:
+            Number of sessions written to the index
+
+        Raises:
+            StorageError: If the bucket cannot be listed
+        """
+        entries = self._walk_metadata()
+
+        def _replace(current: IndexEntries) -> None:
+            current.clear()
+            current.update(entries)
+
+        self._update_index(_replace, rebuild=lambda: dict(entries))
+        return len(entries)
+
+    def _walk_metadata(self) -> IndexEntries:
+        """Download metadata for every session found in the bucket."""
+        fetched = fetch_metadata_concurrently(self._walk_session_names(), self.get_session_metadata)
+        return {metadata.name: metadata for metadata in fetched}
+
+    def _read_index(self) -> tuple[SessionIndex, str] | None:
+        """Download the index and return it with its revision token.
+
+        Returns:
+            Tuple of (index, revision), or None if no index exists. A
+            malformed index is replaced by a fresh walk with an empty revision.
+
+        Raises:
+            StorageError: If the download fails for reasons other than NotFound
+        """
+        from httpx import HTTPStatusError
+        from storage3.exceptions import StorageApiError
+
+        try:
+            data = self.client.storage.from_(self.bucket_name).download(INDEX_OBJECT_NAME)
+        except (HTTPStatusError, StorageApiError) as e:
+            response = getattr(e, "response", None)
+            status = getattr(e, "status", None) or getattr(response, "status_code", None)
+            if status in (404, "404", 400, "400"):
+                return None
+            raise StorageError(f"Failed to read session index: {e}") from e
+
+        index = decode_index(data)
+        if index is None:
+            index = SessionIndex(entries=self._walk_metadata())
+        return index, index.revision
+
+    def _write_index(self, data: bytes, revision: str, expected: str | None) -> bool:
+        """Upload the index if its revision is still ``expected``.
+
+        Args:
+            data: Encoded index document
+            revision: Revision embedded in ``data``
+            expected: Revision the caller read, or None if no index existed
+
+        Returns:
+            True if the upload landed and was read back, False on a conflict
+
+        Raises:
+            StorageError: If the upload fails
+        """
+        from httpx import HTTPStatusError
+        from storage3.exceptions import StorageApiError
+        from storage3.types import FileOptions
+
+        current = self._read_index()
+        if (None if current is None else current[1]) != expected:
+            return False
+
+        storage = self.client.storage.from_(self.bucket_name)
+        options: FileOptions = {
+            "cache-control": str(INDEX_CACHE_CONTROL_SECONDS),
+            "content-type": "application/json",
+        }
+        try:
+            try:
+                storage.upload(file=data, path=INDEX_OBJECT_NAME, file_options=options)
+            except StorageApiError as e:
+                if e.status == 409 or e.status == "409":
+                    storage.update(file=data, path=INDEX_OBJECT_NAME, file_options=options)
+                else:
+                    raise
+        except (HTTPStatusError, StorageApiError) as e:
+            raise StorageError(f"Failed to write session index: {e}") from e
+
+        written = self._read_index()
+        return written is not None and written[1] == revision
+
+    def _load_index(self) -> SessionIndex | None:
+        """Return the index checked against the bucket, or None to fall back to walking.
+
+        Index updates can be lost (see the class docstring), so entries are
+        matched against one listing of the bucket: sessions missing from the
+        index are downloaded individually and entries for sessions no longer
+        in the bucket are dropped.
+        """
+        if not self.use_index:
+            return None
+        try:
+            current = self._read_index()
+        except StorageError as exc:
+            LOG.warning("session_index_read_failed", error=str(exc), backend="supabase")
+            return None
+        if current is None:
+            return None
+
+        index = current[0]
+        names = self._walk_session_names()
+        entries = {name: index.entries[name] for name in names if name in index.entries}
+        missing = [name for name in names if name not in index.entries]
+        if missing or len(entries) != len(index.entries):
+            LOG.warning(
+                "session_index_stale",
+                missing=len(missing),
+                removed=len(index.entries) - len(entries),
+                backend="supabase",
+            )
+            for metadata in fetch_metadata_concurrently(missing, self.get_session_metadata):
+                entries[metadata.name] = metadata
+        return SessionIndex(entries=entries, revision=index.revision)
+
+    def _update_index(
+        self,
+        mutate: Callable[[IndexEntries], None],
+        rebuild: Callable[[], IndexEntries] | None = None,
+    ) -> None:
+        """Apply ``mutate`` to the index, removing the index if that fails.
+
+        Args:
+            mutate: Edits the index entries in place
+            rebuild: Seeds a missing index (defaults to a full bucket walk)
+        """
+        try:
+            if update_index(
+                self._read_index, self._write_index, rebuild or self._walk_metadata, mutate
+            ):
+                return
+            LOG.warning("session_index_update_conflicted", backend="supabase")
+        except StorageError as exc:
+            LOG.warning("session_index_update_failed", error=str(exc), backend="supabase")
+
+        try:
+            self.client.storage.from_(self.bucket_name).remove([INDEX_OBJECT_NAME])
+            LOG.info("session_index_invalidated", backend="supabase")
+        except Exception as exc:  # noqa: BLE001 — best effort; walk fallback still works
+            LOG.error("session_index_invalidate_failed", error=str(exc), backend="supabase")
+
     def _ensure_bucket_exists(self) -> None:
         """Create sessions bucket if it doesn't exist."""
         from httpx import HTTPStatusError
@@ -0,0 +1,227 @@
+"""Read-through local disk cache in front of a remote session storage backend.
+
+``TieredSessionStorage`` wraps a remote backend (S3, Supabase) and keeps a copy
+of every session it reads or writes in a :class:`LocalSessionStorage` under the
+config directory. Session blobs are cached exactly as stored remotely, i.e.
+still encrypted.
+
+Freshness is checked with the remote metadata object only: when its checksum
+matches the local copy, the session bytes are served from disk and the larger
+download is skipped. If the remote store is unreachable, loads fall back to
+the local copy (TTL still enforced) so commands keep working offline.
+"""
+
+import time
+from dataclasses import replace
+from pathlib import Path
+
+from graftpunk.exceptions import SessionNotFoundError, StorageError
+from graftpunk.logging import get_logger
+from graftpunk.storage.base import SessionMetadata, SessionStorageBackend
+from graftpunk.storage.local import LocalSessionStorage
+
+LOG = get_logger(__name__)
+
+# Remote metadata fetched this recently is reused by load_session, so the
+# metadata lookup graftpunk.cache does before a load is not repeated.
+METADATA_REUSE_SECONDS = 2.0
+
+
+class TieredSessionStorage:
+    """Remote session storage with a local encrypted read-through cache.
+
+    Features:
+    - Local hits cost one small metadata request instead of a full download
+    - Write-through on save, delete on delete
+    - Offline fallback to the local copy when the remote store is unreachable
+    - Reports the remote backend's identity, so callers cannot tell it apart
+      from the wrapped backend
+    """
+
+    def __init__(self, remote: SessionStorageBackend, cache_dir: Path) -> None:
+        """Initialize tiered session storage.
+
+        Args:
+            remote: Authoritative remote backend
+            cache_dir: Directory for the local copies
+        """
+        self.remote = remote
+        self.local = LocalSessionStorage(base_dir=cache_dir)
+        self._recent_metadata: dict[str, tuple[float, SessionMetadata | None]] = {}
+        LOG.info(
+            "tiered_session_storage_initialized",
+            remote=remote.storage_location,
+            cache_dir=str(cache_dir),
+        )
+
+    @property
+    def storage_backend(self) -> str:
+        """Backend type identifier of the remote store."""
+        return self.remote.storage_backend
+
+    @property
+    def storage_location(self) -> str:
+        """Display-friendly storage location of the remote store."""
+        return self.remote.storage_location
+
+    def _as_remote(self, metadata: SessionMetadata) -> SessionMetadata:
+        """Restamp locally cached metadata with the remote storage identity."""
+        return replace(
+            metadata,
+            storage_backend=self.remote.storage_backend,
+            storage_location=self.remote.storage_location,
+        )
+
+    def save_session(
+        self,
+        name: str,
+        encrypted_data: bytes,
+        metadata: SessionMetadata,
+    ) -> str:
+        """Save to the remote store, then write through to the local cache.
+
+        Args:
+            name: Session identifier
+            encrypted_data: Already-encrypted session bytes
+            metadata: Session metadata
+
+        Returns:
+            Remote storage location
+
+        Raises:
+            StorageError: If the remote save fails
+        """
+        location = self.remote.save_session(name, encrypted_data, metadata)
+        self._recent_metadata.pop(name, None)
+        try:
+            self.local.save_session(name, encrypted_data, metadata)
+        except OSError as exc:
+            LOG.warning("session_cache_write_failed", name=name, error=str(exc))
+        return location
+
+    def load_session(self, name: str) -> tuple[bytes, SessionMetadata]:
+        """Load a session, serving the bytes locally when they are current.
+
+        Args:
+            name: Session identifier
+
+        Returns:
+            Tuple of (encrypted_data, metadata)
+
+        Raises:
+            SessionNotFoundError: If the session doesn't exist remotely (or,
+                when offline, locally)
+            SessionExpiredError: If session TTL exceeded
+        """
+        recent = self._recent_metadata.pop(name, None)
+        try:
+            if recent is not None and time.monotonic() - recent[0] < METADATA_REUSE_SECONDS:
+                remote_metadata = recent[1]
+            else:
+                remote_metadata = self.remote.get_session_metadata(name)
+        except (StorageError, OSError) as exc:
+            return self._load_offline(name, exc)
+
+        if remote_metadata is None:
+            self.local.delete_session(name)
+            raise SessionNotFoundError(f"Session '{name}' not found")
+
+        cached = self.local.get_session_metadata(name)
+        if cached is not None and self._is_current(cached, remote_metadata):
+            try:
+                encrypted_data, _ = self.local.load_session(name)
+            except (SessionNotFoundError, OSError):
+                pass
+            else:
+                LOG.debug("session_cache_hit", name=name)
+                return encrypted_data, remote_metadata
+
+        LOG.debug("session_cache_miss", name=name)
+        encrypted_data, metadata = self.remote.load_session(name)
+        try:
+            self.local.save_session(name, encrypted_data, metadata)
+        except OSError as exc:
+            LOG.warning("session_cache_write_failed", name=name, error=str(exc))
+        return encrypted_data, metadata
+
+    @staticmethod
+    def _is_current(cached: SessionMetadata, remote: SessionMetadata) -> bool:
+        """Whether the cached bytes match the remote session.
+
+        The checksum identifies the session bytes; metadata-only updates
+        (status changes) don't invalidate the local copy. Sessions without a
+        checksum fall back to comparing modification times.
+        """
+        if remote.checksum:
+            return cached.checksum == remote.checksum
+        return cached.modified_at == remote.modified_at
+
+    def _load_offline(self, name: str, error: Exception) -> tuple[bytes, SessionMetadata]:
+        """Serve the local copy when the remote store is unreachable."""
+        try:
+            encrypted_data, metadata = self.local.load_session(name)
+        except SessionNotFoundError:
+            raise StorageError(
+                f"Remote storage unavailable and no local copy of '{name}': {error}"
+            ) from error
+        LOG.warning("session_cache_offline_fallback", name=name, error=str(error))
+        return encrypted_data, self._as_remote(metadata)
+
+    def list_sessions(self) -> list[str]:
+        """List session names from the remote store."""
+        return self.remote.list_sessions()
+
+    def list_sessions_with_metadata(self) -> list[SessionMetadata]:
+        """List session metadata from the remote store."""
+        return self.remote.list_sessions_with_metadata()
+
+    def delete_session(self, name: str) -> bool:
+        """Delete a session remotely and drop the local copy.
+
+        Args:
+            name: Session identifier
+
+        Returns:
+            Result of the remote delete
+        """
+        deleted = self.remote.delete_session(name)
+        self._recent_metadata.pop(name, None)
+        self.local.delete_session(name)
+        return deleted
+
+    def delete_sessions(self, names: list[str]) -> list[str]:
+        """Delete sessions remotely and drop their local copies.
+
+        Args:
+            names: Session identifiers
+
+        Returns:
+            Names deleted from the remote store
+        """
+        deleted = self.remote.delete_sessions(names)
+        for name in names:
+            self._recent_metadata.pop(name, None)
+        self.local.delete_sessions(names)
+        return deleted
+
+    def get_session_metadata(self, name: str) -> SessionMetadata | None:
+        """Get metadata from the remote store.
+
+        The result is remembered briefly so an immediately following
+        ``load_session`` doesn't fetch it again.
+        """
+        metadata = self.remote.get_session_metadata(name)
+        self._recent_metadata[name] = (time.monotonic(), metadata)
+        return metadata
+
+    def update_session_metadata(
+        self,
+        name: str,
+        status: str | None = None,
+    ) -> bool:
+        """Update metadata in the remote store.
+
+        The local copy stays valid: its bytes are matched by checksum.
+        """
+        self._recent_metadata.pop(name, None)
+        return self.remote.update_session_metadata(name, status=status)
@@ -0,0 +1,342 @@
+"""Connection pool and retry tuning for API sessions.
+
+requests gives every session an ``HTTPAdapter`` with ten pooled connections
+per host and no retries. A plugin that fans out many requests to one host
+then discards connections as soon as more than ten are in flight ("Connection
+pool is full") and pays a fresh TCP/TLS handshake for each of them.
+
+:class:`TransportConfig` describes the adapters a session should use instead:
+pool sizes, an optional urllib3 ``Retry`` policy (backoff on 429/5xx that
+honours ``Retry-After``), a request rate limit and per-host overrides.
+:func:`mount_transport` mounts those adapters on any ``requests.Session``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE, HTTPAdapter
+from urllib3.util.retry import Retry
+
+from graftpunk.logging import get_logger
+from graftpunk.ratelimit import THROTTLE_STATUSES, RateLimit, get_rate_limiter, parse_retry_after
+
+LOG = get_logger(__name__)
+
+# Statuses worth retrying: rate limiting and transient upstream failures.
+DEFAULT_RETRY_STATUSES: tuple[int, ...] = (429, 502, 503, 504)
+
+# Only idempotent methods are retried unless a plugin opts in to more.
+DEFAULT_RETRY_METHODS: tuple[str, ...] = tuple(sorted(Retry.DEFAULT_ALLOWED_METHODS))
+
+
+def _positive_int(owner: str, name: str, value: Any) -> None:
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError(f"{owner}.{name} must be a positive integer, got {value!r}")
+
+
+def _positive_number(owner: str, name: str, value: Any) -> None:
+    if isinstance(value, bool) or not isinstance(value, int | float) or value <= 0:
+        raise ValueError(f"{owner}.{name} must be a positive number, got {value!r}")
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """When and how often a transport retries a request.
+
+    Attributes:
+        total: Maximum number of retries (connection errors and statuses).
+        backoff_factor: Exponential backoff base in seconds
+            (``backoff_factor * 2 ** (retry - 1)``).
+        backoff_max: Upper bound for a single backoff sleep in seconds.
+        status_forcelist: Response statuses that trigger a retry.
+        allowed_methods: HTTP methods that may be retried.
+        respect_retry_after: Sleep for the server's ``Retry-After`` on
+            429/503 instead of the computed backoff.
+    """
+
+    total: int = 3
+    backoff_factor: float = 0.5
+    backoff_max: float = 60.0
+    status_forcelist: tuple[int, ...] = DEFAULT_RETRY_STATUSES
+    allowed_methods: tuple[str, ...] = DEFAULT_RETRY_METHODS
+    respect_retry_after: bool = True
+
+    def __post_init__(self) -> None:
+        if isinstance(self.total, bool) or not isinstance(self.total, int) or self.total < 0:
+            raise ValueError(f"RetryPolicy.total must be >= 0, got {self.total!r}")
+        if self.backoff_factor < 0:
+            raise ValueError("RetryPolicy.backoff_factor must be >= 0")
+        if self.backoff_max < 0:
+            raise ValueError("RetryPolicy.backoff_max must be >= 0")
+        object.__setattr__(self, "status_forcelist", tuple(self.status_forcelist))
+        object.__setattr__(
+            self, "allowed_methods", tuple(method.upper() for method in self.allowed_methods)
+        )
+
+    def to_urllib3(self) -> Retry:
+        """Build the equivalent urllib3 ``Retry``.
+
+        The final response is returned rather than raised when retries run
+        out, so callers still see the 429/503 and decide what to do with it.
+        """
+        return Retry(
+            total=self.total,
+            backoff_factor=self.backoff_factor,
+            backoff_max=self.backoff_max,
+            status_forcelist=self.status_forcelist,
+            allowed_methods=frozenset(self.allowed_methods),
+            respect_retry_after_header=self.respect_retry_after,
+            raise_on_status=False,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> RetryPolicy:
+        """Build a policy from a plain mapping (e.g. a YAML ``retry:`` block).
+
+        Raises:
+            ValueError: On unknown keys or invalid values.
+        """
+        _reject_unknown("retry", data, cls.__dataclass_fields__)
+        kwargs = dict(data)
+        for key in ("status_forcelist", "allowed_methods"):
+            if key in kwargs:
+                kwargs[key] = tuple(kwargs[key])
+        return cls(**kwargs)
+
+
+@dataclass(frozen=True)
+class HostLimits:
+    """Pool and retry overrides for requests to one host.
+
+    Attributes:
+        prefix: URL prefix the overrides apply to, e.g.
+            ``"https://api.example.com"``. A bare host name applies to both
+            http and https.
+        pool_maxsize: Connections kept open to this host, or None to use
+            the transport's default.
+        pool_block: Wait for a free connection instead of opening an extra,
+            unpooled one when the pool is exhausted. None inherits.
+        retry: Retry policy for this host, or None to inherit.
+        rate_limit: Minimum seconds between requests to this host, or None
+            to inherit.
+        burst: Requests allowed back to back after an idle period, or None
+            to inherit.
+    """
+
+    prefix: str
+    pool_maxsize: int | None = None
+    pool_block: bool | None = None
+    retry: RetryPolicy | None = None
+    rate_limit: float | None = None
+    burst: int | None = None
+
+    def __post_init__(self) -> None:
+        if not self.prefix or not self.prefix.strip():
+            raise ValueError("HostLimits.prefix must be non-empty")
+        if self.pool_maxsize is not None:
+            _positive_int("HostLimits", "pool_maxsize", self.pool_maxsize)
+        if self.rate_limit is not None:
+            _positive_number("HostLimits", "rate_limit", self.rate_limit)
+        if self.burst is not None:
+            _positive_int("HostLimits", "burst", self.burst)
+
+    @property
+    def mount_prefixes(self) -> tuple[str, ...]:
+        """Session mount prefixes, each ending at a host boundary.
+
+        The trailing slash keeps ``https://api.example.com`` from also
+        matching ``https://api.example.com.evil``.
+        """
+        prefix = self.prefix.strip()
+        prefixes = (prefix,) if "://" in prefix else (f"https://{prefix}", f"http://{prefix}")
+        return tuple(p if p.endswith("/") else f"{p}/" for p in prefixes)
+
+
+@dataclass(frozen=True)
+class TransportConfig:
+    """Connection pooling and retry settings for an API session.
+
+    Attributes:
+        pool_connections: Number of per-host connection pools to keep.
+        pool_maxsize: Connections kept open per host.
+        pool_block: Wait for a free connection when a pool is exhausted.
+        retry: Retry policy, or None for no retries (the requests default).
+        rate_limit: Minimum seconds between requests to any one host, or
+            None for no limit. Each host gets its own bucket, shared by every
+            session (and, with the file backend, every process).
+        burst: Requests allowed back to back after an idle period.
+        hosts: Per-host overrides, mounted ahead of the defaults.
+    """
+
+    pool_connections: int = DEFAULT_POOLSIZE
+    pool_maxsize: int = DEFAULT_POOLSIZE
+    pool_block: bool = DEFAULT_POOLBLOCK
+    retry: RetryPolicy | None = None
+    rate_limit: float | None = None
+    burst: int = 1
+    hosts: tuple[HostLimits, ...] = ()
+
+    def __post_init__(self) -> None:
+        _positive_int("TransportConfig", "pool_connections", self.pool_connections)
+        _positive_int("TransportConfig", "pool_maxsize", self.pool_maxsize)
+        if self.rate_limit is not None:
+            _positive_number("TransportConfig", "rate_limit", self.rate_limit)
+        _positive_int("TransportConfig", "burst", self.burst)
+        object.__setattr__(self, "hosts", tuple(self.hosts))
+        prefixes = [p for host in self.hosts for p in host.mount_prefixes]
+        if len(prefixes) != len(set(prefixes)):
+            raise ValueError("TransportConfig.hosts has duplicate prefixes")
+
+    def adapter(self, host: HostLimits | None = None) -> HTTPAdapter:
+        """Build an adapter for the defaults, or for one host's overrides."""
+        pool_maxsize = self.pool_maxsize
+        pool_block = self.pool_block
+        retry = self.retry
+        rate_limit = self.rate_limit
+        burst = self.burst
+        if host is not None:
+            pool_maxsize = host.pool_maxsize or pool_maxsize
+            pool_block = pool_block if host.pool_block is None else host.pool_block
+            retry = host.retry or retry
+            rate_limit = host.rate_limit or rate_limit
+            burst = host.burst or burst
+        kwargs: dict[str, Any] = {
+            "pool_connections": self.pool_connections,
+            "pool_maxsize": pool_maxsize,
+            "max_retries": retry.to_urllib3() if retry is not None else 0,
+            "pool_block": pool_block,
+        }
+        if rate_limit is None:
+            return HTTPAdapter(**kwargs)
+        return RateLimitedAdapter(RateLimit(rate_limit, burst), **kwargs)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> TransportConfig:
+        """Build a config from a plain mapping (e.g. a YAML ``transport:`` block).
+
+        ``retry`` is a mapping of :class:`RetryPolicy` fields (``true`` for
+        the defaults); ``hosts`` maps URL prefixes to :class:`HostLimits`
+        fields.
+
+        Raises:
+            ValueError: On unknown keys or invalid values.
+        """
+        _reject_unknown("transport", data, cls.__dataclass_fields__)
+        kwargs = dict(data)
+        kwargs["retry"] = _parse_retry("transport.retry", kwargs.get("retry"))
+        hosts = kwargs.get("hosts") or {}
+        if not isinstance(hosts, Mapping):
+            raise ValueError("transport.hosts must be a mapping of URL prefixes to limits")
+        parsed: list[HostLimits] = []
+        for prefix, limits in hosts.items():
+            if not isinstance(limits, Mapping):
+                raise ValueError(f"transport.hosts[{prefix!r}] must be a mapping")
+            _reject_unknown(f"transport.hosts[{prefix!r}]", limits, HostLimits.__dataclass_fields__)
+            host_kwargs = dict(limits)
+            host_kwargs["retry"] = _parse_retry(
+                f"transport.hosts[{prefix!r}].retry", host_kwargs.get("retry")
+            )
+            parsed.append(HostLimits(prefix=str(prefix), **host_kwargs))
+        kwargs["hosts"] = tuple(parsed)
+        return cls(**kwargs)
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """An HTTPAdapter that spaces out requests per host.
+
+    Before each request the adapter takes a slot from the ``host:<netloc>``
+    bucket of the process-wide :class:`~graftpunk.ratelimit.RateLimiter`.
+    A 429/503 response pauses the bucket for its ``Retry-After`` and halves
+    the host's rate; later successes restore it gradually.
+    """
+
+    def __init__(self, rate_limit: RateLimit, **kwargs: Any) -> None:
+        """Initialize the adapter.
+
+        Args:
+            rate_limit: Rate for each host this adapter sends to.
+            **kwargs: Passed to HTTPAdapter.
+        """
+        self.rate_limit = rate_limit
+        super().__init__(**kwargs)
+
+    def send(self, request: requests.PreparedRequest, *args: Any, **kwargs: Any) -> Any:
+        """Wait for the host's bucket, send, then report the outcome to it."""
+        limiter = get_rate_limiter()
+        key = f"host:{urlsplit(request.url or '').netloc}"
+        limiter.acquire(key, self.rate_limit)
+        response = super().send(request, *args, **kwargs)
+        if response.status_code in THROTTLE_STATUSES:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            limiter.throttled(key, self.rate_limit, retry_after)
+        else:
+            limiter.succeeded(key, self.rate_limit)
+        return response
+
+
+def _reject_unknown(where: str, data: Mapping[str, Any], fields: Mapping[str, Any]) -> None:
+    unknown = sorted(set(data) - set(fields))
+    if unknown:
+        raise ValueError(f"{where} has unknown key(s): {', '.join(map(str, unknown))}")
+
+
+def _parse_retry(where: str, value: Any) -> RetryPolicy | None:
+    if value is None or value is False:
+        return None
+    if value is True:
+        return RetryPolicy()
+    if not isinstance(value, Mapping):
+        raise ValueError(f"{where} must be a mapping or a boolean")
+    return RetryPolicy.from_dict(value)
+
+
+def mount_transport(session: requests.Session, config: TransportConfig) -> None:
+    """Mount adapters built from ``config`` on ``session``.
+
+    Replaces the session's http/https adapters (closing the old ones and
+    their pooled connections) and adds one adapter per host override.
+
+    Args:
+        session: Any requests session.
+        config: Transport settings to apply.
+    """
+    default = config.adapter()
+    mounts: dict[str, HTTPAdapter] = {"https://": default, "http://": default}
+    for host in config.hosts:
+        adapter = config.adapter(host)
+        for prefix in host.mount_prefixes:
+            mounts[prefix] = adapter
+
+    for prefix, adapter in mounts.items():
+        previous = session.adapters.get(prefix)
+        session.mount(prefix, adapter)
+        if previous is not None and previous not in mounts.values():
+            previous.close()
+
+    LOG.debug(
+        "mounted_transport",
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        retries=config.retry.total if config.retry else 0,
+        rate_limit=config.rate_limit,
+        hosts=len(config.hosts),
+    )
+
+
+def plugin_transport_config(plugin: Any) -> TransportConfig | None:
+    """Return a plugin's ``transport_config`` if it declares a valid one.
+
+    Args:
+        plugin: Any plugin object (SitePlugin, YAML plugin, or protocol
+            implementation without the attribute).
+
+    Returns:
+        The plugin's TransportConfig, or None.
+    """
+    config = getattr(plugin, "transport_config", None)
+    return config if isinstance(config, TransportConfig) else None
@@ -32,6 +32,16 @@ def isolated_config(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
 
     reset_settings()
 
+    # Rate-limit buckets, the response cache and retry budgets outlive a test
+    # in process-wide state
+    from graftpunk.ratelimit import reset_rate_limiter
+    from graftpunk.response_cache import reset_response_cache
+    from graftpunk.retry import reset_retry_budgets
+
+    reset_rate_limiter()
+    reset_response_cache()
+    reset_retry_budgets()
+
     return config_dir
 
 
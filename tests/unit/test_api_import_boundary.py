@@ -0,0 +1,53 @@
+"""Guard: the cached-session API path never imports the browser stack.
+
+``load_session_for_api`` projects the stored session document onto a
+``GraftpunkSession`` without building a ``BrowserSession``. Importing
+selenium/requestium/nodriver on that path would put browser start-up cost
+back on every ``gp http`` call and plugin command, so this test runs the path
+in a fresh interpreter and checks ``sys.modules``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import graftpunk
+
+SRC_DIR = Path(graftpunk.__file__).parent.parent
+BROWSER_MODULES = ("selenium", "requestium", "nodriver", "undetected_chromedriver", "httpie")
+
+_SCRIPT = """
+import json, sys
+import requests
+import graftpunk
+
+session = requests.Session()
+session.cookies.set("sid", "abc", domain="example.com")
+graftpunk.cache_session(session, "boundary")
+api = graftpunk.load_session_for_api("boundary")
+assert api.cookies.get("sid") == "abc"
+print(json.dumps(sorted(m for m in {modules!r} if m in sys.modules)))
+"""
+
+
+def test_load_session_for_api_does_not_import_browser_stack(tmp_path: Path) -> None:
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([str(SRC_DIR), os.environ.get("PYTHONPATH", "")]),
+        "GRAFTPUNK_CONFIG_DIR": str(tmp_path),
+        "GRAFTPUNK_STORAGE_BACKEND": "local",
+    }
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", _SCRIPT.format(modules=BROWSER_MODULES)],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=tmp_path,
+        check=True,
+    )
+    imported = json.loads(result.stdout.strip().splitlines()[-1])
+    assert imported == [], f"browser modules imported on the API path: {imported}"
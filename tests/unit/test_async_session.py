@@ -0,0 +1,235 @@
+"""Tests for AsyncGraftpunkSession (async_session.py)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+import requests
+
+from graftpunk.async_session import AsyncGraftpunkSession, http2_available
+from graftpunk.graftpunk_session import GraftpunkSession
+from graftpunk.tokens import _CSRF_TOKENS_ATTR
+
+CHROME_UA = "Mozilla/5.0 (Macintosh) Chrome/120.0.0.0"
+
+ROLES = {
+    "xhr": {
+        "User-Agent": CHROME_UA,
+        "Accept": "application/json",
+        "Sec-Fetch-Mode": "cors",
+        "X-Requested-With": "XMLHttpRequest",
+    },
+    "navigation": {
+        "User-Agent": CHROME_UA,
+        "Accept": "text/html",
+        "Sec-Fetch-Mode": "navigate",
+    },
+    "form": {
+        "User-Agent": CHROME_UA,
+        "Accept": "text/html",
+        "Content-Type": "application/x-www-form-urlencoded",
+        "Sec-Fetch-Mode": "navigate",
+    },
+}
+
+
+def _echo(request: httpx.Request) -> httpx.Response:
+    """Reply with the request's headers, setting a cookie."""
+    return httpx.Response(
+        200,
+        json=dict(request.headers),
+        headers={"Set-Cookie": "seen=1; Path=/"},
+    )
+
+
+def _session(**kwargs: object) -> AsyncGraftpunkSession:
+    kwargs.setdefault("transport", httpx.MockTransport(_echo))
+    return AsyncGraftpunkSession(
+        header_roles=ROLES, base_url="https://example.com", http2=False, **kwargs
+    )
+
+
+async def _sent(session: AsyncGraftpunkSession, method: str, url: str, **kwargs: object) -> dict:
+    response = await session.request(method, url, **kwargs)
+    return json.loads(response.content)
+
+
+class TestRoleDetection:
+    """Tests for auto-detected role headers."""
+
+    async def test_get_is_navigation(self):
+        """A plain GET gets navigation headers and the browser identity."""
+        async with _session() as session:
+            sent = await _sent(session, "GET", "/page")
+
+        assert sent["sec-fetch-mode"] == "navigate"
+        assert sent["user-agent"] == CHROME_UA
+
+    async def test_json_post_is_xhr(self):
+        """POST with json= gets XHR headers."""
+        async with _session() as session:
+            sent = await _sent(session, "POST", "/api", json={"a": 1})
+
+        assert sent["x-requested-with"] == "XMLHttpRequest"
+        assert sent["content-type"] == "application/json"
+
+    async def test_form_post_is_form(self):
+        """POST with data= gets form headers."""
+        async with _session() as session:
+            sent = await _sent(session, "POST", "/login", data={"user": "x"})
+
+        assert sent["sec-fetch-mode"] == "navigate"
+        assert sent["content-type"] == "application/x-www-form-urlencoded"
+
+    async def test_delete_is_xhr(self):
+        """Non-GET/POST methods are XHR."""
+        async with _session() as session:
+            sent = await _sent(session, "DELETE", "/item/1")
+
+        assert sent["sec-fetch-mode"] == "cors"
+
+    async def test_default_role_overrides_detection(self):
+        """gp_default_role forces one role for every request."""
+        async with _session() as session:
+            session.gp_default_role = "xhr"
+            sent = await _sent(session, "GET", "/page")
+
+        assert sent["sec-fetch-mode"] == "cors"
+
+    async def test_header_precedence(self):
+        """Caller headers beat session headers, which beat role headers."""
+        async with _session() as session:
+            session.headers["Sec-Fetch-Mode"] = "same-origin"
+            session.headers["Accept"] = "text/plain"
+            sent = await _sent(session, "GET", "/page", headers={"Accept": "image/png"})
+
+        assert sent["accept"] == "image/png"
+        assert sent["sec-fetch-mode"] == "same-origin"
+
+    async def test_no_roles_sends_httpx_defaults(self):
+        """Without roles no browser headers are added."""
+        async with AsyncGraftpunkSession(http2=False, transport=httpx.MockTransport(_echo)) as s:
+            sent = await _sent(s, "GET", "https://example.com/")
+
+        assert sent["user-agent"].startswith("python-httpx/")
+        assert "sec-fetch-mode" not in sent
+
+
+class TestExplicitRoles:
+    """Tests for xhr()/navigate()/form_submit()/request_with_role()."""
+
+    async def test_xhr_with_referer_path(self):
+        """Referer paths are joined with the base URL."""
+        async with _session() as session:
+            response = await session.xhr("GET", "/api/items", referer="/dashboard")
+        sent = json.loads(response.content)
+
+        assert sent["x-requested-with"] == "XMLHttpRequest"
+        assert sent["referer"] == "https://example.com/dashboard"
+
+    async def test_navigate_and_form_submit(self):
+        """navigate() and form_submit() apply their roles whatever the body."""
+        async with _session() as session:
+            nav = json.loads((await session.navigate("GET", "/", headers={"X-A": "1"})).content)
+            form = json.loads((await session.form_submit("POST", "/f", json={})).content)
+
+        assert nav["sec-fetch-mode"] == "navigate"
+        assert nav["x-a"] == "1"
+        assert form["sec-fetch-mode"] == "navigate"
+
+
+class TestCsrfInjection:
+    """Tests for CSRF token injection."""
+
+    async def test_mutation_methods_only(self):
+        """CSRF tokens go on POST but not GET, and never replace caller headers."""
+        async with _session() as session:
+            setattr(session, _CSRF_TOKENS_ATTR, {"X-CSRF-Token": "tok"})
+            get = await _sent(session, "GET", "/page")
+            post = await _sent(session, "POST", "/api", json={})
+            own = await _sent(session, "POST", "/api", json={}, headers={"X-CSRF-Token": "mine"})
+
+        assert "x-csrf-token" not in get
+        assert post["x-csrf-token"] == "tok"
+        assert own["x-csrf-token"] == "mine"
+
+
+class TestFromSession:
+    """Tests for building an async session from a GraftpunkSession."""
+
+    async def test_shares_cookies_tokens_and_headers(self):
+        """Cookies and token caches are shared; explicit headers and roles are copied."""
+        sync = GraftpunkSession(header_roles=ROLES, base_url="https://example.com")
+        sync.cookies.set("sid", "abc", domain="example.com", path="/")
+        sync.headers["X-Api-Key"] = "k"
+        setattr(sync, _CSRF_TOKENS_ATTR, {})
+
+        async with AsyncGraftpunkSession.from_session(
+            sync, http2=False, transport=httpx.MockTransport(_echo)
+        ) as session:
+            getattr(sync, _CSRF_TOKENS_ATTR)["X-CSRF-Token"] = "tok"
+            sent = await _sent(session, "POST", "/api", json={})
+
+        assert sent["cookie"] == "sid=abc"
+        assert sent["x-api-key"] == "k"
+        assert sent["x-csrf-token"] == "tok"
+        assert sent["user-agent"] == CHROME_UA
+        assert "python-requests" not in sent["user-agent"]
+        # The response cookie landed in the sync session's tracked jar
+        assert sync.cookies.get("seen") == "1"
+        assert sync._has_unpersisted_changes()
+
+    async def test_plain_requests_session(self):
+        """A plain requests.Session contributes cookies and non-default headers."""
+        sync = requests.Session()
+        sync.headers["Authorization"] = "Bearer t"
+        sync.cookies.set("sid", "abc", domain="example.com", path="/")
+
+        async with AsyncGraftpunkSession.from_session(
+            sync, http2=False, transport=httpx.MockTransport(_echo)
+        ) as session:
+            sent = await _sent(session, "GET", "https://example.com/")
+
+        assert sent["authorization"] == "Bearer t"
+        assert sent["cookie"] == "sid=abc"
+        assert sent["user-agent"].startswith("python-httpx/")
+
+
+class TestConcurrency:
+    """Tests for concurrent use of one session."""
+
+    async def test_gather_shares_one_client(self):
+        """Concurrent requests share the client and its cookie jar."""
+        seen: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.headers.get("cookie", ""))
+            return httpx.Response(200, json={})
+
+        async with _session(transport=httpx.MockTransport(handler)) as session:
+            session.cookies.set("sid", "abc", domain="example.com")
+            responses = await asyncio.gather(*(session.xhr("GET", f"/i/{n}") for n in range(20)))
+
+        assert all(r.status_code == 200 for r in responses)
+        assert seen == ["sid=abc"] * 20
+
+
+class TestHttp2:
+    """Tests for HTTP/2 negotiation settings."""
+
+    def test_auto_detects_h2(self):
+        """http2=None follows whether h2 is installed."""
+        if http2_available():
+            pytest.skip("h2 installed; auto-detection enables HTTP/2")
+        session = AsyncGraftpunkSession()
+        assert session._transport._pool._http2 is False  # type: ignore[attr-defined]
+
+    def test_explicit_http2_without_h2(self):
+        """Requesting HTTP/2 without h2 installed fails loudly."""
+        if http2_available():
+            pytest.skip("h2 installed")
+        with pytest.raises(ImportError):
+            AsyncGraftpunkSession(http2=True)
@@ -2,6 +2,9 @@
 
 import hashlib
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
 from unittest.mock import MagicMock, patch
 
@@ -15,18 +18,30 @@ from graftpunk.cache import (
     _get_session_storage_backend,
     _reset_session_storage_backend,
     cache_session,
+    cache_session_async,
     clear_session_cache,
+    clear_sessions,
     get_session_metadata,
     list_sessions,
     list_sessions_with_metadata,
     load_session,
+    load_session_async,
     load_session_for_api,
+    rekey_sessions,
     update_session_cookies,
     update_session_status,
     validate_session_name,
 )
 from graftpunk.encryption import encrypt_data
-from graftpunk.exceptions import EncryptionError, SessionExpiredError, SessionNotFoundError
+from graftpunk.exceptions import (
+    EncryptionError,
+    SessionExpiredError,
+    SessionFormatError,
+    SessionNotFoundError,
+)
+from graftpunk.response_cache import CachedResponse, get_response_cache, session_partition
+from graftpunk.session_format import StoredSession, is_legacy_blob
+from graftpunk.storage.base import SessionMetadata
 
 
 class TestSessionLikeProtocol:
@@ -106,8 +121,8 @@ class SimpleSession:
 class TestCacheSession:
     """Tests for cache_session function.
 
-    Note: MagicMock objects don't serialize well with dill/pickle.
-    We use a simple picklable class instead.
+    Note: MagicMock objects don't serialize to the session format.
+    We use a simple session-like class instead.
     """
 
     def setup_method(self) -> None:
@@ -422,6 +437,7 @@ class TestGetSessionStorageBackendSupabase:
             url="https://test.supabase.co",
             service_key="test-key",
             bucket_name="test-bucket",
+            use_index=False,
         )
         assert backend is mock_supabase_instance
 
@@ -439,16 +455,19 @@ class TestCacheSessionErrors:
     def setup_method(self) -> None:
         _reset_session_storage_backend()
 
-    def test_pickle_error_during_serialization(self, tmp_path, monkeypatch):
-        """Test that PickleError during pickle.dumps is propagated."""
+    def test_format_error_during_serialization(self, tmp_path, monkeypatch):
+        """Test that SessionFormatError during serialization is propagated."""
         _setup_local_env(tmp_path, monkeypatch)
 
         session = SimpleSession()
         with (
-            patch("graftpunk.cache.pickle.dumps", side_effect=pickle.PickleError("cannot pickle")),
-            pytest.raises(pickle.PickleError, match="cannot pickle"),
+            patch(
+                "graftpunk.cache.dumps_session",
+                side_effect=SessionFormatError("cannot encode"),
+            ),
+            pytest.raises(SessionFormatError, match="cannot encode"),
         ):
-            cache_session(session, "pickle-fail")
+            cache_session(session, "format-fail")
 
     def test_encryption_error_during_cache(self, tmp_path, monkeypatch):
         """Test that EncryptionError during encrypt_data is wrapped in the except clause."""
@@ -523,6 +542,70 @@ class TestLoadSessionChecksumPaths:
         assert hasattr(session, "headers")
 
 
+class TestLoadSessionFormat:
+    """Tests for the versioned session format and legacy migration."""
+
+    def setup_method(self) -> None:
+        _reset_session_storage_backend()
+
+    def test_round_trip_returns_stored_session(self, tmp_path, monkeypatch):
+        """A session saved with cache_session loads back as a StoredSession."""
+        import requests
+
+        _setup_local_env(tmp_path, monkeypatch)
+        session = SimpleSession("https://example.com/home")
+        jar = requests.cookies.RequestsCookieJar()
+        jar.set("sid", "abc", domain="example.com")
+        session.cookies = jar
+        session.headers = {"Authorization": "Bearer t"}
+        cache_session(session, "round-trip")
+        _reset_session_storage_backend()
+
+        loaded = load_session("round-trip")
+
+        assert isinstance(loaded, StoredSession)
+        assert loaded.current_url == "https://example.com/home"
+        assert loaded.cookies.get("sid") == "abc"
+        assert loaded.headers["Authorization"] == "Bearer t"
+
+    def test_stored_blob_is_not_a_pickle(self, tmp_path, monkeypatch):
+        """cache_session writes the JSON document format, not dill."""
+        from graftpunk.encryption import decrypt_data
+
+        _setup_local_env(tmp_path, monkeypatch)
+        cache_session(SimpleSession(), "json-blob")
+
+        blob = (tmp_path / "sessions" / "json-blob" / "session.pickle").read_bytes()
+        assert not is_legacy_blob(decrypt_data(blob))
+
+    def test_legacy_session_is_migrated_on_load(self, tmp_path, monkeypatch):
+        """A legacy dill blob loads and is rewritten in the current format."""
+        from graftpunk.encryption import decrypt_data
+
+        _setup_local_env(tmp_path, monkeypatch)
+        _create_session_on_disk(tmp_path, "legacy", SimpleSession("https://old.example.com"))
+
+        loaded = load_session("legacy")
+
+        assert isinstance(loaded, StoredSession)
+        assert loaded.current_url == "https://old.example.com"
+        blob = (tmp_path / "sessions" / "legacy" / "session.pickle").read_bytes()
+        assert not is_legacy_blob(decrypt_data(blob))
+        _reset_session_storage_backend()
+        assert load_session("legacy").current_url == "https://old.example.com"
+
+    def test_failed_migration_still_loads(self, tmp_path, monkeypatch):
+        """A failed legacy rewrite is logged and the session is still returned."""
+        _setup_local_env(tmp_path, monkeypatch)
+        _create_session_on_disk(tmp_path, "legacy-ro", SimpleSession())
+        backend = _get_session_storage_backend()
+
+        with patch.object(backend, "save_session", side_effect=OSError("read-only")):
+            loaded = load_session("legacy-ro")
+
+        assert isinstance(loaded, StoredSession)
+
+
 class TestLoadSessionUnpicklingError:
     """Tests for load_session UnpicklingError path."""
 
@@ -530,14 +613,17 @@ class TestLoadSessionUnpicklingError:
         _reset_session_storage_backend()
 
     def test_unpickling_error_raises_session_expired(self, tmp_path, monkeypatch):
-        """Test that UnpicklingError during deserialization raises SessionExpiredError."""
+        """Test that a legacy blob that cannot be unpickled raises SessionExpiredError."""
         _setup_local_env(tmp_path, monkeypatch)
 
         # Create a valid session on disk first
         _create_session_on_disk(tmp_path, "unpickle-fail", SimpleSession())
 
         with (
-            patch("graftpunk.cache.pickle.loads", side_effect=pickle.UnpicklingError("bad")),
+            patch(
+                "graftpunk.cache.load_legacy_session",
+                side_effect=SessionFormatError("bad"),
+            ),
             pytest.raises(SessionExpiredError, match="Failed to load session"),
         ):
             load_session("unpickle-fail")
@@ -549,7 +635,7 @@ class TestLoadSessionUnpicklingError:
         _create_session_on_disk(tmp_path, "runtime-fail", SimpleSession())
 
         with (
-            patch("graftpunk.cache.pickle.loads", side_effect=RuntimeError("unexpected")),
+            patch("graftpunk.cache.load_legacy_session", side_effect=RuntimeError("unexpected")),
             pytest.raises(SessionExpiredError, match="Failed to load session"),
         ):
             load_session("runtime-fail")
@@ -852,6 +938,44 @@ class TestCreateBackendValidation:
             _create_backend("")
 
 
+class TestCreateBackendLocalCache:
+    """Tests for wrapping remote backends in the local read-through cache."""
+
+    def _settings(self, tmp_path, local_cache_dir):
+        mock_settings = MagicMock()
+        mock_settings.get_storage_config.return_value = {
+            "bucket": "bucket",
+            "endpoint_url": "https://minio.example.com",
+            "local_cache_dir": local_cache_dir,
+        }
+        return mock_settings
+
+    def test_remote_backend_wrapped_when_enabled(self, tmp_path):
+        """With a cache dir configured the remote backend is tiered."""
+        from graftpunk.storage.tiered import TieredSessionStorage
+
+        remote = MagicMock(storage_backend="s3", storage_location="s3://bucket")
+        with (
+            patch("graftpunk.cache.get_settings", return_value=self._settings(tmp_path, tmp_path)),
+            patch("graftpunk.storage.s3.S3SessionStorage", return_value=remote),
+        ):
+            backend = _create_backend("s3")
+
+        assert isinstance(backend, TieredSessionStorage)
+        assert backend.remote is remote
+        assert backend.local.base_dir.parent == tmp_path
+        assert backend.local.base_dir.name.startswith("s3-")
+
+    def test_remote_backend_unwrapped_by_default(self, tmp_path):
+        """Without a cache dir the remote backend is returned as-is."""
+        remote = MagicMock(storage_backend="s3", storage_location="s3://bucket")
+        with (
+            patch("graftpunk.cache.get_settings", return_value=self._settings(tmp_path, None)),
+            patch("graftpunk.storage.s3.S3SessionStorage", return_value=remote),
+        ):
+            assert _create_backend("s3") is remote
+
+
 class TestListSessionsStorageFields:
     """Tests for storage_backend/storage_location in list results."""
 
@@ -944,6 +1068,114 @@ class TestListSessionsWithMetadata:
         assert results[0]["name"] == "valid-session"
 
 
+class TestListSessionsWithMetadataBatching:
+    """list_sessions_with_metadata delegates to the backend batch API."""
+
+    def setup_method(self) -> None:
+        _reset_session_storage_backend()
+
+    def teardown_method(self) -> None:
+        _reset_session_storage_backend()
+
+    def _metadata(self, name: str, modified_at: datetime) -> SessionMetadata:
+        return SessionMetadata(
+            name=name,
+            checksum="abc",
+            created_at=modified_at,
+            modified_at=modified_at,
+            expires_at=None,
+            domain=None,
+            current_url=None,
+            cookie_count=0,
+            cookie_domains=[],
+        )
+
+    def test_uses_backend_batch_listing(self):
+        """The batch method is used instead of per-session metadata lookups."""
+        now = datetime.now(UTC)
+        backend = MagicMock()
+        backend.list_sessions_with_metadata.return_value = [
+            self._metadata("old", now - timedelta(hours=1)),
+            self._metadata("new", now),
+        ]
+
+        with patch("graftpunk.cache._get_session_storage_backend", return_value=backend):
+            results = list_sessions_with_metadata()
+
+        assert [r["name"] for r in results] == ["new", "old"]
+        backend.get_session_metadata.assert_not_called()
+        backend.list_sessions.assert_not_called()
+
+    def test_falls_back_for_backends_without_batch_listing(self):
+        """Backends lacking the batch method are queried one session at a time."""
+        now = datetime.now(UTC)
+        backend = MagicMock(spec=["list_sessions", "get_session_metadata"])
+        backend.list_sessions.return_value = ["a", "missing"]
+        backend.get_session_metadata.side_effect = lambda name: (
+            self._metadata(name, now) if name == "a" else None
+        )
+
+        with patch("graftpunk.cache._get_session_storage_backend", return_value=backend):
+            results = list_sessions_with_metadata()
+
+        assert [r["name"] for r in results] == ["a"]
+        assert backend.get_session_metadata.call_count == 2
+
+
+class TestClearSessionsBatching:
+    """clear_sessions and clear-all delegate to the backend bulk delete."""
+
+    def setup_method(self) -> None:
+        _reset_session_storage_backend()
+
+    def teardown_method(self) -> None:
+        _reset_session_storage_backend()
+
+    def test_uses_backend_bulk_delete(self):
+        """All names go to delete_sessions in one call."""
+        backend = MagicMock()
+        backend.delete_sessions.return_value = ["a", "b"]
+
+        with patch("graftpunk.cache._get_session_storage_backend", return_value=backend):
+            removed = clear_sessions(["a", "b"])
+
+        assert removed == ["a", "b"]
+        backend.delete_sessions.assert_called_once_with(["a", "b"])
+        backend.delete_session.assert_not_called()
+
+    def test_clear_all_uses_bulk_delete(self):
+        """clear_session_cache() without a name deletes everything in one call."""
+        backend = MagicMock()
+        backend.list_sessions.return_value = ["a", "b"]
+        backend.delete_sessions.return_value = ["a", "b"]
+
+        with patch("graftpunk.cache._get_session_storage_backend", return_value=backend):
+            assert clear_session_cache() == ["a", "b"]
+
+        backend.delete_sessions.assert_called_once_with(["a", "b"])
+
+    def test_falls_back_for_backends_without_bulk_delete(self):
+        """Backends lacking delete_sessions are deleted one session at a time."""
+        backend = MagicMock(spec=["delete_session", "storage_location"])
+        backend.storage_location = "mem"
+        backend.delete_session.side_effect = lambda name: name != "missing"
+
+        with patch("graftpunk.cache._get_session_storage_backend", return_value=backend):
+            removed = clear_sessions(["a", "missing"])
+
+        assert removed == ["a"]
+        assert backend.delete_session.call_count == 2
+
+    def test_empty_list_is_noop(self):
+        """No names means no backend calls."""
+        backend = MagicMock()
+
+        with patch("graftpunk.cache._get_session_storage_backend", return_value=backend):
+            assert clear_sessions([]) == []
+
+        backend.delete_sessions.assert_not_called()
+
+
 class TestClearSessionCacheAll:
     """Tests for clear_session_cache clearing all sessions."""
 
@@ -1029,11 +1261,11 @@ class TestUpdateSessionCookies:
     """Tests for update_session_cookies() — persisting API session changes."""
 
     def test_updates_cookies_on_cached_session(self) -> None:
-        """Cookies from the API session are merged into the cached session."""
+        """Cookies from the API session are merged into a copy of the cached session."""
         import requests
 
-        cached_session = MagicMock()
-        cached_session.cookies = requests.cookies.RequestsCookieJar()
+        cached_session = StoredSession()
+        cached_session.current_url = "https://example.com/home"
         cached_session.cookies.set("original", "value")
 
         api_session = requests.Session()
@@ -1042,12 +1274,19 @@ class TestUpdateSessionCookies:
 
         with (
             patch("graftpunk.cache.load_session") as mock_load,
-            patch("graftpunk.cache.cache_session") as mock_cache,
+            patch("graftpunk.cache._cache_session") as mock_cache,
         ):
             mock_load.return_value = cached_session
             update_session_cookies(api_session, "testsession")
             mock_load.assert_called_once_with("testsession")
-            mock_cache.assert_called_once_with(cached_session, "testsession")
+
+        (saved, name), kwargs = mock_cache.call_args
+        assert name == "testsession"
+        assert kwargs == {"replaces": cached_session}
+        assert saved is not cached_session
+        assert saved.current_url == "https://example.com/home"
+        assert saved.cookies.get_dict() == {"original": "updated", "new_cookie": "new_value"}
+        assert cached_session.cookies.get_dict() == {"original": "value"}
 
     def test_load_failure_logs_warning_and_returns(self) -> None:
         """If loading the cached session fails, log a warning and return."""
@@ -1061,13 +1300,12 @@ class TestUpdateSessionCookies:
         """If re-caching fails, log a warning and return."""
         import requests
 
-        cached_session = MagicMock()
-        cached_session.cookies = requests.cookies.RequestsCookieJar()
+        cached_session = StoredSession()
         api_session = requests.Session()
 
         with (
             patch("graftpunk.cache.load_session", return_value=cached_session),
-            patch("graftpunk.cache.cache_session", side_effect=OSError("disk full")),
+            patch("graftpunk.cache._cache_session", side_effect=OSError("disk full")),
         ):
             update_session_cookies(api_session, "testsession")  # Should not raise
 
@@ -1077,8 +1315,7 @@ class TestUpdateSessionCookies:
 
         from graftpunk.tokens import _CACHE_ATTR, CachedToken
 
-        cached_session = MagicMock()
-        cached_session.cookies = requests.cookies.RequestsCookieJar()
+        cached_session = StoredSession()
 
         api_session = requests.Session()
         token_cache = {
@@ -1088,14 +1325,15 @@ class TestUpdateSessionCookies:
 
         with (
             patch("graftpunk.cache.load_session", return_value=cached_session) as mock_load,
-            patch("graftpunk.cache.cache_session") as mock_cache,
+            patch("graftpunk.cache._cache_session") as mock_cache,
         ):
             update_session_cookies(api_session, "testsession")
 
         mock_load.assert_called_once_with("testsession")
-        mock_cache.assert_called_once_with(cached_session, "testsession")
-        # Verify token cache was transferred to the original session
-        assert getattr(cached_session, _CACHE_ATTR) == token_cache
+        saved = mock_cache.call_args.args[0]
+        # Verify token cache was transferred to the saved copy
+        assert getattr(saved, _CACHE_ATTR) == token_cache
+        assert getattr(cached_session, _CACHE_ATTR) == {}
 
     def test_update_session_cookies_persists_csrf_tokens(self) -> None:
         """CSRF tokens survive update_session_cookies round-trip."""
@@ -1103,8 +1341,7 @@ class TestUpdateSessionCookies:
 
         from graftpunk.tokens import _CSRF_TOKENS_ATTR
 
-        cached_session = MagicMock()
-        cached_session.cookies = requests.cookies.RequestsCookieJar()
+        cached_session = StoredSession()
 
         api_session = requests.Session()
         csrf_tokens = {"X-CSRF": "secret123"}
@@ -1112,11 +1349,473 @@ class TestUpdateSessionCookies:
 
         with (
             patch("graftpunk.cache.load_session", return_value=cached_session),
-            patch("graftpunk.cache.cache_session"),
+            patch("graftpunk.cache._cache_session") as mock_cache,
         ):
             update_session_cookies(api_session, "testsession")
 
-        result = getattr(cached_session, _CSRF_TOKENS_ATTR)
+        result = getattr(mock_cache.call_args.args[0], _CSRF_TOKENS_ATTR)
         assert result == csrf_tokens
         # Must be a copy to prevent aliasing between sessions
         assert result is not csrf_tokens
+
+
+class TestDecodedSessionCache:
+    """Tests for the in-process decoded-session cache used by load_session."""
+
+    def setup_method(self) -> None:
+        _reset_session_storage_backend()
+
+    def test_repeat_load_skips_decrypt_and_decode(self, tmp_path, monkeypatch):
+        """An unchanged stored blob is served from the cache on the second load."""
+        _setup_local_env(tmp_path, monkeypatch)
+        _create_session_on_disk(tmp_path, "hot", SimpleSession())
+
+        first = load_session("hot")
+        with (
+            patch("graftpunk.cache.decrypt_data") as mock_decrypt,
+            patch("graftpunk.cache.loads_session") as mock_loads,
+        ):
+            second = load_session("hot")
+
+        assert second is first
+        mock_decrypt.assert_not_called()
+        mock_loads.assert_not_called()
+
+    def test_rewritten_blob_is_reloaded(self, tmp_path, monkeypatch):
+        """A session rewritten on disk is decoded again instead of served stale."""
+        _setup_local_env(tmp_path, monkeypatch)
+        _create_session_on_disk(tmp_path, "changing", SimpleSession("https://old.example.com"))
+        first = load_session("changing")
+
+        _create_session_on_disk(tmp_path, "changing", SimpleSession("https://new.example.com"))
+        second = load_session("changing")
+
+        assert second is not first
+        assert second.current_url == "https://new.example.com"
+
+    def test_cache_disabled_when_size_zero(self, tmp_path, monkeypatch):
+        """GRAFTPUNK_SESSION_CACHE_SIZE=0 decodes on every load."""
+        _setup_local_env(tmp_path, monkeypatch)
+        monkeypatch.setenv("GRAFTPUNK_SESSION_CACHE_SIZE", "0")
+        from graftpunk.config import reset_settings
+
+        reset_settings()
+        _create_session_on_disk(tmp_path, "cold", SimpleSession())
+
+        assert load_session("cold") is not load_session("cold")
+
+    def test_lru_evicts_oldest_entry(self, tmp_path, monkeypatch):
+        """Only the most recently used sessions are retained past the size cap."""
+        _setup_local_env(tmp_path, monkeypatch)
+        monkeypatch.setenv("GRAFTPUNK_SESSION_CACHE_SIZE", "1")
+        from graftpunk.config import reset_settings
+
+        reset_settings()
+        _create_session_on_disk(tmp_path, "one", SimpleSession())
+        _create_session_on_disk(tmp_path, "two", SimpleSession())
+
+        first_one = load_session("one")
+        load_session("two")
+
+        assert load_session("one") is not first_one
+
+    def test_cache_session_rekeys_cached_object(self, tmp_path, monkeypatch):
+        """Re-saving the cached object keeps it cached under the new metadata."""
+        _setup_local_env(tmp_path, monkeypatch)
+        _create_session_on_disk(tmp_path, "resave", SimpleSession())
+        session = load_session("resave")
+
+        session.current_url = "https://example.com/next"
+        cache_session(session, "resave")
+
+        with patch("graftpunk.cache.decrypt_data") as mock_decrypt:
+            assert load_session("resave") is session
+        mock_decrypt.assert_not_called()
+
+    def test_cache_session_with_other_object_invalidates(self, tmp_path, monkeypatch):
+        """Saving a different object drops the cached entry rather than caching it."""
+        _setup_local_env(tmp_path, monkeypatch)
+        _create_session_on_disk(tmp_path, "replace", SimpleSession())
+        load_session("replace")
+
+        replacement = SimpleSession("https://example.com/replaced")
+        cache_session(replacement, "replace")
+        loaded = load_session("replace")
+
+        assert loaded is not replacement
+        assert loaded.current_url == "https://example.com/replaced"
+
+    def test_api_sessions_do_not_share_cookie_jar(self, tmp_path, monkeypatch):
+        """API sessions built from a cached session get independent cookie jars."""
+        import requests
+
+        _setup_local_env(tmp_path, monkeypatch)
+        session = SimpleSession()
+        jar = requests.cookies.RequestsCookieJar()
+        jar.set("sid", "abc", domain="example.com")
+        session.cookies = jar
+        _create_session_on_disk(tmp_path, "shared", session)
+
+        first = load_session_for_api("shared")
+        first.cookies.set("sid", "changed", domain="example.com")
+        second = load_session_for_api("shared")
+
+        assert second.cookies.get("sid") == "abc"
+
+
+class TestUpdateSessionCookiesDelta:
+    """Tests for change-tracked write-back from load_session_for_api sessions."""
+
+    def setup_method(self) -> None:
+        _reset_session_storage_backend()
+
+    def _cache_with_cookie(self, tmp_path, monkeypatch, name):
+        import requests
+
+        _setup_local_env(tmp_path, monkeypatch)
+        session = SimpleSession()
+        jar = requests.cookies.RequestsCookieJar()
+        jar.set("sid", "abc", domain="example.com", path="/")
+        jar.set("keep", "1", domain="example.com", path="/")
+        session.cookies = jar
+        cache_session(session, name)
+
+    def test_unchanged_session_is_not_rewritten(self, tmp_path, monkeypatch):
+        """No cookie or token change means no load and no write."""
+        self._cache_with_cookie(tmp_path, monkeypatch, "quiet")
+        api_session = load_session_for_api("quiet")
+
+        with (
+            patch("graftpunk.cache.load_session") as mock_load,
+            patch("graftpunk.cache._cache_session") as mock_cache,
+        ):
+            update_session_cookies(api_session, "quiet")
+
+        mock_load.assert_not_called()
+        mock_cache.assert_not_called()
+
+    def test_echoed_cookie_is_not_a_change(self, tmp_path, monkeypatch):
+        """A server re-sending an identical cookie does not trigger a write."""
+        self._cache_with_cookie(tmp_path, monkeypatch, "echo")
+        api_session = load_session_for_api("echo")
+        api_session.cookies.set("sid", "abc", domain="example.com", path="/")
+
+        with patch("graftpunk.cache._cache_session") as mock_cache:
+            update_session_cookies(api_session, "echo")
+
+        mock_cache.assert_not_called()
+
+    def test_delta_is_applied_and_persisted(self, tmp_path, monkeypatch):
+        """Changed and cleared cookies are written; other cookies are kept."""
+        self._cache_with_cookie(tmp_path, monkeypatch, "delta")
+        api_session = load_session_for_api("delta")
+        api_session.cookies.set("sid", "rotated", domain="example.com", path="/")
+        api_session.cookies.set("new", "2", domain="example.com", path="/")
+
+        update_session_cookies(api_session, "delta")
+        _reset_session_storage_backend()
+        stored = load_session("delta")
+
+        assert stored.cookies.get("sid") == "rotated"
+        assert stored.cookies.get("new") == "2"
+        assert stored.cookies.get("keep") == "1"
+        assert not api_session._has_unpersisted_changes()
+
+    def test_cleared_cookie_is_removed_from_store(self, tmp_path, monkeypatch):
+        """A cookie cleared on the API session is removed from the stored session."""
+        self._cache_with_cookie(tmp_path, monkeypatch, "logout")
+        api_session = load_session_for_api("logout")
+        del api_session.cookies["sid"]
+
+        update_session_cookies(api_session, "logout")
+        _reset_session_storage_backend()
+        stored = load_session("logout")
+
+        assert stored.cookies.get("sid") is None
+        assert stored.cookies.get("keep") == "1"
+
+    def test_failed_save_leaves_cached_session_untouched(self, tmp_path, monkeypatch):
+        """A write-back that fails to save never changes the shared decoded session."""
+        self._cache_with_cookie(tmp_path, monkeypatch, "shared")
+        cached = load_session("shared")
+        api_session = load_session_for_api("shared")
+        api_session.cookies.set("sid", "rotated", domain="example.com", path="/")
+
+        backend = _get_session_storage_backend()
+        with patch.object(backend, "save_session", side_effect=OSError("disk full")):
+            update_session_cookies(api_session, "shared")
+
+        assert cached.cookies.get("sid") == "abc"
+        assert load_session("shared") is cached
+        assert api_session._has_unpersisted_changes()
+
+    def test_saved_copy_replaces_cached_session(self, tmp_path, monkeypatch):
+        """After a successful save, loads get the updated copy without decoding again."""
+        self._cache_with_cookie(tmp_path, monkeypatch, "publish")
+        cached = load_session("publish")
+        api_session = load_session_for_api("publish")
+        api_session.cookies.set("sid", "rotated", domain="example.com", path="/")
+
+        update_session_cookies(api_session, "publish")
+        with patch("graftpunk.cache.decrypt_data") as mock_decrypt:
+            reloaded = load_session("publish")
+
+        mock_decrypt.assert_not_called()
+        assert reloaded is not cached
+        assert reloaded.cookies.get("sid") == "rotated"
+        assert reloaded.current_url == cached.current_url
+        assert cached.cookies.get("sid") == "abc"
+
+
+class TestResponseCachePartitions:
+    """Tests for tying cached responses to stored sessions."""
+
+    def setup_method(self) -> None:
+        _reset_session_storage_backend()
+
+    def _store_entry(self, name: str) -> None:
+        get_response_cache().put(
+            session_partition(name), "k", CachedResponse("GET", "https://x/", 200, "", (), b"", 0)
+        )
+
+    def _has_entry(self, name: str) -> bool:
+        return get_response_cache().get(session_partition(name), "k") is not None
+
+    def _cache(self, tmp_path, monkeypatch, name):
+        _setup_local_env(tmp_path, monkeypatch)
+        session = SimpleSession()
+        cache_session(session, name)
+
+    def test_api_session_uses_its_partition(self, tmp_path, monkeypatch):
+        """load_session_for_api enables the session's own cache partition."""
+        self._cache(tmp_path, monkeypatch, "cached")
+
+        api_session = load_session_for_api("cached")
+
+        assert api_session._gp_cache_partition == "session:cached"
+
+    def test_new_login_drops_cached_responses(self, tmp_path, monkeypatch):
+        """Saving a new session under a name clears the responses cached for the old one."""
+        self._cache(tmp_path, monkeypatch, "relogin")
+        self._store_entry("relogin")
+        self._store_entry("other")
+
+        cache_session(SimpleSession(), "relogin")
+
+        assert not self._has_entry("relogin")
+        assert self._has_entry("other")
+
+    def test_cookie_write_back_keeps_cached_responses(self, tmp_path, monkeypatch):
+        """Persisting rotated cookies for the same session keeps its cache."""
+        self._cache(tmp_path, monkeypatch, "rotate")
+        api_session = load_session_for_api("rotate")
+        self._store_entry("rotate")
+        api_session.cookies.set("sid", "new", domain="example.com", path="/")
+
+        update_session_cookies(api_session, "rotate")
+
+        assert not api_session._has_unpersisted_changes()
+        assert self._has_entry("rotate")
+
+    def test_clear_session_drops_cached_responses(self, tmp_path, monkeypatch):
+        """Deleting a session removes its cached responses."""
+        self._cache(tmp_path, monkeypatch, "gone")
+        self._store_entry("gone")
+
+        clear_session_cache("gone")
+
+        assert not self._has_entry("gone")
+
+
+class TestAsyncCacheFunctions:
+    """Tests for cache_session_async and load_session_async."""
+
+    async def test_round_trip(self, tmp_path, monkeypatch):
+        """A session cached asynchronously loads back asynchronously."""
+        _setup_local_env(tmp_path, monkeypatch)
+        session = SimpleSession()
+        session.headers = {"X-Test": "1"}
+
+        location = await cache_session_async(session, "async-rt")
+        stored = await load_session_async("async-rt")
+
+        assert "async-rt" in location
+        assert stored.headers["X-Test"] == "1"
+
+    async def test_runs_off_event_loop_thread(self, monkeypatch):
+        """The sync implementation runs in a worker thread."""
+        import threading
+
+        loop_thread = threading.get_ident()
+        seen = []
+
+        def fake_cache_session(session, session_name=None):
+            seen.append(threading.get_ident())
+            return "loc"
+
+        monkeypatch.setattr("graftpunk.cache.cache_session", fake_cache_session)
+
+        assert await cache_session_async(object(), "x") == "loc"
+        assert seen and seen[0] != loop_thread
+
+    async def test_load_errors_propagate(self, tmp_path, monkeypatch):
+        """Storage errors surface from the awaited call."""
+        _setup_local_env(tmp_path, monkeypatch)
+
+        with pytest.raises(SessionNotFoundError):
+            await load_session_async("missing")
+
+
+class TestRekeySessions:
+    """Tests for rekey_sessions."""
+
+    def test_rekeys_after_rotation(self, tmp_path, monkeypatch):
+        """Every session is re-encrypted with the new key and still loads."""
+        from graftpunk.encryption import needs_rekey, rotate_encryption_key
+
+        _setup_local_env(tmp_path, monkeypatch)
+        for name in ("one", "two"):
+            cache_session(SimpleSession(), name)
+        rotate_encryption_key()
+
+        result = rekey_sessions(max_workers=2)
+
+        assert sorted(result.rekeyed) == ["one", "two"]
+        assert result.failed == {}
+        backend = _get_session_storage_backend()
+        for name in ("one", "two"):
+            encrypted, _ = backend.load_session(name)
+            assert needs_rekey(encrypted) is False
+            assert load_session(name).current_url == "https://example.com"
+
+    def test_second_run_is_noop(self, tmp_path, monkeypatch):
+        """Sessions already on the current key are left untouched."""
+        _setup_local_env(tmp_path, monkeypatch)
+        cache_session(SimpleSession(), "one")
+        before = _get_session_storage_backend().load_session("one")[0]
+
+        result = rekey_sessions()
+
+        assert result.current == ["one"]
+        assert result.rekeyed == []
+        assert _get_session_storage_backend().load_session("one")[0] == before
+
+    def test_failures_are_reported(self, tmp_path, monkeypatch):
+        """A session that cannot be decrypted is reported, not raised."""
+        _setup_local_env(tmp_path, monkeypatch)
+        cache_session(SimpleSession(), "one")
+        session_file = tmp_path / "sessions" / "one" / "session.pickle"
+        session_file.write_bytes(b"garbage")
+
+        result = rekey_sessions()
+
+        assert list(result.failed) == ["one"]
+        assert result.rekeyed == []
+
+    def _save_during_first_load(self, backend, monkeypatch):
+        """Make another writer save 'one' right after rekey first loads it."""
+        real_load = backend.load_session
+        loads: list[str] = []
+
+        def load_then_race(name):
+            loaded = real_load(name)
+            loads.append(name)
+            if len(loads) == 1:
+                cache_session(SimpleSession(url="https://example.com/newer"), name)
+            return loaded
+
+        monkeypatch.setattr(backend, "load_session", load_then_race)
+        return loads
+
+    def test_concurrent_save_is_not_overwritten(self, tmp_path, monkeypatch):
+        """A session saved while it is rekeyed keeps the newer save."""
+        from graftpunk.encryption import rotate_encryption_key
+
+        _setup_local_env(tmp_path, monkeypatch)
+        cache_session(SimpleSession(), "one")
+        rotate_encryption_key()
+        loads = self._save_during_first_load(_get_session_storage_backend(), monkeypatch)
+
+        result = rekey_sessions()
+
+        assert loads == ["one", "one"]
+        assert result.current == ["one"]
+        assert load_session("one").current_url == "https://example.com/newer"
+
+    def test_concurrent_save_without_replace_session(self, tmp_path, monkeypatch):
+        """Backends without compare-and-swap re-check the metadata before saving."""
+        from graftpunk.encryption import rotate_encryption_key
+        from graftpunk.storage.local import LocalSessionStorage
+
+        _setup_local_env(tmp_path, monkeypatch)
+        monkeypatch.delattr(LocalSessionStorage, "replace_session")
+        cache_session(SimpleSession(), "one")
+        rotate_encryption_key()
+        loads = self._save_during_first_load(_get_session_storage_backend(), monkeypatch)
+
+        result = rekey_sessions()
+
+        assert loads == ["one", "one"]
+        assert result.current == ["one"]
+        assert load_session("one").current_url == "https://example.com/newer"
+
+    def test_rekeys_without_replace_session(self, tmp_path, monkeypatch):
+        """Unchanged sessions are rekeyed on backends without compare-and-swap."""
+        from graftpunk.encryption import rotate_encryption_key
+        from graftpunk.storage.local import LocalSessionStorage
+
+        _setup_local_env(tmp_path, monkeypatch)
+        monkeypatch.delattr(LocalSessionStorage, "replace_session")
+        cache_session(SimpleSession(), "one")
+        rotate_encryption_key()
+
+        result = rekey_sessions()
+
+        assert result.rekeyed == ["one"]
+        assert load_session("one").current_url == "https://example.com"
+
+
+class TestThreadSafety:
+    """Tests for sharing the backend singleton and decoded cache across threads."""
+
+    def setup_method(self) -> None:
+        _reset_session_storage_backend()
+
+    def teardown_method(self) -> None:
+        _reset_session_storage_backend()
+
+    def test_backend_created_once_under_contention(self, tmp_path, monkeypatch):
+        """Threads racing on first use share one backend instance."""
+        _setup_local_env(tmp_path, monkeypatch)
+        barrier = threading.Barrier(8)
+        real_create = _create_backend
+        calls: list[str] = []
+
+        def slow_create(backend_type: str):
+            calls.append(backend_type)
+            time.sleep(0.05)
+            return real_create(backend_type)
+
+        def get_backend():
+            barrier.wait()
+            return _get_session_storage_backend()
+
+        with (
+            patch("graftpunk.cache._create_backend", side_effect=slow_create),
+            ThreadPoolExecutor(max_workers=8) as pool,
+        ):
+            backends = list(pool.map(lambda _: get_backend(), range(8)))
+
+        assert calls == ["local"]
+        assert all(backend is backends[0] for backend in backends)
+
+    def test_concurrent_loads_share_decoded_session(self, tmp_path, monkeypatch):
+        """Concurrent loads of one session all succeed and end up cached."""
+        _setup_local_env(tmp_path, monkeypatch)
+        _create_session_on_disk(tmp_path, "shared", SimpleSession())
+        first = load_session("shared")
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            loaded = list(pool.map(lambda _: load_session("shared"), range(32)))
+
+        assert all(session is first for session in loaded)
@@ -238,7 +238,7 @@ class TestClearCommand:
         assert "not found" in result.output.lower()
 
     @patch("graftpunk.cli.session_commands.list_sessions_with_metadata")
-    @patch("graftpunk.cli.session_commands.clear_session_cache")
+    @patch("graftpunk.cli.session_commands.clear_sessions")
     def test_clear_by_domain(self, mock_clear, mock_list_meta):
         """Clear sessions matching a domain (dots = domain)."""
         mock_list_meta.return_value = [
@@ -261,7 +261,7 @@ class TestClearCommand:
                 "modified_at": "2026-01-01T00:00:00",
             },
         ]
-        mock_clear.side_effect = lambda n, backend_override=None: [n]
+        mock_clear.side_effect = lambda names, backend_override=None: list(names)
 
         result = runner.invoke(app, ["session", "clear", "example.com", "-f"])
 
@@ -269,7 +269,7 @@ class TestClearCommand:
         assert "app1" in result.output
         assert "app2" in result.output
         assert "other" not in result.output
-        assert mock_clear.call_count == 2
+        mock_clear.assert_called_once_with(["app1", "app2"], backend_override=None)
 
     @patch("graftpunk.cli.session_commands.list_sessions_with_metadata")
     def test_clear_by_domain_no_matches(self, mock_list_meta):
@@ -289,7 +289,7 @@ class TestClearCommand:
         assert "no sessions" in result.output.lower() or "not found" in result.output.lower()
 
     @patch("graftpunk.cli.session_commands.list_sessions_with_metadata")
-    @patch("graftpunk.cli.session_commands.clear_session_cache")
+    @patch("graftpunk.cli.session_commands.clear_sessions")
     def test_clear_all_with_force(self, mock_clear, mock_list_meta):
         """Clear all sessions with --all --force."""
         mock_list_meta.return_value = [
@@ -306,17 +306,33 @@ class TestClearCommand:
                 "modified_at": "2026-01-01T00:00:00",
             },
         ]
-        mock_clear.side_effect = lambda n, backend_override=None: [n]
+        mock_clear.side_effect = lambda names, backend_override=None: list(names)
 
         result = runner.invoke(app, ["session", "clear", "--all", "--force"])
 
         assert result.exit_code == 0
         assert "s1" in result.output
         assert "s2" in result.output
-        assert mock_clear.call_count == 2
+        mock_clear.assert_called_once_with(["s1", "s2"], backend_override=None)
 
     @patch("graftpunk.cli.session_commands.list_sessions_with_metadata")
-    @patch("graftpunk.cli.session_commands.clear_session_cache")
+    @patch("graftpunk.cli.session_commands.clear_sessions")
+    def test_clear_all_reports_only_removed(self, mock_clear, mock_list_meta):
+        """Sessions the backend did not remove are not reported as removed."""
+        mock_list_meta.return_value = [
+            {"name": "s1", "domain": "a.com", "modified_at": "2026-01-01T00:00:00"},
+            {"name": "stuck", "domain": "b.com", "modified_at": "2026-01-01T00:00:00"},
+        ]
+        mock_clear.return_value = ["s1"]
+
+        result = runner.invoke(app, ["session", "clear", "--all", "--force"])
+
+        assert result.exit_code == 0
+        assert "s1" in result.output
+        assert "stuck" not in result.output
+
+    @patch("graftpunk.cli.session_commands.list_sessions_with_metadata")
+    @patch("graftpunk.cli.session_commands.clear_sessions")
     def test_clear_all_prompts_without_force(self, mock_clear, mock_list_meta):
         """Clear all prompts for confirmation without --force."""
         mock_list_meta.return_value = [
@@ -392,6 +408,67 @@ class TestClearCommand:
         assert "hackernews" in output
 
 
+class TestRekeyCommand:
+    """Tests for session rekey command."""
+
+    @patch("graftpunk.cli.session_commands.rekey_sessions")
+    def test_rekey_reports_counts(self, mock_rekey):
+        """Rekey prints how many sessions were re-encrypted."""
+        from graftpunk.cache import RekeyResult
+
+        mock_rekey.return_value = RekeyResult(rekeyed=["a", "b"], current=["c"])
+
+        result = runner.invoke(app, ["session", "rekey", "--workers", "4"])
+
+        assert result.exit_code == 0
+        assert "Re-encrypted 2 session(s)" in result.output
+        assert "1 already current" in result.output
+        mock_rekey.assert_called_once_with(backend_override=None, max_workers=4)
+
+    @patch("graftpunk.cli.session_commands.rekey_sessions")
+    def test_rekey_failures_exit_nonzero(self, mock_rekey):
+        """Sessions that could not be rekeyed are listed and fail the command."""
+        from graftpunk.cache import RekeyResult
+
+        mock_rekey.return_value = RekeyResult(failed={"old": "expired"})
+
+        result = runner.invoke(app, ["session", "rekey"])
+
+        assert result.exit_code == 1
+        assert "old: expired" in result.output
+
+    @patch("graftpunk.cli.session_commands.rekey_sessions")
+    @patch("graftpunk.cli.session_commands.rotate_encryption_key")
+    def test_rekey_rotate_first(self, mock_rotate, mock_rekey):
+        """--rotate generates a new key before re-encrypting."""
+        from cryptography.fernet import Fernet
+
+        from graftpunk.cache import RekeyResult
+
+        mock_rotate.return_value = Fernet.generate_key()
+        mock_rekey.return_value = RekeyResult()
+
+        result = runner.invoke(app, ["session", "rekey", "--rotate"])
+
+        assert result.exit_code == 0
+        assert "New encryption key" in result.output
+        mock_rotate.assert_called_once()
+
+    @patch("graftpunk.cli.session_commands.rekey_sessions")
+    @patch("graftpunk.cli.session_commands.rotate_encryption_key")
+    def test_rekey_rotate_unsupported(self, mock_rotate, mock_rekey):
+        """A provider without rotation support aborts before rekeying."""
+        from graftpunk.exceptions import EncryptionError
+
+        mock_rotate.side_effect = EncryptionError("does not support rotation")
+
+        result = runner.invoke(app, ["session", "rekey", "--rotate"])
+
+        assert result.exit_code == 1
+        assert "does not support rotation" in result.output
+        mock_rekey.assert_not_called()
+
+
 class TestExportCommand:
     """Tests for export command."""
 
@@ -512,10 +589,10 @@ class TestKeepaliveCommands:
 class TestPluginsCommand:
     """Tests for plugins command."""
 
-    @patch("graftpunk.cli.main.create_yaml_plugins")
-    @patch("graftpunk.cli.main.discover_storage_backends")
-    @patch("graftpunk.cli.main.discover_keepalive_handlers")
-    @patch("graftpunk.cli.main.discover_site_plugins")
+    @patch("graftpunk.plugins.create_yaml_plugins")
+    @patch("graftpunk.plugins.discover_storage_backends")
+    @patch("graftpunk.plugins.discover_keepalive_handlers")
+    @patch("graftpunk.plugins.discover_site_plugins")
     def test_plugins_none_installed(self, mock_site, mock_handlers, mock_storage, mock_yaml):
         """Test plugins command with no plugins installed."""
         mock_storage.return_value = {}
@@ -529,10 +606,10 @@ class TestPluginsCommand:
         assert "Plugins" in result.output
         assert "none installed" in result.output
 
-    @patch("graftpunk.cli.main.create_yaml_plugins")
-    @patch("graftpunk.cli.main.discover_storage_backends")
-    @patch("graftpunk.cli.main.discover_keepalive_handlers")
-    @patch("graftpunk.cli.main.discover_site_plugins")
+    @patch("graftpunk.plugins.create_yaml_plugins")
+    @patch("graftpunk.plugins.discover_storage_backends")
+    @patch("graftpunk.plugins.discover_keepalive_handlers")
+    @patch("graftpunk.plugins.discover_site_plugins")
     def test_plugins_with_all_types(self, mock_site, mock_handlers, mock_storage, mock_yaml):
         """Test plugins command with all plugin types installed."""
         mock_storage.return_value = {"local": MagicMock(), "supabase": MagicMock()}
@@ -550,10 +627,10 @@ class TestPluginsCommand:
         assert "cookie-refresh" in output
         assert "my-plugin" in output
 
-    @patch("graftpunk.cli.main.create_yaml_plugins")
-    @patch("graftpunk.cli.main.discover_storage_backends")
-    @patch("graftpunk.cli.main.discover_keepalive_handlers")
-    @patch("graftpunk.cli.main.discover_site_plugins")
+    @patch("graftpunk.plugins.create_yaml_plugins")
+    @patch("graftpunk.plugins.discover_storage_backends")
+    @patch("graftpunk.plugins.discover_keepalive_handlers")
+    @patch("graftpunk.plugins.discover_site_plugins")
     def test_plugins_yaml_plugin_names_aggregated(
         self, mock_site, mock_handlers, mock_storage, mock_yaml
     ):
@@ -1096,7 +1173,7 @@ class TestObserveSessionFlag:
 
         with (
             patch("graftpunk.cli.main.OBSERVE_BASE_DIR", base),
-            patch("graftpunk.cli.main.resolve_session_name", return_value="site-a"),
+            patch("graftpunk.cli.plugin_commands.resolve_session_name", return_value="site-a"),
         ):
             result = runner.invoke(app, ["observe", "--session", "site-a", "list"])
         assert result.exit_code == 0
@@ -1126,7 +1203,7 @@ class TestObserveSessionFlag:
 
         with (
             patch("graftpunk.cli.main.OBSERVE_BASE_DIR", base),
-            patch("graftpunk.cli.main.resolve_session_name", return_value="site-a"),
+            patch("graftpunk.cli.plugin_commands.resolve_session_name", return_value="site-a"),
         ):
             result = runner.invoke(app, ["observe", "--session", "site-a", "show"])
         assert result.exit_code == 0
@@ -1150,7 +1227,7 @@ class TestObserveSessionFlag:
 
         with (
             patch("graftpunk.cli.main.OBSERVE_BASE_DIR", base),
-            patch("graftpunk.cli.main.resolve_session_name", return_value="site-a"),
+            patch("graftpunk.cli.plugin_commands.resolve_session_name", return_value="site-a"),
         ):
             result = runner.invoke(
                 app,
@@ -1365,7 +1442,7 @@ class TestObserveGoCommand:
     def test_observe_go_with_session_flag(self):
         """observe go --session should run the capture flow."""
         with (
-            patch("graftpunk.cli.main.resolve_session_name", return_value="mysite"),
+            patch("graftpunk.cli.plugin_commands.resolve_session_name", return_value="mysite"),
             patch("graftpunk.cli.main._run_observe_go", new_callable=MagicMock),
             patch("graftpunk.cli.main.asyncio") as mock_asyncio,
         ):
@@ -1378,7 +1455,7 @@ class TestObserveGoCommand:
     def test_observe_go_with_wait_option(self):
         """observe go --wait should pass wait value through."""
         with (
-            patch("graftpunk.cli.main.resolve_session_name", return_value="mysite"),
+            patch("graftpunk.cli.plugin_commands.resolve_session_name", return_value="mysite"),
             patch("graftpunk.cli.main._run_observe_go", new_callable=MagicMock),
             patch("graftpunk.cli.main.asyncio") as mock_asyncio,
         ):
@@ -674,6 +674,18 @@ class TestCommandSpecValidation:
         with pytest.raises(ValueError, match="rate_limit must be positive when set"):
             CommandSpec(name="test", handler=lambda: None, rate_limit=-1.0)
 
+    def test_non_positive_deadline_raises(self) -> None:
+        """CommandSpec rejects a zero or negative deadline."""
+        for deadline in (0.0, -5.0):
+            with pytest.raises(ValueError, match="deadline must be positive when set"):
+                CommandSpec(name="test", handler=lambda: None, deadline=deadline)
+
+    def test_non_positive_cache_ttl_raises(self) -> None:
+        """CommandSpec rejects a zero or negative cache_ttl."""
+        for cache_ttl in (0.0, -5.0):
+            with pytest.raises(ValueError, match="cache_ttl must be positive when set"):
+                CommandSpec(name="test", handler=lambda: None, cache_ttl=cache_ttl)
+
     def test_none_timeout_ok(self) -> None:
         """CommandSpec allows None timeout (no limit)."""
         spec = CommandSpec(name="test", handler=lambda: None, timeout=None)
@@ -965,6 +977,21 @@ class TestPluginConfigMetadata:
         with pytest.raises(dataclasses.FrozenInstanceError):
             config.plugin_version = "2.0.0"  # type: ignore[misc]
 
+    @pytest.mark.parametrize("value", [0, -1.5, True, "1"])
+    def test_invalid_rate_limit(self, value: object) -> None:
+        """PluginConfig.rate_limit must be a positive number when set."""
+        with pytest.raises(ValueError, match="rate_limit must be a positive number"):
+            PluginConfig(site_name="test", session_name="test", help_text="Test", rate_limit=value)  # type: ignore[arg-type]
+
+    def test_site_plugin_rate_limit(self) -> None:
+        """A SitePlugin's rate_limit class attribute reaches its PluginConfig."""
+
+        class Limited(SitePlugin):
+            site_name = "limited"
+            rate_limit = 2.0
+
+        assert Limited._plugin_config.rate_limit == 2.0
+
 
 class TestToCliName:
     """Tests for _to_cli_name helper converting Python names to CLI names."""
@@ -0,0 +1,347 @@
+"""Tests for lazy CLI start-up: PEP 562 package root and lazy command group.
+
+The subprocess tests run ``gp`` under ``python -X importtime`` in a fresh
+interpreter and check which modules were imported. They are the regression
+benchmark for start-up cost: a core command importing the browser stack,
+cryptography or plugin code shows up here, with the heaviest imports (by
+cumulative import time) listed in the failure message.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import typer
+from typer.testing import CliRunner
+
+import graftpunk
+from graftpunk.cli import plugin_commands
+from graftpunk.cli.lazy_group import LAZY_SUBCOMMAND_HELP, LAZY_SUBCOMMANDS, LazyCommandGroup
+from graftpunk.cli.plugin_manifest import clear_manifest_cache
+
+SRC_DIR = Path(graftpunk.__file__).parent.parent
+DISCOVER_ALL = "graftpunk.cli.plugin_commands.discover_all_plugins"
+GET_MANIFEST = "graftpunk.cli.plugin_manifest.get_plugin_manifest"
+
+BROWSER_MODULES = ("selenium", "requestium", "nodriver", "undetected_chromedriver")
+PLUGIN_MODULES = (
+    "graftpunk.plugins",
+    "graftpunk.cli.plugin_commands",
+    "graftpunk.cli.login_commands",
+)
+
+_SCRIPT = """
+import json, sys
+from graftpunk.cli.main import app
+sys.argv = ["gp", *{argv!r}]
+try:
+    app(prog_name="gp")
+except SystemExit:
+    pass
+print(json.dumps(sorted(sys.modules)), file=sys.__stdout__)
+"""
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registries(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep plugin registrations from leaking between tests."""
+    monkeypatch.setattr(plugin_commands, "_plugin_session_map", {})
+    monkeypatch.setattr(plugin_commands, "_registered_plugin_sources", {})
+    monkeypatch.setattr(plugin_commands, "_registered_plugins_for_teardown", [])
+    monkeypatch.setattr(plugin_commands, "_plugin_session_map_loaded", False)
+    clear_manifest_cache()
+
+
+_PLUGIN_FILE = """
+from graftpunk.plugins.cli_plugin import SitePlugin, command
+
+
+class Plugin(SitePlugin):
+    site_name = "{site}"
+    session_name = "{site}-session"
+    help_text = "{site} commands"
+    requires_session = False
+
+    @command(help="Ping")
+    def ping(self, ctx):
+        return {{"site": "{site}"}}
+"""
+
+
+def _write_plugin(config_dir: Path, site: str) -> Path:
+    """Write a one-command Python plugin file into the plugins directory."""
+    plugins_dir = config_dir / "plugins"
+    plugins_dir.mkdir(exist_ok=True)
+    path = plugins_dir / f"{site}.py"
+    path.write_text(_PLUGIN_FILE.format(site=site))
+    return path
+
+
+def _built_plugins() -> list[str]:
+    """site_names of plugins that were set up in this process."""
+    return [plugin.site_name for plugin in plugin_commands._registered_plugins_for_teardown]
+
+
+def _app() -> typer.Typer:
+    app = typer.Typer(cls=LazyCommandGroup, no_args_is_help=True)
+
+    @app.callback()
+    def main() -> None:
+        """Test root."""
+
+    @app.command("version")
+    def version() -> None:
+        typer.echo("v1")
+
+    return app
+
+
+def _import_times(stderr: str) -> dict[str, int]:
+    """Parse ``-X importtime`` output into module -> cumulative microseconds."""
+    times: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def _run_gp(
+    argv: list[str], tmp_path: Path, env: dict[str, str] | None = None
+) -> tuple[set[str], dict[str, int]]:
+    """Run gp in a fresh interpreter.
+
+    Returns:
+        Tuple of (modules in sys.modules at exit, -X importtime report)
+    """
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([str(SRC_DIR), os.environ.get("PYTHONPATH", "")]),
+        "GRAFTPUNK_CONFIG_DIR": str(tmp_path),
+        **(env or {}),
+    }
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", _SCRIPT.format(argv=argv)],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=tmp_path,
+        check=True,
+    )
+    modules = set(json.loads(result.stdout.strip().splitlines()[-1]))
+    return modules, _import_times(result.stderr)
+
+
+def _heaviest(times: dict[str, int], count: int = 10) -> list[tuple[str, int]]:
+    return sorted(times.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+class TestLazyPackageRoot:
+    """Tests for PEP 562 attribute loading in graftpunk/__init__.py."""
+
+    def test_all_public_names_resolve(self):
+        """Every name in __all__ is importable from the package root."""
+        for name in graftpunk.__all__:
+            assert getattr(graftpunk, name) is not None
+
+    def test_resolved_attribute_is_the_defining_object(self):
+        """Lazy attributes are the objects from their defining modules."""
+        from graftpunk.cache import load_session_for_api
+
+        assert graftpunk.load_session_for_api is load_session_for_api
+
+    def test_unknown_attribute_raises(self):
+        """Unknown names still raise AttributeError."""
+        with pytest.raises(AttributeError, match="no_such_name"):
+            _ = graftpunk.no_such_name
+
+    def test_dir_lists_lazy_names(self):
+        """dir() includes names that have not been loaded yet."""
+        assert {"GraftpunkClient", "BrowserSession", "cache_session"} <= set(dir(graftpunk))
+
+
+class TestLazyCommandGroup:
+    """Tests for LazyCommandGroup command resolution."""
+
+    def test_core_command_does_not_discover_plugins(self):
+        """Running a built-in command never runs plugin discovery."""
+        with patch(DISCOVER_ALL) as mock_discover, patch(GET_MANIFEST) as mock_manifest:
+            result = CliRunner().invoke(_app(), ["version"])
+
+        assert result.exit_code == 0
+        assert result.output.strip() == "v1"
+        mock_discover.assert_not_called()
+        mock_manifest.assert_not_called()
+
+    def test_plugin_command_builds_only_that_plugin(self, isolated_config: Path):
+        """Invoking a plugin imports and sets up just the matching plugin file."""
+        _write_plugin(isolated_config, "alpha")
+        _write_plugin(isolated_config, "beta")
+        clear_manifest_cache()
+
+        result = CliRunner().invoke(_app(), ["beta", "ping"])
+
+        assert result.exit_code == 0, result.output
+        assert "beta" in result.output
+        assert _built_plugins() == ["beta"]
+        assert plugin_commands._plugin_session_map == {
+            "alpha": "alpha-session",
+            "beta": "beta-session",
+        }
+
+    def test_help_lists_plugins_without_building_them(self, isolated_config: Path):
+        """--help lists built-in groups and manifest plugins, building none."""
+        _write_plugin(isolated_config, "alpha")
+        _write_plugin(isolated_config, "beta")
+
+        with patch(DISCOVER_ALL) as mock_discover:
+            result = CliRunner().invoke(_app(), ["--help"])
+
+        assert result.exit_code == 0
+        for name in ("version", *LAZY_SUBCOMMANDS, "alpha", "beta"):
+            assert name in result.output
+        assert "alpha commands" in result.output
+        assert _built_plugins() == []
+        mock_discover.assert_not_called()
+
+    def test_lazy_sub_app_is_mounted_on_use(self):
+        """A built-in sub-app is imported and mounted when invoked."""
+        with patch(GET_MANIFEST) as mock_manifest:
+            result = CliRunner().invoke(_app(), ["keepalive", "--help"])
+
+        assert result.exit_code == 0
+        assert "keepalive daemon" in result.output
+        mock_manifest.assert_not_called()
+
+    def test_lazy_sub_app_help_matches_sub_app(self):
+        """Placeholder help for built-in sub-apps matches the real apps."""
+        from importlib import import_module
+
+        assert set(LAZY_SUBCOMMAND_HELP) == set(LAZY_SUBCOMMANDS)
+        for name, path in LAZY_SUBCOMMANDS.items():
+            module_name, _, attr = path.partition(":")
+            sub_app = getattr(import_module(module_name), attr)
+            assert sub_app.info.help == LAZY_SUBCOMMAND_HELP[name]
+
+    def test_unknown_command_is_an_error(self):
+        """An unknown name that matches no plugin is still a usage error."""
+        result = CliRunner().invoke(_app(), ["nope"])
+
+        assert result.exit_code == 2
+        assert "No such command" in result.output
+
+    def test_manifest_failure_keeps_core_commands(self):
+        """A broken plugin manifest is reported, not fatal."""
+        with patch(GET_MANIFEST, side_effect=RuntimeError("boom")):
+            help_result = CliRunner().invoke(_app(), ["--help"])
+            run_result = CliRunner().invoke(_app(), ["alpha"])
+
+        assert help_result.exit_code == 0
+        assert "version" in help_result.output
+        assert run_result.exit_code == 2
+
+
+class TestOnDemandPluginLookup:
+    """Tests for session name resolution without built plugin apps."""
+
+    def test_resolve_session_name_uses_manifest(self, isolated_config: Path):
+        """A site_name resolves to its session even if no app was built."""
+        _write_plugin(isolated_config, "alpha")
+
+        assert plugin_commands.resolve_session_name("alpha") == "alpha-session"
+        assert plugin_commands.resolve_session_name("other") == "other"
+        assert _built_plugins() == []
+
+    def test_get_plugin_for_session_sets_up_on_demand(self, isolated_config: Path):
+        """The owning plugin is set up once and registered for teardown."""
+        _write_plugin(isolated_config, "alpha")
+        _write_plugin(isolated_config, "beta")
+
+        plugin = plugin_commands.get_plugin_for_session("alpha-session")
+
+        assert plugin is not None
+        assert plugin.site_name == "alpha"
+        assert plugin_commands.get_plugin_for_session("alpha-session") is plugin
+        assert plugin_commands.get_plugin_for_session("unknown") is None
+        assert _built_plugins() == ["alpha"]
+
+
+class TestStartupImports:
+    """Import-time regression checks for core commands (fresh interpreter)."""
+
+    def test_version_imports_no_plugins_or_heavy_stacks(self, tmp_path: Path):
+        """``gp version`` imports no plugin, HTTP, crypto or browser modules."""
+        modules, times = _run_gp(["version"], tmp_path)
+
+        unexpected = [
+            name
+            for name in modules
+            if name.startswith((*BROWSER_MODULES, *PLUGIN_MODULES, "cryptography", "requests"))
+            or name in ("graftpunk.cache", "graftpunk.cli.http_commands")
+        ]
+        assert not unexpected, (
+            f"gp version imported {sorted(unexpected)}; heaviest: {_heaviest(times)}"
+        )
+
+    def test_help_with_fresh_manifest_imports_no_plugins(self, tmp_path: Path):
+        """``gp --help`` lists plugins from the manifest without importing plugin code."""
+        (tmp_path / "plugins").mkdir()
+        (tmp_path / "plugins" / "httpbin.yaml").write_text(
+            'site_name: httpbin\nhelp: "httpbin commands"\ncommands:\n  ip:\n    url: "/ip"\n'
+        )
+        first, _ = _run_gp(["--help"], tmp_path)
+        modules, times = _run_gp(["--help"], tmp_path)
+
+        assert "graftpunk.plugins.yaml_plugin" in first
+        unexpected = [
+            name
+            for name in modules
+            if name.startswith((*BROWSER_MODULES, *PLUGIN_MODULES, "requests"))
+            or name in {path.partition(":")[0] for path in LAZY_SUBCOMMANDS.values()}
+        ]
+        assert not unexpected, (
+            f"gp --help imported {sorted(unexpected)}; heaviest: {_heaviest(times)}"
+        )
+
+    def test_plugin_completion_imports_no_plugin_code(self, tmp_path: Path):
+        """Completing ``gp <site> ...`` answers from the manifest without building the plugin."""
+        _write_plugin(tmp_path, "alpha")
+        completion_env = {
+            "_GP_COMPLETE": "complete_bash",
+            "COMP_WORDS": "gp alpha p",
+            "COMP_CWORD": "2",
+        }
+        _run_gp([], tmp_path, completion_env)
+        modules, times = _run_gp([], tmp_path, completion_env)
+
+        unexpected = [
+            name
+            for name in modules
+            if name.startswith((*BROWSER_MODULES, *PLUGIN_MODULES, "requests"))
+            or name in ("graftpunk.cli.command_factory", "alpha")
+        ]
+        assert not unexpected, (
+            f"gp completion imported {sorted(unexpected)}; heaviest: {_heaviest(times)}"
+        )
+
+    def test_http_imports_no_plugins_or_browser(self, tmp_path: Path):
+        """``gp http get --help`` imports the HTTP group but no plugin or browser code."""
+        modules, times = _run_gp(["http", "get", "--help"], tmp_path)
+
+        assert "graftpunk.cli.http_commands" in modules
+        unexpected = [
+            name
+            for name in modules
+            if name.startswith(BROWSER_MODULES) or name in ("graftpunk.cli.login_commands",)
+        ]
+        assert not unexpected, (
+            f"gp http imported {sorted(unexpected)}; heaviest: {_heaviest(times)}"
+        )
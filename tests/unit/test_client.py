@@ -2,6 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import threading
+import time
+from collections.abc import Iterator
 from typing import Any
 from unittest.mock import MagicMock, call, patch
 
@@ -10,14 +15,24 @@ import requests
 
 from graftpunk.client import (
     GraftpunkClient,
+    _arun_handler_with_limits,
     _CommandCallable,
-    _enforce_shared_rate_limit,
     _GroupProxy,
     _run_handler_with_limits,
     execute_plugin_command,
 )
-from graftpunk.exceptions import CommandError, SessionNotFoundError
-from graftpunk.plugins.cli_plugin import CommandContext, CommandResult, CommandSpec
+from graftpunk.event_loop import get_loop_runner
+from graftpunk.exceptions import CommandError, CommandTimeoutError, SessionNotFoundError
+from graftpunk.graftpunk_session import GraftpunkSession
+from graftpunk.plugins.cli_plugin import (
+    CommandContext,
+    CommandResult,
+    CommandSpec,
+    build_plugin_config,
+)
+from graftpunk.plugins.pagination import Page, PaginationConfig, Paginator
+from graftpunk.ratelimit import AdaptiveConcurrency, RateLimit, RateLimiter
+from graftpunk.transport import TransportConfig
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -395,7 +410,7 @@ class TestExecutionPipeline:
         client = GraftpunkClient("testsite")
         mock_load.assert_not_called()
         client.fetch()
-        mock_load.assert_called_once_with("testsite")
+        mock_load.assert_called_once_with("testsite", transport=None)
 
     @patch("graftpunk.client.load_session_for_api")
     @patch("graftpunk.client.get_plugin")
@@ -557,6 +572,32 @@ class TestSessionPersistence:
         client.fetch()
         mock_update.assert_not_called()
 
+    @patch("graftpunk.client.update_session_cookies")
+    @patch("graftpunk.client.load_session_for_api")
+    @patch("graftpunk.client.get_plugin")
+    def test_paginated_result_persisted_again_on_close(
+        self,
+        mock_get: MagicMock,
+        mock_load: MagicMock,
+        mock_update: MagicMock,
+    ) -> None:
+        """Cookies set while a paginated result is iterated are saved by close()."""
+        paginator = Paginator(
+            MagicMock(),
+            "GET",
+            Page(1, "https://api.example.com/items", None, [], []),
+            PaginationConfig("link"),
+        )
+        spec = _make_spec("items", handler=MagicMock(return_value=paginator), saves_session=True)
+        mock_get.return_value = _make_plugin(commands=[spec])
+        mock_load.return_value = MagicMock(spec=requests.Session)
+        client = GraftpunkClient("testsite")
+
+        assert client.items().data is paginator
+        assert client._session_dirty is True
+        client.close()
+        assert mock_update.call_count == 2
+
 
 # ---------------------------------------------------------------------------
 # Error handling
@@ -611,7 +652,8 @@ class TestRetryLogic:
         result = client.fetch()
         assert result.data == {"ok": True}
         assert handler.call_count == 2
-        mock_time.sleep.assert_called_once_with(1)  # 2**0
+        (backoff,), _ = mock_time.sleep.call_args
+        assert 1 <= backoff <= 3  # decorrelated jitter from the 1s base
 
     @patch("graftpunk.client.time")
     @patch("graftpunk.client.load_session_for_api")
@@ -757,15 +799,15 @@ class TestExecutePluginCommand:
         result = execute_plugin_command(spec, ctx)
         assert result is cr
 
-    def test_uses_custom_rate_limit_state(self) -> None:
-        """Custom rate_limit_state dict is passed through."""
-        state: dict[str, float] = {}
+    def test_uses_custom_limiter(self) -> None:
+        """A custom limiter is used for the command's bucket."""
+        limiter = MagicMock(spec=RateLimiter)
         handler = MagicMock(return_value={})
         spec = _make_spec("cmd", handler=handler, rate_limit=1.0)
         ctx = self._make_ctx()
-        with patch("graftpunk.client.time"):
-            execute_plugin_command(spec, ctx, rate_limit_state=state)
-        assert "testplugin.cmd" in state
+        execute_plugin_command(spec, ctx, limiter=limiter)
+        limiter.acquire.assert_called_once_with("command:testplugin.cmd", RateLimit(1.0))
+        limiter.succeeded.assert_called_once_with("command:testplugin.cmd", RateLimit(1.0))
 
     def test_forwards_kwargs_to_handler(self) -> None:
         """Keyword arguments are passed to the handler."""
@@ -799,7 +841,7 @@ class TestRunHandlerWithLimits:
         spec = _make_spec("cmd", handler=handler, max_retries=2)
         ctx = self._make_ctx()
         with patch("graftpunk.client.time.sleep"):
-            result = _run_handler_with_limits(handler, ctx, spec, {})
+            result = _run_handler_with_limits(handler, ctx, spec, RateLimiter())
         assert result == {"ok": True}
         assert handler.call_count == 2
 
@@ -812,20 +854,21 @@ class TestRunHandlerWithLimits:
             patch("graftpunk.client.time.sleep"),
             pytest.raises(requests.ConnectionError, match="permanent"),
         ):
-            _run_handler_with_limits(handler, ctx, spec, {})
+            _run_handler_with_limits(handler, ctx, spec, RateLimiter())
         assert handler.call_count == 3
 
-    def test_exponential_backoff_timing(self) -> None:
-        """time.sleep called with 1, 2, 4 for 3 retries."""
+    def test_jittered_backoff_timing(self) -> None:
+        """Each backoff is drawn from [1s, 3 * previous], capped at 30s."""
         handler = MagicMock(side_effect=requests.ConnectionError("fail"))
-        spec = _make_spec("cmd", handler=handler, max_retries=3)
+        spec = _make_spec("cmd", handler=handler, max_retries=4)
         ctx = self._make_ctx()
         with (
+            patch("graftpunk.retry.random.uniform", side_effect=lambda low, high: high),
             patch("graftpunk.client.time.sleep") as mock_sleep,
             pytest.raises(requests.ConnectionError),
         ):
-            _run_handler_with_limits(handler, ctx, spec, {})
-        assert mock_sleep.call_args_list == [call(1), call(2), call(4)]
+            _run_handler_with_limits(handler, ctx, spec, RateLimiter())
+        assert mock_sleep.call_args_list == [call(3), call(9), call(27), call(30)]
 
     def test_no_retry_on_programming_error(self) -> None:
         """TypeError/ValueError propagate immediately without retry."""
@@ -834,12 +877,12 @@ class TestRunHandlerWithLimits:
             spec = _make_spec("cmd", handler=handler, max_retries=3)
             ctx = self._make_ctx()
             with pytest.raises(exc_class, match="bug"):
-                _run_handler_with_limits(handler, ctx, spec, {})
+                _run_handler_with_limits(handler, ctx, spec, RateLimiter())
             assert handler.call_count == 1
 
     @pytest.mark.parametrize(
         "exc_type",
-        [requests.RequestException, ConnectionError, TimeoutError, OSError],
+        [requests.ConnectionError, requests.Timeout, ConnectionError, TimeoutError],
     )
     def test_each_retryable_exception_type(self, exc_type: type[Exception]) -> None:
         """Each retryable exception type triggers retry."""
@@ -847,53 +890,171 @@ class TestRunHandlerWithLimits:
         spec = _make_spec("cmd", handler=handler, max_retries=1)
         ctx = self._make_ctx()
         with patch("graftpunk.client.time.sleep"):
-            result = _run_handler_with_limits(handler, ctx, spec, {})
+            result = _run_handler_with_limits(handler, ctx, spec, RateLimiter())
         assert result == {"ok": True}
         assert handler.call_count == 2
 
-    def test_zero_retries_raises_immediately(self) -> None:
-        """max_retries=0 means single attempt then raise."""
-        handler = MagicMock(side_effect=requests.ConnectionError("once"))
-        spec = _make_spec("cmd", handler=handler, max_retries=0)
-        ctx = self._make_ctx()
-        with pytest.raises(requests.ConnectionError, match="once"):
-            _run_handler_with_limits(handler, ctx, spec, {})
+    @pytest.mark.parametrize(
+        "exc",
+        [
+            requests.RequestException("generic"),
+            requests.exceptions.InvalidURL("bad url"),
+            FileNotFoundError("missing"),
+            PermissionError("denied"),
+        ],
+    )
+    def test_non_transient_errors_not_retried(self, exc: Exception) -> None:
+        """Errors that will fail again (bad URL, missing file) propagate at once."""
+        handler = MagicMock(side_effect=exc)
+        spec = _make_spec("cmd", handler=handler, max_retries=3)
+        with pytest.raises(type(exc)):
+            _run_handler_with_limits(handler, self._make_ctx(), spec, RateLimiter())
         assert handler.call_count == 1
 
-
-# ---------------------------------------------------------------------------
-# _enforce_shared_rate_limit
-# ---------------------------------------------------------------------------
-
-
-class TestEnforceSharedRateLimit:
-    """Tests for _enforce_shared_rate_limit."""
-
-    def test_first_call_no_sleep(self) -> None:
-        """First call does not sleep."""
-        state: dict[str, float] = {}
+    @pytest.mark.parametrize(("status", "calls"), [(404, 1), (502, 2)])
+    def test_http_errors_retried_by_status(self, status: int, calls: int) -> None:
+        """Only 429/502/503/504 HTTPErrors are retried."""
+        response = requests.Response()
+        response.status_code = status
+        handler = MagicMock(side_effect=[requests.HTTPError(response=response), {"ok": True}])
+        spec = _make_spec("cmd", handler=handler, max_retries=1)
+        with patch("graftpunk.client.time.sleep"), contextlib.suppress(requests.HTTPError):
+            _run_handler_with_limits(handler, self._make_ctx(), spec, RateLimiter())
+        assert handler.call_count == calls
+
+    def test_retry_budget_stops_retries(self) -> None:
+        """Once most recent attempts failed, the plugin stops retrying."""
+        handler = MagicMock(side_effect=requests.ConnectionError("down"))
+        spec = _make_spec("cmd", handler=handler, max_retries=10)
         with (
             patch("graftpunk.client.time.sleep") as mock_sleep,
-            patch("graftpunk.client.time.monotonic", return_value=100.0),
+            pytest.raises(requests.ConnectionError),
         ):
-            _enforce_shared_rate_limit("key", 1.0, state)
-        mock_sleep.assert_not_called()
-        assert "key" in state
+            _run_handler_with_limits(handler, self._make_ctx(), spec, RateLimiter())
+        # 10 tokens, retries allowed while more than 5 remain
+        assert handler.call_count == 5
+        assert mock_sleep.call_count == 4
+
+        handler.reset_mock()
+        with pytest.raises(requests.ConnectionError):
+            _run_handler_with_limits(handler, self._make_ctx(), spec, RateLimiter())
+        assert handler.call_count == 1
 
-    def test_rapid_second_call_sleeps(self) -> None:
-        """Second call within rate limit sleeps for remainder."""
-        state: dict[str, float] = {}
+    def test_deadline_stops_retries(self) -> None:
+        """A retry that could not start before the deadline raises CommandTimeoutError."""
+        handler = MagicMock(side_effect=requests.ConnectionError("slow"))
+        spec = CommandSpec(name="cmd", handler=handler, max_retries=5, deadline=2.0)
         with (
+            patch("graftpunk.retry.random.uniform", side_effect=lambda low, high: high),
             patch("graftpunk.client.time.sleep") as mock_sleep,
-            patch(
-                "graftpunk.client.time.monotonic",
-                side_effect=[100.0, 100.0, 100.5, 100.5],
-            ),
+            pytest.raises(CommandTimeoutError, match="2s deadline") as excinfo,
         ):
-            _enforce_shared_rate_limit("key", 1.0, state)
-            mock_sleep.assert_not_called()
-            _enforce_shared_rate_limit("key", 1.0, state)
-            mock_sleep.assert_called_once_with(0.5)
+            _run_handler_with_limits(handler, self._make_ctx(), spec, RateLimiter())
+        assert handler.call_count == 1
+        mock_sleep.assert_not_called()
+        assert isinstance(excinfo.value.__cause__, requests.ConnectionError)
+
+    def test_attempt_timeout_reaches_requests(self) -> None:
+        """Inside an attempt request_timeout() reports the time left."""
+        from graftpunk.retry import request_timeout
+
+        seen: list[float | None] = []
+        spec = CommandSpec(
+            name="cmd", handler=lambda ctx: seen.append(request_timeout()), timeout=5.0
+        )
+
+        _run_handler_with_limits(spec.handler, self._make_ctx(), spec, RateLimiter())
+
+        assert seen[0] is not None
+        assert 4 < seen[0] <= 5
+        assert request_timeout() is None
+
+    def test_cache_ttl_active_during_attempt(self) -> None:
+        """A command's cache_ttl is in effect while its handler runs."""
+        from graftpunk.response_cache import current_cache_ttl
+
+        seen: list[float | None] = []
+        spec = CommandSpec(
+            name="cmd", handler=lambda ctx: seen.append(current_cache_ttl()), cache_ttl=300
+        )
+
+        _run_handler_with_limits(spec.handler, self._make_ctx(), spec, RateLimiter())
+
+        assert seen == [300]
+        assert current_cache_ttl() is None
+
+    def test_async_handler_cancelled_at_timeout(self) -> None:
+        """A coroutine handler that overruns its timeout is cancelled and retried."""
+        calls: list[int] = []
+
+        async def handler(ctx: CommandContext) -> str:
+            calls.append(1)
+            if len(calls) == 1:
+                await asyncio.sleep(10)
+            return "done"
+
+        spec = CommandSpec(name="cmd", handler=handler, timeout=0.05, max_retries=1)
+        with patch("graftpunk.client.time.sleep"):
+            result = _run_handler_with_limits(handler, self._make_ctx(), spec, RateLimiter())
+
+        assert result == "done"
+        assert len(calls) == 2
+
+    def test_plugin_rate_limit_bucket(self) -> None:
+        """A plugin's rate_limit adds a bucket shared by all its commands."""
+        limiter = MagicMock(spec=RateLimiter)
+        handler = MagicMock(return_value={})
+        spec = _make_spec("cmd", handler=handler, rate_limit=1.0)
+        ctx = self._make_ctx()
+        ctx.config = build_plugin_config(site_name="testplugin", rate_limit=0.5)
+
+        _run_handler_with_limits(handler, ctx, spec, limiter)
+
+        assert limiter.acquire.call_args_list == [
+            call("command:testplugin.cmd", RateLimit(1.0)),
+            call("plugin:testplugin", RateLimit(0.5)),
+        ]
+
+    def test_throttled_retry_waits_for_retry_after(self) -> None:
+        """A 429 without rate-limit buckets sleeps for Retry-After, not 2**attempt."""
+        response = requests.Response()
+        response.status_code = 429
+        response.headers["Retry-After"] = "7"
+        handler = MagicMock(side_effect=[requests.HTTPError(response=response), {"ok": True}])
+        spec = _make_spec("cmd", handler=handler, max_retries=1)
+        ctx = self._make_ctx()
+        with patch("graftpunk.client.time.sleep") as mock_sleep:
+            result = _run_handler_with_limits(handler, ctx, spec, RateLimiter())
+        assert result == {"ok": True}
+        mock_sleep.assert_called_once_with(7.0)
+
+    def test_throttled_retry_slows_buckets(self) -> None:
+        """A 429 pauses and slows the command's bucket; the retry waits in acquire()."""
+        response = requests.Response()
+        response.status_code = 429
+        response.headers["Retry-After"] = "3"
+        handler = MagicMock(side_effect=[requests.HTTPError(response=response), {"ok": True}])
+        spec = _make_spec("cmd", handler=handler, max_retries=1, rate_limit=1.0)
+        ctx = self._make_ctx()
+        waits: list[float] = []
+        limiter = RateLimiter(clock=lambda: 1000.0, sleep=waits.append)
+
+        with patch("graftpunk.client.time.sleep"):
+            _run_handler_with_limits(handler, ctx, spec, limiter)
+
+        assert waits == [3.0]
+        assert limiter.throttle_count == 1
+        # Halved rate: the next slot is two intervals after the retry
+        assert limiter.reserve("command:testplugin.cmd", RateLimit(1.0)) == pytest.approx(5.0)
+
+    def test_zero_retries_raises_immediately(self) -> None:
+        """max_retries=0 means single attempt then raise."""
+        handler = MagicMock(side_effect=requests.ConnectionError("once"))
+        spec = _make_spec("cmd", handler=handler, max_retries=0)
+        ctx = self._make_ctx()
+        with pytest.raises(requests.ConnectionError, match="once"):
+            _run_handler_with_limits(handler, ctx, spec, RateLimiter())
+        assert handler.call_count == 1
 
 
 # ---------------------------------------------------------------------------
@@ -902,7 +1063,7 @@ class TestEnforceSharedRateLimit:
 
 
 class TestAsyncHandlerDetection:
-    """Tests for async handler auto-execution in _run_handler_with_limits."""
+    """Tests for async handlers run through the sync _run_handler_with_limits."""
 
     def _make_ctx(self) -> CommandContext:
         return CommandContext(
@@ -912,19 +1073,49 @@ class TestAsyncHandlerDetection:
             api_version=1,
         )
 
-    def test_async_handler_auto_executed_with_warning(self) -> None:
-        """Async handlers are auto-executed via asyncio.run with a warning."""
+    def test_async_handler_runs_on_persistent_loop(self) -> None:
+        """Async handlers run on one shared loop, without a warning."""
+        loops: list[asyncio.AbstractEventLoop] = []
 
         async def async_handler(ctx: Any, **kwargs: Any) -> dict[str, str]:
+            loops.append(asyncio.get_running_loop())
             return {"async": "result"}
 
         spec = _make_spec("asynccmd", handler=async_handler)
         ctx = self._make_ctx()
         with patch("graftpunk.client.LOG") as mock_log:
-            result = _run_handler_with_limits(async_handler, ctx, spec, {})
+            result = _run_handler_with_limits(async_handler, ctx, spec, RateLimiter())
+            _run_handler_with_limits(async_handler, ctx, spec, RateLimiter())
         assert result == {"async": "result"}
-        mock_log.warning.assert_called_once()
-        assert mock_log.warning.call_args[0][0] == "async_handler_auto_executed"
+        mock_log.warning.assert_not_called()
+        assert loops[0] is loops[1]
+        assert loops[0] is get_loop_runner().loop
+
+    def test_async_handler_inside_running_loop(self) -> None:
+        """Sync execution of an async handler works from code already inside a loop."""
+
+        async def async_handler(ctx: Any, **kwargs: Any) -> str:
+            await asyncio.sleep(0)
+            return "ok"
+
+        spec = _make_spec("asynccmd", handler=async_handler)
+
+        async def caller() -> str:
+            return _run_handler_with_limits(async_handler, self._make_ctx(), spec, RateLimiter())
+
+        assert asyncio.run(caller()) == "ok"
+
+    def test_async_handler_sees_attempt_timeout(self) -> None:
+        """The attempt deadline reaches coroutines run on the shared loop."""
+        from graftpunk.retry import request_timeout
+
+        async def async_handler(ctx: Any, **kwargs: Any) -> float | None:
+            return request_timeout()
+
+        spec = CommandSpec(name="cmd", handler=async_handler, timeout=5.0)
+        remaining = _run_handler_with_limits(async_handler, self._make_ctx(), spec, RateLimiter())
+        assert remaining is not None
+        assert 4 < remaining <= 5
 
     def test_async_handler_result_returned(self) -> None:
         """Return value from async handler is returned correctly."""
@@ -934,7 +1125,7 @@ class TestAsyncHandlerDetection:
 
         spec = _make_spec("asynccmd2", handler=async_handler)
         ctx = self._make_ctx()
-        result = _run_handler_with_limits(async_handler, ctx, spec, {})
+        result = _run_handler_with_limits(async_handler, ctx, spec, RateLimiter())
         assert result == [1, 2, 3]
 
     def test_sync_handler_no_warning(self) -> None:
@@ -946,7 +1137,7 @@ class TestAsyncHandlerDetection:
         spec = _make_spec("synccmd", handler=sync_handler)
         ctx = self._make_ctx()
         with patch("graftpunk.client.LOG") as mock_log:
-            result = _run_handler_with_limits(sync_handler, ctx, spec, {})
+            result = _run_handler_with_limits(sync_handler, ctx, spec, RateLimiter())
         assert result == {"sync": "result"}
         mock_log.warning.assert_not_called()
 
@@ -964,11 +1155,144 @@ class TestAsyncHandlerDetection:
         spec = _make_spec("flakyasync", handler=flaky_async, max_retries=1)
         ctx = self._make_ctx()
         with patch("graftpunk.client.time.sleep"):
-            result = _run_handler_with_limits(flaky_async, ctx, spec, {})
+            result = _run_handler_with_limits(flaky_async, ctx, spec, RateLimiter())
         assert result == {"recovered": "yes"}
         assert call_count == 2
 
 
+# ---------------------------------------------------------------------------
+# Async execution
+# ---------------------------------------------------------------------------
+
+
+class TestAsyncExecution:
+    """Tests for _arun_handler_with_limits and GraftpunkClient.aexecute."""
+
+    def _make_ctx(self) -> CommandContext:
+        return CommandContext(
+            session=MagicMock(),
+            plugin_name="testplugin",
+            command_name="test",
+            api_version=1,
+        )
+
+    async def test_async_handler_awaited_on_caller_loop(self) -> None:
+        """Coroutine handlers run on the caller's loop, not the shared one."""
+
+        async def handler(ctx: Any, **kwargs: Any) -> asyncio.AbstractEventLoop:
+            return asyncio.get_running_loop()
+
+        spec = _make_spec("cmd", handler=handler)
+        loop = await _arun_handler_with_limits(handler, self._make_ctx(), spec, RateLimiter())
+        assert loop is asyncio.get_running_loop()
+
+    async def test_sync_handler_runs_in_thread(self) -> None:
+        """Sync handlers run in a worker thread so they do not block the loop."""
+        spec = _make_spec("cmd", handler=lambda ctx, **kw: threading.current_thread())
+        thread = await _arun_handler_with_limits(
+            spec.handler, self._make_ctx(), spec, RateLimiter()
+        )
+        assert thread is not threading.current_thread()
+
+    async def test_retries_with_async_sleep(self) -> None:
+        """Transient failures are retried, waiting with asyncio.sleep."""
+        handler = MagicMock(side_effect=[requests.ConnectionError("flaky"), {"ok": True}])
+        spec = _make_spec("cmd", handler=handler, max_retries=1)
+        with (
+            patch("graftpunk.client.asyncio.sleep") as mock_sleep,
+            patch("graftpunk.client.time.sleep") as mock_time_sleep,
+        ):
+            result = await _arun_handler_with_limits(handler, self._make_ctx(), spec, RateLimiter())
+        assert result == {"ok": True}
+        assert handler.call_count == 2
+        mock_sleep.assert_awaited_once()
+        mock_time_sleep.assert_not_called()
+
+    async def test_non_transient_error_not_retried(self) -> None:
+        """Errors that would fail again are raised at once."""
+        handler = MagicMock(side_effect=ValueError("bad"))
+        spec = _make_spec("cmd", handler=handler, max_retries=3)
+        with pytest.raises(ValueError, match="bad"):
+            await _arun_handler_with_limits(handler, self._make_ctx(), spec, RateLimiter())
+        assert handler.call_count == 1
+
+    async def test_timeout_cancels_and_retries(self) -> None:
+        """A coroutine handler that overruns its timeout is cancelled and retried."""
+        calls: list[int] = []
+
+        async def handler(ctx: CommandContext) -> str:
+            calls.append(1)
+            if len(calls) == 1:
+                await asyncio.sleep(10)
+            return "done"
+
+        spec = CommandSpec(name="cmd", handler=handler, timeout=0.05, max_retries=1)
+        with patch("graftpunk.retry.random.uniform", return_value=0):
+            result = await _arun_handler_with_limits(handler, self._make_ctx(), spec, RateLimiter())
+        assert result == "done"
+        assert len(calls) == 2
+
+    async def test_rate_limit_waits_without_blocking(self) -> None:
+        """Rate-limit waits use the async acquire."""
+        limiter = RateLimiter()
+        spec = _make_spec("cmd", handler=lambda ctx, **kw: "ok", rate_limit=1.0)
+        with patch.object(limiter, "aacquire", wraps=limiter.aacquire) as aacquire:
+            await _arun_handler_with_limits(spec.handler, self._make_ctx(), spec, limiter)
+        aacquire.assert_awaited_once_with("command:testplugin.cmd", RateLimit(1.0))
+
+    @patch("graftpunk.client.load_session_for_api")
+    @patch("graftpunk.client.get_plugin")
+    async def test_aexecute(self, mock_get: MagicMock, mock_load: MagicMock) -> None:
+        """aexecute runs the full pipeline and returns a CommandResult."""
+
+        async def handler(ctx: CommandContext, **kwargs: Any) -> dict[str, Any]:
+            await asyncio.sleep(0)
+            return {"session": ctx.session, **kwargs}
+
+        spec = _make_spec("invoice_get", group="invoice", handler=handler)
+        mock_get.return_value = _make_plugin(commands=[spec])
+        session = MagicMock(spec=requests.Session)
+        mock_load.return_value = session
+
+        async with GraftpunkClient("testsite") as client:
+            results = await asyncio.gather(
+                *(client.aexecute("invoice", "invoice_get", id=i) for i in range(3))
+            )
+
+        assert [r.data["id"] for r in results] == [0, 1, 2]
+        assert all(r.data["session"] is session for r in results)
+        mock_load.assert_called_once()
+        client._plugin.teardown.assert_called_once()
+
+    @patch("graftpunk.client.clear_cached_tokens")
+    @patch("graftpunk.client.prepare_session")
+    @patch("graftpunk.client.load_session_for_api")
+    @patch("graftpunk.client.get_plugin")
+    async def test_aexecute_403_refreshes_tokens(
+        self,
+        mock_get: MagicMock,
+        mock_load: MagicMock,
+        mock_prep: MagicMock,
+        mock_clear: MagicMock,
+    ) -> None:
+        """A 403 refreshes tokens and retries once, as execute() does."""
+        response_403 = MagicMock()
+        response_403.status_code = 403
+        response_403.url = "https://ex.com/api"
+        handler = MagicMock(
+            side_effect=[requests.exceptions.HTTPError(response=response_403), {"retried": True}]
+        )
+        spec = _make_spec("fetch", handler=handler)
+        mock_get.return_value = _make_plugin(commands=[spec], token_config=MagicMock())
+        mock_load.return_value = MagicMock(spec=requests.Session)
+
+        result = await GraftpunkClient("testsite").aexecute("fetch")
+
+        assert result.data == {"retried": True}
+        mock_clear.assert_called_once()
+        assert mock_prep.call_count == 2
+
+
 # ---------------------------------------------------------------------------
 # close() session persistence
 # ---------------------------------------------------------------------------
@@ -1111,6 +1435,41 @@ class TestRequiresSessionFallback:
         client.health()
         mock_load.assert_not_called()
 
+    @patch("graftpunk.client.get_plugin")
+    def test_bare_session_reused_with_transport(self, mock_get: MagicMock) -> None:
+        """Session-less commands share one bare session using the plugin's transport."""
+        handler = MagicMock(return_value={})
+        spec = _make_spec("health", handler=handler, requires_session=False)
+        plugin = _make_plugin(commands=[spec], requires_session=False)
+        plugin.transport_config = TransportConfig(pool_maxsize=40)
+        mock_get.return_value = plugin
+        client = GraftpunkClient("testsite")
+
+        client.health()
+        client.health()
+
+        first, second = (args[0].session for args, _ in handler.call_args_list)
+        assert first is second
+        assert first.get_adapter("https://example.com/")._pool_maxsize == 40
+        assert isinstance(first, GraftpunkSession)
+        assert first._gp_cache_partition == "anonymous:testsite"
+
+    @patch("graftpunk.client.load_session_for_api")
+    @patch("graftpunk.client.get_plugin")
+    def test_session_loaded_with_plugin_transport(
+        self, mock_get: MagicMock, mock_load: MagicMock
+    ) -> None:
+        """The plugin's transport config is passed to load_session_for_api."""
+        transport = TransportConfig(pool_maxsize=40)
+        plugin = _make_plugin(commands=[_make_spec("fetch", handler=MagicMock(return_value={}))])
+        plugin.transport_config = transport
+        mock_get.return_value = plugin
+        mock_load.return_value = MagicMock(spec=requests.Session)
+
+        GraftpunkClient("testsite").fetch()
+
+        mock_load.assert_called_once_with("testsite", transport=transport)
+
 
 # ---------------------------------------------------------------------------
 # gp_base_url attribute
@@ -1186,3 +1545,253 @@ class TestReprMethods:
         client = GraftpunkClient("testsite")
         cmd = client.login
         assert repr(cmd) == "_CommandCallable('login')"
+
+
+# ---------------------------------------------------------------------------
+# map() / batch()
+# ---------------------------------------------------------------------------
+
+
+def _http_403() -> requests.exceptions.HTTPError:
+    response = MagicMock()
+    response.status_code = 403
+    response.url = "https://ex.com/api"
+    return requests.exceptions.HTTPError(response=response)
+
+
+@pytest.fixture
+def batch_mocks() -> Iterator[dict[str, MagicMock]]:
+    """Patch session loading, token and persistence hooks used by the client."""
+    with (
+        patch("graftpunk.client.get_plugin") as get_plugin,
+        patch("graftpunk.client.load_session_for_api") as load,
+        patch("graftpunk.client.prepare_session") as prepare,
+        patch("graftpunk.client.clear_cached_tokens") as clear,
+        patch("graftpunk.client.update_session_cookies") as update,
+    ):
+        load.return_value = MagicMock(spec=requests.Session)
+        yield {
+            "get_plugin": get_plugin,
+            "load": load,
+            "prepare": prepare,
+            "clear": clear,
+            "update": update,
+        }
+
+
+class TestBatchExecution:
+    """Tests for GraftpunkClient.map() and batch()."""
+
+    def test_map_runs_every_call_on_one_session(self, batch_mocks: dict[str, MagicMock]):
+        """Each kwargs set runs once; the session is loaded and prepared once."""
+        sessions: list[Any] = []
+
+        def handler(ctx: CommandContext, **kwargs: Any) -> dict[str, Any]:
+            sessions.append(ctx.session)
+            return {"id": kwargs["id"]}
+
+        spec = _make_spec("get", group="invoice", handler=handler)
+        batch_mocks["get_plugin"].return_value = _make_plugin(
+            commands=[spec], token_config=MagicMock()
+        )
+        client = GraftpunkClient("testsite")
+
+        results = list(client.map("invoice.get", [{"id": i} for i in range(20)], concurrency=4))
+
+        assert sorted(r.index for r in results) == list(range(20))
+        assert all(r.ok and r.unwrap().data == {"id": r.kwargs["id"]} for r in results)
+        assert {r.command for r in results} == {"invoice.get"}
+        assert len(set(map(id, sessions))) == 1
+        batch_mocks["load"].assert_called_once()
+        batch_mocks["prepare"].assert_called_once()
+
+    def test_calls_run_concurrently_up_to_limit(self, batch_mocks: dict[str, MagicMock]):
+        """Up to ``concurrency`` handlers run at the same time, never more."""
+        barrier = threading.Barrier(3, timeout=5)
+        lock = threading.Lock()
+        active = peak = 0
+
+        def handler(ctx: CommandContext, **kwargs: Any) -> None:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            if kwargs["n"] < 3:
+                barrier.wait()
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+
+        batch_mocks["get_plugin"].return_value = _make_plugin(
+            commands=[_make_spec("work", handler=handler)]
+        )
+        client = GraftpunkClient("testsite")
+
+        results = list(client.map("work", [{"n": n} for n in range(12)], concurrency=3))
+
+        assert all(r.ok for r in results)
+        assert peak == 3
+
+    def test_failures_are_reported_per_call(self, batch_mocks: dict[str, MagicMock]):
+        """A failing call yields its error; the other calls still complete."""
+
+        def handler(ctx: CommandContext, n: int) -> int:
+            if n == 2:
+                raise CommandError("bad item")
+            return n
+
+        batch_mocks["get_plugin"].return_value = _make_plugin(
+            commands=[_make_spec("work", handler=handler)]
+        )
+        client = GraftpunkClient("testsite")
+
+        results = {r.index: r for r in client.map("work", [{"n": n} for n in range(4)])}
+
+        assert [results[i].ok for i in range(4)] == [True, True, False, True]
+        assert isinstance(results[2].error, CommandError)
+        assert results[2].result is None
+        with pytest.raises(CommandError, match="bad item"):
+            results[2].unwrap()
+
+    def test_batch_mixes_command_references(self, batch_mocks: dict[str, MagicMock]):
+        """batch() accepts names, dotted names, path tuples and bound callables."""
+        specs = [
+            _make_spec("login", handler=lambda ctx: "login"),
+            _make_spec("list", group="invoice", handler=lambda ctx: "list"),
+            _make_spec("get", group="invoice", handler=lambda ctx, id: id),
+        ]
+        batch_mocks["get_plugin"].return_value = _make_plugin(commands=specs)
+        client = GraftpunkClient("testsite")
+
+        results = client.batch(
+            [
+                ("login", {}),
+                ("invoice.list", {}),
+                (("invoice", "get"), {"id": 7}),
+                (client.invoice.get, {"id": 8}),
+            ]
+        )
+
+        by_index = {r.index: r.unwrap().data for r in results}
+        assert by_index == {0: "login", 1: "list", 2: 7, 3: 8}
+
+    def test_concurrent_403s_refresh_tokens_once(self, batch_mocks: dict[str, MagicMock]):
+        """Workers rejected with the same tokens share one refresh."""
+        barrier = threading.Barrier(4, timeout=5)
+        first_attempt: set[int] = set()
+        lock = threading.Lock()
+
+        def handler(ctx: CommandContext, n: int) -> int:
+            with lock:
+                retry = n in first_attempt
+                first_attempt.add(n)
+            if not retry:
+                barrier.wait()
+                raise _http_403()
+            return n
+
+        batch_mocks["get_plugin"].return_value = _make_plugin(
+            commands=[_make_spec("work", handler=handler)], token_config=MagicMock()
+        )
+        client = GraftpunkClient("testsite")
+
+        results = list(client.map("work", [{"n": n} for n in range(4)], concurrency=4))
+
+        assert all(r.ok for r in results)
+        batch_mocks["clear"].assert_called_once()
+        assert batch_mocks["prepare"].call_count == 2
+        # The refreshed tokens are persisted once, when the batch ends
+        batch_mocks["update"].assert_called_once()
+
+    def test_session_persisted_once(self, batch_mocks: dict[str, MagicMock]):
+        """A saves_session command is persisted once per batch, not per call."""
+        batch_mocks["get_plugin"].return_value = _make_plugin(
+            commands=[_make_spec("touch", saves_session=True)]
+        )
+        client = GraftpunkClient("testsite")
+
+        list(client.map("touch", [{}] * 10))
+
+        batch_mocks["update"].assert_called_once()
+
+    def test_rate_limit_shared_across_workers(self, batch_mocks: dict[str, MagicMock]):
+        """CommandSpec.rate_limit spaces calls out across all workers."""
+        slept: list[float] = []
+        limiter = RateLimiter(clock=lambda: 1000.0, sleep=slept.append)
+        batch_mocks["get_plugin"].return_value = _make_plugin(
+            commands=[_make_spec("work", handler=MagicMock(return_value=None), rate_limit=0.02)]
+        )
+        client = GraftpunkClient("testsite")
+
+        results = list(client.map("work", [{}] * 5, concurrency=5, limiter=limiter))
+
+        assert all(r.ok for r in results)
+        # One call starts at once; the others waited for distinct, evenly spaced slots
+        assert sorted(slept) == pytest.approx([0.02, 0.04, 0.06, 0.08])
+
+    def test_throttling_lowers_concurrency(self, batch_mocks: dict[str, MagicMock]):
+        """A round of 429s halves the calls in flight once, not once per call."""
+        barrier = threading.Barrier(4, timeout=5)
+        response = requests.Response()
+        response.status_code = 429
+
+        def handler(ctx: CommandContext) -> None:
+            barrier.wait()
+            raise requests.HTTPError(response=response)
+
+        gates: list[AdaptiveConcurrency] = []
+
+        def make_gate(maximum: int) -> AdaptiveConcurrency:
+            gates.append(AdaptiveConcurrency(maximum))
+            return gates[-1]
+
+        batch_mocks["get_plugin"].return_value = _make_plugin(
+            commands=[_make_spec("work", handler=handler)]
+        )
+        client = GraftpunkClient("testsite")
+
+        with patch("graftpunk.client.AdaptiveConcurrency", side_effect=make_gate):
+            results = list(client.map("work", [{}] * 4, concurrency=4))
+
+        assert [r.ok for r in results] == [False] * 4
+        assert gates[0].limit == 2
+
+    def test_inputs_are_consumed_lazily(self, batch_mocks: dict[str, MagicMock]):
+        """Breaking out early stops reading inputs and cancels unstarted calls."""
+        handler = MagicMock(return_value=None)
+        batch_mocks["get_plugin"].return_value = _make_plugin(
+            commands=[_make_spec("work", handler=handler)]
+        )
+        client = GraftpunkClient("testsite")
+        produced = 0
+
+        def inputs() -> Iterator[dict[str, Any]]:
+            nonlocal produced
+            for _ in range(1000):
+                produced += 1
+                yield {}
+
+        for _ in client.map("work", inputs(), concurrency=2):
+            break
+
+        assert produced <= 5
+        assert handler.call_count <= produced
+
+    def test_missing_session_raises(self, batch_mocks: dict[str, MagicMock]):
+        """A session that can't be loaded fails the batch instead of every call."""
+        batch_mocks["get_plugin"].return_value = _make_plugin(commands=[_make_spec("work")])
+        batch_mocks["load"].side_effect = SessionNotFoundError("no session")
+        client = GraftpunkClient("testsite")
+
+        with pytest.raises(SessionNotFoundError):
+            list(client.map("work", [{}, {}]))
+
+    def test_invalid_arguments(self, batch_mocks: dict[str, MagicMock]):
+        """Bad concurrency and unknown commands are rejected up front."""
+        batch_mocks["get_plugin"].return_value = _make_plugin(commands=[_make_spec("work")])
+        client = GraftpunkClient("testsite")
+
+        with pytest.raises(ValueError, match="concurrency"):
+            client.map("work", [{}], concurrency=0)
+        with pytest.raises(AttributeError):
+            client.map("nope", [{}])
@@ -0,0 +1,208 @@
+"""Tests for manifest-backed shell completion (cli/completion.py)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import typer
+from typer._completion_classes import BashComplete
+
+from graftpunk.cli import plugin_commands
+from graftpunk.cli.completion import complete_from_manifest, complete_plugin_args
+from graftpunk.cli.main import app as gp_app
+from graftpunk.cli.plugin_manifest import clear_manifest_cache, get_plugin_manifest
+
+try:
+    from typer._click.shell_completion import CompletionItem, ShellComplete
+except ModuleNotFoundError:  # typer < 0.26 runs on Click itself
+    from click.shell_completion import CompletionItem, ShellComplete
+
+IMPORT_SOURCE = "graftpunk.cli.plugin_manifest._import_source"
+HELP_NAMES = ("-h", "--help")
+
+_PLUGIN = """
+from enum import Enum
+
+from graftpunk.plugins.cli_plugin import PluginParamSpec, SitePlugin, command
+
+
+class Kind(Enum):
+    NEW = "new"
+    TOP = "top"
+
+
+class Order(Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+
+class Plugin(SitePlugin):
+    site_name = "hn"
+    session_name = "hackernews"
+    help_text = "Hacker News"
+    requires_session = False
+
+    @command(
+        help="List stories from the front page, newest first by default",
+        params=[
+            PluginParamSpec.option("kind", type=Kind, default=Kind.TOP, help="Story list"),
+            PluginParamSpec.option("all_pages", type=bool, default=False, help="Every page"),
+            PluginParamSpec.argument("query"),
+        ],
+    )
+    def stories(self, ctx, kind, all_pages, query):
+        return {}
+
+    @command(
+        help="Sort saved items",
+        params=[
+            PluginParamSpec.option("strict", type=bool, default=False),
+            PluginParamSpec.argument("order", type=Order),
+            PluginParamSpec.argument("ids", click_kwargs={"nargs": -1, "required": False}),
+        ],
+    )
+    def sort(self, ctx, strict, order, ids):
+        return {}
+
+    def login(self, credentials):
+        \"\"\"Log in to Hacker News.\"\"\"
+        return True
+
+
+@command(help="Item commands")
+class Items:
+    @command(help="Show one item")
+    def show(self, ctx, item_id: int):
+        return {}
+"""
+
+CASES = [
+    ([], ""),
+    ([], "s"),
+    ([], "-"),
+    (["bogus"], ""),
+    (["stories"], "-"),
+    (["stories"], "--"),
+    (["stories"], "--k"),
+    (["stories", "--kind"], ""),
+    (["stories", "--kind"], "t"),
+    (["stories"], "--kind=n"),
+    (["stories", "--kind", "new"], "--"),
+    (["stories", "--kind=new"], "--"),
+    (["stories", "--view", "a"], "--v"),
+    (["stories", "q"], ""),
+    (["stories", "-f", "json"], "-"),
+    (["sort"], ""),
+    (["sort"], "d"),
+    (["sort", "--strict"], ""),
+    (["sort", "asc"], ""),
+    (["sort", "--", "asc"], "-"),
+    (["items"], ""),
+    (["items"], "-"),
+    (["items", "show"], "-"),
+    (["login"], "-"),
+]
+
+
+@pytest.fixture(autouse=True)
+def _plugin(isolated_config: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Install the test plugin and index it."""
+    monkeypatch.setattr(plugin_commands, "_plugin_session_map", {})
+    monkeypatch.setattr(plugin_commands, "_registered_plugin_sources", {})
+    monkeypatch.setattr(plugin_commands, "_registered_plugins_for_teardown", [])
+    clear_manifest_cache()
+    (isolated_config / "plugins").mkdir()
+    (isolated_config / "plugins" / "hn.py").write_text(_PLUGIN)
+    get_plugin_manifest()
+
+
+def _root() -> typer.core.TyperGroup:
+    return typer.main.get_command(gp_app)  # type: ignore[return-value]
+
+
+def _normalized(items: list[CompletionItem]) -> list[tuple[str, str]]:
+    """(value, type) pairs; the help option's names sorted, as Click emits them from a set."""
+    pairs = [(item.value, item.type) for item in items]
+    helps = [pair for pair in pairs if pair[0] in HELP_NAMES]
+    return [pair for pair in pairs if pair[0] not in HELP_NAMES] + sorted(helps)
+
+
+def _typer_completions(args: list[str], incomplete: str) -> list[tuple[str, str]]:
+    """Completions from the fully built Typer tree (the reference behavior)."""
+    full_app = typer.Typer(context_settings=gp_app.info.context_settings)
+
+    @full_app.callback()
+    def main() -> None:
+        """Test root."""
+
+    plugin_commands.register_plugin_commands(full_app, notify_errors=False)
+    comp = BashComplete(typer.main.get_command(full_app), {}, "gp", "_GP_COMPLETE")
+    return _normalized(ShellComplete.get_completions(comp, ["hn", *args], incomplete))
+
+
+class TestCompletePluginArgs:
+    """Tests for complete_plugin_args."""
+
+    @pytest.mark.parametrize(("args", "incomplete"), CASES)
+    def test_matches_typer(self, args: list[str], incomplete: str):
+        """Manifest completions equal those of the fully built command tree."""
+        expected = _typer_completions(args, incomplete)
+        clear_manifest_cache()
+
+        with patch(IMPORT_SOURCE) as mock_import:
+            items = complete_plugin_args(_root(), ["hn", *args], incomplete)
+
+        mock_import.assert_not_called()
+        assert items is not None
+        assert _normalized(items) == expected
+
+    def test_command_help(self):
+        """Command completions carry Click's shortened help text."""
+        items = complete_plugin_args(_root(), ["hn"], "")
+
+        assert items is not None
+        helps = {item.value: item.help for item in items}
+        assert helps["stories"] == "List stories from the front page, newest..."
+        assert helps["login"] == "Log in to Hacker News."
+
+    def test_root_options_are_skipped(self):
+        """Root options before the site name, with or without values, are skipped."""
+        items = complete_plugin_args(_root(), ["-v", "--log-format", "json", "hn"], "st")
+
+        assert items is not None
+        assert [item.value for item in items] == ["stories"]
+
+    @pytest.mark.parametrize(
+        "args",
+        [[], ["session"], ["http"], ["version"], ["--bogus", "hn"], ["nosuch"]],
+    )
+    def test_defers_to_typer(self, args: list[str]):
+        """Built-ins, unknown root options and unknown sites are left to Typer."""
+        assert complete_plugin_args(_root(), args, "") is None
+
+
+class TestCompleteFromManifest:
+    """Tests for the shell-level entry point."""
+
+    def test_prints_bash_completions(
+        self, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ):
+        """A bash request for a plugin command is answered and printed."""
+        monkeypatch.setenv("_GP_COMPLETE", "complete_bash")
+        monkeypatch.setenv("COMP_WORDS", "gp hn stories --kind ")
+        monkeypatch.setenv("COMP_CWORD", "4")
+
+        assert complete_from_manifest(_root(), "gp", None) is True
+        assert capsys.readouterr().out.split() == ["new", "top"]
+
+    def test_other_requests_are_not_handled(self, monkeypatch: pytest.MonkeyPatch):
+        """Source-script requests and built-in commands fall through to Typer."""
+        monkeypatch.setenv("_GP_COMPLETE", "source_bash")
+        assert complete_from_manifest(_root(), "gp", None) is False
+
+        monkeypatch.setenv("_GP_COMPLETE", "complete_bash")
+        monkeypatch.setenv("COMP_WORDS", "gp session ")
+        monkeypatch.setenv("COMP_CWORD", "2")
+        assert complete_from_manifest(_root(), "gp", None) is False
@@ -10,6 +10,13 @@ _STORAGE_ENV_VARS = [
     "GRAFTPUNK_S3_BUCKET",
     "GRAFTPUNK_S3_REGION",
     "GRAFTPUNK_S3_ENDPOINT_URL",
+    "GRAFTPUNK_STORAGE_INDEX",
+    "GRAFTPUNK_S3_CONCURRENT_WRITES",
+    "GRAFTPUNK_STORAGE_LOCAL_CACHE",
+    "GRAFTPUNK_KEY_PROVIDER",
+    "GRAFTPUNK_KEY_CACHE_TTL_SECONDS",
+    "GRAFTPUNK_RATE_LIMIT_BACKEND",
+    "GRAFTPUNK_RESPONSE_CACHE_SIZE_MB",
 ]
 
 
@@ -86,6 +93,58 @@ class TestGetStorageConfig:
         assert config["retry_max_attempts"] == 5
         assert config["retry_base_delay"] == 1.0
 
+    def test_storage_index_disabled_by_default(self, monkeypatch, _clean_storage_env):
+        """Remote backends get use_index=False unless GRAFTPUNK_STORAGE_INDEX is set."""
+        monkeypatch.setenv("GRAFTPUNK_S3_BUCKET", "my-bucket")
+        reset_settings()
+
+        assert get_settings().get_storage_config("s3")["use_index"] is False
+
+    def test_storage_index_enabled_from_env(self, monkeypatch, _clean_storage_env):
+        """GRAFTPUNK_STORAGE_INDEX=true enables the index for remote backends."""
+        monkeypatch.setenv("GRAFTPUNK_S3_BUCKET", "my-bucket")
+        monkeypatch.setenv("GRAFTPUNK_STORAGE_INDEX", "true")
+        reset_settings()
+
+        assert get_settings().get_storage_config("s3")["use_index"] is True
+
+    def test_s3_concurrent_writes_from_env(self, monkeypatch, _clean_storage_env):
+        """GRAFTPUNK_S3_CONCURRENT_WRITES toggles the S3 concurrent write mode."""
+        monkeypatch.setenv("GRAFTPUNK_S3_BUCKET", "my-bucket")
+        reset_settings()
+        assert get_settings().get_storage_config("s3")["concurrent_writes"] is False
+
+        monkeypatch.setenv("GRAFTPUNK_S3_CONCURRENT_WRITES", "1")
+        reset_settings()
+        assert get_settings().get_storage_config("s3")["concurrent_writes"] is True
+
+    def test_local_cache_dir_only_when_enabled(self, monkeypatch, _clean_storage_env):
+        """GRAFTPUNK_STORAGE_LOCAL_CACHE exposes the remote cache directory."""
+        monkeypatch.setenv("GRAFTPUNK_S3_BUCKET", "my-bucket")
+        reset_settings()
+        assert get_settings().get_storage_config("s3")["local_cache_dir"] is None
+
+        monkeypatch.setenv("GRAFTPUNK_STORAGE_LOCAL_CACHE", "true")
+        reset_settings()
+        settings = get_settings()
+        assert settings.get_storage_config("s3")["local_cache_dir"] == settings.remote_cache_dir
+
+    def test_key_settings_defaults(self, _clean_storage_env):
+        """Key provider is auto-selected and keys are cached for an hour."""
+        settings = get_settings()
+        assert settings.key_provider is None
+        assert settings.key_cache_ttl_seconds == 3600
+
+    def test_key_settings_from_env(self, monkeypatch, _clean_storage_env):
+        """GRAFTPUNK_KEY_PROVIDER and GRAFTPUNK_KEY_CACHE_TTL_SECONDS are read."""
+        monkeypatch.setenv("GRAFTPUNK_KEY_PROVIDER", "supabase-vault")
+        monkeypatch.setenv("GRAFTPUNK_KEY_CACHE_TTL_SECONDS", "0")
+        reset_settings()
+
+        settings = get_settings()
+        assert settings.key_provider == "supabase-vault"
+        assert settings.key_cache_ttl_seconds == 0
+
     def test_s3_missing_bucket(self, _clean_storage_env):
         """S3 backend raises ValueError when bucket is missing."""
         settings = get_settings()
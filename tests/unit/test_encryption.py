@@ -1,17 +1,40 @@
 """Tests for encryption module."""
 
+import io
 from unittest.mock import MagicMock, patch
 
 import pytest
 from cryptography.fernet import Fernet
 
 from graftpunk.encryption import (
+    _HEADER,
+    _HEADER_V1,
+    _HEADER_V2,
+    ALGORITHM_AES_256_GCM,
+    ALGORITHM_CHACHA20_POLY1305,
+    ENVELOPE_MAGIC,
+    FileKeyProvider,
+    _aead,
+    _derive_key,
     _get_key_from_supabase_vault,
     _load_encryption_key,
+    _master_key,
+    _nonce,
+    _parse_header,
     decrypt_data,
+    decrypt_stream,
     encrypt_data,
+    encrypt_stream,
     get_encryption_key,
+    get_key_provider,
+    get_keyring,
+    is_envelope,
+    key_id,
+    list_key_providers,
+    needs_rekey,
+    register_key_provider,
     reset_encryption_key_cache,
+    rotate_encryption_key,
 )
 from graftpunk.exceptions import EncryptionError
 
@@ -150,6 +173,50 @@ class TestEncryptionKeyFile:
         key = get_encryption_key()
         assert key == existing_key
 
+    def test_concurrent_first_use_creates_one_key(self, tmp_path, monkeypatch):
+        """Threads racing on first use all get the one key written to the file."""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        monkeypatch.setenv("GRAFTPUNK_CONFIG_DIR", str(tmp_path))
+        monkeypatch.setenv("GRAFTPUNK_STORAGE_BACKEND", "local")
+        from graftpunk.config import reset_settings
+
+        reset_settings()
+        barrier = threading.Barrier(8)
+
+        def first_use(_: int) -> bytes:
+            barrier.wait()
+            return get_encryption_key()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            keys = set(pool.map(first_use, range(8)))
+
+        assert keys == {(tmp_path / ".session_key").read_bytes()}
+
+    def test_key_file_created_by_another_process(self, tmp_path, monkeypatch):
+        """If another process creates the key file first, its key is used."""
+        import os
+
+        monkeypatch.setenv("GRAFTPUNK_CONFIG_DIR", str(tmp_path))
+        monkeypatch.setenv("GRAFTPUNK_STORAGE_BACKEND", "local")
+        from graftpunk.config import reset_settings
+
+        reset_settings()
+        other_key = Fernet.generate_key()
+        key_file = tmp_path / ".session_key"
+        real_open = os.open
+
+        def racing_open(path, flags, *args):  # type: ignore[no-untyped-def]
+            if str(path) == str(key_file):
+                key_file.write_bytes(other_key)
+                raise FileExistsError(path)
+            return real_open(path, flags, *args)
+
+        with patch("graftpunk.encryption.os.open", side_effect=racing_open):
+            assert get_encryption_key() == other_key
+        assert key_file.read_bytes() == other_key
+
 
 class TestLoadEncryptionKeySupabasePath:
     """Tests for the supabase branch in _load_encryption_key()."""
@@ -163,6 +230,7 @@ class TestLoadEncryptionKeySupabasePath:
     def test_load_key_delegates_to_supabase_vault(self, mock_settings, mock_vault):
         """Test that _load_encryption_key calls supabase vault when backend is supabase."""
         mock_settings.return_value.storage_backend = "supabase"
+        mock_settings.return_value.key_provider = None
         expected_key = Fernet.generate_key()
         mock_vault.return_value = expected_key
 
@@ -176,6 +244,7 @@ class TestLoadEncryptionKeySupabasePath:
     def test_load_key_supabase_case_insensitive(self, mock_settings, mock_vault):
         """Test that storage_backend comparison is case-insensitive."""
         mock_settings.return_value.storage_backend = "Supabase"
+        mock_settings.return_value.key_provider = None
         expected_key = Fernet.generate_key()
         mock_vault.return_value = expected_key
 
@@ -474,3 +543,293 @@ class TestGetKeyFromSupabaseVault:
             pytest.raises(EncryptionError, match="not found in Supabase Vault"),
         ):
             _get_key_from_supabase_vault()
+
+
+@pytest.fixture
+def local_key(tmp_path, monkeypatch):
+    """Use a fresh local key file for the test."""
+    monkeypatch.setenv("GRAFTPUNK_CONFIG_DIR", str(tmp_path))
+    monkeypatch.setenv("GRAFTPUNK_STORAGE_BACKEND", "local")
+    from graftpunk.config import reset_settings
+
+    reset_settings()
+    reset_encryption_key_cache()
+    yield get_encryption_key()
+    reset_encryption_key_cache()
+
+
+class TestEnvelope:
+    """Tests for the chunked AEAD envelope."""
+
+    @pytest.mark.parametrize("algorithm", [ALGORITHM_AES_256_GCM, ALGORITHM_CHACHA20_POLY1305])
+    @pytest.mark.parametrize("size", [0, 1, 15, 16, 17, 48, 100])
+    def test_round_trip_across_chunk_boundaries(self, local_key, algorithm, size):
+        """Payloads shorter, equal to and longer than a chunk round-trip."""
+        data = bytes(range(256))[:size]
+        encrypted = encrypt_data(data, algorithm=algorithm, chunk_size=16)
+
+        assert is_envelope(encrypted)
+        assert decrypt_data(encrypted) == data
+
+    def test_output_is_raw_binary_and_compact(self, local_key):
+        """Envelope overhead is a header plus one tag per chunk, no base64."""
+        data = b"x" * 10_000
+        encrypted = encrypt_data(data)
+
+        assert encrypted.startswith(ENVELOPE_MAGIC)
+        assert len(encrypted) < len(Fernet(local_key).encrypt(data))
+        assert len(encrypted) - len(data) < 64
+
+    def test_legacy_fernet_tokens_still_decrypt(self, local_key):
+        """Tokens written by Fernet-era releases decrypt transparently."""
+        token = Fernet(local_key).encrypt(b"legacy session")
+
+        assert not is_envelope(token)
+        assert decrypt_data(token) == b"legacy session"
+
+    def test_tampered_chunk_fails(self, local_key):
+        """Flipping a ciphertext bit fails authentication."""
+        encrypted = bytearray(encrypt_data(b"secret" * 10, chunk_size=16))
+        encrypted[-1] ^= 0x01
+
+        with pytest.raises(EncryptionError):
+            decrypt_data(bytes(encrypted))
+
+    def test_truncation_at_chunk_boundary_fails(self, local_key):
+        """Dropping whole trailing chunks is detected via the final-chunk flag."""
+        encrypted = encrypt_data(b"a" * 64, chunk_size=16)
+        header_size = len(encrypted) - 4 * (16 + 16)
+
+        with pytest.raises(EncryptionError):
+            decrypt_data(encrypted[: header_size + 2 * (16 + 16)])
+
+    def test_reordered_chunks_fail(self, local_key):
+        """Swapping two chunks fails authentication."""
+        encrypted = encrypt_data(b"a" * 16 + b"b" * 16 + b"c" * 16, chunk_size=16)
+        header_size = len(encrypted) - 3 * 32
+        header, body = encrypted[:header_size], encrypted[header_size:]
+        swapped = header + body[32:64] + body[:32] + body[64:]
+
+        with pytest.raises(EncryptionError):
+            decrypt_data(swapped)
+
+    def test_unsupported_version_fails(self, local_key):
+        """An envelope from a newer format version is rejected clearly."""
+        encrypted = bytearray(encrypt_data(b"data"))
+        encrypted[len(ENVELOPE_MAGIC)] = 99
+
+        with pytest.raises(EncryptionError, match="Unsupported envelope version"):
+            decrypt_data(bytes(encrypted))
+
+    def test_invalid_algorithm_rejected(self, local_key):
+        """Unknown algorithm ids are rejected on encrypt."""
+        with pytest.raises(EncryptionError, match="Unsupported encryption algorithm"):
+            encrypt_data(b"data", algorithm=99)
+
+    def test_master_key_is_cached(self, local_key):
+        """Repeated calls reuse the decoded master key instead of decoding it again."""
+        encrypt_data(b"one")
+        hits = _master_key.cache_info().hits
+        decrypt_data(encrypt_data(b"two"))
+
+        assert _master_key.cache_info().hits >= hits + 2
+
+    def test_each_envelope_has_its_own_cipher_key(self, local_key):
+        """Two envelopes of the same plaintext carry different salts and derived keys."""
+        first = _parse_header(encrypt_data(b"same")[: _HEADER.size])
+        second = _parse_header(encrypt_data(b"same")[: _HEADER.size])
+
+        assert first.salt != second.salt
+        assert _derive_key(local_key, ALGORITHM_AES_256_GCM, first.salt) != _derive_key(
+            local_key, ALGORITHM_AES_256_GCM, second.salt
+        )
+
+    def test_swapped_salt_fails(self, local_key):
+        """A chunk only opens under the key derived from its own envelope's salt."""
+        first = encrypt_data(b"one")
+        second = encrypt_data(b"two")
+
+        with pytest.raises(EncryptionError):
+            decrypt_data(first[: _HEADER.size] + second[_HEADER.size :])
+
+    def test_version_2_envelopes_still_decrypt(self, local_key):
+        """Envelopes sealed with the shared per-key cipher stay readable and need a rekey."""
+        header = _HEADER_V2.pack(
+            ENVELOPE_MAGIC, 2, ALGORITHM_AES_256_GCM, 64, b"\x02" * 7, key_id(local_key)
+        )
+        sealed = _aead(local_key, ALGORITHM_AES_256_GCM).encrypt(
+            _nonce(b"\x02" * 7, 0, True), b"v2 data", header
+        )
+
+        assert decrypt_data(header + sealed) == b"v2 data"
+        assert needs_rekey(header + sealed) is True
+
+
+class TestEnvelopeStreams:
+    """Tests for encrypt_stream and decrypt_stream."""
+
+    def test_stream_round_trip(self, local_key):
+        """Streams round-trip and interoperate with the in-memory API."""
+        data = bytes(range(256)) * 50
+        encrypted = io.BytesIO()
+
+        written = encrypt_stream(io.BytesIO(data), encrypted, chunk_size=1000)
+
+        assert written == len(encrypted.getvalue())
+        assert decrypt_data(encrypted.getvalue()) == data
+        plaintext = io.BytesIO()
+        assert decrypt_stream(io.BytesIO(encrypted.getvalue()), plaintext) == len(data)
+        assert plaintext.getvalue() == data
+
+    def test_stream_decrypts_in_memory_envelope(self, local_key):
+        """decrypt_stream reads envelopes produced by encrypt_data."""
+        encrypted = encrypt_data(b"z" * 5000, chunk_size=512)
+        plaintext = io.BytesIO()
+
+        decrypt_stream(io.BytesIO(encrypted), plaintext)
+
+        assert plaintext.getvalue() == b"z" * 5000
+
+    def test_truncated_stream_fails(self, local_key):
+        """A stream cut short raises EncryptionError."""
+        encrypted = encrypt_data(b"q" * 4000, chunk_size=1000)
+
+        with pytest.raises(EncryptionError):
+            decrypt_stream(io.BytesIO(encrypted[:-100]), io.BytesIO())
+
+    def test_stream_rejects_non_envelope(self, local_key):
+        """Fernet tokens and garbage are not accepted by decrypt_stream."""
+        with pytest.raises(EncryptionError):
+            decrypt_stream(io.BytesIO(Fernet(local_key).encrypt(b"x")), io.BytesIO())
+
+
+class TestKeyRotation:
+    """Tests for multi-key keyrings, key ids and rotation."""
+
+    def test_envelope_carries_current_key_id(self, local_key):
+        """New envelopes embed the id of the key that sealed them."""
+        encrypted = encrypt_data(b"data")
+
+        assert key_id(local_key) in encrypted[: len(ENVELOPE_MAGIC) + 32]
+        assert needs_rekey(encrypted) is False
+
+    def test_rotation_keeps_old_data_readable(self, local_key, tmp_path):
+        """After rotating, data sealed with the old key still decrypts."""
+        old_envelope = encrypt_data(b"old")
+        old_fernet = Fernet(local_key).encrypt(b"older")
+
+        new_key = rotate_encryption_key()
+
+        assert get_encryption_key() == new_key
+        assert (tmp_path / ".session_key").read_bytes().splitlines()[1] == local_key
+        assert decrypt_data(old_envelope) == b"old"
+        assert decrypt_data(old_fernet) == b"older"
+        assert needs_rekey(old_envelope) is True
+        assert needs_rekey(encrypt_data(b"new")) is False
+
+    def test_rotated_key_file_is_private(self, local_key, tmp_path):
+        """The rewritten key file keeps 0o600 permissions."""
+        rotate_encryption_key()
+
+        assert (tmp_path / ".session_key").stat().st_mode & 0o777 == 0o600
+
+    def test_unknown_key_id_refreshes_keyring(self, local_key, tmp_path):
+        """A key added by another process is picked up without waiting for the TTL."""
+        key_file = tmp_path / ".session_key"
+        other_key = Fernet.generate_key()
+        # Another process seals data with a key this process hasn't loaded yet.
+        key_file.write_bytes(other_key)
+        reset_encryption_key_cache()
+        encrypted = encrypt_data(b"from another process")
+        key_file.write_bytes(local_key)
+        reset_encryption_key_cache()
+        get_keyring()
+        # The key is then added to the key source while our keyring is cached.
+        key_file.write_bytes(local_key + b"\n" + other_key)
+
+        assert decrypt_data(encrypted) == b"from another process"
+
+    def test_removed_key_fails_clearly(self, local_key, tmp_path):
+        """Data sealed with a key no longer in the keyring names the key id."""
+        encrypted = encrypt_data(b"data")
+        (tmp_path / ".session_key").write_bytes(Fernet.generate_key())
+        reset_encryption_key_cache()
+
+        with pytest.raises(EncryptionError, match=key_id(local_key).hex()):
+            decrypt_data(encrypted)
+
+    def test_version_1_envelopes_try_every_key(self, local_key):
+        """Envelopes without a key id decrypt with whichever key sealed them."""
+        header = _HEADER_V1.pack(ENVELOPE_MAGIC, 1, ALGORITHM_AES_256_GCM, 64, b"\x01" * 7)
+        sealed = _aead(local_key, ALGORITHM_AES_256_GCM).encrypt(
+            _nonce(b"\x01" * 7, 0, True), b"v1 data", header
+        )
+        rotate_encryption_key()
+
+        assert decrypt_data(header + sealed) == b"v1 data"
+        assert needs_rekey(header + sealed) is True
+
+    def test_keyring_cached_within_ttl(self, local_key, monkeypatch):
+        """The provider is consulted once per TTL window."""
+        calls = []
+        original = FileKeyProvider.load_keys
+
+        def counting(self):
+            calls.append(1)
+            return original(self)
+
+        monkeypatch.setattr(FileKeyProvider, "load_keys", counting)
+        reset_encryption_key_cache()
+        get_keyring()
+        get_keyring()
+        assert len(calls) == 1
+
+        monkeypatch.setattr("graftpunk.encryption.time.monotonic", lambda: 10**9)
+        get_keyring()
+        assert len(calls) == 2
+
+
+class TestKeyProviderRegistry:
+    """Tests for key provider selection and registration."""
+
+    def test_builtin_providers(self):
+        """File and Supabase Vault providers are registered."""
+        assert {"file", "supabase-vault"} <= set(list_key_providers())
+
+    def test_duplicate_registration_rejected(self):
+        """Registering an existing name raises ValueError."""
+        with pytest.raises(ValueError, match="already registered"):
+            register_key_provider("file", FileKeyProvider)
+
+    def test_custom_provider_selected_by_setting(self, tmp_path, monkeypatch):
+        """GRAFTPUNK_KEY_PROVIDER selects a registered provider."""
+        from graftpunk import encryption
+        from graftpunk.config import reset_settings
+
+        key = Fernet.generate_key()
+
+        class StaticProvider:
+            def load_keys(self):
+                return [key]
+
+        monkeypatch.setitem(encryption._KEY_PROVIDER_REGISTRY, "static", StaticProvider)
+        monkeypatch.setenv("GRAFTPUNK_CONFIG_DIR", str(tmp_path))
+        monkeypatch.setenv("GRAFTPUNK_KEY_PROVIDER", "static")
+        reset_settings()
+        reset_encryption_key_cache()
+
+        assert get_encryption_key() == key
+        with pytest.raises(EncryptionError, match="does not support rotation"):
+            rotate_encryption_key()
+        reset_encryption_key_cache()
+
+    def test_unknown_provider_raises(self, tmp_path, monkeypatch):
+        """An unregistered provider name is an EncryptionError."""
+        from graftpunk.config import reset_settings
+
+        monkeypatch.setenv("GRAFTPUNK_CONFIG_DIR", str(tmp_path))
+        monkeypatch.setenv("GRAFTPUNK_KEY_PROVIDER", "nope")
+        reset_settings()
+
+        with pytest.raises(EncryptionError, match="Unknown key provider 'nope'"):
+            get_key_provider()
@@ -0,0 +1,153 @@
+"""Tests for the persistent event loop runner (event_loop.py)."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from contextvars import ContextVar
+
+import pytest
+
+from graftpunk.event_loop import (
+    LoopRunner,
+    get_loop_runner,
+    run_coroutine,
+    shutdown_loop_runner,
+)
+
+_var: ContextVar[str] = ContextVar("test_event_loop_var", default="unset")
+
+
+async def _running_loop() -> asyncio.AbstractEventLoop:
+    return asyncio.get_running_loop()
+
+
+class TestLoopRunner:
+    """Tests for LoopRunner."""
+
+    def test_runs_coroutines_on_one_loop(self):
+        """Every call runs on the same loop, in the runner's thread."""
+        runner = LoopRunner()
+        try:
+            first = runner.run(_running_loop())
+            second = runner.run(_running_loop())
+
+            assert first is second is runner.loop
+            assert runner.running
+        finally:
+            runner.close()
+
+    def test_starts_lazily(self):
+        """No thread is started until the loop is needed."""
+        runner = LoopRunner()
+
+        assert not runner.running
+
+    def test_propagates_exceptions(self):
+        """Exceptions raised by the coroutine reach the caller."""
+
+        async def fail() -> None:
+            raise ValueError("boom")
+
+        runner = LoopRunner()
+        try:
+            with pytest.raises(ValueError, match="boom"):
+                runner.run(fail())
+        finally:
+            runner.close()
+
+    def test_copies_caller_context(self):
+        """Context variables set by the caller are visible to the coroutine."""
+
+        async def read() -> str:
+            return _var.get()
+
+        runner = LoopRunner()
+        token = _var.set("caller")
+        try:
+            assert runner.run(read()) == "caller"
+        finally:
+            _var.reset(token)
+            runner.close()
+
+    def test_works_inside_running_loop(self):
+        """Sync code called from a coroutine can still run coroutines."""
+        runner = LoopRunner()
+
+        async def caller() -> int:
+            async def answer() -> int:
+                return 42
+
+            return runner.run(answer())
+
+        try:
+            assert asyncio.run(caller()) == 42
+        finally:
+            runner.close()
+
+    def test_run_from_own_loop_raises(self):
+        """Blocking on the runner from its own loop would deadlock, so it raises."""
+        runner = LoopRunner()
+
+        async def nested() -> None:
+            runner.run(_running_loop())
+
+        try:
+            with pytest.raises(RuntimeError, match="its own event loop"):
+                runner.run(nested())
+        finally:
+            runner.close()
+
+    def test_concurrent_callers(self):
+        """Coroutines from several threads run concurrently on the loop."""
+        runner = LoopRunner()
+        barrier = asyncio.Event()
+        results: list[str] = []
+
+        async def wait_then(value: str) -> str:
+            if value == "first":
+                await barrier.wait()
+            else:
+                barrier.set()
+            return value
+
+        def call(value: str) -> None:
+            results.append(runner.run(wait_then(value)))
+
+        try:
+            runner.loop  # noqa: B018 — start the loop before binding the event to it
+            threads = [threading.Thread(target=call, args=(v,)) for v in ("first", "second")]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(5)
+            assert sorted(results) == ["first", "second"]
+        finally:
+            runner.close()
+
+    def test_restarts_after_close(self):
+        """A closed runner starts a fresh loop when used again."""
+        runner = LoopRunner()
+        first = runner.run(_running_loop())
+        runner.close()
+
+        assert not runner.running
+        assert first.is_closed()
+        try:
+            assert runner.run(_running_loop()) is not first
+        finally:
+            runner.close()
+
+
+class TestProcessRunner:
+    """Tests for the process-wide runner."""
+
+    def test_singleton_until_shutdown(self):
+        """One runner is shared until shut down."""
+        runner = get_loop_runner()
+
+        assert run_coroutine(_running_loop()) is runner.loop
+        assert get_loop_runner() is runner
+        shutdown_loop_runner()
+        assert not runner.running
+        assert get_loop_runner() is not runner
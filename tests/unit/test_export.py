@@ -28,6 +28,7 @@ from graftpunk.plugins.formatters import (
     XlsxFormatter,
 )
 from graftpunk.plugins.output_config import OutputConfig, ViewConfig
+from graftpunk.plugins.pagination import Page, PaginationConfig, Paginator
 
 
 class TestFlattenDict:
@@ -418,6 +419,27 @@ class TestExportTextFormats:
             result.export("nonexistent")
 
 
+class TestExportStreams:
+    """export() handles paginated results."""
+
+    def _paginator(self) -> Paginator:
+        items = [{"id": 1}, {"id": 2}]
+        first = Page(1, "https://api.example.com/items", None, items, items)
+        return Paginator(MagicMock(), "GET", first, PaginationConfig("link"))
+
+    def test_paginator_can_be_exported_repeatedly(self) -> None:
+        """Each export walks the listing again, so formats can be chained."""
+        result = CommandResult(data=self._paginator())
+        assert json.loads(result.export("json")) == [{"id": 1}, {"id": 2}]
+        assert json.loads(result.export("json")) == [{"id": 1}, {"id": 2}]
+        assert result.export("csv").splitlines()[0] == "id"
+
+    def test_paginator_collected_for_binary_format(self) -> None:
+        """Formats that do not stream receive the items as a list."""
+        output = CommandResult(data=self._paginator()).export("xlsx")
+        assert output[:2] == b"PK"
+
+
 class TestExportBinaryFormats:
     """export() returns bytes for binary formats without output path."""
 
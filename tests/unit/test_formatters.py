@@ -14,6 +14,7 @@ from rich.table import Table
 from graftpunk.plugins.cli_plugin import CommandResult
 from graftpunk.plugins.formatters import (
     BUILTIN_FORMATTERS,
+    CSV_STREAM_SAMPLE_ROWS,
     CsvFormatter,
     JsonFormatter,
     OutputFormatter,
@@ -24,6 +25,7 @@ from graftpunk.plugins.formatters import (
     discover_formatters,
     format_output,
 )
+from graftpunk.plugins.pagination import Page, PaginationConfig, Paginator
 
 
 def _parse_csv_output(console: MagicMock) -> list[list[str]]:
@@ -322,6 +324,121 @@ class TestCsvFormatter:
         assert rows[1][1] == "likes commas, and stuff"
 
 
+def _paginator(*pages: list[object]) -> Paginator:
+    """A link-style paginator over the given pages, served by a mock session."""
+    responses = []
+    for number, items in enumerate(pages[1:], start=2):
+        response = MagicMock()
+        response.json.return_value = items
+        response.links = (
+            {"next": {"url": f"/items?page={number + 1}"}} if number < len(pages) else {}
+        )
+        responses.append(response)
+    session = MagicMock()
+    session.request.side_effect = responses
+    first = Page(
+        1,
+        "https://api.example.com/items",
+        None,
+        pages[0],
+        list(pages[0]),
+        "https://api.example.com/items?page=2" if len(pages) > 1 else None,
+    )
+    return Paginator(session, "GET", first, PaginationConfig("link", prefetch=False))
+
+
+class TestItemStreams:
+    """Tests for formatting item streams (iterators and paginators)."""
+
+    def test_json_stream_is_valid_json(self) -> None:
+        """Streamed JSON output parses to the full list of items."""
+        buf = io.StringIO()
+        items = [{"id": 1, "tags": ["a"]}, {"id": 2, "tags": []}]
+        JsonFormatter().format(iter(items), Console(file=buf, width=200))
+        assert json.loads(buf.getvalue()) == items
+
+    def test_json_empty_stream(self) -> None:
+        """An empty stream is written as an empty array."""
+        buf = io.StringIO()
+        JsonFormatter().format(iter([]), Console(file=buf, width=200))
+        assert buf.getvalue() == "[]\n"
+
+    def test_json_stream_to_file(self, tmp_path: Path) -> None:
+        """A stream written to a file contains plain JSON."""
+        out = tmp_path / "sub" / "items.json"
+        JsonFormatter().format(iter([1, 2]), MagicMock(spec=Console), output_path=str(out))
+        assert json.loads(out.read_text()) == [1, 2]
+
+    def test_json_streams_paginator(self) -> None:
+        """A paginator's items from every page are written."""
+        buf = io.StringIO()
+        JsonFormatter().format(_paginator([1, 2], [3]), Console(file=buf, width=200))
+        assert json.loads(buf.getvalue()) == [1, 2, 3]
+
+    def test_csv_stream(self) -> None:
+        """Streamed CSV has a header from the sampled rows and one line per item."""
+        buf = io.StringIO()
+        items = ({"id": n, "name": f"n{n}"} for n in range(250))
+        CsvFormatter().format(items, Console(file=buf, width=200))
+        rows = list(csv.reader(io.StringIO(buf.getvalue())))
+        assert rows[0] == ["id", "name"]
+        assert rows[1] == ["0", "n0"]
+        assert len(rows) == 251
+
+    def test_csv_stream_keys_after_sample_are_dropped(self) -> None:
+        """Columns come from the first CSV_STREAM_SAMPLE_ROWS rows only."""
+        buf = io.StringIO()
+        items = [{"id": n} for n in range(CSV_STREAM_SAMPLE_ROWS)] + [{"id": "x", "late": 1}]
+        CsvFormatter().format(iter(items), Console(file=buf, width=200))
+        rows = list(csv.reader(io.StringIO(buf.getvalue())))
+        assert rows[0] == ["id"]
+        assert rows[-1] == ["x"]
+
+    def test_csv_stream_column_filter(self) -> None:
+        """The default view's column filter applies to streamed rows."""
+        from graftpunk.plugins import ColumnFilter, OutputConfig, ViewConfig
+
+        buf = io.StringIO()
+        cfg = OutputConfig(
+            views=[ViewConfig(name="default", columns=ColumnFilter("include", ["name"]))],
+        )
+        items = iter([{"id": 1, "name": "a"}, {"id": 2, "name": "b"}])
+        CsvFormatter().format(items, Console(file=buf, width=200), output_config=cfg)
+        rows = list(csv.reader(io.StringIO(buf.getvalue())))
+        assert rows == [["name"], ["a"], ["b"]]
+
+    def test_csv_stream_non_dicts_fall_back_to_raw(self) -> None:
+        """A stream of non-dict items is written as raw JSON, like a list would be."""
+        console = MagicMock(spec=Console)
+        CsvFormatter().format(iter([1, 2]), console)
+        console.print.assert_called_once_with(json.dumps([1, 2], default=str))
+
+    @patch("graftpunk.plugins.formatters.gp_console")
+    def test_csv_stream_to_file(self, mock_console: MagicMock, tmp_path: Path) -> None:
+        """A streamed CSV file has no blank lines between rows."""
+        out = tmp_path / "items.csv"
+        CsvFormatter().format(
+            iter([{"a": 1}, {"a": 2}]), MagicMock(spec=Console), output_path=str(out)
+        )
+        assert out.read_text().splitlines() == ["a", "1", "2"]
+        mock_console.info.assert_called_once()
+
+    def test_table_receives_collected_stream(self) -> None:
+        """Non-streaming formatters get the stream as a list via format_output."""
+        console = MagicMock(spec=Console)
+        format_output(_paginator([{"id": 1}], [{"id": 2}]), "table", console)
+        table = console.print.call_args[0][0]
+        assert isinstance(table, Table)
+        assert table.row_count == 2
+
+    def test_command_result_stream(self) -> None:
+        """A stream wrapped in a CommandResult is formatted too."""
+        buf = io.StringIO()
+        result = CommandResult(data=iter([{"id": 1}]))
+        format_output(result, "json", Console(file=buf, width=200))
+        assert json.loads(buf.getvalue()) == [{"id": 1}]
+
+
 class TestCommandResultUnwrapping:
     """Tests that format_output unwraps CommandResult before formatting."""
 
@@ -1,7 +1,10 @@
 """Tests for GraftpunkSession browser header replay."""
 
 import contextlib
+import copy
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 
 import pytest
@@ -10,6 +13,7 @@ import requests
 from graftpunk.graftpunk_session import (
     _ROLE_REGISTRY,
     GraftpunkSession,
+    TrackingCookieJar,
     _case_insensitive_get,
     get_role_headers,
     list_roles,
@@ -78,6 +82,16 @@ class TestRoleDetection:
         prepared = session.prepare_request(req)
         assert prepared.headers.get("X-Requested-With") == "XMLHttpRequest"
 
+    def test_explicit_bytes_accept_json_uses_xhr(self):
+        session = GraftpunkSession(header_roles=SAMPLE_ROLES)
+        req = requests.Request(
+            "GET",
+            "https://example.com/api",
+            headers={"Accept": b"application/json"},
+        )
+        prepared = session.prepare_request(req)
+        assert prepared.headers.get("X-Requested-With") == "XMLHttpRequest"
+
     def test_put_with_json_uses_xhr(self):
         session = GraftpunkSession(header_roles=SAMPLE_ROLES)
         req = requests.Request("PUT", "https://example.com/api/1", json={"key": "val"})
@@ -979,3 +993,286 @@ class TestSessionEncapsulation:
         session = GraftpunkSession(header_roles=original)
         session.clear_header_roles()
         assert original == {"xhr": {"Accept": "*/*"}}
+
+
+class TestTrackingCookieJar:
+    """Tests for TrackingCookieJar change recording."""
+
+    def test_new_cookie_is_a_change(self):
+        jar = TrackingCookieJar()
+        jar.set("sid", "abc", domain="example.com", path="/")
+        updated, removed = jar.changes()
+        assert [c.name for c in updated] == ["sid"]
+        assert removed == []
+
+    def test_identical_value_is_not_a_change(self):
+        """Re-setting a cookie to the same value does not mark the jar dirty."""
+        jar = TrackingCookieJar()
+        jar.set("sid", "abc", domain="example.com", path="/")
+        jar.mark_clean()
+        jar.set("sid", "abc", domain="example.com", path="/")
+        assert not jar.has_changes
+
+    def test_changed_value_is_a_change(self):
+        jar = TrackingCookieJar()
+        jar.set("sid", "abc", domain="example.com", path="/")
+        jar.mark_clean()
+        jar.set("sid", "def", domain="example.com", path="/")
+        updated, _ = jar.changes()
+        assert [c.value for c in updated] == ["def"]
+
+    def test_cleared_cookie_is_recorded_as_removed(self):
+        jar = TrackingCookieJar()
+        jar.set("sid", "abc", domain="example.com", path="/")
+        jar.mark_clean()
+        del jar["sid"]
+        assert jar.changes() == ([], [("example.com", "/", "sid")])
+
+    def test_reset_after_remove_is_an_update(self):
+        jar = TrackingCookieJar()
+        jar.set("sid", "abc", domain="example.com", path="/")
+        jar.mark_clean()
+        jar.clear()
+        jar.set("sid", "new", domain="example.com", path="/")
+        updated, removed = jar.changes()
+        assert [c.value for c in updated] == ["new"]
+        assert removed == []
+
+    def test_session_uses_tracking_jar(self):
+        assert isinstance(GraftpunkSession().cookies, TrackingCookieJar)
+
+
+class TestPersistedState:
+    """Tests for GraftpunkSession change detection used by session write-back."""
+
+    def test_fresh_session_after_mark_is_clean(self):
+        session = GraftpunkSession()
+        session.cookies.set("sid", "abc")
+        session._mark_persisted()
+        assert not session._has_unpersisted_changes()
+
+    def test_cookie_change_is_detected(self):
+        session = GraftpunkSession()
+        session._mark_persisted()
+        session.cookies.set("sid", "abc")
+        assert session._has_unpersisted_changes()
+
+    def test_token_change_is_detected(self):
+        session = GraftpunkSession()
+        session._mark_persisted()
+        session._gp_csrf_tokens["X-CSRF"] = "tok"
+        assert session._has_unpersisted_changes()
+
+    def test_replaced_jar_always_counts_as_changed(self):
+        session = GraftpunkSession()
+        session.cookies = requests.cookies.RequestsCookieJar()
+        session._mark_persisted()
+        assert session._has_unpersisted_changes()
+
+
+class TestRoleTables:
+    """Tests for the cached per-role header tables used by prepare_request."""
+
+    def test_prepare_request_does_not_touch_session_headers(self):
+        """prepare_request leaves session.headers (and its version) unchanged."""
+        session = GraftpunkSession(header_roles=SAMPLE_ROLES)
+        before = dict(session.headers)
+        version = session.headers.version
+
+        session.prepare_request(requests.Request("POST", "https://example.com/api", json={}))
+
+        assert dict(session.headers) == before
+        assert session.headers.version == version
+
+    def test_prepare_request_does_not_touch_caller_request(self):
+        """The caller's Request is not mutated; role headers land on the prepared copy."""
+        session = GraftpunkSession(header_roles=SAMPLE_ROLES)
+        req = requests.Request("GET", "https://example.com/page", headers={"X-Mine": "1"})
+
+        prepared = session.prepare_request(req)
+
+        assert req.headers == {"X-Mine": "1"}
+        assert prepared.headers["X-Mine"] == "1"
+        assert "text/html" in prepared.headers["Accept"]
+
+    def test_table_is_computed_once(self):
+        """Repeat requests for one role reuse the cached table."""
+        session = GraftpunkSession(header_roles=SAMPLE_ROLES)
+        with patch.object(session, "_resolve_role", wraps=session._resolve_role) as resolve:
+            for _ in range(3):
+                session.prepare_request(requests.Request("GET", "https://example.com/"))
+        assert resolve.call_count == 1
+
+    def test_session_header_change_invalidates(self):
+        """Setting a session header rebuilds the table so the user header wins."""
+        session = GraftpunkSession(header_roles=SAMPLE_ROLES)
+        session.prepare_request(requests.Request("GET", "https://example.com/"))
+
+        session.headers["Accept"] = "text/plain"
+        prepared = session.prepare_request(requests.Request("GET", "https://example.com/"))
+
+        assert prepared.headers["Accept"] == "text/plain"
+
+    def test_replaced_headers_are_tracked(self):
+        """Assigning a new headers mapping keeps change tracking working."""
+        session = GraftpunkSession(header_roles=SAMPLE_ROLES)
+        session.headers = {"Accept": "text/plain"}
+
+        prepared = session.prepare_request(requests.Request("GET", "https://example.com/"))
+
+        assert prepared.headers["Accept"] == "text/plain"
+        assert session.headers.version > 0
+
+    def test_role_changes_invalidate(self):
+        """merge_header_roles() and clear_header_roles() invalidate cached tables."""
+        session = GraftpunkSession(header_roles=SAMPLE_ROLES)
+        session.prepare_request(requests.Request("GET", "https://example.com/"))
+
+        session.merge_header_roles({"navigation": {"Accept": "text/custom"}})
+        merged = session.prepare_request(requests.Request("GET", "https://example.com/"))
+        session.clear_header_roles()
+        cleared = session.prepare_request(requests.Request("GET", "https://example.com/"))
+
+        assert merged.headers["Accept"] == "text/custom"
+        assert cleared.headers["Accept"] == "*/*"
+
+    @pytest.mark.usefixtures("_clean_registry")
+    def test_registry_change_invalidates_fallback(self):
+        """Registering a role is picked up by sessions that fall back to the registry."""
+        session = GraftpunkSession(header_roles={"xhr": SAMPLE_ROLES["xhr"]})
+        assert session._role_headers_for("api") == {}
+
+        register_role("api", {"Accept": "application/vnd.api+json"})
+
+        assert session._role_headers_for("api") == {"Accept": "application/vnd.api+json"}
+
+    def test_captured_roles_are_copied(self):
+        """Mutating the dict passed in does not change the session's roles."""
+        roles = {"xhr": dict(SAMPLE_ROLES["xhr"])}
+        session = GraftpunkSession(header_roles=roles)
+
+        roles["xhr"]["Accept"] = "changed"
+
+        assert session.headers_for("xhr")["Accept"] == "application/json"
+
+
+class TestThreadSafety:
+    """Tests for sharing one GraftpunkSession between threads."""
+
+    def test_header_iteration_survives_writes(self):
+        """Iterating session headers uses a snapshot that later writes don't disturb."""
+        session = GraftpunkSession(header_roles=SAMPLE_ROLES)
+        names = iter(session.headers)
+        next(names)
+
+        session.headers["X-Added"] = "1"
+        del session.headers["Accept"]
+
+        assert "X-Added" not in list(names)
+        assert session.headers["X-Added"] == "1"
+
+    def test_cookie_iteration_survives_writes(self):
+        """Iterating the cookie jar uses a snapshot that later writes don't disturb."""
+        jar = TrackingCookieJar()
+        jar.set("a", "1", domain="example.com", path="/")
+        cookies = iter(jar)
+
+        jar.set("b", "2", domain="example.com", path="/")
+
+        assert [c.name for c in cookies] == ["a"]
+        assert {c.name for c in jar} == {"a", "b"}
+
+    def test_roles_are_replaced_not_mutated(self):
+        """merge_header_roles() and clear_header_roles() swap in new role dicts."""
+        session = GraftpunkSession(header_roles=SAMPLE_ROLES)
+        before = session._gp_header_roles
+
+        session.merge_header_roles({"custom": {"Accept": "x"}})
+        session.clear_header_roles()
+
+        assert "custom" not in before
+        assert before.keys() == SAMPLE_ROLES.keys()
+
+    def test_concurrent_prepare_and_cookie_updates(self):
+        """Threads preparing requests while others set cookies get consistent headers."""
+        session = GraftpunkSession(header_roles=SAMPLE_ROLES)
+        session.cookies.set("sid", "abc", domain="example.com", path="/")
+        barrier = threading.Barrier(8)
+
+        def worker(n: int) -> list[tuple[str, str, str]]:
+            barrier.wait()
+            seen = []
+            for i in range(50):
+                if n % 2:
+                    session.cookies.set(f"c{n}-{i}", "v", domain="example.com", path="/")
+                    req = requests.Request("POST", "https://example.com/api", json={})
+                else:
+                    req = requests.Request("GET", "https://example.com/page")
+                prepared = session.prepare_request(req)
+                seen.append(
+                    (
+                        req.method,
+                        prepared.headers["Accept"],
+                        prepared.headers["User-Agent"],
+                    )
+                )
+            return seen
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = [row for rows in pool.map(worker, range(8)) for row in rows]
+
+        for method, accept, user_agent in results:
+            expected = SAMPLE_ROLES["xhr" if method == "POST" else "navigation"]["Accept"]
+            assert accept == expected
+            assert user_agent == "Mozilla/5.0 Test"
+        assert len(session.cookies) == 1 + 4 * 50
+
+    def test_versioned_headers_copy(self):
+        """Session headers can be deep-copied (and pickled) despite carrying a lock."""
+        session = GraftpunkSession(header_roles=SAMPLE_ROLES)
+        session.headers["X-Api-Key"] = "k"
+
+        restored = copy.deepcopy(session.headers)
+
+        assert restored["X-Api-Key"] == "k"
+        restored["X-Other"] = "1"
+        assert restored.version == session.headers.version + 1
+
+
+class TestAttemptTimeout:
+    """Tests for applying command attempt deadlines in send()."""
+
+    class _RecordingAdapter(requests.adapters.BaseAdapter):
+        def __init__(self) -> None:
+            super().__init__()
+            self.timeouts: list[object] = []
+
+        def send(self, request, **kwargs):  # type: ignore[no-untyped-def]
+            self.timeouts.append(kwargs.get("timeout"))
+            response = requests.Response()
+            response.status_code = 200
+            response.request = request
+            return response
+
+        def close(self) -> None:
+            pass
+
+    def test_timeout_capped_inside_attempt(self):
+        """Requests get the attempt's remaining time; outside an attempt nothing changes."""
+        from graftpunk.retry import attempt_deadline
+
+        session = GraftpunkSession()
+        adapter = self._RecordingAdapter()
+        session.mount("https://", adapter)
+
+        session.get("https://example.com/")
+        with attempt_deadline(3.0):
+            session.get("https://example.com/")
+            session.get("https://example.com/", timeout=60)
+            session.get("https://example.com/", timeout=1)
+
+        untouched, filled, shortened, kept = adapter.timeouts
+        assert untouched is None
+        assert 2.9 < filled <= 3.0
+        assert 2.9 < shortened <= 3.0
+        assert kept == 1
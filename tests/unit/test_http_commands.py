@@ -17,6 +17,7 @@ from graftpunk.cli.http_commands import (
     _resolve_role_name,
     _save_observe_data,
 )
+from graftpunk.transport import RetryPolicy, TransportConfig
 
 
 class TestResolveJsonBody:
@@ -60,7 +61,7 @@ class TestMakeRequest:
 
         response = _make_request("GET", "https://example.com", session_name="test-session")
 
-        mock_load.assert_called_once_with("test-session")
+        mock_load.assert_called_once_with("test-session", transport=None)
         assert response == mock_response
 
     @patch("graftpunk.cli.http_commands.load_session_for_api")
@@ -216,6 +217,41 @@ class TestMakeRequestErrorPaths:
 
         mock_get_plugin.assert_not_called()
 
+    def test_retries_mount_retry_adapter_on_bare_session(self) -> None:
+        """retries > 0 mounts a retrying adapter on a bare session."""
+        mock_response = MagicMock(spec=requests.Response)
+        mock_response.status_code = 200
+        sessions: list[requests.Session] = []
+
+        def fake_request(self: requests.Session, *args: object, **kwargs: object) -> MagicMock:
+            sessions.append(self)
+            return mock_response
+
+        with patch.object(requests.Session, "request", fake_request):
+            _make_request("GET", "https://example.com", no_session=True, retries=4)
+
+        (session,) = sessions
+        assert session.get_adapter("https://example.com/").max_retries.total == 4
+
+    @patch("graftpunk.cli.http_commands.load_session_for_api")
+    @patch("graftpunk.cli.plugin_commands.get_plugin_for_session")
+    def test_plugin_transport_with_retries_override(
+        self, mock_get_plugin: MagicMock, mock_load: MagicMock
+    ) -> None:
+        """The session's plugin transport is used, with --retries replacing its policy."""
+        plugin = MagicMock(token_config=None, header_roles=None)
+        plugin.transport_config = TransportConfig(pool_maxsize=50, retry=RetryPolicy(total=1))
+        mock_get_plugin.return_value = plugin
+        mock_session = MagicMock(spec=requests.Session)
+        mock_session.headers = {}
+        mock_load.return_value = mock_session
+
+        _make_request("GET", "https://example.com", session_name="mysite", retries=3)
+
+        mock_load.assert_called_once_with(
+            "mysite", transport=TransportConfig(pool_maxsize=50, retry=RetryPolicy(total=3))
+        )
+
     @patch("graftpunk.cli.http_commands.load_session_for_api")
     @patch("graftpunk.cli.plugin_commands._registered_plugins_for_teardown", [])
     @patch("graftpunk.cli.plugin_commands._plugin_session_map", {})
@@ -248,7 +284,7 @@ class TestMakeRequestErrorPaths:
             _make_request("GET", "https://example.com", session_name="nonexistent")
 
         assert exc_info.value.exit_code == 1
-        mock_load.assert_called_once_with("nonexistent")
+        mock_load.assert_called_once_with("nonexistent", transport=None)
 
 
 class TestSaveObserveData:
@@ -122,11 +122,14 @@ class TestDeclarativeLoginEngine:
 
         with (
             patch("graftpunk.plugins.login_engine.BrowserSession", mock_bs),
-            patch("graftpunk.plugins.login_engine.cache_session"),
+            patch(
+                "graftpunk.plugins.login_engine.cache_session_async", new_callable=AsyncMock
+            ) as mock_cache,
         ):
             result = await login_method({"username": "user", "password": "test"})  # noqa: S106
 
         assert result is True
+        mock_cache.assert_awaited_once_with(instance, plugin.session_name)
 
     @pytest.mark.asyncio
     async def test_nodriver_login_failure(self) -> None:
@@ -644,7 +647,7 @@ class TestNodriverLoginValidationPaths:
 
         with (
             patch("graftpunk.plugins.login_engine.BrowserSession", mock_bs),
-            patch("graftpunk.plugins.login_engine.cache_session"),
+            patch("graftpunk.plugins.login_engine.cache_session_async", new_callable=AsyncMock),
         ):
             result = await login_method({"username": "user", "password": "test"})  # noqa: S106
 
@@ -702,7 +705,7 @@ class TestNodriverLoginValidationPaths:
 
         with (
             patch("graftpunk.plugins.login_engine.BrowserSession", mock_bs),
-            patch("graftpunk.plugins.login_engine.cache_session"),
+            patch("graftpunk.plugins.login_engine.cache_session_async", new_callable=AsyncMock),
             patch("graftpunk.plugins.login_engine.LOG") as mock_log,
         ):
             result = await login_method({"username": "user", "password": "test"})  # noqa: S106
@@ -924,7 +927,7 @@ class TestLoginEngineHeaderCapture:
 
         with (
             patch("graftpunk.plugins.login_engine.BrowserSession", mock_bs),
-            patch("graftpunk.plugins.login_engine.cache_session"),
+            patch("graftpunk.plugins.login_engine.cache_session_async", new_callable=AsyncMock),
             patch(
                 "graftpunk.observe.capture.create_capture_backend",
                 return_value=mock_capture,
@@ -1080,7 +1083,7 @@ class TestLoginTimeTokenExtraction:
 
         with (
             patch("graftpunk.plugins.login_engine.BrowserSession", mock_bs),
-            patch("graftpunk.plugins.login_engine.cache_session"),
+            patch("graftpunk.plugins.login_engine.cache_session_async", new_callable=AsyncMock),
             patch(
                 "graftpunk.observe.capture.create_capture_backend",
                 return_value=mock_capture,
@@ -1129,7 +1132,7 @@ class TestLoginTimeTokenExtraction:
 
         with (
             patch("graftpunk.plugins.login_engine.BrowserSession", mock_bs),
-            patch("graftpunk.plugins.login_engine.cache_session"),
+            patch("graftpunk.plugins.login_engine.cache_session_async", new_callable=AsyncMock),
             patch(
                 "graftpunk.observe.capture.create_capture_backend",
                 return_value=mock_capture,
@@ -1478,7 +1481,7 @@ class TestNodriverMultiStepLogin:
 
         with (
             patch("graftpunk.plugins.login_engine.BrowserSession", mock_bs),
-            patch("graftpunk.plugins.login_engine.cache_session"),
+            patch("graftpunk.plugins.login_engine.cache_session_async", new_callable=AsyncMock),
             patch(
                 "graftpunk.observe.capture.create_capture_backend",
                 return_value=mock_capture,
@@ -1527,7 +1530,7 @@ class TestNodriverMultiStepLogin:
 
         with (
             patch("graftpunk.plugins.login_engine.BrowserSession", mock_bs),
-            patch("graftpunk.plugins.login_engine.cache_session"),
+            patch("graftpunk.plugins.login_engine.cache_session_async", new_callable=AsyncMock),
             patch(
                 "graftpunk.observe.capture.create_capture_backend",
                 return_value=mock_capture,
@@ -1689,7 +1692,7 @@ class TestNodriverMultiStepLogin:
 
         with (
             patch("graftpunk.plugins.login_engine.BrowserSession", mock_bs),
-            patch("graftpunk.plugins.login_engine.cache_session"),
+            patch("graftpunk.plugins.login_engine.cache_session_async", new_callable=AsyncMock),
             patch(
                 "graftpunk.observe.capture.create_capture_backend",
                 return_value=mock_capture,
@@ -1762,7 +1765,7 @@ class TestNodriverMultiStepLogin:
 
         with (
             patch("graftpunk.plugins.login_engine.BrowserSession", mock_bs),
-            patch("graftpunk.plugins.login_engine.cache_session"),
+            patch("graftpunk.plugins.login_engine.cache_session_async", new_callable=AsyncMock),
             patch(
                 "graftpunk.observe.capture.create_capture_backend",
                 return_value=mock_capture,
@@ -1805,7 +1808,7 @@ class TestNodriverMultiStepLogin:
 
         with (
             patch("graftpunk.plugins.login_engine.BrowserSession", mock_bs),
-            patch("graftpunk.plugins.login_engine.cache_session"),
+            patch("graftpunk.plugins.login_engine.cache_session_async", new_callable=AsyncMock),
             patch(
                 "graftpunk.observe.capture.create_capture_backend",
                 return_value=mock_capture,
@@ -223,7 +223,7 @@ class TestLoginRetryIntegration:
 
         with (
             patch("graftpunk.plugins.login_engine.BrowserSession", mock_bs),
-            patch("graftpunk.plugins.login_engine.cache_session"),
+            patch("graftpunk.plugins.login_engine.cache_session_async", new_callable=AsyncMock),
             patch("graftpunk.plugins.login_engine.asyncio.sleep", new_callable=AsyncMock),
         ):
             result = await login_method({"username": "user", "password": "test"})  # noqa: S106
@@ -261,7 +261,7 @@ class TestLoginWaitFor:
 
         with (
             patch("graftpunk.plugins.login_engine.BrowserSession", mock_bs),
-            patch("graftpunk.plugins.login_engine.cache_session"),
+            patch("graftpunk.plugins.login_engine.cache_session_async", new_callable=AsyncMock),
             patch("graftpunk.plugins.login_engine.asyncio.sleep", new_callable=AsyncMock),
         ):
             result = await login_method({"username": "user"})
@@ -344,7 +344,7 @@ class TestLoginWaitFor:
 
         with (
             patch("graftpunk.plugins.login_engine.BrowserSession", mock_bs),
-            patch("graftpunk.plugins.login_engine.cache_session"),
+            patch("graftpunk.plugins.login_engine.cache_session_async", new_callable=AsyncMock),
             patch("graftpunk.plugins.login_engine.asyncio.sleep", new_callable=AsyncMock),
         ):
             result = await login_method({"username": "user", "password": "test"})  # noqa: S106
@@ -0,0 +1,356 @@
+"""Tests for declarative pagination (pagination.py)."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import requests
+
+from graftpunk.exceptions import CommandError
+from graftpunk.plugins.pagination import PaginationConfig, Paginator, paginate
+from graftpunk.response_cache import current_cache_ttl, response_cache_ttl
+from graftpunk.retry import attempt_deadline
+
+URL = "https://api.example.com/items"
+
+Reply = tuple[int, dict[str, str], object] | BaseException
+
+
+class ScriptedAdapter(requests.adapters.BaseAdapter):
+    """Answers requests with queued (status, headers, body) replies and records them.
+
+    Bodies that are not bytes are sent as JSON; a queued exception is raised.
+    """
+
+    def __init__(self, *replies: Reply) -> None:
+        super().__init__()
+        self.replies = list(replies)
+        self.requests: list[requests.PreparedRequest] = []
+        self.seen: list[tuple[float | None, object]] = []
+        self.sent = threading.Condition()
+
+    def send(self, request, **kwargs):  # type: ignore[no-untyped-def]
+        with self.sent:
+            self.requests.append(request)
+            self.seen.append((current_cache_ttl(), kwargs.get("timeout")))
+            self.sent.notify_all()
+        reply = self.replies.pop(0)
+        if isinstance(reply, BaseException):
+            raise reply
+        status, headers, body = reply
+        response = requests.Response()
+        response.status_code = status
+        response.reason = "OK" if status == 200 else ""
+        response.headers = requests.structures.CaseInsensitiveDict(headers)
+        response._content = body if isinstance(body, bytes) else json.dumps(body).encode()
+        response.url = request.url
+        response.request = request
+        return response
+
+    def params(self, index: int) -> dict[str, list[str]]:
+        """Query parameters of the index-th request."""
+        return parse_qs(urlsplit(self.requests[index].url).query)
+
+    def wait_for(self, count: int, timeout: float = 5.0) -> bool:
+        """Wait until ``count`` requests were sent."""
+        with self.sent:
+            return self.sent.wait_for(lambda: len(self.requests) >= count, timeout)
+
+    def close(self) -> None:
+        pass
+
+
+def _session(*replies: Reply) -> tuple[requests.Session, ScriptedAdapter]:
+    adapter = ScriptedAdapter(*replies)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    return session, adapter
+
+
+def _ok(body: object, headers: dict[str, str] | None = None) -> Reply:
+    return 200, headers or {}, body
+
+
+class TestPaginationConfig:
+    """Tests for PaginationConfig validation."""
+
+    def test_param_defaults_to_style(self):
+        """The query parameter defaults to the style's name."""
+        assert PaginationConfig("offset").param == "offset"
+        assert PaginationConfig("page").param == "page"
+        assert PaginationConfig("cursor", next="next").param == "cursor"
+        assert PaginationConfig("link").param == ""
+        assert PaginationConfig("page", param="p").param == "p"
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"style": "scroll"},
+            {"style": "cursor"},
+            {"style": "page", "page_size": 0},
+            {"style": "page", "page_size": True},
+            {"style": "page", "max_pages": "2"},
+            {"style": "offset", "start": -1},
+        ],
+    )
+    def test_invalid_values(self, kwargs: dict[str, object]):
+        """Unknown styles, cursors without 'next' and bad numbers raise ValueError."""
+        with pytest.raises(ValueError):
+            PaginationConfig(**kwargs)  # type: ignore[arg-type]
+
+    def test_from_dict(self):
+        """from_dict builds a config from a YAML-style mapping."""
+        config = PaginationConfig.from_dict({"style": "offset", "items": "data", "page_size": 50})
+
+        assert config == PaginationConfig("offset", items="data", page_size=50)
+
+    @pytest.mark.parametrize(
+        ("data", "message"),
+        [({"style": "page", "size": 10}, "unknown key"), ({"items": "data"}, "requires 'style'")],
+    )
+    def test_from_dict_errors(self, data: dict[str, object], message: str):
+        """Unknown keys and a missing style are rejected."""
+        with pytest.raises(ValueError, match=message):
+            PaginationConfig.from_dict(data)
+
+
+class TestStyles:
+    """Tests for walking each pagination style."""
+
+    def test_cursor(self):
+        """The next cursor is sent back as the cursor parameter until there is none."""
+        session, adapter = _session(
+            _ok({"data": [1, 2], "meta": {"next": "abc"}}),
+            _ok({"data": [3], "meta": {"next": None}}),
+        )
+        config = PaginationConfig("cursor", items="data", next="meta.next")
+
+        items = list(paginate(session, "get", URL, config, params={"q": "x"}))
+
+        assert items == [1, 2, 3]
+        assert adapter.params(0) == {"q": ["x"]}
+        assert adapter.params(1) == {"q": ["x"], "cursor": ["abc"]}
+        assert adapter.requests[1].method == "GET"
+
+    def test_cursor_url(self):
+        """A next value that is a URL is followed, relative to the current page."""
+        session, adapter = _session(
+            _ok({"items": [1], "next": "/items?after=1"}),
+            _ok({"items": [2], "next": "https://api.example.com/items?after=2"}),
+            _ok({"items": [3]}),
+        )
+        config = PaginationConfig("cursor", items="items", next="next")
+
+        assert list(paginate(session, "GET", URL, config)) == [1, 2, 3]
+        assert adapter.requests[1].url == "https://api.example.com/items?after=1"
+        assert adapter.requests[2].url == "https://api.example.com/items?after=2"
+
+    def test_repeated_cursor_stops(self):
+        """A cursor that was already followed ends the listing instead of looping."""
+        session, adapter = _session(
+            _ok({"items": [1], "next": "a"}),
+            _ok({"items": [2], "next": "b"}),
+            _ok({"items": [3], "next": "a"}),
+        )
+        config = PaginationConfig("cursor", items="items", next="next")
+
+        assert list(paginate(session, "GET", URL, config)) == [1, 2, 3]
+        assert len(adapter.requests) == 3
+
+    def test_offset_short_page(self):
+        """The offset advances by the items received; a short page ends the listing."""
+        session, adapter = _session(_ok([1, 2]), _ok([3, 4]), _ok([5]))
+        config = PaginationConfig("offset", limit_param="limit", page_size=2)
+
+        assert list(paginate(session, "GET", URL, config)) == [1, 2, 3, 4, 5]
+        assert adapter.params(0) == {"limit": ["2"], "offset": ["0"]}
+        assert adapter.params(1) == {"limit": ["2"], "offset": ["2"]}
+        assert adapter.params(2) == {"limit": ["2"], "offset": ["4"]}
+
+    def test_offset_total(self):
+        """With a total path the listing ends once that many items were received."""
+        session, adapter = _session(
+            _ok({"rows": [1, 2], "count": 4}), _ok({"rows": [3, 4], "count": 4})
+        )
+        config = PaginationConfig("offset", items="rows", total="count")
+
+        assert list(paginate(session, "GET", URL, config)) == [1, 2, 3, 4]
+        assert len(adapter.requests) == 2
+
+    def test_page_empty_page(self):
+        """Page numbers count up from start until an empty page."""
+        session, adapter = _session(_ok({"r": [1]}), _ok({"r": [2]}), _ok({"r": []}))
+        config = PaginationConfig("page", items="r", param="p")
+
+        assert list(paginate(session, "GET", URL, config)) == [1, 2]
+        assert [adapter.params(i)["p"] for i in range(3)] == [["1"], ["2"], ["3"]]
+
+    def test_caller_param_overrides_start(self):
+        """A starting value passed by the caller wins over the configured start."""
+        session, adapter = _session(_ok([1]), _ok([]))
+
+        list(paginate(session, "GET", URL, PaginationConfig("page"), params={"page": 5}))
+
+        assert adapter.params(0)["page"] == ["5"]
+        assert adapter.params(1)["page"] == ["6"]
+
+    def test_link_header(self):
+        """The rel="next" URL of the Link header is followed."""
+        session, adapter = _session(
+            _ok([1], {"Link": '</items?page=2>; rel="next"'}),
+            _ok([2], {"Link": '<https://api.example.com/items?page=1>; rel="prev"'}),
+        )
+
+        assert list(paginate(session, "GET", URL, PaginationConfig("link"))) == [1, 2]
+        assert adapter.requests[1].url == "https://api.example.com/items?page=2"
+
+    def test_max_pages(self):
+        """max_pages stops the walk even if the server has more."""
+        session, adapter = _session(_ok([1]), _ok([2]), _ok([3]))
+
+        items = list(paginate(session, "GET", URL, PaginationConfig("page", max_pages=2)))
+
+        assert items == [1, 2]
+        assert len(adapter.requests) == 2
+
+    def test_single_item_page(self):
+        """A page whose items path is an object yields it as one item."""
+        session, _ = _session(_ok({"item": {"id": 1}}))
+
+        assert list(paginate(session, "GET", URL, PaginationConfig("link", items="item"))) == [
+            {"id": 1}
+        ]
+
+
+class TestPaginator:
+    """Tests for fetching behavior."""
+
+    def test_first_page_fetched_eagerly(self):
+        """paginate() requests the first page before returning."""
+        session, adapter = _session(_ok([1]))
+
+        paginator = paginate(session, "GET", URL, PaginationConfig("page", page_size=5))
+
+        assert isinstance(paginator, Paginator)
+        assert len(adapter.requests) == 1
+
+    def test_reiteration_refetches_later_pages(self):
+        """Iterating again reuses the first page and requests the rest again."""
+        session, adapter = _session(_ok([1]), _ok([]), _ok([]))
+        paginator = paginate(session, "GET", URL, PaginationConfig("page"))
+
+        assert list(paginator) == [1]
+        assert list(paginator) == [1]
+        assert len(adapter.requests) == 3
+
+    def test_prefetch(self):
+        """The next page is requested while the current page is still being consumed."""
+        session, adapter = _session(_ok([1, 2]), _ok([3]), _ok([]))
+        items = iter(paginate(session, "GET", URL, PaginationConfig("page")))
+
+        assert next(items) == 1
+        assert adapter.wait_for(2)
+        assert list(items) == [2, 3]
+
+    def test_no_prefetch(self):
+        """With prefetch off, a page is only requested once the previous one is consumed."""
+        session, adapter = _session(_ok([1, 2]), _ok([]))
+        items = iter(paginate(session, "GET", URL, PaginationConfig("page", prefetch=False)))
+
+        assert next(items) == 1
+        assert next(items) == 2
+        assert len(adapter.requests) == 1
+        assert list(items) == []
+        assert len(adapter.requests) == 2
+
+    def test_later_pages_keep_the_cache_ttl(self):
+        """Pages fetched after paginate() returned still use the command's cache TTL."""
+        session, adapter = _session(_ok([1]), _ok([2]), _ok([]))
+        with response_cache_ttl(60):
+            paginator = paginate(session, "GET", URL, PaginationConfig("page"))
+
+        assert list(paginator) == [1, 2]
+        assert [ttl for ttl, _ in adapter.seen] == [60, 60, 60]
+
+    def test_later_pages_outlive_the_attempt_deadline(self):
+        """Pages fetched after the handler's deadline passed get their own timeout."""
+        session, adapter = _session(_ok([1]), _ok([2]), _ok([]))
+        with attempt_deadline(0.01):
+            paginator = paginate(session, "GET", URL, PaginationConfig("page"), timeout=5)
+            first_timeout = adapter.seen[0][1]
+        time.sleep(0.02)
+
+        assert list(paginator) == [1, 2]
+        assert first_timeout is not None and 0 < first_timeout <= 0.01
+        assert [timeout for _, timeout in adapter.seen[1:]] == [5, 5]
+
+    def test_timeout_in_request_kwargs_is_rejected(self):
+        """The page timeout has its own argument, so it cannot be passed twice."""
+        session, _ = _session(_ok([1]))
+        first = paginate(session, "GET", URL, PaginationConfig("page")).first
+
+        with pytest.raises(TypeError, match="timeout"):
+            Paginator(
+                session, "GET", first, PaginationConfig("page"), request_kwargs={"timeout": 5}
+            )
+
+    def test_prefetch_ignores_the_attempt_deadline(self):
+        """A prefetched page is not bound by the deadline of the attempt that created it."""
+        session, adapter = _session(_ok([1]), _ok([2]), _ok([]))
+        with attempt_deadline(0.01):
+            items = iter(paginate(session, "GET", URL, PaginationConfig("page")))
+            assert next(items) == 1
+            assert adapter.wait_for(2)
+        time.sleep(0.02)
+
+        assert list(items) == [2]
+        assert adapter.seen[1][1] is None
+
+    def test_transient_failure_retried(self, monkeypatch):
+        """A later page is retried on transient errors up to max_retries times."""
+        sleeps: list[float] = []
+        monkeypatch.setattr("graftpunk.plugins.pagination.time.sleep", sleeps.append)
+        session, adapter = _session(
+            _ok([1]), requests.ConnectionError("reset"), (503, {}, b""), _ok([2]), _ok([])
+        )
+
+        paginator = paginate(session, "GET", URL, PaginationConfig("page"), max_retries=2)
+
+        assert list(paginator) == [1, 2]
+        assert len(sleeps) == 2
+        assert len(adapter.requests) == 5
+
+    def test_retries_exhausted(self, monkeypatch):
+        """Once max_retries is used up the error propagates."""
+        monkeypatch.setattr("graftpunk.plugins.pagination.time.sleep", lambda _: None)
+        session, _ = _session(_ok([1]), (503, {}, b""), (503, {}, b""))
+        paginator = paginate(session, "GET", URL, PaginationConfig("page"), max_retries=1)
+
+        with pytest.raises(requests.HTTPError):
+            list(paginator)
+
+    def test_first_page_error(self):
+        """An error on the first page is raised by paginate() itself."""
+        session, _ = _session((404, {}, b"{}"))
+
+        with pytest.raises(requests.HTTPError):
+            paginate(session, "GET", URL, PaginationConfig("page"))
+
+    def test_non_json_page(self):
+        """A page that is not JSON raises CommandError naming the content type."""
+        session, _ = _session((200, {"Content-Type": "text/html"}, b"<html>"))
+
+        with pytest.raises(CommandError, match="text/html"):
+            paginate(session, "GET", URL, PaginationConfig("page"))
+
+    def test_request_kwargs_sent_with_every_page(self):
+        """Extra request arguments such as headers go with each page."""
+        session, adapter = _session(_ok([1]), _ok([]))
+
+        list(paginate(session, "GET", URL, PaginationConfig("page"), headers={"X-Key": "k"}))
+
+        assert [r.headers["X-Key"] for r in adapter.requests] == ["k", "k"]
@@ -1006,7 +1006,7 @@ class TestBrowserSessionContextManager:
 
         with (
             patch("graftpunk.BrowserSession") as mock_bs,
-            patch("graftpunk.cache_session"),
+            patch("graftpunk.cache_session_async", new_callable=AsyncMock),
         ):
             instance = mock_bs.return_value
             instance.start_async = AsyncMock()
@@ -1740,7 +1740,7 @@ class TestBrowserSessionErrorPaths:
 
         with (
             patch("graftpunk.BrowserSession") as mock_bs,
-            patch("graftpunk.cache_session") as mock_cache,
+            patch("graftpunk.cache_session_async", new_callable=AsyncMock) as mock_cache,
         ):
             instance = mock_bs.return_value
             instance.start_async = AsyncMock()
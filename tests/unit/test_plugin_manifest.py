@@ -0,0 +1,316 @@
+"""Tests for the persistent plugin manifest (cli/plugin_manifest.py)."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from graftpunk.cli import plugin_commands
+from graftpunk.cli.plugin_manifest import (
+    MANIFEST_FILE_NAME,
+    MANIFEST_VERSION,
+    PluginManifest,
+    clear_manifest_cache,
+    get_manifest_path,
+    get_plugin_manifest,
+    load_source_plugins,
+    read_manifest,
+)
+
+IMPORT_SOURCE = "graftpunk.cli.plugin_manifest._import_source"
+ENTRY_POINTS = "graftpunk.cli.plugin_manifest.entry_points"
+
+_PYTHON_PLUGIN = """
+from enum import Enum
+
+from graftpunk.plugins.cli_plugin import PluginParamSpec, SitePlugin, command
+
+
+class Kind(Enum):
+    NEW = "new"
+    TOP = "top"
+
+
+class Plugin(SitePlugin):
+    site_name = "{site}"
+    session_name = "{site}-session"
+    help_text = "{help}"
+    requires_session = False
+
+    @command(
+        help="List stories",
+        params=[
+            PluginParamSpec.option("kind", type=Kind, default=Kind.TOP, help="Story list"),
+            PluginParamSpec.argument("query"),
+        ],
+    )
+    def stories(self, ctx, kind, query):
+        return {{}}
+
+    def login(self, credentials):
+        \"\"\"Sign in with a username.\"\"\"
+        return True
+"""
+
+_YAML_PLUGIN = """
+site_name: httpbin
+help: "httpbin commands"
+commands:
+  ip:
+    help: "Show IP"
+    url: "/ip"
+"""
+
+
+@pytest.fixture(autouse=True)
+def _fresh_manifest(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Start each test without in-process manifests or plugin registrations."""
+    clear_manifest_cache()
+    monkeypatch.setattr(plugin_commands, "_plugin_session_map", {})
+    monkeypatch.setattr(plugin_commands, "_registered_plugin_sources", {})
+    monkeypatch.setattr(plugin_commands, "_registered_plugins_for_teardown", [])
+    monkeypatch.setattr(plugin_commands, "_plugin_session_map_loaded", False)
+
+
+@pytest.fixture
+def plugins_dir(isolated_config: Path) -> Path:
+    path = isolated_config / "plugins"
+    path.mkdir()
+    return path
+
+
+def _write_python(plugins_dir: Path, site: str, help_text: str = "") -> Path:
+    path = plugins_dir / f"{site}.py"
+    path.write_text(_PYTHON_PLUGIN.format(site=site, help=help_text or f"{site} commands"))
+    return path
+
+
+def _touch(path: Path) -> None:
+    """Move a file's mtime forward so its fingerprint changes."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _rescan() -> PluginManifest:
+    """Re-validate the on-disk manifest as a new process would."""
+    clear_manifest_cache()
+    return get_plugin_manifest()
+
+
+class TestManifestContents:
+    """Tests for what the manifest records about each plugin."""
+
+    def test_records_commands_params_and_login(self, plugins_dir: Path):
+        """Commands, parameters, Enum choices and the login command are recorded."""
+        _write_python(plugins_dir, "hn")
+
+        plugin = get_plugin_manifest().get("hn")
+
+        assert plugin is not None
+        assert plugin.session_name == "hn-session"
+        assert plugin.help_text == "hn commands"
+        assert plugin.source == f"python:{plugins_dir / 'hn.py'}"
+        stories, login = plugin.commands
+        assert stories.name == "stories"
+        assert stories.help == "List stories"
+        kind, query = stories.params
+        assert (kind.name, kind.is_option, kind.type) == ("kind", True, "Kind")
+        assert kind.choices == ("new", "top")
+        assert kind.default == "top"
+        assert (query.is_option, query.required) == (False, True)
+        assert login.name == "login"
+        assert login.help == "Sign in with a username."
+
+    def test_yaml_and_python_sources(self, plugins_dir: Path):
+        """YAML files are indexed before Python files."""
+        (plugins_dir / "httpbin.yaml").write_text(_YAML_PLUGIN)
+        _write_python(plugins_dir, "hn")
+
+        manifest = get_plugin_manifest()
+
+        assert [plugin.site_name for plugin in manifest.plugins] == ["httpbin", "hn"]
+        assert manifest.session_map() == {"httpbin": "httpbin", "hn": "hn-session"}
+
+    def test_written_to_config_dir(self, isolated_config: Path, plugins_dir: Path):
+        """The manifest is persisted as JSON in the config directory."""
+        _write_python(plugins_dir, "hn")
+
+        get_plugin_manifest()
+
+        path = isolated_config / MANIFEST_FILE_NAME
+        assert get_manifest_path() == path
+        data = json.loads(path.read_text())
+        assert data["version"] == MANIFEST_VERSION
+        assert read_manifest(path) == get_plugin_manifest()
+
+    def test_failed_source_is_recorded(self, plugins_dir: Path):
+        """A source that fails to load is kept with its error and no plugins."""
+        (plugins_dir / "broken.py").write_text("raise RuntimeError('bad plugin')\n")
+
+        (source,) = get_plugin_manifest().sources
+
+        assert source.plugins == ()
+        assert "bad plugin" in (source.error or "")
+
+    def test_no_plugins_dir(self):
+        """Without a plugins directory the manifest is empty."""
+        with patch(ENTRY_POINTS, return_value=[]):
+            assert get_plugin_manifest().plugins == ()
+
+
+class TestManifestInvalidation:
+    """Tests for per-source reuse and invalidation."""
+
+    def test_unchanged_sources_are_not_imported(self, plugins_dir: Path):
+        """A fresh process reuses the on-disk manifest without importing plugins."""
+        _write_python(plugins_dir, "hn")
+        get_plugin_manifest()
+
+        with patch(IMPORT_SOURCE) as mock_import:
+            manifest = _rescan()
+
+        mock_import.assert_not_called()
+        assert manifest.get("hn") is not None
+
+    def test_changed_file_is_reindexed(self, plugins_dir: Path):
+        """A file whose mtime changed is imported and described again."""
+        (plugins_dir / "httpbin.yaml").write_text(_YAML_PLUGIN)
+        path = _write_python(plugins_dir, "hn")
+        get_plugin_manifest()
+
+        path.write_text(_PYTHON_PLUGIN.format(site="hn", help="Hacker News"))
+        _touch(path)
+        clear_manifest_cache()
+        manifest = get_plugin_manifest()
+
+        plugin = manifest.get("hn")
+        assert plugin is not None
+        assert plugin.help_text == "Hacker News"
+        assert read_manifest(get_manifest_path()) == manifest
+
+    def test_only_changed_source_is_imported(self, plugins_dir: Path):
+        """Sibling sources keep their recorded entries."""
+        (plugins_dir / "httpbin.yaml").write_text(_YAML_PLUGIN)
+        path = _write_python(plugins_dir, "hn")
+        get_plugin_manifest()
+        _touch(path)
+
+        with patch(IMPORT_SOURCE, return_value=()) as mock_import:
+            _rescan()
+
+        mock_import.assert_called_once_with(f"python:{path}")
+
+    def test_removed_file_is_dropped(self, plugins_dir: Path):
+        """Deleting a plugin file removes its plugins from the manifest."""
+        path = _write_python(plugins_dir, "hn")
+        get_plugin_manifest()
+        path.unlink()
+
+        assert _rescan().plugins == ()
+
+    def test_entry_point_version_change_reindexes(self, plugins_dir: Path):
+        """Upgrading an entry-point distribution re-imports its plugin."""
+
+        def fake_entry_points(version: str) -> list[SimpleNamespace]:
+            dist = SimpleNamespace(name="gp-acme", version=version)
+            return [SimpleNamespace(name="acme", value="acme.cli:Plugin", dist=dist)]
+
+        with (
+            patch(ENTRY_POINTS, return_value=fake_entry_points("1.0")),
+            patch(IMPORT_SOURCE, return_value=()) as mock_import,
+        ):
+            get_plugin_manifest()
+            _rescan()
+            assert mock_import.call_count == 1
+
+        with (
+            patch(ENTRY_POINTS, return_value=fake_entry_points("1.1")),
+            patch(IMPORT_SOURCE, return_value=()) as mock_import,
+        ):
+            (source,) = _rescan().sources
+
+        mock_import.assert_called_once_with("entry_point:acme")
+        assert source.fingerprint == "acme.cli:Plugin@gp-acme==1.1"
+
+    def test_corrupt_manifest_is_rebuilt(self, plugins_dir: Path):
+        """An unreadable manifest file is ignored and rewritten."""
+        _write_python(plugins_dir, "hn")
+        get_manifest_path().write_text("{not json")
+
+        manifest = get_plugin_manifest()
+
+        assert manifest.get("hn") is not None
+        assert read_manifest(get_manifest_path()) == manifest
+
+    def test_other_graftpunk_version_is_discarded(self, plugins_dir: Path):
+        """A manifest written by another graftpunk version is not trusted."""
+        _write_python(plugins_dir, "hn")
+        get_plugin_manifest()
+        path = get_manifest_path()
+        data = json.loads(path.read_text())
+        data["graftpunk_version"] = "0.0.1"
+        path.write_text(json.dumps(data))
+
+        assert read_manifest(path) is None
+
+    @pytest.mark.parametrize(
+        ("field", "value"),
+        [
+            ("name", 42),
+            ("required", "yes"),
+            ("nargs", True),
+            ("choices", "abc"),
+            ("default", {"nested": 1}),
+        ],
+    )
+    def test_malformed_param_field_is_discarded(self, plugins_dir: Path, field: str, value: object):
+        """A manifest whose fields have the wrong JSON types is rebuilt, not trusted."""
+        _write_python(plugins_dir, "hn")
+        expected = get_plugin_manifest()
+        path = get_manifest_path()
+        data = json.loads(path.read_text())
+        command = next(cmd for cmd in data["sources"][0]["plugins"][0]["commands"] if cmd["params"])
+        command["params"][0][field] = value
+        path.write_text(json.dumps(data))
+
+        assert read_manifest(path) is None
+        assert _rescan() == expected
+
+
+class TestManifestRouting:
+    """Tests for loading plugins through the manifest."""
+
+    def test_load_source_plugins_reuses_indexed_instances(self, plugins_dir: Path):
+        """A source imported while indexing is not executed again."""
+        path = _write_python(plugins_dir, "hn")
+        get_plugin_manifest()
+
+        with patch(IMPORT_SOURCE) as mock_import:
+            (plugin,) = load_source_plugins(f"python:{path}")
+
+        mock_import.assert_not_called()
+        assert plugin.site_name == "hn"
+
+    def test_register_only_imports_matching_source(self, plugins_dir: Path):
+        """Routing to one plugin imports only that plugin's file."""
+        import typer
+
+        (plugins_dir / "httpbin.yaml").write_text(_YAML_PLUGIN)
+        path = _write_python(plugins_dir, "hn")
+        get_plugin_manifest()
+        clear_manifest_cache()
+
+        with patch(IMPORT_SOURCE, return_value=()) as mock_import:
+            get_plugin_manifest()
+            plugin_commands.register_plugin_commands(typer.Typer(), only="hn")
+
+        mock_import.assert_called_once_with(f"python:{path}")
+        assert plugin_commands._plugin_session_map == {
+            "httpbin": "httpbin",
+            "hn": "hn-session",
+        }
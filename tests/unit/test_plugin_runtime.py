@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import typer
 from typer.testing import CliRunner
@@ -23,6 +23,31 @@ class _EchoPlugin(SitePlugin):
         return {"echo": kw}
 
 
+class _SavingPlugin(SitePlugin):
+    site_name = "savesite"
+    session_name = "savesession"
+    help_text = "Session-saving plugin"
+
+    def get_session(self):
+        return MagicMock()
+
+    @command(help="List items", saves_session=True)
+    def items(self, ctx):
+        return iter([{"id": 1}])
+
+
+def _invoke(plugin: SitePlugin, name: str):
+    spec = next(s for s in plugin.get_commands() if s.name == name)
+
+    def body(ctx: typer.Context, **kwargs) -> None:
+        run_plugin_command(plugin, spec, ctx, **kwargs)
+
+    fn = synthesize_command_fn(name=name, param_specs=list(spec.params), body=body)
+    app = typer.Typer()
+    app.command(name=name)(fn)
+    return CliRunner().invoke(app, [])
+
+
 class TestFactoryPlusRuntime:
     def test_end_to_end_command_executes_pipeline(self) -> None:
         plugin = _EchoPlugin()
@@ -39,3 +64,24 @@ class TestFactoryPlusRuntime:
         assert result.exit_code == 0, result.output
         mock_fmt.assert_called_once()
         assert mock_fmt.call_args.kwargs["user_explicit"] is False
+
+    def test_session_persisted_after_output(self) -> None:
+        """Cookies are saved after formatting, which may fetch further pages."""
+        calls = MagicMock()
+        with (
+            patch("graftpunk.cli.plugin_runtime.format_output", calls.format_output),
+            patch("graftpunk.cli.plugin_runtime.update_session_cookies", calls.persist),
+        ):
+            result = _invoke(_SavingPlugin(), "items")
+        assert result.exit_code == 0, result.output
+        assert [c[0] for c in calls.mock_calls] == ["format_output", "persist"]
+
+    def test_session_persisted_when_output_fails(self) -> None:
+        """A failure while writing the output still saves the session."""
+        with (
+            patch("graftpunk.cli.plugin_runtime.format_output", side_effect=OSError("disk full")),
+            patch("graftpunk.cli.plugin_runtime.update_session_cookies") as mock_persist,
+        ):
+            result = _invoke(_SavingPlugin(), "items")
+        assert result.exit_code == 1
+        mock_persist.assert_called_once()
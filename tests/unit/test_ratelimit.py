@@ -0,0 +1,359 @@
+"""Tests for token-bucket rate limiting (ratelimit.py)."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from graftpunk.config import reset_settings
+from graftpunk.ratelimit import (
+    MAX_RETRY_AFTER,
+    MAX_SLOWDOWN,
+    AdaptiveConcurrency,
+    FileBucketStore,
+    MemoryBucketStore,
+    RateLimit,
+    RateLimiter,
+    get_rate_limiter,
+    parse_retry_after,
+    reset_rate_limiter,
+)
+
+
+class FakeClock:
+    """Manual wall clock; sleeping advances it."""
+
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+        self.slept: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def _limiter(clock: FakeClock, store: object | None = None) -> RateLimiter:
+    return RateLimiter(store, clock=clock, sleep=clock.sleep)  # type: ignore[arg-type]
+
+
+class TestRateLimit:
+    """Tests for RateLimit validation."""
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{"interval": 0}, {"interval": -1}, {"interval": True}, {"interval": 1, "burst": 0}],
+    )
+    def test_invalid_values(self, kwargs: dict[str, object]):
+        """Intervals must be positive and bursts positive integers."""
+        with pytest.raises(ValueError):
+            RateLimit(**kwargs)  # type: ignore[arg-type]
+
+
+class TestReserve:
+    """Tests for slot reservation."""
+
+    def test_first_call_is_free(self):
+        """An idle bucket hands out a slot immediately."""
+        clock = FakeClock()
+        limiter = _limiter(clock)
+
+        assert limiter.acquire("k", RateLimit(1.0)) == 0
+        assert clock.slept == []
+
+    def test_calls_are_spaced_by_interval(self):
+        """Back-to-back calls wait out the rest of the interval."""
+        clock = FakeClock()
+        limiter = _limiter(clock)
+        limiter.acquire("k", RateLimit(1.0))
+        clock.now += 0.25
+
+        limiter.acquire("k", RateLimit(1.0))
+
+        assert clock.slept == [0.75]
+
+    def test_reservations_queue_up(self):
+        """Each reservation takes the next free slot."""
+        limiter = _limiter(FakeClock())
+
+        delays = [limiter.reserve("k", RateLimit(0.5)) for _ in range(4)]
+
+        assert delays == [0, 0.5, 1.0, 1.5]
+
+    def test_burst(self):
+        """After an idle period ``burst`` calls go through back to back."""
+        clock = FakeClock()
+        limiter = _limiter(clock)
+        limit = RateLimit(1.0, burst=3)
+
+        assert [limiter.reserve("k", limit) for _ in range(4)] == [0, 0, 0, 1.0]
+        clock.now += 10
+        assert [limiter.reserve("k", limit) for _ in range(3)] == [0, 0, 0]
+
+    def test_buckets_are_independent(self):
+        """Different keys do not wait for each other."""
+        limiter = _limiter(FakeClock())
+        limiter.reserve("a", RateLimit(1.0))
+
+        assert limiter.reserve("b", RateLimit(1.0)) == 0
+
+    async def test_async_acquire(self):
+        """aacquire() waits out the slot with asyncio.sleep."""
+        clock = FakeClock()
+        limiter = _limiter(clock)
+        limiter.reserve("k", RateLimit(0.02))
+
+        started = time.monotonic()
+        assert await limiter.aacquire("k", RateLimit(0.02)) == pytest.approx(0.02)
+        assert time.monotonic() - started >= 0.015
+        assert clock.slept == []
+
+    def test_threads_reserve_distinct_slots(self):
+        """Concurrent callers are spaced by the interval instead of waking together."""
+        limiter = RateLimiter()
+        barrier = threading.Barrier(4, timeout=5)
+        finished: list[float] = []
+        lock = threading.Lock()
+
+        def call() -> None:
+            barrier.wait()
+            limiter.acquire("k", RateLimit(0.02))
+            with lock:
+                finished.append(time.monotonic())
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        finished.sort()
+        assert finished[-1] - finished[0] >= 0.055
+
+
+class TestThrottling:
+    """Tests for AIMD adaptation to throttling responses."""
+
+    def test_retry_after_pauses_bucket(self):
+        """The next slot starts after Retry-After, and the rate is halved."""
+        clock = FakeClock()
+        limiter = _limiter(clock)
+        limit = RateLimit(1.0)
+
+        assert limiter.throttled("k", limit, retry_after=5.0) == 5.0
+        assert limiter.reserve("k", limit) == 5.0
+        assert limiter.reserve("k", limit) == 7.0
+        assert limiter.throttle_count == 1
+
+    def test_pause_without_retry_after(self):
+        """Without Retry-After the bucket pauses for one (slowed) interval."""
+        limiter = _limiter(FakeClock())
+
+        assert limiter.throttled("k", RateLimit(1.0)) == 2.0
+
+    def test_slowdown_is_capped(self):
+        """Repeated throttling never slows a bucket past MAX_SLOWDOWN."""
+        clock = FakeClock()
+        limiter = _limiter(clock)
+        limit = RateLimit(1.0)
+        for _ in range(10):
+            limiter.throttled("k", limit, retry_after=0)
+        clock.now += 1000
+
+        limiter.reserve("k", limit)
+
+        assert limiter.reserve("k", limit) == MAX_SLOWDOWN
+
+    def test_successes_restore_rate(self):
+        """Each success wins back part of the rate until the bucket is at full speed."""
+        clock = FakeClock()
+        limiter = _limiter(clock)
+        limit = RateLimit(1.0)
+        limiter.throttled("k", limit, retry_after=0)
+        limiter.throttled("k", limit, retry_after=0)
+
+        gaps = []
+        for _ in range(10):
+            limiter.acquire("k", limit)
+            limiter.succeeded("k", limit)
+            gaps.append(limiter.reserve("k", limit))
+            clock.now += gaps[-1]
+            limiter.succeeded("k", limit)
+
+        assert gaps[0] > gaps[1] > gaps[2]
+        assert gaps[-1] == 1.0
+        assert "k" not in limiter._slowed
+
+    def test_non_adaptive_keeps_rate(self):
+        """Non-adaptive limits honour Retry-After but never slow down."""
+        clock = FakeClock()
+        limiter = _limiter(clock)
+        limit = RateLimit(1.0, adaptive=False)
+
+        limiter.throttled("k", limit, retry_after=3.0)
+
+        assert limiter.reserve("k", limit) == 3.0
+        assert limiter.reserve("k", limit) == 4.0
+
+    def test_success_at_full_speed_skips_store(self):
+        """succeeded() does not touch the store for buckets that are not slowed."""
+
+        class CountingStore(MemoryBucketStore):
+            updates = 0
+
+            def update(self, key, fn):  # type: ignore[no-untyped-def]
+                CountingStore.updates += 1
+                return super().update(key, fn)
+
+        limiter = _limiter(FakeClock(), CountingStore())
+        limiter.acquire("k", RateLimit(1.0))
+        limiter.succeeded("k", RateLimit(1.0))
+
+        assert CountingStore.updates == 1
+
+
+class TestParseRetryAfter:
+    """Tests for parse_retry_after."""
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [("5", 5.0), (" 2.5 ", 2.5), ("-3", 0.0), ("100000", MAX_RETRY_AFTER)],
+    )
+    def test_seconds(self, value: str, expected: float):
+        """Delay seconds are clamped to [0, MAX_RETRY_AFTER]."""
+        assert parse_retry_after(value) == expected
+
+    def test_http_date(self):
+        """HTTP dates are converted to seconds from now."""
+        now = 784111777.0  # Sun, 06 Nov 1994 08:49:37 GMT
+        assert parse_retry_after("Sun, 06 Nov 1994 08:50:07 GMT", now=now) == 30.0
+
+    @pytest.mark.parametrize("value", [None, "", "soon"])
+    def test_missing_or_invalid(self, value: str | None):
+        """Missing or unparseable headers give None."""
+        assert parse_retry_after(value) is None
+
+
+class TestFileBucketStore:
+    """Tests for the file-backed, cross-process store."""
+
+    def test_state_shared_between_instances(self, tmp_path):
+        """Separate limiters over one directory share buckets, as processes would."""
+        clock = FakeClock()
+        first = _limiter(clock, FileBucketStore(tmp_path))
+        second = _limiter(clock, FileBucketStore(tmp_path))
+
+        first.reserve("host:api.example.com", RateLimit(1.0))
+        second.throttled("host:api.example.com", RateLimit(1.0), retry_after=4.0)
+
+        assert first.reserve("host:api.example.com", RateLimit(1.0)) == 4.0
+        assert len(list(tmp_path.glob("host_api.example.com-*.json"))) == 1
+
+    def test_threads_reserve_distinct_slots(self, tmp_path):
+        """Concurrent reservations through separate store instances never collide."""
+        clock = FakeClock()
+        delays: list[float] = []
+        lock = threading.Lock()
+
+        def reserve() -> None:
+            limiter = _limiter(clock, FileBucketStore(tmp_path))
+            for _ in range(5):
+                delay = limiter.reserve("k", RateLimit(1.0))
+                with lock:
+                    delays.append(delay)
+
+        threads = [threading.Thread(target=reserve) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(delays) == [float(n) for n in range(20)]
+
+    def test_corrupt_state_is_reset(self, tmp_path):
+        """An unreadable state file is replaced by a fresh bucket."""
+        store = FileBucketStore(tmp_path)
+        store._path("k").write_text("{not json")
+
+        assert _limiter(FakeClock(), store).reserve("k", RateLimit(1.0)) == 0
+
+
+class TestAdaptiveConcurrency:
+    """Tests for the AIMD concurrency limit."""
+
+    def test_throttle_halves_once_per_round(self):
+        """Calls started before a decrease cannot decrease the limit again."""
+        gate = AdaptiveConcurrency(8)
+        tickets = [gate.acquire() for _ in range(8)]
+
+        for ticket in tickets:
+            gate.release(ticket, throttled=True)
+        assert gate.limit == 4
+
+        gate.release(gate.acquire(), throttled=True)
+        assert gate.limit == 2
+
+    def test_successes_grow_limit(self):
+        """Each success adds 1/limit, up to the maximum."""
+        gate = AdaptiveConcurrency(4)
+        gate.release(gate.acquire(), throttled=True)
+        gate.release(gate.acquire(), throttled=True)
+        assert gate.limit == 1
+
+        for _ in range(3):
+            gate.release(gate.acquire())
+        assert gate.limit == 2
+        for _ in range(50):
+            gate.release(gate.acquire())
+        assert gate.limit == 4
+
+    def test_acquire_blocks_at_limit(self):
+        """A call waits while the limit is in use."""
+        gate = AdaptiveConcurrency(1)
+        ticket = gate.acquire()
+        started = threading.Event()
+
+        def worker() -> None:
+            gate.release(gate.acquire())
+            started.set()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        assert not started.wait(0.05)
+        gate.release(ticket)
+        assert started.wait(5)
+        thread.join()
+
+    @pytest.mark.parametrize(("maximum", "minimum"), [(0, 1), (2, 3), (4, 0)])
+    def test_invalid_bounds(self, maximum: int, minimum: int):
+        """Bounds must be positive and ordered."""
+        with pytest.raises(ValueError):
+            AdaptiveConcurrency(maximum, minimum=minimum)
+
+
+class TestGetRateLimiter:
+    """Tests for the process-wide limiter."""
+
+    def test_singleton_in_memory_by_default(self):
+        """One in-memory limiter is shared until reset."""
+        limiter = get_rate_limiter()
+
+        assert isinstance(limiter.store, MemoryBucketStore)
+        assert get_rate_limiter() is limiter
+        reset_rate_limiter()
+        assert get_rate_limiter() is not limiter
+
+    def test_file_backend(self, monkeypatch, isolated_config):
+        """GRAFTPUNK_RATE_LIMIT_BACKEND=file keeps buckets in the config directory."""
+        monkeypatch.setenv("GRAFTPUNK_RATE_LIMIT_BACKEND", "file")
+        reset_settings()
+        reset_rate_limiter()
+
+        store = get_rate_limiter().store
+
+        assert isinstance(store, FileBucketStore)
+        assert store.directory == isolated_config / "ratelimit"
@@ -0,0 +1,457 @@
+"""Tests for the encrypted HTTP response cache (response_cache.py)."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+import requests
+
+from graftpunk.config import reset_settings
+from graftpunk.graftpunk_session import GraftpunkSession
+from graftpunk.response_cache import (
+    CachedResponse,
+    ResponseCache,
+    anonymous_partition,
+    clear_response_cache,
+    current_cache_ttl,
+    get_response_cache,
+    reset_response_cache,
+    response_cache_ttl,
+    session_partition,
+)
+
+URL = "https://api.example.com/items"
+
+
+class FakeClock:
+    """Manual wall clock."""
+
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ScriptedAdapter(requests.adapters.BaseAdapter):
+    """Answers requests with queued (status, headers, body) tuples and records them."""
+
+    def __init__(self, *replies: tuple[int, dict[str, str], bytes]) -> None:
+        super().__init__()
+        self.replies = list(replies)
+        self.requests: list[requests.PreparedRequest] = []
+
+    def send(self, request, **kwargs):  # type: ignore[no-untyped-def]
+        self.requests.append(request)
+        status, headers, body = self.replies.pop(0)
+        response = requests.Response()
+        response.status_code = status
+        response.reason = "OK" if status == 200 else ""
+        response.headers = requests.structures.CaseInsensitiveDict(headers)
+        response._content = body
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def _session(
+    cache: ResponseCache, adapter: ScriptedAdapter, partition: str = "session:test"
+) -> GraftpunkSession:
+    session = GraftpunkSession()
+    session.mount("https://", adapter)
+    session.enable_response_cache(partition, cache=cache)
+    return session
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock) -> ResponseCache:
+    return ResponseCache(tmp_path / "responses", 1024 * 1024, clock=clock)
+
+
+class TestCacheTtlContext:
+    """Tests for response_cache_ttl and current_cache_ttl."""
+
+    def test_nesting_and_default(self):
+        """The innermost TTL wins; None keeps the outer one; outside, the default applies."""
+        assert current_cache_ttl() is None
+        assert current_cache_ttl(5) == 5
+        with response_cache_ttl(60):
+            assert current_cache_ttl(5) == 60
+            with response_cache_ttl(None):
+                assert current_cache_ttl() == 60
+            with response_cache_ttl(10):
+                assert current_cache_ttl() == 10
+        assert current_cache_ttl() is None
+
+
+class TestCachedResponse:
+    """Tests for CachedResponse."""
+
+    def _response(self, headers: dict[str, str]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = requests.structures.CaseInsensitiveDict(headers)
+        response._content = b'{"a": 1}'
+        response.url = URL
+        return response
+
+    def test_round_trip(self):
+        """encode() and decode() preserve every field."""
+        request = requests.Request("GET", URL, headers={"Accept": "json"}).prepare()
+        entry = CachedResponse.from_response(
+            self._response({"ETag": '"v1"', "Vary": "Accept"}), request, 5.0
+        )
+
+        assert CachedResponse.decode(entry.encode()) == entry
+        assert entry.vary == (("accept", "json"),)
+
+    def test_transfer_headers_and_cookies_are_not_stored(self):
+        """Set-Cookie and per-transfer headers are dropped; the body is rebuilt as-is."""
+        request = requests.Request("GET", URL).prepare()
+        entry = CachedResponse.from_response(
+            self._response(
+                {
+                    "Content-Type": "application/json",
+                    "Set-Cookie": "sid=secret",
+                    "Content-Encoding": "gzip",
+                    "Content-Length": "999",
+                }
+            ),
+            request,
+            0.0,
+        )
+
+        response = entry.to_response(request)
+
+        assert "Set-Cookie" not in response.headers
+        assert "Content-Encoding" not in response.headers
+        assert response.headers["Content-Length"] == "8"
+        assert response.json() == {"a": 1}
+
+    def test_decode_rejects_garbage(self):
+        """Data that is not an entry raises ValueError."""
+        with pytest.raises(ValueError):
+            CachedResponse.decode(b"\x00\x00\x00\x05nope!")
+
+    def test_no_cache_is_never_fresh(self):
+        """Responses marked no-cache are revalidated on every use."""
+        request = requests.Request("GET", URL).prepare()
+        entry = CachedResponse.from_response(
+            self._response({"Cache-Control": "private, no-cache"}), request, 0.0
+        )
+
+        assert not entry.is_fresh(60, 1.0)
+
+    def test_revalidated_merges_headers(self):
+        """A 304 updates matching headers case-insensitively and adds new ones."""
+        request = requests.Request("GET", URL).prepare()
+        entry = CachedResponse.from_response(
+            self._response({"ETag": '"v1"', "Date": "old"}), request, 0.0
+        )
+        not_modified = requests.Response()
+        not_modified.headers = requests.structures.CaseInsensitiveDict(
+            {"date": "new", "X-Extra": "1", "Set-Cookie": "sid=x"}
+        )
+
+        refreshed = entry.revalidated(not_modified, 50.0)
+
+        assert refreshed.header("Date") == "new"
+        assert refreshed.header("X-Extra") == "1"
+        assert refreshed.header("Set-Cookie") is None
+        assert refreshed.stored_at == 50.0
+        assert refreshed.body == entry.body
+
+
+class TestResponseCacheStore:
+    """Tests for the on-disk store."""
+
+    def _entry(self, body: bytes = b"x") -> CachedResponse:
+        return CachedResponse("GET", URL, 200, "OK", (), body, 0.0)
+
+    def test_entries_are_encrypted(self, cache):
+        """Nothing readable about the response or its URL lands on disk."""
+        cache.put("session:s", f"GET {URL}", self._entry(b"very secret body"))
+
+        (path,) = cache.directory.glob("*/*.bin")
+        raw = path.read_bytes()
+        assert b"very secret body" not in raw
+        assert b"example.com" not in raw
+        assert "example" not in str(path)
+        assert cache.get("session:s", f"GET {URL}").body == b"very secret body"
+
+    def test_partitions_are_isolated(self, cache):
+        """One partition never sees another's entries, and clearing one keeps the rest."""
+        cache.put("session:a", "k", self._entry(b"a"))
+        cache.put("session:b", "k", self._entry(b"b"))
+
+        assert cache.get("session:a", "k").body == b"a"
+        cache.clear("session:a")
+        assert cache.get("session:a", "k") is None
+        assert cache.get("session:b", "k").body == b"b"
+
+    def test_lru_eviction(self, tmp_path):
+        """Going over the size bound evicts the least recently used entries."""
+        probe = ResponseCache(tmp_path / "probe", 1 << 20)
+        probe.put("p", "k", self._entry(b"0" * 100))
+        entry_size = probe.total_bytes
+        cache = ResponseCache(tmp_path / "lru", entry_size * 2 + 10)
+
+        cache.put("p", "a", self._entry(b"a" * 100))
+        cache.put("p", "b", self._entry(b"b" * 100))
+        assert cache.get("p", "a") is not None
+        cache.put("p", "c", self._entry(b"c" * 100))
+
+        assert cache.get("p", "b") is None
+        assert cache.get("p", "a") is not None
+        assert cache.get("p", "c") is not None
+        assert cache.total_bytes <= cache.max_bytes
+
+    def test_oversized_entry_is_skipped(self, tmp_path):
+        """An entry bigger than the whole cache is not stored."""
+        cache = ResponseCache(tmp_path / "small", 64)
+
+        cache.put("p", "k", self._entry(b"x" * 100))
+
+        assert cache.get("p", "k") is None
+        assert cache.total_bytes == 0
+
+    def test_index_rebuilt_from_disk(self, cache, tmp_path):
+        """A new instance (another process) sees existing entries, oldest first."""
+        cache.put("p", "old", self._entry())
+        cache.put("p", "new", self._entry())
+        old_path = cache._path("p", "old")
+        os.utime(old_path, (1, 1))
+
+        reopened = ResponseCache(cache.directory, cache.max_bytes)
+
+        assert reopened.total_bytes == cache.total_bytes
+        assert next(iter(reopened._load_index())) == old_path
+
+    def test_corrupt_entry_is_deleted(self, cache):
+        """Unreadable entries are removed and treated as misses."""
+        cache.put("p", "k", self._entry())
+        path = cache._path("p", "k")
+        path.write_bytes(b"garbage")
+
+        assert cache.get("p", "k") is None
+        assert not path.exists()
+
+
+class TestFetch:
+    """Tests for serving requests through a GraftpunkSession."""
+
+    def test_no_ttl_means_no_caching(self, cache):
+        """Outside a caching command every request goes to the network."""
+        adapter = ScriptedAdapter((200, {}, b"1"), (200, {}, b"2"))
+        session = _session(cache, adapter)
+
+        assert session.get(URL).content == b"1"
+        assert session.get(URL).content == b"2"
+        assert cache.total_bytes == 0
+
+    def test_fresh_hit(self, cache, clock):
+        """Within the TTL the stored response is served without a request."""
+        adapter = ScriptedAdapter((200, {"Content-Type": "application/json"}, b'{"n": 1}'))
+        session = _session(cache, adapter)
+
+        with response_cache_ttl(60):
+            first = session.get(URL)
+            clock.now += 30
+            second = session.get(URL)
+
+        assert len(adapter.requests) == 1
+        assert second.json() == first.json() == {"n": 1}
+        assert second.status_code == 200
+        assert second.request.url == URL
+
+    def test_hit_runs_response_hooks(self, cache):
+        """Response hooks run for cached responses too."""
+        seen: list[int] = []
+        session = _session(cache, ScriptedAdapter((200, {}, b"x")))
+        session.hooks["response"].append(lambda r, **_: seen.append(r.status_code))
+
+        with response_cache_ttl(60):
+            session.get(URL)
+            session.get(URL)
+
+        assert seen == [200, 200]
+
+    def test_stale_entry_revalidates_with_304(self, cache, clock):
+        """After the TTL a conditional request is sent; 304 reuses and refreshes the body."""
+        adapter = ScriptedAdapter(
+            (200, {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}, b"body"),
+            (304, {"ETag": '"v1"'}, b""),
+        )
+        session = _session(cache, adapter)
+
+        with response_cache_ttl(60):
+            session.get(URL)
+            clock.now += 120
+            response = session.get(URL)
+            clock.now += 30
+            session.get(URL)
+
+        assert len(adapter.requests) == 2
+        assert adapter.requests[1].headers["If-None-Match"] == '"v1"'
+        assert adapter.requests[1].headers["If-Modified-Since"].startswith("Mon")
+        assert "If-None-Match" not in adapter.requests[0].headers
+        assert response.status_code == 200
+        assert response.content == b"body"
+
+    def test_stale_entry_replaced_when_changed(self, cache, clock):
+        """A full response to the conditional request replaces the entry."""
+        adapter = ScriptedAdapter((200, {"ETag": '"v1"'}, b"one"), (200, {"ETag": '"v2"'}, b"two"))
+        session = _session(cache, adapter)
+
+        with response_cache_ttl(60):
+            session.get(URL)
+            clock.now += 120
+            assert session.get(URL).content == b"two"
+            assert session.get(URL).content == b"two"
+
+        assert len(adapter.requests) == 2
+
+    @pytest.mark.parametrize(
+        "headers",
+        [{"Cache-Control": "no-store"}, {"Vary": "*"}],
+    )
+    def test_unstorable_responses(self, cache, headers):
+        """no-store and Vary: * responses are never cached."""
+        adapter = ScriptedAdapter((200, headers, b"1"), (200, headers, b"2"))
+        session = _session(cache, adapter)
+
+        with response_cache_ttl(60):
+            session.get(URL)
+            assert session.get(URL).content == b"2"
+
+    def test_errors_are_not_cached(self, cache):
+        """Only final, cacheable statuses are stored."""
+        adapter = ScriptedAdapter((500, {}, b"boom"), (200, {}, b"ok"))
+        session = _session(cache, adapter)
+
+        with response_cache_ttl(60):
+            session.get(URL)
+            assert session.get(URL).content == b"ok"
+
+    @pytest.mark.parametrize(
+        ("method", "headers"),
+        [
+            ("POST", {}),
+            ("GET", {"Range": "bytes=0-1"}),
+            ("GET", {"If-None-Match": '"mine"'}),
+            ("GET", {"Cache-Control": "no-cache"}),
+        ],
+    )
+    def test_bypassed_requests(self, cache, method, headers):
+        """Unsafe methods and requests that manage caching themselves skip the cache."""
+        adapter = ScriptedAdapter((200, {}, b"1"), (200, {}, b"2"))
+        session = _session(cache, adapter)
+
+        with response_cache_ttl(60):
+            session.request(method, URL, headers=headers)
+            assert session.request(method, URL, headers=headers).content == b"2"
+        assert cache.total_bytes == 0
+
+    def test_vary_mismatch_is_a_miss(self, cache):
+        """A response is only reused for requests with the same varying headers."""
+        adapter = ScriptedAdapter(
+            (200, {"Vary": "Accept"}, b"json"), (200, {"Vary": "Accept"}, b"xml")
+        )
+        session = _session(cache, adapter)
+
+        with response_cache_ttl(60):
+            session.get(URL, headers={"Accept": "application/json"})
+            assert session.get(URL, headers={"Accept": "text/xml"}).content == b"xml"
+
+    def test_bytes_header_values(self, cache):
+        """Bytes request headers are stored and matched as text, and survive a reload."""
+        adapter = ScriptedAdapter(
+            (200, {"Vary": "Accept"}, b"json"), (200, {"Vary": "Accept"}, b"fresh")
+        )
+        session = _session(cache, adapter)
+
+        with response_cache_ttl(60):
+            session.get(URL, headers={"Accept": b"application/json"})
+            assert session.get(URL, headers={"Accept": "application/json"}).content == b"json"
+            no_cache = {"Accept": b"application/json", "Cache-Control": b"no-cache"}
+            assert session.get(URL, headers=no_cache).content == b"fresh"
+
+        assert len(adapter.requests) == 2
+
+    def test_cookies_are_not_replayed(self, cache):
+        """A hit does not set cookies again."""
+        adapter = ScriptedAdapter((200, {"Set-Cookie": "sid=1; Path=/"}, b"x"))
+        session = _session(cache, adapter)
+
+        with response_cache_ttl(60):
+            session.get(URL)
+            session.cookies.clear()
+            response = session.get(URL)
+
+        assert "Set-Cookie" not in response.headers
+        assert not session.cookies
+
+    def test_sessions_do_not_share_partitions(self, cache):
+        """A response cached for one session is not served to another."""
+        first = _session(cache, ScriptedAdapter((200, {}, b"alice")), session_partition("a"))
+        second = _session(cache, ScriptedAdapter((200, {}, b"bob")), session_partition("b"))
+
+        with response_cache_ttl(60):
+            first.get(URL)
+            assert second.get(URL).content == b"bob"
+
+    def test_stream_bypasses_cache(self, cache):
+        """Streamed requests always go to the network."""
+        adapter = ScriptedAdapter((200, {}, b"1"), (200, {}, b"2"))
+        session = _session(cache, adapter)
+
+        with response_cache_ttl(60):
+            session.get(URL, stream=True)
+            session.get(URL, stream=True)
+
+        assert len(adapter.requests) == 2
+
+    def test_session_default_ttl(self, cache):
+        """enable_response_cache(ttl=...) caches outside a caching command."""
+        adapter = ScriptedAdapter((200, {}, b"1"))
+        session = GraftpunkSession()
+        session.mount("https://", adapter)
+        session.enable_response_cache(anonymous_partition("site"), cache=cache, ttl=60)
+
+        session.get(URL)
+        session.get(URL)
+
+        assert len(adapter.requests) == 1
+
+
+class TestGetResponseCache:
+    """Tests for the process-wide cache."""
+
+    def test_configured_from_settings(self, isolated_config):
+        """The cache lives in the config directory, sized by the setting."""
+        cache = get_response_cache()
+
+        assert cache is get_response_cache()
+        assert cache.directory == isolated_config / "response-cache"
+        assert cache.max_bytes == 64 * 1024 * 1024
+
+    def test_zero_size_disables(self, monkeypatch, isolated_config):
+        """GRAFTPUNK_RESPONSE_CACHE_SIZE_MB=0 turns caching off but still allows clearing."""
+        get_response_cache().put("p", "k", CachedResponse("GET", URL, 200, "", (), b"x", 0.0))
+        monkeypatch.setenv("GRAFTPUNK_RESPONSE_CACHE_SIZE_MB", "0")
+        reset_settings()
+        reset_response_cache()
+
+        assert get_response_cache() is None
+        clear_response_cache("p")
+        assert not list((isolated_config / "response-cache").glob("*/*.bin"))
@@ -0,0 +1,153 @@
+"""Tests for retry, backoff and deadline helpers (retry.py)."""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from graftpunk.exceptions import CommandTimeoutError
+from graftpunk.retry import (
+    RETRY_MAX_DELAY,
+    RetryBudget,
+    attempt_deadline,
+    clamp_timeout,
+    decorrelated_jitter,
+    is_transient,
+    request_timeout,
+    reset_retry_budgets,
+    retry_budget,
+)
+
+
+def _http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+class TestIsTransient:
+    """Tests for is_transient."""
+
+    @pytest.mark.parametrize(
+        "exc",
+        [
+            requests.ConnectionError(),
+            requests.ReadTimeout(),
+            requests.exceptions.ChunkedEncodingError(),
+            ConnectionResetError(),
+            TimeoutError(),
+            _http_error(429),
+            _http_error(503),
+        ],
+    )
+    def test_transient(self, exc: Exception):
+        """Connection failures, timeouts and overload statuses are retried."""
+        assert is_transient(exc)
+
+    @pytest.mark.parametrize(
+        "exc",
+        [
+            requests.RequestException(),
+            requests.exceptions.SSLError(),
+            requests.exceptions.MissingSchema(),
+            requests.HTTPError(),
+            _http_error(404),
+            _http_error(500),
+            FileNotFoundError(),
+            CommandTimeoutError("deadline"),
+        ],
+    )
+    def test_not_transient(self, exc: Exception):
+        """Errors that would fail the same way again are not retried."""
+        assert not is_transient(exc)
+
+
+class TestDecorrelatedJitter:
+    """Tests for decorrelated_jitter."""
+
+    def test_bounds(self):
+        """Delays stay within [base, min(cap, 3 * previous)]."""
+        delay = 1.0
+        for _ in range(200):
+            previous, delay = delay, decorrelated_jitter(delay)
+            assert 1.0 <= delay <= min(RETRY_MAX_DELAY, previous * 3)
+
+    def test_spread(self):
+        """Callers starting from the same delay do not pick the same next one."""
+        assert len({decorrelated_jitter(4.0) for _ in range(20)}) > 1
+
+
+class TestRetryBudget:
+    """Tests for RetryBudget."""
+
+    def test_failures_exhaust_budget(self):
+        """Retries stop once half the tokens are spent."""
+        budget = RetryBudget(max_tokens=4)
+
+        assert budget.record_failure() is True
+        assert budget.record_failure() is False
+
+    def test_successes_refill(self):
+        """Successful attempts earn tokens back, up to the maximum."""
+        budget = RetryBudget(max_tokens=4, token_ratio=0.5)
+        budget.record_failure()
+        budget.record_failure()
+
+        budget.record_success()
+        assert budget.tokens == 2.5
+        for _ in range(10):
+            budget.record_success()
+        assert budget.tokens == 4
+
+    def test_per_plugin_registry(self):
+        """Each plugin has one shared budget until reset."""
+        budget = retry_budget("a")
+
+        assert retry_budget("a") is budget
+        assert retry_budget("b") is not budget
+        reset_retry_budgets()
+        assert retry_budget("a") is not budget
+
+
+class TestAttemptDeadline:
+    """Tests for attempt_deadline, request_timeout and clamp_timeout."""
+
+    def test_outside_attempt(self):
+        """Without a deadline timeouts pass through untouched."""
+        assert request_timeout() is None
+        assert clamp_timeout(None) is None
+        assert clamp_timeout(5) == 5
+
+    def test_clamps_timeouts(self):
+        """Timeouts are filled in or shortened to the time left."""
+        with attempt_deadline(2.0):
+            assert 1.9 < clamp_timeout(None) <= 2.0
+            assert clamp_timeout(0.5) == 0.5
+            assert clamp_timeout(10) <= 2.0
+            connect, read = clamp_timeout((0.5, None))
+            assert connect == 0.5
+            assert 1.9 < read <= 2.0
+        assert request_timeout() is None
+
+    def test_nested_deadline_never_extends(self):
+        """An inner deadline cannot outlast the outer one."""
+        with attempt_deadline(1.0), attempt_deadline(60.0):
+            assert request_timeout() <= 1.0
+
+    def test_none_keeps_outer_deadline(self):
+        """attempt_deadline(None) leaves the current deadline in place."""
+        with attempt_deadline(1.0), attempt_deadline(None):
+            assert request_timeout() <= 1.0
+
+    def test_expired_attempt_raises_timeout(self):
+        """A request started after the attempt ran out fails like a timeout."""
+        later = time.monotonic() + 5
+        with (
+            attempt_deadline(1.0),
+            patch("graftpunk.retry.time.monotonic", return_value=later),
+            pytest.raises(requests.Timeout),
+        ):
+            request_timeout()
@@ -0,0 +1,139 @@
+"""Tests for the versioned session wire format."""
+
+import json
+
+import dill
+import pytest
+import requests
+
+from graftpunk.exceptions import SessionFormatError
+from graftpunk.session_format import (
+    FORMAT_NAME,
+    FORMAT_VERSION,
+    StoredSession,
+    dumps_session,
+    is_legacy_blob,
+    load_legacy_session,
+    loads_session,
+    session_to_document,
+)
+from graftpunk.tokens import CachedToken
+
+
+def _make_session() -> requests.Session:
+    session = requests.Session()
+    session.cookies.set("sid", "abc123", domain=".example.com", path="/app", secure=True)
+    session.headers["Authorization"] = "Bearer token"
+    session.current_url = "https://example.com/app"  # type: ignore[attr-defined]
+    session._session_name = "example"  # type: ignore[attr-defined]
+    session._gp_header_roles = {"xhr": {"Accept": "application/json"}}  # type: ignore[attr-defined]
+    session._gp_cached_tokens = {  # type: ignore[attr-defined]
+        "X-CSRF": CachedToken(name="X-CSRF", value="tok", extracted_at=1000.0, ttl=300)
+    }
+    session._gp_csrf_tokens = {"X-CSRF": "tok"}  # type: ignore[attr-defined]
+    return session
+
+
+class TestRoundTrip:
+    """Tests for dumps_session / loads_session."""
+
+    def test_round_trip_preserves_http_state(self):
+        """Cookies, headers, roles, tokens and URL survive a round trip."""
+        loaded = loads_session(dumps_session(_make_session()))
+
+        assert isinstance(loaded, StoredSession)
+        assert loaded.session_name == "example"
+        assert loaded.current_url == "https://example.com/app"
+        assert loaded.headers["Authorization"] == "Bearer token"
+        assert loaded._gp_header_roles == {"xhr": {"Accept": "application/json"}}
+        assert loaded._gp_cached_tokens["X-CSRF"] == CachedToken(
+            name="X-CSRF", value="tok", extracted_at=1000.0, ttl=300
+        )
+        assert loaded._gp_csrf_tokens == {"X-CSRF": "tok"}
+
+    def test_round_trip_preserves_cookie_attributes(self):
+        """Cookie domain, path and secure flag are preserved."""
+        loaded = loads_session(dumps_session(_make_session()))
+
+        (cookie,) = list(loaded.cookies)
+        assert cookie.name == "sid"
+        assert cookie.value == "abc123"
+        assert cookie.domain == ".example.com"
+        assert cookie.path == "/app"
+        assert cookie.secure is True
+
+    def test_output_is_deterministic(self):
+        """Identical session state serializes to identical bytes."""
+        assert dumps_session(_make_session()) == dumps_session(_make_session())
+
+    def test_document_is_versioned(self):
+        """The document carries the format name and version."""
+        document = json.loads(dumps_session(_make_session()))
+
+        assert document["format"] == FORMAT_NAME
+        assert document["version"] == FORMAT_VERSION
+
+    def test_dict_cookies_are_accepted(self):
+        """A plain name/value cookie mapping is encoded as simple cookies."""
+
+        class DictCookieSession:
+            cookies = {"a": "1"}
+            headers: dict[str, str] = {}
+
+        document = session_to_document(DictCookieSession())
+        assert document["cookies"] == [{"name": "a", "value": "1"}]
+        assert loads_session(dumps_session(DictCookieSession())).cookies.get("a") == "1"
+
+    def test_requests_default_headers_are_not_added(self):
+        """Decoding does not inject requests' default headers."""
+        session = requests.Session()
+        session.headers.clear()
+        session.headers["X-Only"] = "1"
+
+        loaded = loads_session(dumps_session(session))
+        assert dict(loaded.headers) == {"X-Only": "1"}
+
+
+class TestDecodeErrors:
+    """Tests for malformed or unsupported documents."""
+
+    def test_future_version_is_rejected(self):
+        """A newer format version raises SessionFormatError."""
+        data = json.dumps({"format": FORMAT_NAME, "version": FORMAT_VERSION + 1}).encode()
+        with pytest.raises(SessionFormatError, match="Unsupported session format"):
+            loads_session(data)
+
+    def test_foreign_json_is_rejected(self):
+        """JSON that is not a session document raises SessionFormatError."""
+        with pytest.raises(SessionFormatError, match="Not a graftpunk session"):
+            loads_session(b'{"hello": "world"}')
+
+    def test_invalid_json_is_rejected(self):
+        """Truncated JSON raises SessionFormatError."""
+        with pytest.raises(SessionFormatError, match="Malformed"):
+            loads_session(b'{"format": ')
+
+    def test_malformed_token_is_rejected(self):
+        """An invalid cached token entry raises SessionFormatError."""
+        document = json.loads(dumps_session(_make_session()))
+        document["cached_tokens"]["X-CSRF"]["ttl"] = 0
+        with pytest.raises(SessionFormatError, match="Malformed"):
+            loads_session(json.dumps(document).encode())
+
+
+class TestLegacyBlobs:
+    """Tests for legacy dill blob detection and decoding."""
+
+    def test_detects_dill_blob(self):
+        """dill output is detected as legacy; JSON documents are not."""
+        assert is_legacy_blob(dill.dumps({"cookies": {}}))
+        assert not is_legacy_blob(dumps_session(_make_session()))
+
+    def test_load_legacy_session(self):
+        """Legacy blobs decode with dill."""
+        assert load_legacy_session(dill.dumps({"a": 1})) == {"a": 1}
+
+    def test_load_legacy_session_error(self):
+        """Undecodable legacy blobs raise SessionFormatError."""
+        with pytest.raises(SessionFormatError, match="legacy"):
+            load_legacy_session(b"\x80\x04garbage")
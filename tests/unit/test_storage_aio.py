@@ -0,0 +1,115 @@
+"""Tests for the async storage adapter."""
+
+import threading
+from datetime import UTC, datetime
+
+import pytest
+
+from graftpunk.exceptions import SessionNotFoundError
+from graftpunk.storage.aio import AsyncSessionStorage
+from graftpunk.storage.base import SessionMetadata
+from graftpunk.storage.local import LocalSessionStorage
+
+
+def _metadata(name: str) -> SessionMetadata:
+    now = datetime.now(UTC)
+    return SessionMetadata(
+        name=name,
+        checksum="abc",
+        created_at=now,
+        modified_at=now,
+        expires_at=None,
+        domain="example.com",
+        current_url=None,
+        cookie_count=1,
+        cookie_domains=["example.com"],
+    )
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """Async adapter over local storage."""
+    return AsyncSessionStorage(LocalSessionStorage(base_dir=tmp_path))
+
+
+class TestAsyncSessionStorage:
+    """Tests for AsyncSessionStorage."""
+
+    def test_reports_wrapped_identity(self, storage):
+        """Identity properties come from the wrapped backend."""
+        assert storage.storage_backend == "local"
+        assert storage.storage_location == storage.backend.storage_location
+
+    async def test_save_load_round_trip(self, storage):
+        """Saved sessions load back with their metadata."""
+        await storage.save_session("s", b"blob", _metadata("s"))
+
+        data, metadata = await storage.load_session("s")
+
+        assert data == b"blob"
+        assert metadata.name == "s"
+
+    async def test_listing_and_metadata(self, storage):
+        """List, metadata and batch listing delegate to the backend."""
+        await storage.save_session("a", b"1", _metadata("a"))
+        await storage.save_session("b", b"2", _metadata("b"))
+
+        assert await storage.list_sessions() == ["a", "b"]
+        assert {m.name for m in await storage.list_sessions_with_metadata()} == {"a", "b"}
+        assert (await storage.get_session_metadata("a")).name == "a"
+        assert await storage.update_session_metadata("a", status="logged_out") is True
+        assert (await storage.get_session_metadata("a")).status == "logged_out"
+
+    async def test_deletes(self, storage):
+        """Single and batch deletes delegate to the backend."""
+        for name in ("a", "b", "c"):
+            await storage.save_session(name, b"x", _metadata(name))
+
+        assert await storage.delete_session("a") is True
+        assert sorted(await storage.delete_sessions(["b", "c"])) == ["b", "c"]
+        assert await storage.list_sessions() == []
+
+    async def test_errors_propagate(self, storage):
+        """Backend exceptions are raised from the awaited call."""
+        with pytest.raises(SessionNotFoundError):
+            await storage.load_session("missing")
+
+    async def test_calls_run_in_worker_thread(self, tmp_path):
+        """Backend calls never run on the event loop thread."""
+        loop_thread = threading.get_ident()
+        seen = []
+
+        class RecordingStorage(LocalSessionStorage):
+            def list_sessions(self):
+                seen.append(threading.get_ident())
+                return super().list_sessions()
+
+        storage = AsyncSessionStorage(RecordingStorage(base_dir=tmp_path))
+
+        await storage.list_sessions()
+
+        assert seen and seen[0] != loop_thread
+
+    async def test_backend_without_batch_methods(self):
+        """Backends lacking the batch API get per-session metadata and deletes."""
+
+        class MinimalStorage:
+            """Backend predating list_sessions_with_metadata and delete_sessions."""
+
+            def __init__(self) -> None:
+                self.sessions = {name: _metadata(name) for name in ("a", "b", "c")}
+
+            def list_sessions(self) -> list[str]:
+                return sorted(self.sessions)
+
+            def get_session_metadata(self, name: str) -> SessionMetadata | None:
+                return self.sessions.get(name)
+
+            def delete_session(self, name: str) -> bool:
+                return self.sessions.pop(name, None) is not None
+
+        storage = AsyncSessionStorage(MinimalStorage())  # type: ignore[arg-type]
+
+        assert [m.name for m in await storage.list_sessions_with_metadata()] == ["a", "b", "c"]
+        assert await storage.delete_sessions(["a", "missing", "c"]) == ["a", "c"]
+        assert await storage.list_sessions() == ["b"]
@@ -4,6 +4,7 @@ Tests for shared storage utilities including:
 - SessionMetadata dataclass
 - metadata_to_dict and dict_to_metadata conversion functions
 - parse_datetime_iso helper function
+- fetch_metadata_concurrently helper function
 """
 
 from datetime import UTC, datetime, timedelta
@@ -13,6 +14,7 @@ import pytest
 from graftpunk.storage.base import (
     SessionMetadata,
     dict_to_metadata,
+    fetch_metadata_concurrently,
     metadata_to_dict,
     parse_datetime_iso,
 )
@@ -172,6 +174,7 @@ class TestMetadataConversion:
             "status",
             "storage_backend",
             "storage_location",
+            "generation",
         }
         assert set(data.keys()) == expected_keys
 
@@ -292,3 +295,48 @@ class TestStorageFields:
         restored = dict_to_metadata(data)
         assert restored.storage_backend == original.storage_backend
         assert restored.storage_location == original.storage_location
+
+
+class TestFetchMetadataConcurrently:
+    """Tests for fetch_metadata_concurrently helper."""
+
+    def test_empty_names_does_not_fetch(self):
+        """No names returns an empty list without calling fetch."""
+
+        def fetch(name):
+            raise AssertionError("fetch should not be called")
+
+        assert fetch_metadata_concurrently([], fetch) == []
+
+    def test_preserves_order_and_drops_missing(self, sample_metadata):
+        """Results follow input order and None results are dropped."""
+        from dataclasses import replace
+
+        def fetch(name):
+            return None if name == "gone" else replace(sample_metadata, name=name)
+
+        results = fetch_metadata_concurrently(["b", "gone", "a"], fetch)
+        assert [m.name for m in results] == ["b", "a"]
+
+    def test_fetches_run_concurrently(self, sample_metadata):
+        """Fetches overlap instead of running one after another."""
+        import threading
+
+        barrier = threading.Barrier(4, timeout=5)
+
+        def fetch(name):
+            # Deadlocks (and times out) unless all four fetches run at once.
+            barrier.wait()
+            return sample_metadata
+
+        results = fetch_metadata_concurrently(["a", "b", "c", "d"], fetch, max_workers=4)
+        assert len(results) == 4
+
+    def test_fetch_errors_propagate(self):
+        """Exceptions from fetch are raised to the caller."""
+
+        def fetch(name):
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            fetch_metadata_concurrently(["a"], fetch)
@@ -0,0 +1,116 @@
+"""Tests for the consolidated session index helpers."""
+
+import json
+from datetime import UTC, datetime
+
+from graftpunk.storage.base import SessionMetadata
+from graftpunk.storage.index import (
+    INDEX_VERSION,
+    SessionIndex,
+    decode_index,
+    encode_index,
+    update_index,
+)
+
+
+def _metadata(name: str) -> SessionMetadata:
+    now = datetime.now(UTC)
+    return SessionMetadata(
+        name=name,
+        checksum="abc",
+        created_at=now,
+        modified_at=now,
+        expires_at=None,
+        domain="example.com",
+        current_url=None,
+        cookie_count=1,
+        cookie_domains=["example.com"],
+    )
+
+
+class TestEncodeDecode:
+    """Tests for encode_index and decode_index."""
+
+    def test_round_trip(self):
+        """Entries and revision survive an encode/decode cycle."""
+        entries = {"a": _metadata("a"), "b": _metadata("b")}
+
+        data, revision = encode_index(entries)
+        index = decode_index(data)
+
+        assert index is not None
+        assert index.revision == revision
+        assert index.entries == entries
+
+    def test_each_encode_gets_new_revision(self):
+        """Every write carries a distinct revision token."""
+        _, first = encode_index({})
+        _, second = encode_index({})
+        assert first != second
+
+    def test_malformed_returns_none(self):
+        """Garbage bytes decode to None instead of raising."""
+        assert decode_index(b"\xff not json") is None
+        assert decode_index(b"[]") is None
+
+    def test_unknown_version_returns_none(self):
+        """Documents from an incompatible version are ignored."""
+        data = json.dumps({"version": INDEX_VERSION + 1, "sessions": {}}).encode()
+        assert decode_index(data) is None
+
+
+class TestUpdateIndex:
+    """Tests for the optimistic-concurrency update loop."""
+
+    def test_seeds_missing_index_from_rebuild(self):
+        """A missing index is rebuilt, mutated and created-if-absent."""
+        writes = []
+
+        def write(data, revision, token):
+            writes.append((decode_index(data), token))
+            return True
+
+        def mutate(entries):
+            entries["new"] = _metadata("new")
+
+        ok = update_index(lambda: None, write, lambda: {"old": _metadata("old")}, mutate)
+
+        assert ok is True
+        ((index, token),) = writes
+        assert token is None
+        assert set(index.entries) == {"old", "new"}
+
+    def test_retries_on_conflict_with_fresh_read(self):
+        """A conflicting write re-reads the index and reapplies the mutation."""
+        reads = iter(
+            [
+                (SessionIndex({"a": _metadata("a")}, "r1"), "etag-1"),
+                (SessionIndex({"a": _metadata("a"), "b": _metadata("b")}, "r2"), "etag-2"),
+            ]
+        )
+        etags = []
+
+        def write(data, revision, etag):
+            etags.append(etag)
+            return etag == "etag-2"
+
+        def mutate(entries):
+            entries.pop("a", None)
+
+        ok = update_index(lambda: next(reads), write, dict, mutate)
+
+        assert ok is True
+        assert etags == ["etag-1", "etag-2"]
+
+    def test_gives_up_after_attempts(self):
+        """Persistent conflicts return False after the configured attempts."""
+        calls = []
+
+        def write(data, revision, token):
+            calls.append(token)
+            return False
+
+        ok = update_index(lambda: (SessionIndex(), "e"), write, dict, lambda e: None, attempts=3)
+
+        assert ok is False
+        assert len(calls) == 3
@@ -1,8 +1,11 @@
 """Tests for local storage backend."""
 
+import hashlib
 import json
+import threading
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -162,6 +165,7 @@ class TestLegacyFlatFile:
         assert metadata.checksum == ""
         assert metadata.expires_at is None
         assert metadata.status == "active"
+        assert metadata.generation == 0
 
     def test_list_sessions_includes_legacy_files(self, storage, tmp_path):
         """Test that list_sessions includes legacy flat file sessions."""
@@ -387,6 +391,82 @@ class TestSessionMetadata:
         assert metadata.status == "active"
 
 
+class TestLocalListSessionsWithMetadata:
+    """Tests for LocalSessionStorage.list_sessions_with_metadata."""
+
+    @pytest.fixture
+    def storage(self, tmp_path):
+        """Create a LocalSessionStorage instance."""
+        return LocalSessionStorage(base_dir=tmp_path)
+
+    def _metadata(self, name):
+        now = datetime.now(UTC)
+        return SessionMetadata(
+            name=name,
+            checksum="abc123",
+            created_at=now,
+            modified_at=now,
+            expires_at=None,
+            domain="example.com",
+            current_url=None,
+            cookie_count=0,
+            cookie_domains=[],
+        )
+
+    def test_empty(self, storage):
+        """No sessions yields an empty list."""
+        assert storage.list_sessions_with_metadata() == []
+
+    def test_returns_metadata_for_all_sessions(self, storage):
+        """Every saved session is returned with its stored metadata."""
+        storage.save_session("a", b"data", self._metadata("a"))
+        storage.save_session("b", b"data", self._metadata("b"))
+
+        results = storage.list_sessions_with_metadata()
+
+        assert sorted(m.name for m in results) == ["a", "b"]
+        assert all(m.storage_backend == "local" for m in results)
+
+    def test_matches_per_session_lookup(self, storage):
+        """Batch results equal get_session_metadata for each listed session."""
+        storage.save_session("a", b"data", self._metadata("a"))
+
+        (batch,) = storage.list_sessions_with_metadata()
+        assert batch == storage.get_session_metadata("a")
+
+    def test_skips_incomplete_and_legacy_entries(self, storage, tmp_path):
+        """Dirs without metadata or data, stray files and legacy files are skipped."""
+        storage.save_session("valid", b"data", self._metadata("valid"))
+        (tmp_path / "no-metadata").mkdir()
+        (tmp_path / "no-metadata" / "session.pickle").write_bytes(b"data")
+        (tmp_path / "no-data").mkdir()
+        (tmp_path / "no-data" / "metadata.json").write_text("{}")
+        (tmp_path / "legacy.session.pickle").write_bytes(b"data")
+
+        results = storage.list_sessions_with_metadata()
+
+        assert [m.name for m in results] == ["valid"]
+
+    def test_delete_sessions(self, storage, tmp_path):
+        """delete_sessions removes each existing session and skips unknown names."""
+        storage.save_session("a", b"data", self._metadata("a"))
+        storage.save_session("b", b"data", self._metadata("b"))
+
+        assert storage.delete_sessions(["a", "b", "missing"]) == ["a", "b"]
+        assert storage.list_sessions() == []
+
+    def test_skips_corrupt_metadata(self, storage, tmp_path):
+        """Unreadable metadata.json is skipped rather than failing the listing."""
+        storage.save_session("valid", b"data", self._metadata("valid"))
+        (tmp_path / "corrupt").mkdir()
+        (tmp_path / "corrupt" / "session.pickle").write_bytes(b"data")
+        (tmp_path / "corrupt" / "metadata.json").write_text("{not json")
+
+        results = storage.list_sessions_with_metadata()
+
+        assert [m.name for m in results] == ["valid"]
+
+
 class TestLocalStorageIdentity:
     """Tests for storage identity properties and metadata stamping."""
 
@@ -477,3 +557,121 @@ class TestLocalStorageIdentity:
         metadata = storage._dict_to_metadata(old_dict)
         assert metadata.storage_backend == ""
         assert metadata.storage_location == ""
+
+
+class TestLocalAtomicWrites:
+    """Tests for atomic, locked writes and the generation counter."""
+
+    @pytest.fixture
+    def storage(self, tmp_path):
+        """Create a LocalSessionStorage instance."""
+        return LocalSessionStorage(base_dir=tmp_path)
+
+    def _metadata(self, name, checksum="abc123"):
+        now = datetime.now(UTC)
+        return SessionMetadata(
+            name=name,
+            checksum=checksum,
+            created_at=now,
+            modified_at=now,
+            expires_at=None,
+            domain="example.com",
+            current_url=None,
+            cookie_count=0,
+            cookie_domains=[],
+        )
+
+    def test_files_private_and_no_temp_left(self, storage, tmp_path):
+        """Both files are 0o600 and no temp files remain after a save."""
+        storage.save_session("s", b"data", self._metadata("s"))
+
+        session_dir = tmp_path / "s"
+        assert sorted(p.name for p in session_dir.iterdir()) == ["metadata.json", "session.pickle"]
+        for path in session_dir.iterdir():
+            assert path.stat().st_mode & 0o777 == 0o600
+
+    def test_generation_increments_on_every_write(self, storage):
+        """Saves and metadata updates bump the stored generation."""
+        storage.save_session("s", b"1", self._metadata("s"))
+        assert storage.get_session_metadata("s").generation == 1
+
+        storage.save_session("s", b"2", self._metadata("s"))
+        assert storage.get_session_metadata("s").generation == 2
+
+        storage.update_session_metadata("s", status="logged_out")
+        _, metadata = storage.load_session("s")
+        assert metadata.generation == 3
+
+    def test_failed_write_keeps_previous_session(self, storage, tmp_path):
+        """A write that fails before the rename leaves the old files intact."""
+        storage.save_session("s", b"old", self._metadata("s"))
+
+        with (
+            patch("graftpunk.storage.local.os.replace", side_effect=OSError("disk full")),
+            pytest.raises(OSError, match="disk full"),
+        ):
+            storage.save_session("s", b"new", self._metadata("s", checksum="new"))
+
+        data, metadata = storage.load_session("s")
+        assert data == b"old"
+        assert metadata.checksum == "abc123"
+        assert not list((tmp_path / "s").glob("*.tmp"))
+
+    def test_lock_files_not_listed_as_sessions(self, storage):
+        """The lock directory never shows up as a session."""
+        storage.save_session("s", b"data", self._metadata("s"))
+
+        assert storage.list_sessions() == ["s"]
+        assert [m.name for m in storage.list_sessions_with_metadata()] == ["s"]
+
+    def test_concurrent_saves_stay_consistent(self, storage):
+        """Parallel writers never leave data and metadata from different saves."""
+        writers, saves_each = 4, 10
+
+        def writer(worker):
+            for i in range(saves_each):
+                data = f"{worker}-{i}".encode() * 1000
+                checksum = hashlib.sha256(data).hexdigest()
+                storage.save_session("s", data, self._metadata("s", checksum=checksum))
+
+        threads = [threading.Thread(target=writer, args=(w,)) for w in range(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        data, metadata = storage.load_session("s")
+        assert hashlib.sha256(data).hexdigest() == metadata.checksum
+        assert metadata.generation == writers * saves_each
+
+    def test_replace_session_saves_when_unchanged(self, storage):
+        """replace_session writes when the generation still matches the loaded one."""
+        storage.save_session("s", b"old", self._metadata("s"))
+        _, metadata = storage.load_session("s")
+
+        assert storage.replace_session("s", b"new", metadata) is True
+
+        data, metadata = storage.load_session("s")
+        assert data == b"new"
+        assert metadata.generation == 2
+
+    def test_replace_session_refuses_after_concurrent_write(self, storage):
+        """A save between load and replace_session is not overwritten."""
+        storage.save_session("s", b"old", self._metadata("s"))
+        _, stale = storage.load_session("s")
+        storage.save_session("s", b"newer", self._metadata("s", checksum="newer"))
+
+        assert storage.replace_session("s", b"rekeyed", stale) is False
+
+        data, metadata = storage.load_session("s")
+        assert data == b"newer"
+        assert metadata.checksum == "newer"
+
+    def test_replace_session_does_not_resurrect_deleted(self, storage, tmp_path):
+        """A session deleted since it was loaded stays deleted."""
+        storage.save_session("s", b"old", self._metadata("s"))
+        _, metadata = storage.load_session("s")
+        storage.delete_session("s")
+
+        assert storage.replace_session("s", b"rekeyed", metadata) is False
+        assert not (tmp_path / "s").exists()
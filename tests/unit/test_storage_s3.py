@@ -1,8 +1,9 @@
 """Tests for S3 storage backend."""
 
 import json
+from dataclasses import replace
 from datetime import UTC, datetime, timedelta
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
 
@@ -31,6 +32,16 @@ def sample_metadata():
     )
 
 
+@pytest.fixture(autouse=True)
+def _clear_shared_clients():
+    """Isolate tests from the process-wide shared boto3 client cache."""
+    from graftpunk.storage import s3
+
+    s3._shared_clients.clear()
+    yield
+    s3._shared_clients.clear()
+
+
 @pytest.fixture
 def mock_s3_client():
     """Create a mock boto3 S3 client."""
@@ -78,6 +89,7 @@ class TestS3SessionStorageInit:
         )
         mock_boto_client.assert_called_once_with(
             "s3",
+            config=ANY,
             region_name="us-west-2",
             endpoint_url="https://r2.example.com",
         )
@@ -96,9 +108,26 @@ class TestS3SessionStorageInit:
         )
         mock_boto_client.assert_called_once_with(
             "s3",
+            config=ANY,
             endpoint_url="https://r2.example.com",
         )
 
+    @patch("boto3.client")
+    def test_client_is_pooled_and_shared(self, mock_boto_client):
+        """Instances for the same endpoint share one client with a sized connection pool."""
+        from graftpunk.storage.s3 import S3_MAX_POOL_CONNECTIONS, S3SessionStorage
+
+        mock_boto_client.return_value = MagicMock()
+        first = S3SessionStorage(bucket="a", region="us-east-1")
+        second = S3SessionStorage(bucket="b", region="us-east-1")
+        other = S3SessionStorage(bucket="c", region="eu-west-1")
+
+        assert first._client is second._client
+        assert mock_boto_client.call_count == 2
+        config = mock_boto_client.call_args_list[0].kwargs["config"]
+        assert config.max_pool_connections == S3_MAX_POOL_CONNECTIONS
+        assert other._client is mock_boto_client.return_value
+
     def test_boto3_import_error_raises_storage_error(self):
         """Test that missing boto3 raises StorageError with helpful message."""
         import sys
@@ -260,6 +289,149 @@ class TestListSessions:
         assert sessions == ["session-a", "session-b"]
 
 
+class TestListSessionsWithMetadata:
+    """Tests for list_sessions_with_metadata method."""
+
+    def test_fetches_metadata_for_each_listed_session(self, storage, mock_s3_client):
+        """One listing, then one metadata GET per session."""
+        from botocore.exceptions import ClientError
+
+        mock_paginator = MagicMock()
+        mock_paginator.paginate.return_value = [
+            {
+                "Contents": [
+                    {"Key": "sessions/a/session.pickle"},
+                    {"Key": "sessions/a/metadata.json"},
+                    {"Key": "sessions/b/session.pickle"},
+                    {"Key": "sessions/b/metadata.json"},
+                    {"Key": "sessions/orphan/session.pickle"},
+                ]
+            }
+        ]
+        mock_s3_client.get_paginator.return_value = mock_paginator
+
+        def get_object(Bucket, Key):  # noqa: N803
+            name = Key.split("/")[1]
+            if name == "orphan":
+                raise ClientError(
+                    {"Error": {"Code": "NoSuchKey"}, "ResponseMetadata": {"HTTPStatusCode": 404}},
+                    "GetObject",
+                )
+            body = MagicMock()
+            body.read.return_value = json.dumps({"name": name}).encode()
+            return {"Body": body}
+
+        mock_s3_client.get_object.side_effect = get_object
+
+        results = storage.list_sessions_with_metadata()
+
+        assert [m.name for m in results] == ["a", "b"]
+        assert mock_paginator.paginate.call_count == 1
+        assert mock_s3_client.get_object.call_count == 3
+
+    def test_empty_bucket_makes_no_gets(self, storage, mock_s3_client):
+        """An empty bucket returns no metadata without any GETs."""
+        mock_paginator = MagicMock()
+        mock_paginator.paginate.return_value = [{"Contents": []}]
+        mock_s3_client.get_paginator.return_value = mock_paginator
+
+        assert storage.list_sessions_with_metadata() == []
+        mock_s3_client.get_object.assert_not_called()
+
+
+class TestConcurrentWrites:
+    """Tests for the concurrent_writes save mode."""
+
+    def test_puts_run_in_parallel(self, sample_metadata):
+        """Data and metadata puts overlap instead of running back to back."""
+        import threading
+
+        from graftpunk.storage.s3 import S3SessionStorage
+
+        barrier = threading.Barrier(2, timeout=5)
+        client = MagicMock()
+        # Deadlocks (and times out) unless both puts are in flight at once.
+        client.put_object.side_effect = lambda **kw: barrier.wait()
+        storage = S3SessionStorage(bucket="b", client=client, concurrent_writes=True)
+
+        storage.save_session("s", b"data", sample_metadata)
+
+        keys = sorted(call.kwargs["Key"] for call in client.put_object.call_args_list)
+        assert keys == ["sessions/s/metadata.json", "sessions/s/session.pickle"]
+
+    def test_failure_surfaces_after_both_puts(self, sample_metadata):
+        """A failed put raises StorageError once both requests have finished."""
+        from botocore.exceptions import ClientError
+
+        from graftpunk.storage.s3 import S3SessionStorage
+
+        client = MagicMock()
+        denied = {"Error": {"Code": "AccessDenied"}, "ResponseMetadata": {"HTTPStatusCode": 403}}
+
+        def put_object(**kwargs):
+            if kwargs["Key"].endswith("session.pickle"):
+                raise ClientError(denied, "PutObject")
+
+        client.put_object.side_effect = put_object
+        storage = S3SessionStorage(bucket="b", client=client, concurrent_writes=True)
+
+        with pytest.raises(StorageError, match="save_session_data"):
+            storage.save_session("s", b"data", sample_metadata)
+        assert client.put_object.call_count == 2
+
+    def test_sequential_by_default(self, storage, mock_s3_client, sample_metadata):
+        """Without concurrent_writes data is written before metadata."""
+        storage.save_session("s", b"data", sample_metadata)
+
+        keys = [call.kwargs["Key"] for call in mock_s3_client.put_object.call_args_list]
+        assert keys == ["sessions/s/session.pickle", "sessions/s/metadata.json"]
+
+
+class TestDeleteSessions:
+    """Tests for bulk delete_sessions."""
+
+    def test_single_delete_objects_request(self, storage, mock_s3_client):
+        """Deleting several sessions issues one delete_objects call."""
+        mock_s3_client.delete_objects.return_value = {}
+
+        deleted = storage.delete_sessions(["a", "b"])
+
+        assert deleted == ["a", "b"]
+        mock_s3_client.delete_object.assert_not_called()
+        (call,) = mock_s3_client.delete_objects.call_args_list
+        keys = [obj["Key"] for obj in call.kwargs["Delete"]["Objects"]]
+        assert keys == [
+            "sessions/a/session.pickle",
+            "sessions/a/metadata.json",
+            "sessions/b/session.pickle",
+            "sessions/b/metadata.json",
+        ]
+
+    def test_batches_at_request_limit(self, storage, mock_s3_client):
+        """Key lists beyond the 1000-key limit are split across requests."""
+        from graftpunk.storage.s3 import S3_DELETE_BATCH_SIZE
+
+        mock_s3_client.delete_objects.return_value = {}
+        names = [f"s{i}" for i in range(S3_DELETE_BATCH_SIZE)]
+
+        assert storage.delete_sessions(names) == names
+        assert mock_s3_client.delete_objects.call_count == 2
+
+    def test_per_key_errors_raise(self, storage, mock_s3_client):
+        """Keys S3 failed to delete are reported; other sessions still count."""
+        mock_s3_client.delete_objects.return_value = {
+            "Errors": [{"Key": "sessions/b/session.pickle", "Code": "AccessDenied"}]
+        }
+
+        with pytest.raises(StorageError, match="sessions/b/session.pickle"):
+            storage.delete_sessions(["a", "b"])
+
+    def test_empty_is_noop(self, storage, mock_s3_client):
+        """No names means no requests."""
+        assert storage.delete_sessions([]) == []
+        mock_s3_client.delete_objects.assert_not_called()
+
+
 class TestDeleteSession:
     """Tests for delete_session method."""
 
@@ -357,6 +529,208 @@ class TestUpdateSessionMetadata:
         assert result is False
 
 
+class FakeS3Client:
+    """In-memory S3 client honoring If-Match/If-None-Match on put_object."""
+
+    def __init__(self):
+        self.objects: dict[str, tuple[bytes, str]] = {}
+        self.puts: list[str] = []
+        self._etag_counter = 0
+
+    def _error(self, code, status, operation):
+        from botocore.exceptions import ClientError
+
+        return ClientError(
+            {"Error": {"Code": code}, "ResponseMetadata": {"HTTPStatusCode": status}}, operation
+        )
+
+    def put_object(self, Bucket, Key, Body, ContentType=None, IfMatch=None, IfNoneMatch=None):  # noqa: N803
+        current = self.objects.get(Key)
+        if IfNoneMatch == "*" and current is not None:
+            raise self._error("PreconditionFailed", 412, "PutObject")
+        if IfMatch is not None and (current is None or current[1] != IfMatch):
+            raise self._error("PreconditionFailed", 412, "PutObject")
+        self._etag_counter += 1
+        self.objects[Key] = (Body, f'"etag-{self._etag_counter}"')
+        self.puts.append(Key)
+        return {}
+
+    def get_object(self, Bucket, Key):  # noqa: N803
+        if Key not in self.objects:
+            raise self._error("NoSuchKey", 404, "GetObject")
+        data, etag = self.objects[Key]
+        body = MagicMock()
+        body.read.return_value = data
+        return {"Body": body, "ETag": etag}
+
+    def delete_object(self, Bucket, Key):  # noqa: N803
+        self.objects.pop(Key, None)
+        return {}
+
+    def get_paginator(self, name):
+        paginator = MagicMock()
+        paginator.paginate.side_effect = lambda **kw: [
+            {"Contents": [{"Key": key} for key in sorted(self.objects)]}
+        ]
+        return paginator
+
+
+class TestSessionIndex:
+    """Tests for the optional consolidated sessions/_index.json."""
+
+    @pytest.fixture
+    def fake_client(self):
+        """Create an in-memory S3 client."""
+        return FakeS3Client()
+
+    @pytest.fixture
+    def indexed(self, fake_client):
+        """Create S3SessionStorage with the index enabled."""
+        from graftpunk.storage.s3 import S3SessionStorage
+
+        return S3SessionStorage(bucket="b", client=fake_client, use_index=True)
+
+    def _index_names(self, fake_client):
+        data, _ = fake_client.objects["sessions/_index.json"]
+        return set(json.loads(data)["sessions"])
+
+    def test_index_disabled_by_default(self, fake_client, sample_metadata):
+        """Without use_index no index object is written."""
+        from graftpunk.storage.s3 import S3SessionStorage
+
+        storage = S3SessionStorage(bucket="b", client=fake_client)
+        storage.save_session("a", b"data", replace(sample_metadata, name="a"))
+
+        assert "sessions/_index.json" not in fake_client.objects
+
+    def test_save_creates_and_updates_index(self, indexed, fake_client, sample_metadata):
+        """Each save adds the session to the index."""
+        indexed.save_session("a", b"data", replace(sample_metadata, name="a"))
+        indexed.save_session("b", b"data", replace(sample_metadata, name="b"))
+
+        assert self._index_names(fake_client) == {"a", "b"}
+
+    def test_index_excluded_from_bucket_walk(self, indexed, fake_client, sample_metadata):
+        """The index object is never mistaken for a session."""
+        indexed.save_session("a", b"data", replace(sample_metadata, name="a"))
+
+        assert indexed._walk_session_names() == ["a"]
+
+    def test_delete_removes_from_index(self, indexed, fake_client, sample_metadata):
+        """Deleting a session drops it from the index."""
+        indexed.save_session("a", b"data", replace(sample_metadata, name="a"))
+        indexed.save_session("b", b"data", replace(sample_metadata, name="b"))
+
+        indexed.delete_session("a")
+
+        assert self._index_names(fake_client) == {"b"}
+
+    def test_update_metadata_refreshes_index(self, indexed, fake_client, sample_metadata):
+        """Status changes are reflected in the index."""
+        indexed.save_session("a", b"data", replace(sample_metadata, name="a"))
+
+        indexed.update_session_metadata("a", status="logged_out")
+
+        (metadata,) = indexed.list_sessions_with_metadata()
+        assert metadata.status == "logged_out"
+
+    def test_listing_reads_only_the_index(self, indexed, fake_client, sample_metadata):
+        """Listing with an index does not walk the bucket or fetch metadata.json."""
+        indexed.save_session("a", b"data", replace(sample_metadata, name="a"))
+        indexed.save_session("b", b"data", replace(sample_metadata, name="b"))
+        fake_client.get_paginator = MagicMock(side_effect=AssertionError("walked bucket"))
+
+        assert indexed.list_sessions() == ["a", "b"]
+        assert {m.name for m in indexed.list_sessions_with_metadata()} == {"a", "b"}
+
+    def test_conflicting_writer_is_retried(self, indexed, fake_client, sample_metadata):
+        """An index changed between read and write is re-read, not clobbered."""
+        indexed.save_session("a", b"data", replace(sample_metadata, name="a"))
+        original_read = indexed._read_index
+        raced = []
+
+        def racing_read():
+            result = original_read()
+            if not raced:
+                # Another writer updates the index right after our read.
+                raced.append(True)
+                data, _ = fake_client.objects["sessions/_index.json"]
+                document = json.loads(data)
+                document["sessions"]["other"] = document["sessions"]["a"]
+                fake_client.put_object(
+                    Bucket="b", Key="sessions/_index.json", Body=json.dumps(document).encode()
+                )
+            return result
+
+        indexed._read_index = racing_read
+        indexed.save_session("b", b"data", replace(sample_metadata, name="b"))
+
+        assert self._index_names(fake_client) == {"a", "b", "other"}
+
+    def test_failed_update_invalidates_index(self, indexed, fake_client, sample_metadata):
+        """If the index cannot be updated it is deleted and listing walks the bucket."""
+        indexed.save_session("a", b"data", replace(sample_metadata, name="a"))
+        indexed._write_index = MagicMock(return_value=False)
+
+        indexed.save_session("b", b"data", replace(sample_metadata, name="b"))
+
+        assert "sessions/_index.json" not in fake_client.objects
+        assert indexed.list_sessions() == ["a", "b"]
+
+    @pytest.mark.parametrize("failure", ["param_validation", "not_implemented"])
+    def test_unsupported_conditional_put_disables_index(
+        self, indexed, fake_client, sample_metadata, failure
+    ):
+        """Without conditional PUTs the index is removed once and then left alone."""
+        from botocore.exceptions import ParamValidationError
+
+        indexed.save_session("a", b"data", replace(sample_metadata, name="a"))
+        real_put = fake_client.put_object
+
+        def put_object(Key, IfMatch=None, IfNoneMatch=None, **kwargs):  # noqa: N803
+            if IfMatch is not None or IfNoneMatch is not None:
+                if failure == "param_validation":
+                    raise ParamValidationError(report='Unknown parameter in input: "IfMatch"')
+                raise fake_client._error("NotImplemented", 501, "PutObject")
+            return real_put(Key=Key, **kwargs)
+
+        fake_client.put_object = put_object
+        indexed.save_session("b", b"data", replace(sample_metadata, name="b"))
+
+        assert indexed.use_index is False
+        assert "sessions/_index.json" not in fake_client.objects
+
+        walks = MagicMock(side_effect=fake_client.get_paginator)
+        fake_client.get_paginator = walks
+        fake_client.delete_object = MagicMock(side_effect=AssertionError("deleted index again"))
+        indexed.save_session("c", b"data", replace(sample_metadata, name="c"))
+        indexed.update_session_metadata("c", status="logged_out")
+
+        walks.assert_not_called()
+        assert indexed.list_sessions() == ["a", "b", "c"]
+
+    def test_missing_index_falls_back_to_walk(self, indexed, fake_client, sample_metadata):
+        """Listing works before any index exists."""
+        from graftpunk.storage.s3 import S3SessionStorage
+
+        plain = S3SessionStorage(bucket="b", client=fake_client)
+        plain.save_session("a", b"data", replace(sample_metadata, name="a"))
+
+        assert indexed.list_sessions() == ["a"]
+        assert [m.name for m in indexed.list_sessions_with_metadata()] == ["a"]
+
+    def test_rebuild_index(self, indexed, fake_client, sample_metadata):
+        """rebuild_index writes every session found in the bucket."""
+        from graftpunk.storage.s3 import S3SessionStorage
+
+        plain = S3SessionStorage(bucket="b", client=fake_client)
+        plain.save_session("a", b"data", replace(sample_metadata, name="a"))
+        plain.save_session("b", b"data", replace(sample_metadata, name="b"))
+
+        assert indexed.rebuild_index() == 2
+        assert self._index_names(fake_client) == {"a", "b"}
+
+
 class TestS3StorageIdentity:
     """Tests for S3SessionStorage identity properties."""
 
@@ -349,6 +349,192 @@ class TestSupabaseSessionStorage:
         mock_storage_bucket.update.assert_called_once()
 
 
+class TestListSessionsWithMetadata:
+    """Tests for SupabaseSessionStorage.list_sessions_with_metadata."""
+
+    @patch("supabase.create_client")
+    def test_downloads_metadata_for_each_session(self, mock_create_client):
+        """Each listed session's metadata is downloaded and missing ones skipped."""
+        from storage3.exceptions import StorageApiError
+
+        storage, mock_client = _make_storage(mock_create_client)
+        bucket = mock_client.storage.from_.return_value
+        bucket.list.return_value = [{"name": "a"}, {"name": "b"}, {"name": "gone"}]
+
+        def download(path):
+            name = path.split("/")[0]
+            if name == "gone":
+                raise StorageApiError("Not found", code="404", status=404)
+            return json.dumps({"name": name}).encode("utf-8")
+
+        bucket.download.side_effect = download
+
+        results = storage.list_sessions_with_metadata()
+
+        assert [m.name for m in results] == ["a", "b"]
+        assert bucket.download.call_count == 3
+
+    @patch("supabase.create_client")
+    def test_download_error_raises_storage_error(self, mock_create_client):
+        """Non-404 download failures surface as StorageError."""
+        from storage3.exceptions import StorageApiError
+
+        storage, mock_client = _make_storage(mock_create_client)
+        bucket = mock_client.storage.from_.return_value
+        bucket.list.return_value = [{"name": "a"}]
+        bucket.download.side_effect = StorageApiError("Server error", code="500", status=500)
+
+        with pytest.raises(StorageError):
+            storage.list_sessions_with_metadata()
+
+
+class FakeBucket:
+    """In-memory stand-in for a Supabase Storage bucket client."""
+
+    def __init__(self):
+        self.files: dict[str, bytes] = {}
+
+    def upload(self, file, path, file_options=None):
+        from storage3.exceptions import StorageApiError
+
+        if path in self.files:
+            raise StorageApiError("Duplicate", code="409", status=409)
+        self.files[path] = file
+
+    def update(self, file, path, file_options=None):
+        self.files[path] = file
+
+    def download(self, path):
+        from storage3.exceptions import StorageApiError
+
+        if path not in self.files:
+            raise StorageApiError("Not found", code="404", status=404)
+        return self.files[path]
+
+    def remove(self, paths):
+        for path in paths:
+            self.files.pop(path, None)
+
+    def list(self):
+        return [{"name": name} for name in sorted({p.split("/")[0] for p in self.files})]
+
+
+class TestDeleteSessions:
+    """Tests for SupabaseSessionStorage.delete_sessions."""
+
+    @patch("supabase.create_client")
+    def test_single_remove_request(self, mock_create_client):
+        """All session files are removed in one request."""
+        storage, mock_client = _make_storage(mock_create_client)
+        bucket = mock_client.storage.from_.return_value
+
+        assert storage.delete_sessions(["a", "b"]) == ["a", "b"]
+        bucket.remove.assert_called_once_with(
+            ["a/session.pickle", "a/metadata.json", "b/session.pickle", "b/metadata.json"]
+        )
+
+    @patch("supabase.create_client")
+    def test_remove_error_raises_storage_error(self, mock_create_client):
+        """A failed remove request surfaces as StorageError."""
+        from storage3.exceptions import StorageApiError
+
+        storage, mock_client = _make_storage(mock_create_client)
+        bucket = mock_client.storage.from_.return_value
+        bucket.remove.side_effect = StorageApiError("Server error", code="500", status=500)
+
+        with pytest.raises(StorageError):
+            storage.delete_sessions(["a"])
+
+
+class TestSessionIndex:
+    """Tests for the optional consolidated _index.json."""
+
+    def _make_indexed(self, mock_create_client):
+        from graftpunk.storage.supabase import SupabaseSessionStorage
+
+        bucket = FakeBucket()
+        mock_client = MagicMock()
+        mock_client.storage.from_.return_value = bucket
+        mock_create_client.return_value = mock_client
+        storage = SupabaseSessionStorage(
+            url="https://test.supabase.co", service_key="test-key", use_index=True
+        )
+        return storage, bucket
+
+    def _metadata(self, sample_metadata, name):
+        from dataclasses import replace
+
+        return replace(sample_metadata, name=name)
+
+    @patch("supabase.create_client")
+    def test_save_and_delete_maintain_index(self, mock_create_client, sample_metadata):
+        """Saves add entries and deletes remove them."""
+        storage, bucket = self._make_indexed(mock_create_client)
+
+        storage.save_session("a", b"data", self._metadata(sample_metadata, "a"))
+        storage.save_session("b", b"data", self._metadata(sample_metadata, "b"))
+        storage.delete_session("a")
+
+        assert set(json.loads(bucket.files["_index.json"])["sessions"]) == {"b"}
+
+    @patch("supabase.create_client")
+    def test_listing_uses_index_and_skips_index_file(self, mock_create_client, sample_metadata):
+        """Metadata comes from the index; the index file itself is never a session."""
+        storage, bucket = self._make_indexed(mock_create_client)
+        storage.save_session("a", b"data", self._metadata(sample_metadata, "a"))
+        real_download = bucket.download
+        downloads: list[str] = []
+
+        def download(path):
+            downloads.append(path)
+            return real_download(path)
+
+        bucket.download = download
+
+        assert storage.list_sessions() == ["a"]
+        assert [m.name for m in storage.list_sessions_with_metadata()] == ["a"]
+        assert downloads == ["_index.json"]
+
+    @patch("supabase.create_client")
+    def test_index_is_checked_against_the_bucket(self, mock_create_client, sample_metadata):
+        """An entry lost to a racing writer is fetched; entries for deleted sessions are dropped."""
+        storage, bucket = self._make_indexed(mock_create_client)
+        for name in ("a", "b"):
+            storage.save_session(name, b"data", self._metadata(sample_metadata, name))
+        document = json.loads(bucket.files["_index.json"])
+        # Simulate a lost update for "b" and a stale entry for a session that is gone.
+        document["sessions"]["gone"] = document["sessions"].pop("b")
+        document["sessions"]["gone"]["name"] = "gone"
+        bucket.files["_index.json"] = json.dumps(document).encode()
+
+        listed = storage.list_sessions_with_metadata()
+
+        assert sorted(m.name for m in listed) == ["a", "b"]
+        assert storage.list_sessions() == ["a", "b"]
+
+    @patch("supabase.create_client")
+    def test_lost_update_is_detected(self, mock_create_client, sample_metadata):
+        """A concurrent overwrite after upload is caught by the read-back and retried."""
+        storage, bucket = self._make_indexed(mock_create_client)
+        storage.save_session("a", b"data", self._metadata(sample_metadata, "a"))
+        original_update = bucket.update
+        raced = []
+
+        def racing_update(file, path, file_options=None):
+            original_update(file, path, file_options)
+            if path == "_index.json" and not raced:
+                raced.append(True)
+                document = json.loads(file)
+                document["revision"] = "someone-else"
+                document["sessions"]["other"] = document["sessions"]["a"]
+                original_update(json.dumps(document).encode(), path)
+
+        bucket.update = racing_update
+        storage.save_session("b", b"data", self._metadata(sample_metadata, "b"))
+
+        assert set(json.loads(bucket.files["_index.json"])["sessions"]) == {"a", "b", "other"}
+
+
 class TestDoSave:
     """Tests for _do_save method."""
 
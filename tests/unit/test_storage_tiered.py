@@ -0,0 +1,168 @@
+"""Tests for the tiered (remote + local cache) storage backend."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from graftpunk.exceptions import SessionExpiredError, SessionNotFoundError, StorageError
+from graftpunk.storage.base import SessionMetadata
+from graftpunk.storage.local import LocalSessionStorage
+from graftpunk.storage.tiered import TieredSessionStorage
+
+
+def _metadata(name: str, checksum: str = "sum-1", expires_in: timedelta | None = None):
+    now = datetime.now(UTC)
+    return SessionMetadata(
+        name=name,
+        checksum=checksum,
+        created_at=now,
+        modified_at=now,
+        expires_at=now + expires_in if expires_in is not None else None,
+        domain="example.com",
+        current_url=None,
+        cookie_count=1,
+        cookie_domains=["example.com"],
+    )
+
+
+@pytest.fixture
+def remote(tmp_path):
+    """A spy-wrapped local backend standing in for a remote store."""
+    backend = LocalSessionStorage(base_dir=tmp_path / "remote")
+    return MagicMock(wraps=backend, storage_backend="s3", storage_location="s3://bucket")
+
+
+@pytest.fixture
+def tiered(remote, tmp_path):
+    """Tiered storage over the fake remote."""
+    return TieredSessionStorage(remote, tmp_path / "cache")
+
+
+class TestReadThrough:
+    """Tests for cached loads."""
+
+    def test_first_load_downloads_and_caches(self, tiered, remote):
+        """A cold load reads the remote blob and stores a local copy."""
+        remote.save_session("s", b"blob", _metadata("s"))
+
+        data, _ = tiered.load_session("s")
+
+        assert data == b"blob"
+        assert remote.load_session.call_count == 1
+        assert tiered.local.load_session("s")[0] == b"blob"
+
+    def test_repeat_load_skips_download(self, tiered, remote):
+        """A warm load with an unchanged checksum only fetches metadata."""
+        tiered.save_session("s", b"blob", _metadata("s"))
+
+        data, metadata = tiered.load_session("s")
+
+        assert data == b"blob"
+        remote.load_session.assert_not_called()
+        assert metadata == remote.get_session_metadata("s")
+
+    def test_changed_checksum_downloads_again(self, tiered, remote, tmp_path):
+        """A session rewritten elsewhere is re-downloaded."""
+        tiered.save_session("s", b"old", _metadata("s", checksum="sum-1"))
+        remote.save_session("s", b"new", _metadata("s", checksum="sum-2"))
+
+        data, _ = tiered.load_session("s")
+
+        assert data == b"new"
+        assert tiered.local.load_session("s")[0] == b"new"
+
+    def test_metadata_only_update_keeps_local_copy(self, tiered, remote):
+        """A status change does not invalidate the cached bytes."""
+        tiered.save_session("s", b"blob", _metadata("s"))
+        tiered.update_session_metadata("s", status="logged_out")
+
+        data, metadata = tiered.load_session("s")
+
+        assert data == b"blob"
+        assert metadata.status == "logged_out"
+        remote.load_session.assert_not_called()
+
+    def test_recent_metadata_is_reused(self, tiered, remote):
+        """get_session_metadata followed by load_session fetches metadata once."""
+        tiered.save_session("s", b"blob", _metadata("s"))
+
+        tiered.get_session_metadata("s")
+        tiered.load_session("s")
+
+        assert remote.get_session_metadata.call_count == 1
+
+    def test_remote_delete_drops_local_copy(self, tiered, remote):
+        """A session gone remotely is not served from the cache."""
+        tiered.save_session("s", b"blob", _metadata("s"))
+        remote.delete_session("s")
+
+        with pytest.raises(SessionNotFoundError):
+            tiered.load_session("s")
+        assert tiered.local.get_session_metadata("s") is None
+
+
+class TestOfflineFallback:
+    """Tests for loads while the remote store is unreachable."""
+
+    def test_serves_local_copy(self, tiered, remote):
+        """Remote errors fall back to the cached blob with remote identity."""
+        tiered.save_session("s", b"blob", _metadata("s"))
+        remote.get_session_metadata.side_effect = StorageError("offline")
+
+        data, metadata = tiered.load_session("s")
+
+        assert data == b"blob"
+        assert metadata.storage_backend == "s3"
+        assert metadata.storage_location == "s3://bucket"
+
+    def test_no_local_copy_raises_storage_error(self, tiered, remote):
+        """Without a cached copy the remote failure is reported."""
+        remote.get_session_metadata.side_effect = StorageError("offline")
+
+        with pytest.raises(StorageError, match="no local copy"):
+            tiered.load_session("s")
+
+    def test_ttl_still_enforced(self, tiered, remote):
+        """An expired cached session is not served offline."""
+        tiered.save_session("s", b"blob", _metadata("s", expires_in=timedelta(hours=-1)))
+        remote.get_session_metadata.side_effect = StorageError("offline")
+
+        with pytest.raises(SessionExpiredError):
+            tiered.load_session("s")
+
+
+class TestWriteThrough:
+    """Tests for saves and deletes."""
+
+    def test_save_writes_both_tiers(self, tiered, remote):
+        """Saves land remotely and locally."""
+        tiered.save_session("s", b"blob", _metadata("s"))
+
+        assert remote.list_sessions() == ["s"]
+        assert tiered.local.list_sessions() == ["s"]
+
+    def test_local_write_failure_does_not_fail_save(self, tiered, remote):
+        """A broken local cache never fails the authoritative save."""
+        tiered.local = MagicMock()
+        tiered.local.save_session.side_effect = OSError("disk full")
+
+        tiered.save_session("s", b"blob", _metadata("s"))
+
+        assert remote.list_sessions() == ["s"]
+
+    def test_delete_removes_both_tiers(self, tiered, remote):
+        """Deletes remove the local copy too."""
+        tiered.save_session("a", b"blob", _metadata("a"))
+        tiered.save_session("b", b"blob", _metadata("b"))
+
+        tiered.delete_session("a")
+        tiered.delete_sessions(["b"])
+
+        assert remote.list_sessions() == []
+        assert tiered.local.list_sessions() == []
+
+    def test_identity_is_remote(self, tiered):
+        """The wrapper reports the remote backend identity."""
+        assert tiered.storage_backend == "s3"
+        assert tiered.storage_location == "s3://bucket"
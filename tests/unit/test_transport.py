@@ -0,0 +1,290 @@
+"""Tests for connection pool and retry tuning (transport.py)."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from graftpunk.graftpunk_session import GraftpunkSession
+from graftpunk.ratelimit import RateLimit, get_rate_limiter
+from graftpunk.transport import (
+    DEFAULT_RETRY_STATUSES,
+    HostLimits,
+    RateLimitedAdapter,
+    RetryPolicy,
+    TransportConfig,
+    mount_transport,
+    plugin_transport_config,
+)
+
+
+def _pool_maxsize(adapter: HTTPAdapter) -> int:
+    return adapter._pool_maxsize  # type: ignore[attr-defined]
+
+
+@pytest.fixture
+def flaky_server() -> Iterator[tuple[str, list[int]]]:
+    """Local server answering 503 + Retry-After twice, then 200; yields (url, statuses)."""
+    statuses: list[int] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802 — BaseHTTPRequestHandler API
+            status = 503 if len(statuses) < 2 else 200
+            statuses.append(status)
+            self.send_response(status)
+            if status == 503:
+                self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/", statuses
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class TestRetryPolicy:
+    """Tests for RetryPolicy."""
+
+    def test_to_urllib3(self):
+        """The urllib3 Retry backs off on 429/5xx and honours Retry-After."""
+        retry = RetryPolicy(total=5, backoff_factor=1.0).to_urllib3()
+
+        assert retry.total == 5
+        assert retry.backoff_factor == 1.0
+        assert set(retry.status_forcelist) == set(DEFAULT_RETRY_STATUSES)
+        assert retry.respect_retry_after_header is True
+        assert retry.raise_on_status is False
+        assert retry.is_retry("GET", 429, has_retry_after=True)
+        assert not retry.is_retry("POST", 503)
+
+    def test_methods_are_uppercased(self):
+        """Allowed methods are normalized so YAML can use lower case."""
+        policy = RetryPolicy(allowed_methods=("get", "post"))
+
+        assert policy.allowed_methods == ("GET", "POST")
+        assert policy.to_urllib3().is_retry("POST", 503)
+
+    @pytest.mark.parametrize(
+        "kwargs", [{"total": -1}, {"total": True}, {"backoff_factor": -0.1}, {"backoff_max": -1}]
+    )
+    def test_invalid_values(self, kwargs: dict[str, object]):
+        """Negative counts and delays are rejected."""
+        with pytest.raises(ValueError):
+            RetryPolicy(**kwargs)  # type: ignore[arg-type]
+
+
+class TestTransportConfig:
+    """Tests for TransportConfig validation and parsing."""
+
+    @pytest.mark.parametrize("field", ["pool_connections", "pool_maxsize"])
+    @pytest.mark.parametrize("value", [0, -5, True])
+    def test_pool_sizes_must_be_positive(self, field: str, value: object):
+        """Pool sizes must be positive integers."""
+        with pytest.raises(ValueError, match=field):
+            TransportConfig(**{field: value})  # type: ignore[arg-type]
+
+    @pytest.mark.parametrize(
+        "kwargs", [{"rate_limit": 0}, {"rate_limit": -1.0}, {"rate_limit": True}, {"burst": 0}]
+    )
+    def test_invalid_rate_limits(self, kwargs: dict[str, object]):
+        """Rate limits must be positive and bursts positive integers."""
+        with pytest.raises(ValueError):
+            TransportConfig(**kwargs)  # type: ignore[arg-type]
+        with pytest.raises(ValueError):
+            HostLimits("api.example.com", **kwargs)  # type: ignore[arg-type]
+
+    def test_duplicate_host_prefixes(self):
+        """Two overrides for the same host are rejected."""
+        with pytest.raises(ValueError, match="duplicate"):
+            TransportConfig(
+                hosts=(HostLimits("https://api.example.com"), HostLimits("api.example.com"))
+            )
+
+    def test_from_dict(self):
+        """A YAML-style mapping becomes nested dataclasses."""
+        config = TransportConfig.from_dict(
+            {
+                "pool_connections": 4,
+                "pool_maxsize": 32,
+                "retry": {"total": 2, "status_forcelist": [429, 503]},
+                "hosts": {"https://cdn.example.com": {"pool_maxsize": 100, "retry": False}},
+            }
+        )
+
+        assert config.pool_connections == 4
+        assert config.pool_maxsize == 32
+        assert config.retry == RetryPolicy(total=2, status_forcelist=(429, 503))
+        assert config.hosts == (HostLimits("https://cdn.example.com", pool_maxsize=100),)
+
+    def test_from_dict_retry_true_uses_defaults(self):
+        """``retry: true`` enables the default policy."""
+        assert TransportConfig.from_dict({"retry": True}).retry == RetryPolicy()
+
+    @pytest.mark.parametrize(
+        ("data", "match"),
+        [
+            ({"pool_size": 10}, "unknown key"),
+            ({"retry": {"tries": 3}}, "unknown key"),
+            ({"retry": 3}, "mapping or a boolean"),
+            ({"hosts": ["api.example.com"]}, "mapping of URL prefixes"),
+            ({"hosts": {"api.example.com": {"max": 1}}}, "unknown key"),
+        ],
+    )
+    def test_from_dict_errors(self, data: dict[str, object], match: str):
+        """Typos and wrong shapes are reported rather than ignored."""
+        with pytest.raises(ValueError, match=match):
+            TransportConfig.from_dict(data)
+
+
+class TestMountTransport:
+    """Tests for mounting adapters on a session."""
+
+    def test_default_adapters_replaced(self):
+        """Both schemes use one adapter with the configured pool and retries."""
+        session = requests.Session()
+        old = session.get_adapter("https://example.com/")
+
+        mount_transport(session, TransportConfig(pool_maxsize=50, retry=RetryPolicy(total=4)))
+
+        adapter = session.get_adapter("https://example.com/")
+        assert adapter is not old
+        assert adapter is session.get_adapter("http://example.com/")
+        assert _pool_maxsize(adapter) == 50
+        assert adapter.max_retries.total == 4
+
+    def test_host_overrides(self):
+        """Per-host adapters apply only to that host and inherit unset values."""
+        session = requests.Session()
+        config = TransportConfig(
+            pool_maxsize=20,
+            retry=RetryPolicy(total=2),
+            hosts=(HostLimits("api.example.com", pool_maxsize=100),),
+        )
+
+        mount_transport(session, config)
+
+        host_adapter = session.get_adapter("https://api.example.com/v1/items")
+        assert session.get_adapter("http://api.example.com/") is host_adapter
+        assert _pool_maxsize(host_adapter) == 100
+        assert host_adapter.max_retries.total == 2
+        for url in ("https://example.com/", "https://api.example.com.evil/"):
+            assert _pool_maxsize(session.get_adapter(url)) == 20
+
+    def test_no_retry_policy(self):
+        """Without a retry policy requests' no-retry default is kept."""
+        session = requests.Session()
+
+        mount_transport(session, TransportConfig(pool_maxsize=30))
+
+        assert session.get_adapter("https://example.com/").max_retries.total == 0
+
+    def test_retries_transient_statuses(self, flaky_server: tuple[str, list[int]]):
+        """A 503 with Retry-After is retried until the server succeeds."""
+        url, statuses = flaky_server
+        session = requests.Session()
+        mount_transport(session, TransportConfig(retry=RetryPolicy(total=3, backoff_factor=0)))
+
+        response = session.get(url, timeout=5)
+
+        assert response.status_code == 200
+        assert statuses == [503, 503, 200]
+
+    def test_exhausted_retries_return_last_response(self, flaky_server: tuple[str, list[int]]):
+        """When retries run out the final 503 is returned, not raised."""
+        url, statuses = flaky_server
+        session = requests.Session()
+        mount_transport(session, TransportConfig(retry=RetryPolicy(total=1, backoff_factor=0)))
+
+        response = session.get(url, timeout=5)
+
+        assert response.status_code == 503
+        assert statuses == [503, 503]
+
+    def test_rate_limited_adapters(self):
+        """A rate limit mounts RateLimitedAdapters; host overrides inherit unset values."""
+        session = requests.Session()
+        config = TransportConfig(
+            rate_limit=0.5,
+            burst=2,
+            hosts=(
+                HostLimits("api.example.com", rate_limit=0.1),
+                HostLimits("cdn.example.com", pool_maxsize=50),
+            ),
+        )
+
+        mount_transport(session, config)
+
+        default = session.get_adapter("https://example.com/")
+        assert isinstance(default, RateLimitedAdapter)
+        assert default.rate_limit == RateLimit(0.5, burst=2)
+        api = session.get_adapter("https://api.example.com/")
+        assert isinstance(api, RateLimitedAdapter)
+        assert api.rate_limit == RateLimit(0.1, burst=2)
+        cdn = session.get_adapter("https://cdn.example.com/")
+        assert isinstance(cdn, RateLimitedAdapter)
+        assert cdn.rate_limit == RateLimit(0.5, burst=2)
+
+    def test_no_rate_limit_plain_adapter(self):
+        """Without a rate limit the plain HTTPAdapter is used."""
+        session = requests.Session()
+
+        mount_transport(session, TransportConfig())
+
+        assert type(session.get_adapter("https://example.com/")) is HTTPAdapter
+
+    def test_rate_limited_adapter_reports_throttling(self, flaky_server: tuple[str, list[int]]):
+        """The host bucket is slowed by a 503 and recovers on later successes."""
+        url, statuses = flaky_server
+        session = requests.Session()
+        mount_transport(session, TransportConfig(rate_limit=0.001))
+        limiter = get_rate_limiter()
+        key = f"host:{url.split('/')[2]}"
+
+        assert session.get(url, timeout=5).status_code == 503
+        assert limiter.throttle_count == 1
+        assert key in limiter._slowed
+        assert session.get(url, timeout=5).status_code == 503
+        for _ in range(10):
+            assert session.get(url, timeout=5).status_code == 200
+
+        assert limiter.throttle_count == 2
+        assert key not in limiter._slowed
+
+    def test_graftpunk_session_transport_kwarg(self):
+        """GraftpunkSession mounts a transport passed at construction."""
+        session = GraftpunkSession(transport=TransportConfig(pool_maxsize=64))
+
+        assert _pool_maxsize(session.get_adapter("https://example.com/")) == 64
+
+
+class TestPluginTransportConfig:
+    """Tests for plugin_transport_config."""
+
+    def test_returns_declared_config(self):
+        """A plugin's TransportConfig is returned."""
+        config = TransportConfig(pool_maxsize=16)
+        assert plugin_transport_config(SimpleNamespace(transport_config=config)) is config
+
+    @pytest.mark.parametrize(
+        "plugin", [None, SimpleNamespace(), SimpleNamespace(transport_config=5)]
+    )
+    def test_missing_or_invalid(self, plugin: object):
+        """Plugins without a valid config get None."""
+        assert plugin_transport_config(plugin) is None
@@ -5,12 +5,14 @@ from pathlib import Path
 import pytest
 
 from graftpunk.exceptions import PluginError
+from graftpunk.plugins.pagination import PaginationConfig
 from graftpunk.plugins.yaml_loader import (
     discover_yaml_plugins,
     expand_env_vars,
     parse_yaml_plugin,
     validate_yaml_schema,
 )
+from graftpunk.transport import HostLimits, RetryPolicy, TransportConfig
 
 
 class TestExpandEnvVars:
@@ -649,6 +651,7 @@ commands:
     timeout: 60
     max_retries: 3
     rate_limit: 2.0
+    deadline: 120
 """
         yaml_file = tmp_path / "test.yaml"
         yaml_file.write_text(yaml_content)
@@ -656,6 +659,7 @@ commands:
         assert commands[0].timeout == 60
         assert commands[0].max_retries == 3
         assert commands[0].rate_limit == 2.0
+        assert commands[0].deadline == 120
 
     def test_command_defaults_no_limits(self, tmp_path: Path) -> None:
         """Test that resource limits default correctly when not specified."""
@@ -701,6 +705,106 @@ commands:
         assert slow_cmd.max_retries == 5
         assert slow_cmd.rate_limit == 0.5
 
+    def test_command_cache_ttl(self, tmp_path: Path) -> None:
+        """cache_ttl is parsed for GET commands and defaults to None."""
+        yaml_content = """
+site_name: test-site
+base_url: "https://example.com"
+commands:
+  cached:
+    url: "/api/cached"
+    cache_ttl: 300
+  live:
+    url: "/api/live"
+"""
+        yaml_file = tmp_path / "test.yaml"
+        yaml_file.write_text(yaml_content)
+        config, commands, headers = parse_yaml_plugin(yaml_file)
+        by_name = {c.name: c for c in commands}
+        assert by_name["cached"].cache_ttl == 300
+        assert by_name["live"].cache_ttl is None
+
+    def test_cache_ttl_rejected_for_unsafe_method(self, tmp_path: Path) -> None:
+        """cache_ttl on a POST command is a configuration error."""
+        yaml_content = """
+site_name: test-site
+base_url: "https://example.com"
+commands:
+  create:
+    method: POST
+    url: "/api/items"
+    cache_ttl: 60
+"""
+        yaml_file = tmp_path / "test.yaml"
+        yaml_file.write_text(yaml_content)
+        with pytest.raises(ValueError, match="cache_ttl only applies to GET and HEAD"):
+            parse_yaml_plugin(yaml_file)
+
+    def test_command_pagination(self, tmp_path: Path) -> None:
+        """A pagination block becomes a PaginationConfig; it defaults to None."""
+        yaml_content = """
+site_name: test-site
+base_url: "https://example.com"
+commands:
+  list:
+    url: "/api/items"
+    pagination:
+      style: offset
+      items: data.items
+      limit_param: limit
+      page_size: 50
+  single:
+    url: "/api/item"
+"""
+        yaml_file = tmp_path / "test.yaml"
+        yaml_file.write_text(yaml_content)
+        config, commands, headers = parse_yaml_plugin(yaml_file)
+        by_name = {c.name: c for c in commands}
+        assert by_name["list"].pagination == PaginationConfig(
+            "offset", items="data.items", limit_param="limit", page_size=50
+        )
+        assert by_name["single"].pagination is None
+
+    @pytest.mark.parametrize(
+        ("block", "message"),
+        [
+            ("pagination: cursor", "must be a mapping"),
+            ("pagination:\n      style: cursor", "invalid 'pagination'.*requires 'next'"),
+            ("pagination:\n      style: page\n      size: 10", "unknown key"),
+        ],
+    )
+    def test_invalid_pagination(self, tmp_path: Path, block: str, message: str) -> None:
+        """Malformed pagination blocks raise PluginError naming the command."""
+        yaml_content = f"""
+site_name: test-site
+base_url: "https://example.com"
+commands:
+  list:
+    url: "/api/items"
+    {block}
+"""
+        yaml_file = tmp_path / "test.yaml"
+        yaml_file.write_text(yaml_content)
+        with pytest.raises(PluginError, match=message):
+            parse_yaml_plugin(yaml_file)
+
+    def test_pagination_with_jmespath_rejected(self, tmp_path: Path) -> None:
+        """Paginated commands select items with pagination.items, not jmespath."""
+        yaml_content = """
+site_name: test-site
+base_url: "https://example.com"
+commands:
+  list:
+    url: "/api/items"
+    jmespath: data
+    pagination:
+      style: page
+"""
+        yaml_file = tmp_path / "test.yaml"
+        yaml_file.write_text(yaml_content)
+        with pytest.raises(ValueError, match="pagination.items"):
+            parse_yaml_plugin(yaml_file)
+
 
 class TestYAMLTokenConfig:
     """Tests for YAML token config parsing."""
@@ -849,6 +953,104 @@ commands:
         assert config.token_config is None
 
 
+class TestYAMLTransportConfig:
+    """Tests for YAML transport (pooling and retry) config parsing."""
+
+    def test_parse_transport(self, tmp_path: Path) -> None:
+        """transport: block produces TransportConfig on PluginConfig."""
+        yaml_content = """
+site_name: testsite
+base_url: https://example.com
+commands:
+  test:
+    url: /api/test
+transport:
+  pool_maxsize: 64
+  retry:
+    total: 5
+    backoff_factor: 1
+  hosts:
+    https://cdn.example.com:
+      pool_maxsize: 128
+"""
+        yaml_file = tmp_path / "test.yaml"
+        yaml_file.write_text(yaml_content)
+
+        config, commands, headers = parse_yaml_plugin(yaml_file)
+
+        assert config.transport_config == TransportConfig(
+            pool_maxsize=64,
+            retry=RetryPolicy(total=5, backoff_factor=1),
+            hosts=(HostLimits("https://cdn.example.com", pool_maxsize=128),),
+        )
+
+    def test_transport_reaches_plugin(self, tmp_path: Path) -> None:
+        """The YAML plugin instance exposes the parsed TransportConfig."""
+        from graftpunk.plugins.yaml_plugin import create_yaml_site_plugin
+
+        yaml_file = tmp_path / "test.yaml"
+        yaml_file.write_text(
+            "site_name: testsite\ncommands:\n  test:\n    url: /x\ntransport:\n  pool_maxsize: 32\n"
+        )
+        config, commands, headers = parse_yaml_plugin(yaml_file)
+
+        plugin = create_yaml_site_plugin(config, commands, headers)
+
+        assert plugin.transport_config == TransportConfig(pool_maxsize=32)
+
+    @pytest.mark.parametrize(
+        ("block", "match"),
+        [
+            ("transport: 10", "'transport' must be a mapping"),
+            ("transport:\n  pool_maxsize: 0", "invalid 'transport'.*pool_maxsize"),
+            ("transport:\n  poolsize: 10", "invalid 'transport'.*unknown key"),
+        ],
+    )
+    def test_invalid_transport(self, tmp_path: Path, block: str, match: str) -> None:
+        """Malformed transport blocks raise PluginError naming the problem."""
+        yaml_file = tmp_path / "test.yaml"
+        yaml_file.write_text(f"site_name: testsite\ncommands:\n  test:\n    url: /x\n{block}\n")
+
+        with pytest.raises(PluginError, match=match):
+            parse_yaml_plugin(yaml_file)
+
+    def test_rate_limits(self, tmp_path: Path) -> None:
+        """Top-level rate_limit and transport rate limits reach the plugin."""
+        from graftpunk.plugins.yaml_plugin import create_yaml_site_plugin
+
+        yaml_file = tmp_path / "test.yaml"
+        yaml_file.write_text(
+            "site_name: testsite\ncommands:\n  test:\n    url: /x\nrate_limit: 0.5\n"
+            "transport:\n  rate_limit: 0.1\n  burst: 4\n"
+        )
+        config, commands, headers = parse_yaml_plugin(yaml_file)
+
+        plugin = create_yaml_site_plugin(config, commands, headers)
+
+        assert config.rate_limit == 0.5
+        assert plugin.rate_limit == 0.5
+        assert plugin.transport_config == TransportConfig(rate_limit=0.1, burst=4)
+
+    @pytest.mark.parametrize("value", ["0", "-1", "fast", "true"])
+    def test_invalid_rate_limit(self, tmp_path: Path, value: str) -> None:
+        """A non-positive or non-numeric plugin rate_limit raises PluginError."""
+        yaml_file = tmp_path / "test.yaml"
+        yaml_file.write_text(
+            f"site_name: testsite\ncommands:\n  test:\n    url: /x\nrate_limit: {value}\n"
+        )
+
+        with pytest.raises(PluginError, match="'rate_limit' must be a positive number"):
+            parse_yaml_plugin(yaml_file)
+
+    def test_no_transport_block_is_none(self, tmp_path: Path) -> None:
+        """No transport: block means transport_config is None."""
+        yaml_file = tmp_path / "test.yaml"
+        yaml_file.write_text("site_name: testsite\ncommands:\n  test:\n    url: /x\n")
+
+        config, commands, headers = parse_yaml_plugin(yaml_file)
+        assert config.transport_config is None
+
+
 class TestYAMLOutputConfig:
     """Tests for YAML output_config parsing."""
 
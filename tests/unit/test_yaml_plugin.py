@@ -17,6 +17,7 @@ from graftpunk.plugins.cli_plugin import (
 )
 from graftpunk.plugins.yaml_loader import YAMLCommandDef, YAMLParamDef
 from graftpunk.plugins.yaml_plugin import _convert_params, create_yaml_site_plugin
+from graftpunk.transport import TransportConfig
 
 
 def _make_config(
@@ -26,6 +27,7 @@ def _make_config(
     base_url: str = "https://api.example.com",
     requires_session: bool = True,
     login_config: LoginConfig | None = None,
+    transport_config: TransportConfig | None = None,
 ) -> PluginConfig:
     """Helper to create a PluginConfig with sensible defaults."""
     return build_plugin_config(
@@ -34,6 +36,7 @@ def _make_config(
         base_url=base_url,
         requires_session=requires_session,
         login_config=login_config,
+        transport_config=transport_config,
     )
 
 
@@ -49,6 +52,8 @@ def _make_command(
     timeout: float | None = None,
     max_retries: int = 0,
     rate_limit: float | None = None,
+    deadline: float | None = None,
+    cache_ttl: float | None = None,
 ) -> YAMLCommandDef:
     """Helper to create a YAMLCommandDef."""
     return YAMLCommandDef(
@@ -63,6 +68,8 @@ def _make_command(
         timeout=timeout,
         max_retries=max_retries,
         rate_limit=rate_limit,
+        deadline=deadline,
+        cache_ttl=cache_ttl,
     )
 
 
@@ -169,7 +176,7 @@ class TestGetSession:
         ) as mock_load:
             result = plugin.get_session()
 
-        mock_load.assert_called_once_with("my_session")
+        mock_load.assert_called_once_with("my_session", transport=None)
         assert result is mock_session
 
     def test_get_session_without_requires_session(self) -> None:
@@ -180,6 +187,28 @@ class TestGetSession:
         session = plugin.get_session()
         assert isinstance(session, requests.Session)
 
+    def test_get_session_passes_transport_config(self) -> None:
+        """The plugin's transport config is applied to the loaded session."""
+        transport = TransportConfig(pool_maxsize=25)
+        config = _make_config(session_name="my_session", transport_config=transport)
+        plugin = create_yaml_site_plugin(config, [])
+
+        with patch("graftpunk.plugins.cli_plugin.load_session_for_api") as mock_load:
+            plugin.get_session()
+
+        mock_load.assert_called_once_with("my_session", transport=transport)
+
+    def test_get_session_without_requires_session_uses_transport(self) -> None:
+        """A plain session for session-less plugins also gets the transport."""
+        config = _make_config(
+            requires_session=False, transport_config=TransportConfig(pool_maxsize=25)
+        )
+        plugin = create_yaml_site_plugin(config, [])
+
+        session = plugin.get_session()
+
+        assert session.get_adapter("https://example.com/")._pool_maxsize == 25
+
 
 class TestHandlerURLConstruction:
     """Tests for URL building inside the handler closure."""
@@ -483,6 +512,8 @@ class TestResourceLimitsPassthrough:
             timeout=30.0,
             max_retries=3,
             rate_limit=1.5,
+            deadline=90.0,
+            cache_ttl=600.0,
         )
         config = _make_config()
         plugin = create_yaml_site_plugin(config, [cmd])
@@ -492,6 +523,8 @@ class TestResourceLimitsPassthrough:
         assert spec.timeout == 30.0
         assert spec.max_retries == 3
         assert spec.rate_limit == 1.5
+        assert spec.deadline == 90.0
+        assert spec.cache_ttl == 600.0
 
     def test_default_limits_passed_to_command_spec(self) -> None:
         """Default resource limit values are forwarded to CommandSpec."""
@@ -789,3 +822,72 @@ class TestHandlerOutputConfig:
         assert isinstance(result, CommandResult)
         assert result.data == {"data": {"items": [{"id": 1}]}}
         assert result.output_config is output_config
+
+
+class TestHandlerPagination:
+    """Tests for paginated YAML commands."""
+
+    def _handler(self, **kwargs: object):
+        from graftpunk.plugins.pagination import PaginationConfig
+
+        cmd = YAMLCommandDef(
+            name="test",
+            help_text="",
+            method="GET",
+            url="/items",
+            headers={"Accept": "application/json"},
+            pagination=PaginationConfig("page", items="data", page_size=2, limit_param="n"),
+            **kwargs,  # type: ignore[arg-type]
+        )
+        plugin = create_yaml_site_plugin(_make_config(), [cmd])
+        return {c.name: c for c in plugin.get_commands()}["test"].handler
+
+    def _session(self, *pages: list[object]) -> MagicMock:
+        responses = []
+        for items in pages:
+            resp = _mock_response(json_data={"data": items})
+            resp.links = {}
+            responses.append(resp)
+        session = MagicMock(spec=requests.Session)
+        session.request.side_effect = responses
+        return session
+
+    def test_returns_paginator_over_all_pages(self) -> None:
+        """The handler returns a Paginator yielding the items of every page."""
+        from graftpunk.plugins.pagination import Paginator
+
+        session = self._session([1, 2], [3])
+
+        result = self._handler()(_mock_ctx(session), q="x", skip=None)
+
+        assert isinstance(result, Paginator)
+        assert list(result) == [1, 2, 3]
+        first, second = session.request.call_args_list
+        assert first.kwargs["url"] == "https://api.example.com/items"
+        assert first.kwargs["params"] == {"q": "x", "n": 2, "page": 1}
+        assert second.kwargs["params"] == {"q": "x", "n": 2, "page": 2}
+        assert second.kwargs["headers"] == {"Accept": "application/json"}
+
+    def test_later_pages_use_the_command_timeout(self) -> None:
+        """Pages after the first are bounded by the command's timeout."""
+        session = self._session([1, 2], [3])
+
+        result = self._handler(timeout=7)(_mock_ctx(session))
+
+        assert list(result) == [1, 2, 3]
+        assert session.request.call_args_list[1].kwargs["timeout"] == 7
+
+    def test_output_config_wraps_paginator(self) -> None:
+        """With output_config the Paginator is returned inside a CommandResult."""
+        from graftpunk.plugins.cli_plugin import CommandResult
+        from graftpunk.plugins.output_config import OutputConfig, ViewConfig
+        from graftpunk.plugins.pagination import Paginator
+
+        output_config = OutputConfig(views=[ViewConfig(name="default")])
+        session = self._session([1])
+
+        result = self._handler(output_config=output_config)(_mock_ctx(session))
+
+        assert isinstance(result, CommandResult)
+        assert isinstance(result.data, Paginator)
+        assert result.output_config is output_config